@@ -3,6 +3,8 @@ Copyright 2024 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
+import gzip
+
 from flask import Flask, make_response, request
 
 
@@ -12,18 +14,24 @@ def empty_json_response():
     return response
 
 
+def get_request_data() -> bytes:
+    if request.content_encoding == 'gzip':
+        return gzip.decompress(request.data)
+    return request.data
+
+
 app = Flask('mocked_loki')
 
 
 @app.post('/otel')
 def loki_push_otel_logs():
-    print(f'<< {request.data}')
+    print(f'<< {get_request_data()}')
     return empty_json_response(), 204
 
 
 @app.post('/loki/api/v1/push')
 def loki_push_logs():
-    print(f'<< {request.data}')
+    print(f'<< {get_request_data()}')
     return empty_json_response(), 204
 
 
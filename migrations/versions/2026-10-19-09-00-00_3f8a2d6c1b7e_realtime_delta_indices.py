@@ -0,0 +1,45 @@
+"""realtime delta indices
+
+Revision ID: 3f8a2d6c1b7e
+Revises: 7c2e1f4a9b3d
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '3f8a2d6c1b7e'
+down_revision = '7c2e1f4a9b3d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('parking_site', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_parking_site_realtime_data_updated_at_id',
+            ['realtime_data_updated_at', 'id'],
+            unique=False,
+        )
+
+    with op.batch_alter_table('parking_spot', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_parking_spot_realtime_data_updated_at_id',
+            ['realtime_data_updated_at', 'id'],
+            unique=False,
+        )
+
+    with op.batch_alter_table('parking_restriction', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_parking_restriction_parking_site_id'), ['parking_site_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('parking_restriction', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_parking_restriction_parking_site_id'))
+
+    with op.batch_alter_table('parking_spot', schema=None) as batch_op:
+        batch_op.drop_index('ix_parking_spot_realtime_data_updated_at_id')
+
+    with op.batch_alter_table('parking_site', schema=None) as batch_op:
+        batch_op.drop_index('ix_parking_site_realtime_data_updated_at_id')
@@ -0,0 +1,58 @@
+"""change log
+
+Revision ID: 5b1e9c4d7a20
+Revises: 3f8a2d6c1b7e
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+import sqlalchemy_utc
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '5b1e9c4d7a20'
+down_revision = '3f8a2d6c1b7e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'change_log_entry',
+        sa.Column(
+            'object_type',
+            sa.Enum('PARKING_SITE', 'PARKING_SPOT', name='changelogobjecttype'),
+            nullable=False,
+        ),
+        sa.Column('object_id', sa.BigInteger(), nullable=False),
+        sa.Column('source_id', sa.BigInteger(), nullable=False),
+        sa.Column('action', sa.Enum('CREATED', 'UPDATED', 'DELETED', name='changelogaction'), nullable=False),
+        sa.Column('transaction_id', sa.BigInteger(), nullable=True),
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('created_at', sqlalchemy_utc.sqltypes.UtcDateTime(timezone=True), nullable=False),
+        sa.Column('modified_at', sqlalchemy_utc.sqltypes.UtcDateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id', name=op.f('pk_change_log_entry')),
+        mysql_charset='utf8mb4',
+        mysql_collate='utf8mb4_unicode_ci',
+    )
+    with op.batch_alter_table('change_log_entry', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_change_log_entry_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_change_log_entry_modified_at'), ['modified_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_change_log_entry_source_id'), ['source_id'], unique=False)
+        batch_op.create_index('ix_change_log_entry_object', ['object_type', 'object_id', 'id'], unique=False)
+        batch_op.create_index('ix_change_log_entry_transaction', ['transaction_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('change_log_entry', schema=None) as batch_op:
+        batch_op.drop_index('ix_change_log_entry_transaction')
+        batch_op.drop_index('ix_change_log_entry_object')
+        batch_op.drop_index(batch_op.f('ix_change_log_entry_source_id'))
+        batch_op.drop_index(batch_op.f('ix_change_log_entry_modified_at'))
+        batch_op.drop_index(batch_op.f('ix_change_log_entry_created_at'))
+
+    op.drop_table('change_log_entry')
+
+    sa.Enum(name='changelogaction').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='changelogobjecttype').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,31 @@
+"""parking spot spatial index
+
+Revision ID: 8e4f1a2b6c93
+Revises: 5b1e9c4d7a20
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '8e4f1a2b6c93'
+down_revision = '5b1e9c4d7a20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # parking_site.geometry is indexed by ix_geometry_index since the initial migration
+    engine_name = op.get_bind().engine.name
+    if engine_name == 'postgresql':
+        op.execute('CREATE INDEX ix_parking_spot_geometry ON parking_spot USING GIST (geometry);')
+    elif engine_name == 'mysql':
+        op.execute('CREATE SPATIAL INDEX ix_parking_spot_geometry ON parking_spot (geometry);')
+    else:
+        raise NotImplementedError('The application just supports mysql, mariadb and postgresql.')
+
+
+def downgrade():
+    with op.batch_alter_table('parking_spot', schema=None) as batch_op:
+        batch_op.drop_index('ix_parking_spot_geometry')
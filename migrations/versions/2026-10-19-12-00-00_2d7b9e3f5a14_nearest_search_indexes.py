@@ -0,0 +1,45 @@
+"""nearest search indexes
+
+Revision ID: 2d7b9e3f5a14
+Revises: 8e4f1a2b6c93
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '2d7b9e3f5a14'
+down_revision = '8e4f1a2b6c93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    engine_name = op.get_bind().engine.name
+    if engine_name == 'postgresql':
+        # Backs KNN ordering by geography distance
+        op.execute('CREATE INDEX ix_parking_site_geography ON parking_site USING GIST (geography(geometry));')
+        op.execute('CREATE INDEX ix_parking_spot_geography ON parking_spot USING GIST (geography(geometry));')
+    elif engine_name == 'mysql':
+        # Backs the expanding envelope search, which filters by lat / lon ranges
+        with op.batch_alter_table('parking_site', schema=None) as batch_op:
+            batch_op.create_index('ix_parking_site_lat_lon', ['lat', 'lon'], unique=False)
+        with op.batch_alter_table('parking_spot', schema=None) as batch_op:
+            batch_op.create_index('ix_parking_spot_lat_lon', ['lat', 'lon'], unique=False)
+    else:
+        raise NotImplementedError('The application just supports mysql, mariadb and postgresql.')
+
+
+def downgrade():
+    engine_name = op.get_bind().engine.name
+    if engine_name == 'postgresql':
+        op.execute('DROP INDEX ix_parking_spot_geography;')
+        op.execute('DROP INDEX ix_parking_site_geography;')
+    elif engine_name == 'mysql':
+        with op.batch_alter_table('parking_spot', schema=None) as batch_op:
+            batch_op.drop_index('ix_parking_spot_lat_lon')
+        with op.batch_alter_table('parking_site', schema=None) as batch_op:
+            batch_op.drop_index('ix_parking_site_lat_lon')
+    else:
+        raise NotImplementedError('The application just supports mysql, mariadb and postgresql.')
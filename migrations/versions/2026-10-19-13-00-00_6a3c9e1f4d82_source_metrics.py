@@ -0,0 +1,41 @@
+"""source metrics
+
+Revision ID: 6a3c9e1f4d82
+Revises: 2d7b9e3f5a14
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+import sqlalchemy_utc
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '6a3c9e1f4d82'
+down_revision = '2d7b9e3f5a14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('source', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('parking_site_count', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('parking_spot_count', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('realtime_outdated_parking_site_count', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('realtime_outdated_parking_spot_count', sa.Integer(), nullable=True))
+        batch_op.add_column(
+            sa.Column(
+                'realtime_outdated_counted_before',
+                sqlalchemy_utc.sqltypes.UtcDateTime(timezone=True),
+                nullable=True,
+            ),
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('source', schema=None) as batch_op:
+        batch_op.drop_column('realtime_outdated_counted_before')
+        batch_op.drop_column('realtime_outdated_parking_spot_count')
+        batch_op.drop_column('realtime_outdated_parking_site_count')
+        batch_op.drop_column('parking_spot_count')
+        batch_op.drop_column('parking_site_count')
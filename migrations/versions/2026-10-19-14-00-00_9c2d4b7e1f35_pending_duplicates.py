@@ -0,0 +1,99 @@
+"""pending duplicates
+
+Revision ID: 9c2d4b7e1f35
+Revises: 6a3c9e1f4d82
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+import sqlalchemy_utc
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '9c2d4b7e1f35'
+down_revision = '6a3c9e1f4d82'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'pending_duplicate',
+        sa.Column('parking_site_id', sa.BigInteger(), nullable=False),
+        sa.Column('duplicate_parking_site_id', sa.BigInteger(), nullable=False),
+        sa.Column('distance', sa.Float(), nullable=False),
+        sa.Column('dismissed', sa.Boolean(), nullable=False),
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('created_at', sqlalchemy_utc.sqltypes.UtcDateTime(timezone=True), nullable=False),
+        sa.Column('modified_at', sqlalchemy_utc.sqltypes.UtcDateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['parking_site_id'],
+            ['parking_site.id'],
+            name=op.f('fk_pending_duplicate_parking_site_id'),
+            ondelete='CASCADE',
+        ),
+        sa.ForeignKeyConstraint(
+            ['duplicate_parking_site_id'],
+            ['parking_site.id'],
+            name=op.f('fk_pending_duplicate_duplicate_parking_site_id'),
+            ondelete='CASCADE',
+        ),
+        sa.PrimaryKeyConstraint('id', name=op.f('pk_pending_duplicate')),
+        sa.UniqueConstraint(
+            'parking_site_id',
+            'duplicate_parking_site_id',
+            name=op.f('uq_pending_duplicate_parking_site_id_duplicate_parking_site_id'),
+        ),
+        mysql_charset='utf8mb4',
+        mysql_collate='utf8mb4_unicode_ci',
+    )
+    with op.batch_alter_table('pending_duplicate', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_pending_duplicate_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_pending_duplicate_modified_at'), ['modified_at'], unique=False)
+        batch_op.create_index(
+            batch_op.f('ix_pending_duplicate_duplicate_parking_site_id'),
+            ['duplicate_parking_site_id'],
+            unique=False,
+        )
+
+    op.create_table(
+        'pending_duplicate_check',
+        sa.Column('parking_site_id', sa.BigInteger(), nullable=False),
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('created_at', sqlalchemy_utc.sqltypes.UtcDateTime(timezone=True), nullable=False),
+        sa.Column('modified_at', sqlalchemy_utc.sqltypes.UtcDateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['parking_site_id'],
+            ['parking_site.id'],
+            name=op.f('fk_pending_duplicate_check_parking_site_id'),
+            ondelete='CASCADE',
+        ),
+        sa.PrimaryKeyConstraint('id', name=op.f('pk_pending_duplicate_check')),
+        mysql_charset='utf8mb4',
+        mysql_collate='utf8mb4_unicode_ci',
+    )
+    with op.batch_alter_table('pending_duplicate_check', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_pending_duplicate_check_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_pending_duplicate_check_modified_at'), ['modified_at'], unique=False)
+        batch_op.create_index(
+            batch_op.f('ix_pending_duplicate_check_parking_site_id'),
+            ['parking_site_id'],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('pending_duplicate_check', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_pending_duplicate_check_parking_site_id'))
+        batch_op.drop_index(batch_op.f('ix_pending_duplicate_check_modified_at'))
+        batch_op.drop_index(batch_op.f('ix_pending_duplicate_check_created_at'))
+
+    op.drop_table('pending_duplicate_check')
+
+    with op.batch_alter_table('pending_duplicate', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_pending_duplicate_duplicate_parking_site_id'))
+        batch_op.drop_index(batch_op.f('ix_pending_duplicate_modified_at'))
+        batch_op.drop_index(batch_op.f('ix_pending_duplicate_created_at'))
+
+    op.drop_table('pending_duplicate')
@@ -0,0 +1,141 @@
+"""parking site history partitioning
+
+Revision ID: 5f8a3c1d9e27
+Revises: 9c2d4b7e1f35
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+from datetime import datetime, timezone
+
+from alembic import op
+
+from webapp.services.parking_site_history_service.parking_site_history_service import (
+    add_months,
+    get_month_start,
+    get_partition_name,
+)
+
+# revision identifiers, used by Alembic.
+revision = '5f8a3c1d9e27'
+down_revision = '9c2d4b7e1f35'
+branch_labels = None
+depends_on = None
+
+PARTITIONS_AHEAD = 3
+
+
+def upgrade():
+    engine_name = op.get_bind().engine.name
+    if engine_name == 'postgresql':
+        # The existing table is kept as one partition for everything before next month instead of copying all rows.
+        # It is dropped by the history maintenance as soon as all its entries are expired.
+        legacy_upper_bound = add_months(get_month_start(datetime.now(tz=timezone.utc)), 1)
+
+        op.execute('ALTER TABLE parking_site_history RENAME TO parking_site_history_legacy;')
+        op.execute(
+            'ALTER TABLE parking_site_history_legacy RENAME CONSTRAINT fk_parking_site_history_parking_site_id '
+            'TO fk_parking_site_history_legacy_parking_site_id;'
+        )
+        # Primary keys of partitioned tables have to contain the partition key
+        op.execute('ALTER TABLE parking_site_history_legacy DROP CONSTRAINT pk_parking_site_history;')
+        op.execute(
+            'ALTER TABLE parking_site_history_legacy '
+            'ADD CONSTRAINT pk_parking_site_history_legacy PRIMARY KEY (id, created_at);'
+        )
+        op.execute('DROP INDEX ix_parking_site_history_created_at;')
+        op.execute(
+            'ALTER INDEX ix_parking_site_history_modified_at RENAME TO ix_parking_site_history_legacy_modified_at;'
+        )
+        # Indexes are created before attaching, so they are named consistently and just attached to the parent indexes
+        op.execute(
+            'CREATE INDEX ix_parking_site_history_legacy_parking_site_id_created_at '
+            'ON parking_site_history_legacy (parking_site_id, created_at);'
+        )
+        op.execute(
+            'CREATE INDEX ix_parking_site_history_legacy_created_at ON parking_site_history_legacy USING BRIN (created_at);'
+        )
+        # A validated check constraint lets ATTACH PARTITION skip its full table scan under an exclusive lock
+        op.execute(
+            'ALTER TABLE parking_site_history_legacy ADD CONSTRAINT ck_parking_site_history_legacy_created_at '
+            f"CHECK (created_at < '{legacy_upper_bound.isoformat()}') NOT VALID;"
+        )
+        op.execute(
+            'ALTER TABLE parking_site_history_legacy VALIDATE CONSTRAINT ck_parking_site_history_legacy_created_at;'
+        )
+
+        op.execute(
+            'CREATE TABLE parking_site_history (LIKE parking_site_history_legacy INCLUDING DEFAULTS) '
+            'PARTITION BY RANGE (created_at);'
+        )
+        op.execute(
+            'ALTER TABLE parking_site_history ADD CONSTRAINT pk_parking_site_history PRIMARY KEY (id, created_at);'
+        )
+        op.execute(
+            'ALTER TABLE parking_site_history ADD CONSTRAINT fk_parking_site_history_parking_site_id '
+            'FOREIGN KEY (parking_site_id) REFERENCES parking_site (id);'
+        )
+        op.execute(
+            'CREATE INDEX ix_parking_site_history_parking_site_id_created_at '
+            'ON parking_site_history (parking_site_id, created_at);'
+        )
+        op.execute('CREATE INDEX ix_parking_site_history_created_at ON parking_site_history USING BRIN (created_at);')
+        op.execute('CREATE INDEX ix_parking_site_history_modified_at ON parking_site_history (modified_at);')
+        # Otherwise, the id sequence would be dropped together with the legacy partition
+        op.execute('ALTER SEQUENCE parking_site_history_id_seq OWNED BY parking_site_history.id;')
+
+        op.execute(
+            'ALTER TABLE parking_site_history ATTACH PARTITION parking_site_history_legacy '
+            f"FOR VALUES FROM (MINVALUE) TO ('{legacy_upper_bound.isoformat()}');"
+        )
+        op.execute('ALTER TABLE parking_site_history_legacy DROP CONSTRAINT ck_parking_site_history_legacy_created_at;')
+
+        for month_offset in range(PARTITIONS_AHEAD + 1):
+            month_start = add_months(legacy_upper_bound, month_offset)
+            op.execute(
+                f'CREATE TABLE {get_partition_name(month_start)} PARTITION OF parking_site_history '
+                f"FOR VALUES FROM ('{month_start.isoformat()}') TO ('{add_months(month_start, 1).isoformat()}');"
+            )
+        # Catches inserts if the history maintenance did not create partitions in time
+        op.execute('CREATE TABLE parking_site_history_default PARTITION OF parking_site_history DEFAULT;')
+
+    elif engine_name == 'mysql':
+        # The index on created_at stays a B-tree, as MySQL has no BRIN indexes
+        with op.batch_alter_table('parking_site_history', schema=None) as batch_op:
+            batch_op.create_index(
+                'ix_parking_site_history_parking_site_id_created_at',
+                ['parking_site_id', 'created_at'],
+                unique=False,
+            )
+    else:
+        raise NotImplementedError('The application just supports mysql, mariadb and postgresql.')
+
+
+def downgrade():
+    engine_name = op.get_bind().engine.name
+    if engine_name == 'postgresql':
+        op.execute('ALTER TABLE parking_site_history DETACH PARTITION parking_site_history_legacy;')
+        op.execute('INSERT INTO parking_site_history_legacy SELECT * FROM parking_site_history;')
+        op.execute('ALTER SEQUENCE parking_site_history_id_seq OWNED BY parking_site_history_legacy.id;')
+        # Drops all remaining partitions as well
+        op.execute('DROP TABLE parking_site_history;')
+
+        op.execute('ALTER TABLE parking_site_history_legacy RENAME TO parking_site_history;')
+        op.execute(
+            'ALTER TABLE parking_site_history RENAME CONSTRAINT fk_parking_site_history_legacy_parking_site_id '
+            'TO fk_parking_site_history_parking_site_id;'
+        )
+        op.execute('ALTER TABLE parking_site_history DROP CONSTRAINT pk_parking_site_history_legacy;')
+        op.execute('ALTER TABLE parking_site_history ADD CONSTRAINT pk_parking_site_history PRIMARY KEY (id);')
+        op.execute('DROP INDEX ix_parking_site_history_legacy_parking_site_id_created_at;')
+        op.execute('DROP INDEX ix_parking_site_history_legacy_created_at;')
+        op.execute(
+            'ALTER INDEX ix_parking_site_history_legacy_modified_at RENAME TO ix_parking_site_history_modified_at;'
+        )
+        op.execute('CREATE INDEX ix_parking_site_history_created_at ON parking_site_history (created_at);')
+
+    elif engine_name == 'mysql':
+        with op.batch_alter_table('parking_site_history', schema=None) as batch_op:
+            batch_op.drop_index('ix_parking_site_history_parking_site_id_created_at')
+    else:
+        raise NotImplementedError('The application just supports mysql, mariadb and postgresql.')
@@ -0,0 +1,77 @@
+"""parking site history rollup
+
+Revision ID: 7b1e4d2a9c58
+Revises: 5f8a3c1d9e27
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+import sqlalchemy_utc
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '7b1e4d2a9c58'
+down_revision = '5f8a3c1d9e27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'parking_site_history_rollup',
+        sa.Column('parking_site_id', sa.BigInteger(), nullable=False),
+        sa.Column('resolution', sa.Enum('HOUR', 'DAY', name='parkingsitehistoryresolution'), nullable=False),
+        sa.Column('period_start', sqlalchemy_utc.sqltypes.UtcDateTime(timezone=True), nullable=False),
+        sa.Column('change_count', sa.Integer(), nullable=False),
+        sa.Column('opening_status_seconds', sa.Integer(), nullable=False),
+        sa.Column('open_seconds', sa.Integer(), nullable=False),
+        sa.Column('realtime_free_capacity_seconds', sa.Integer(), nullable=False),
+        sa.Column('realtime_free_capacity_integral', sa.BigInteger(), nullable=True),
+        sa.Column('realtime_free_capacity_min', sa.Integer(), nullable=True),
+        sa.Column('realtime_free_capacity_max', sa.Integer(), nullable=True),
+        sa.Column(
+            'realtime_opening_status_last',
+            sa.Enum('OPEN', 'CLOSED', 'UNKNOWN', name='history_rollup_openingstatus'),
+            nullable=True,
+        ),
+        sa.Column('realtime_free_capacity_last', sa.Integer(), nullable=True),
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('created_at', sqlalchemy_utc.sqltypes.UtcDateTime(timezone=True), nullable=False),
+        sa.Column('modified_at', sqlalchemy_utc.sqltypes.UtcDateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['parking_site_id'],
+            ['parking_site.id'],
+            name=op.f('fk_parking_site_history_rollup_parking_site_id'),
+            ondelete='CASCADE',
+        ),
+        sa.PrimaryKeyConstraint('id', name=op.f('pk_parking_site_history_rollup')),
+        sa.UniqueConstraint(
+            'parking_site_id',
+            'resolution',
+            'period_start',
+            name='uq_parking_site_history_rollup_period',
+        ),
+        mysql_charset='utf8mb4',
+        mysql_collate='utf8mb4_unicode_ci',
+    )
+    with op.batch_alter_table('parking_site_history_rollup', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_parking_site_history_rollup_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_parking_site_history_rollup_modified_at'), ['modified_at'], unique=False)
+        batch_op.create_index(
+            'ix_parking_site_history_rollup_resolution_period_start',
+            ['resolution', 'period_start'],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('parking_site_history_rollup', schema=None) as batch_op:
+        batch_op.drop_index('ix_parking_site_history_rollup_resolution_period_start')
+        batch_op.drop_index(batch_op.f('ix_parking_site_history_rollup_modified_at'))
+        batch_op.drop_index(batch_op.f('ix_parking_site_history_rollup_created_at'))
+
+    op.drop_table('parking_site_history_rollup')
+
+    sa.Enum(name='parkingsitehistoryresolution').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='history_rollup_openingstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,102 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from flask.testing import FlaskClient
+from freezegun import freeze_time
+from sqlalchemy import insert, select
+
+from tests.model_generator.parking_site import get_parking_site
+from tests.model_generator.source import get_source
+from webapp.common.sqlalchemy import SQLAlchemy
+from webapp.models import ChangeLogAction, ChangeLogEntry, ChangeLogObjectType
+
+
+def test_get_changes(db: SQLAlchemy, public_api_test_client: FlaskClient) -> None:
+    with freeze_time('2026-10-19 08:00:00'):
+        parking_site = get_parking_site(source=get_source())
+        db.session.add(parking_site)
+        db.session.commit()
+
+        parking_site.name = 'Updated Parking Site'
+        db.session.commit()
+
+        db.session.delete(parking_site)
+        db.session.commit()
+
+    with freeze_time('2026-10-19 08:10:00'):
+        response = public_api_test_client.get(path='/api/public/v3/changes?limit=2')
+
+    assert response.status_code == 200
+    assert [(item['object_type'], item['action']) for item in response.json['items']] == [
+        ('PARKING_SITE', 'CREATED'),
+        ('PARKING_SITE', 'UPDATED'),
+    ]
+    assert response.json['next_after'] == response.json['items'][-1]['id']
+    assert response.json['next_path'] == f'/api/public/v3/changes?limit=2&after={response.json["next_after"]}'
+
+    with freeze_time('2026-10-19 08:10:00'):
+        response = public_api_test_client.get(path=response.json['next_path'])
+
+    assert response.status_code == 200
+    assert [(item['object_type'], item['action']) for item in response.json['items']] == [
+        ('PARKING_SITE', 'DELETED'),
+    ]
+    assert 'next_path' not in response.json
+
+
+def test_realtime_only_updates_write_no_change_log_entries(db: SQLAlchemy) -> None:
+    parking_site = get_parking_site(source=get_source())
+    db.session.add(parking_site)
+    db.session.commit()
+
+    parking_site.realtime_free_capacity = 1
+    parking_site.realtime_data_updated_at = datetime.now(tz=timezone.utc)
+    db.session.commit()
+
+    assert [entry.action for entry in db.session.scalars(select(ChangeLogEntry))] == [ChangeLogAction.CREATED]
+
+    parking_site.name = 'Updated Parking Site'
+    db.session.commit()
+
+    assert [entry.action for entry in db.session.scalars(select(ChangeLogEntry).order_by(ChangeLogEntry.id))] == [
+        ChangeLogAction.CREATED,
+        ChangeLogAction.UPDATED,
+    ]
+
+
+def test_get_changes_waits_for_running_transactions(db: SQLAlchemy, public_api_test_client: FlaskClient) -> None:
+    if db.engine.dialect.name != 'postgresql':
+        pytest.skip('MySQL publishes changes after CHANGE_LOG_VISIBILITY_DELAY_SECONDS instead')
+
+    with db.engine.connect() as connection:
+        # A long running transaction writes its entry first, so it gets the lower sequence number
+        connection.execute(
+            insert(ChangeLogEntry).values(
+                object_type=ChangeLogObjectType.PARKING_SITE,
+                object_id=4711,
+                source_id=1,
+                action=ChangeLogAction.UPDATED,
+            ),
+        )
+
+        parking_site = get_parking_site(source=get_source())
+        db.session.add(parking_site)
+        db.session.commit()
+
+        # The committed change has to wait, otherwise mirrors would pass the entry of the running transaction
+        response = public_api_test_client.get(path='/api/public/v3/changes')
+
+        assert response.status_code == 200
+        assert response.json['items'] == []
+
+        connection.commit()
+
+    response = public_api_test_client.get(path='/api/public/v3/changes')
+
+    assert response.status_code == 200
+    assert [item['object_id'] for item in response.json['items']] == [4711, parking_site.id]
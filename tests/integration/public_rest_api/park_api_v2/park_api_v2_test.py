@@ -22,3 +22,23 @@ def test_get_v1_lots(public_api_test_client: FlaskClient, multi_source_parking_s
 
     assert response.status_code == 200
     assert response.json == PARK_API_V2_LOTS_RESPONSE
+
+
+def test_get_v2_lots_paginated(public_api_test_client: FlaskClient, multi_source_parking_site_test_data: None) -> None:
+    first_response = public_api_test_client.get(path='/api/public/v2/lots/', query_string={'limit': 4})
+
+    assert first_response.status_code == 200
+    assert first_response.json['count'] == 6
+    assert first_response.json['previous'] is None
+    assert first_response.json['results'] == PARK_API_V2_LOTS_RESPONSE['results'][:4]
+
+    second_response = public_api_test_client.get(first_response.json['next'])
+
+    assert second_response.status_code == 200
+    assert second_response.json['count'] == 6
+    assert second_response.json['next'] is None
+    assert second_response.json['results'] == PARK_API_V2_LOTS_RESPONSE['results'][4:]
+
+    previous_response = public_api_test_client.get(second_response.json['previous'])
+
+    assert previous_response.json['results'] == first_response.json['results']
@@ -105,3 +105,30 @@ def test_realtime_data_outdated_calculation_enabled_explicitly(
     assert response.status_code == 200
     assert response.json['has_realtime_data'] is False
     assert not any(key.startswith('realtime_') for key in response.json)
+
+
+def test_realtime_delta(public_api_test_client: FlaskClient, realtime_parking_site: None) -> None:
+    response = public_api_test_client.get(path='/api/public/v3/parking-sites/realtime')
+
+    assert response.status_code == 200
+    assert response.json == {
+        'items': [
+            {
+                'id': 1,
+                'realtime_data_updated_at': '2025-01-01T12:00:00Z',
+                'realtime_capacity': 100,
+                'realtime_free_capacity': 42,
+                'realtime_opening_status': 'OPEN',
+            },
+        ],
+        'next_since': '2025-01-01T12:00:00.000000Z',
+    }
+
+
+def test_realtime_delta_since(public_api_test_client: FlaskClient, realtime_parking_site: None) -> None:
+    response = public_api_test_client.get(
+        path='/api/public/v3/parking-sites/realtime?since=2025-01-01T12:00:00.000000Z',
+    )
+
+    assert response.status_code == 200
+    assert response.json == {'items': [], 'next_since': '2025-01-01T12:00:00.000000Z'}
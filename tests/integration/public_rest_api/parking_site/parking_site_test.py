@@ -4,11 +4,16 @@ Use of this source code is governed by an MIT-style license that can be found in
 """
 
 from flask.testing import FlaskClient
+from parkapi_sources.models.enums import ExternalIdentifierType, ParkingAudience
 
 from tests.integration.public_rest_api.parking_site.parking_site_responses import (
     PARKING_SITE_ITEM_RESPONSE,
     PARKING_SITE_LIST_RESPONSE,
 )
+from tests.model_generator.parking_site import get_parking_site
+from tests.model_generator.source import get_source
+from webapp.common.sqlalchemy import SQLAlchemy
+from webapp.models import ExternalIdentifier, ParkingRestriction, Tag
 
 
 def test_get_parking_site_list(public_api_test_client: FlaskClient, multi_source_parking_site_test_data: None) -> None:
@@ -23,3 +28,85 @@ def test_get_parking_site_item(public_api_test_client: FlaskClient, multi_source
 
     assert response.status_code == 200
     assert response.json == PARKING_SITE_ITEM_RESPONSE
+
+
+def test_get_parking_site_list_geojson(test_client: FlaskClient, multi_source_parking_site_test_data: None) -> None:
+    response = test_client.get(path='/api/public/v3/parking-sites?format=geojson&fields=name,capacity')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/geo+json'
+    assert response.json['type'] == 'FeatureCollection'
+    assert response.json['total_count'] == 6
+    assert response.json['features'][0] == {
+        'type': 'Feature',
+        'id': 1,
+        'geometry': {'type': 'Point', 'coordinates': [10.1, 50.1]},
+        'properties': {'name': 'Demo Parking Site 1', 'capacity': 100},
+    }
+
+
+def test_get_parking_site_vector_tile(test_client: FlaskClient, multi_source_parking_site_test_data: None) -> None:
+    response = test_client.get(path='/api/public/v3/parking-sites/tiles/0/0/0.mvt')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/vnd.mapbox-vector-tile'
+    assert b'parking_sites' in response.data
+
+
+def test_get_parking_site_vector_tile_invalid(test_client: FlaskClient) -> None:
+    response = test_client.get(path='/api/public/v3/parking-sites/tiles/1/2/0.mvt')
+
+    assert response.status_code == 400
+
+
+def test_get_parking_site_list_nearest(test_client: FlaskClient, multi_source_parking_site_test_data: None) -> None:
+    response = test_client.get(path='/api/public/v3/parking-sites?lat=50.32&lon=10.32&nearest=2')
+
+    assert response.status_code == 200
+    assert [item['id'] for item in response.json['items']] == [3, 4]
+    assert response.json['items'][0]['distance'] < response.json['items'][1]['distance']
+
+    response = test_client.get(path=response.json['next_path'])
+
+    assert response.status_code == 200
+    assert [item['id'] for item in response.json['items']] == [2, 5]
+
+
+def test_get_parking_site_list_count_modes(test_client: FlaskClient, multi_source_parking_site_test_data: None) -> None:
+    response = test_client.get(path='/api/public/v3/parking-sites?limit=2&count=none')
+
+    assert response.status_code == 200
+    assert len(response.json['items']) == 2
+    assert 'total_count' not in response.json
+    assert response.json['next_path'] == '/api/public/v3/parking-sites?limit=2&count=none&start=3'
+
+    response = test_client.get(path='/api/public/v3/parking-sites?limit=2&count=estimated')
+
+    assert response.status_code == 200
+    assert response.json['total_count'] >= 2
+
+    response = test_client.get(path='/api/public/v3/parking-sites?limit=2&count=exact')
+
+    assert response.status_code == 200
+    assert response.json['total_count'] == 6
+
+
+def test_get_parking_site_list_matches_item(test_client: FlaskClient, db: SQLAlchemy) -> None:
+    parking_site = get_parking_site(source=get_source())
+    parking_site.restrictions = [
+        ParkingRestriction(type=ParkingAudience.DISABLED, capacity=2),
+        ParkingRestriction(type=ParkingAudience.WOMEN, hours='Mo-Fr 08:00-18:00'),
+    ]
+    parking_site.external_identifiers = [ExternalIdentifier(type=ExternalIdentifierType.OSM, value='123')]
+    parking_site.tags = [Tag(value='tag-1'), Tag(value='tag-2')]
+    db.session.add(parking_site)
+    db.session.commit()
+
+    # The list loads aggregated rows, the item loads ORM instances, but both have to be serialized the same way
+    list_response = test_client.get(path='/api/public/v3/parking-sites')
+    item_response = test_client.get(path=f'/api/public/v3/parking-sites/{parking_site.id}')
+
+    assert list_response.status_code == 200
+    assert list_response.json['items'] == [item_response.json]
+    assert len(item_response.json['restrictions']) == 2
+    assert item_response.json['restricted_to'] == [{'type': 'WOMEN', 'hours': 'Mo-Fr 08:00-18:00'}]
@@ -0,0 +1,67 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+import os
+from typing import Generator
+
+import pytest
+
+from tests.integration.helpers import OpenApiApp
+from tests.model_generator.parking_site import get_parking_site
+from tests.model_generator.source import get_source
+from webapp import launch
+from webapp.common.flask_app import App
+from webapp.common.sqlalchemy import READ_REPLICA_BIND_KEY
+from webapp.extensions import db as flask_sqlalchemy
+
+
+@pytest.fixture
+def read_replica_flask_app() -> Generator[App, None, None]:
+    """
+    Creates a Flask app instance with a second local database as stand-in for the read replica. As there is no
+    replication, data written to the primary is not visible at the read replica.
+    """
+    read_replica_uri = os.environ.get('TEST_READ_REPLICA_DATABASE_URI')
+    if read_replica_uri is None:
+        pytest.skip('TEST_READ_REPLICA_DATABASE_URI is not set')
+
+    os.environ['CONFIG_FILE'] = os.environ.get('TEST_CONFIG_FILE', 'config_dist_dev.yaml')
+
+    app = launch(
+        app_class=OpenApiApp,
+        config_overrides={
+            'TESTING': True,
+            'DEBUG': True,
+            'SERVER_NAME': 'localhost:5000',
+            'SQLALCHEMY_READ_REPLICA_URI': read_replica_uri,
+        },
+    )
+
+    with app.app_context():
+        read_replica_engine = flask_sqlalchemy.engines[READ_REPLICA_BIND_KEY]
+        for engine in [flask_sqlalchemy.engine, read_replica_engine]:
+            flask_sqlalchemy.metadata.drop_all(bind=engine)
+            flask_sqlalchemy.metadata.create_all(bind=engine)
+        yield app
+
+
+def test_public_reads_use_read_replica(read_replica_flask_app: App) -> None:
+    flask_sqlalchemy.session.add(get_parking_site(source=get_source()))
+    flask_sqlalchemy.session.commit()
+
+    with read_replica_flask_app.test_client() as test_client:
+        # The session wrote in this app context, so it keeps reading from the primary
+        response = test_client.get(path='/api/public/v3/parking-sites')
+
+        assert response.status_code == 200
+        assert len(response.json['items']) == 1
+
+        flask_sqlalchemy.session.remove()
+
+        # A new session without writes reads from the read replica, which doesn't know the parking site
+        response = test_client.get(path='/api/public/v3/parking-sites')
+
+        assert response.status_code == 200
+        assert response.json['items'] == []
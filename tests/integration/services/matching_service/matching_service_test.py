@@ -5,9 +5,11 @@ Use of this source code is governed by an MIT-style license that can be found in
 
 import pytest
 
+from webapp.common.flask_app import App
 from webapp.common.sqlalchemy import SQLAlchemy
 from webapp.dependencies import dependencies
 from webapp.models import ParkingSite
+from webapp.repositories.exceptions import ObjectNotFoundException
 from webapp.services.matching_service import MatchingService
 
 
@@ -72,6 +74,26 @@ class MatchingServiceTest:
         # expect one duplicates pair, because the other one is between source 2 and 3.
         assert len(duplicates) == 2
 
+    @staticmethod
+    def test_check_pending_duplicates(
+        flask_app: App,
+        multi_source_parking_site_test_data: None,
+        matching_service: MatchingService,
+    ) -> None:
+        flask_app.config['MATCH_RADIUS'] = 25000
+
+        # All parking sites are new, so they are queued for the check
+        matching_service.check_pending_duplicates()
+        duplicates = matching_service.get_pending_duplicates()
+
+        # Same pairs as a full generation
+        assert len(duplicates) == 4
+
+        # Decided duplicates are not pending anymore
+        matching_service.apply_duplicates([[duplicates[0].id, duplicates[0].duplicate_id]], [])
+
+        assert len(matching_service.get_pending_duplicates()) == 2
+
     @staticmethod
     def test_apply_duplicates_new(
         db: SQLAlchemy,
@@ -88,6 +110,22 @@ class MatchingServiceTest:
             else:
                 assert parking_site.duplicate_of_parking_site_id is None
 
+    @staticmethod
+    def test_apply_duplicates_missing_parking_site(
+        db: SQLAlchemy,
+        multi_source_parking_site_test_data: None,
+        matching_service: MatchingService,
+    ) -> None:
+        with pytest.raises(ObjectNotFoundException):
+            matching_service.apply_duplicates([], [[4, 1], [5, 999]])
+
+        db.session.rollback()
+        parking_sites = db.session.query(ParkingSite).all()
+
+        assert len(parking_sites) == 6
+        for parking_site in parking_sites:
+            assert parking_site.duplicate_of_parking_site_id is None
+
     @staticmethod
     def test_apply_duplicates_overwrite(
         db: SQLAlchemy,
@@ -0,0 +1,79 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from webapp.common.events import Event, EventHelper, EventReceiver, EventSource, EventType
+
+
+class OptionEventReceiver(EventReceiver):
+    listen_to_event_types = [EventType.OPTION_UPDATED]
+    required_parameters = ['option_id']
+
+    def __init__(self):
+        self.data_list = []
+
+    def run(self, event_source: EventSource, data: dict):
+        self.data_list.append(data)
+
+
+def get_event_helper() -> EventHelper:
+    app_context = SimpleNamespace()
+    event_helper = EventHelper(celery_helper=Mock(), context_helper=Mock(get_app_context=lambda: app_context))
+    event_helper.register_receivers([OptionEventReceiver()])
+    return event_helper
+
+
+class EventHelperTest:
+    @staticmethod
+    def test_publish_events_deduplicates_and_coalesces():
+        event_helper = get_event_helper()
+        for option_id in [1, 2, 1, 3, 2]:
+            event_helper.record(
+                Event(type=EventType.OPTION_UPDATED, source=EventSource.ORM, data={'option_id': option_id})
+            )
+        event_helper.record(Event(type=EventType.OPTION_CREATED, source=EventSource.ORM, data={'option_id': 1}))
+
+        event_helper.publish_events()
+
+        event_helper.celery_helper.with_delay.assert_called_once()
+        assert event_helper.celery_helper.with_delay.call_args.kwargs['data_list'] == [
+            {'option_id': 1},
+            {'option_id': 2},
+            {'option_id': 3},
+        ]
+
+    @staticmethod
+    def test_suppress_model_events():
+        event_helper = get_event_helper()
+        with event_helper.suppress_model_events():
+            event_helper.record(Event(type=EventType.OPTION_UPDATED, source=EventSource.ORM, data={'option_id': 1}))
+            event_helper.record(Event(type=EventType.OPTION_UPDATED, source=EventSource.SERVICE, data={'option_id': 2}))
+        event_helper.record(Event(type=EventType.OPTION_UPDATED, source=EventSource.ORM, data={'option_id': 3}))
+
+        event_helper.publish_events()
+
+        assert event_helper.celery_helper.with_delay.call_count == 2
+        assert [call.kwargs['data_list'] for call in event_helper.celery_helper.with_delay.call_args_list] == [
+            [{'option_id': 2}],
+            [{'option_id': 3}],
+        ]
+
+    @staticmethod
+    def test_trigger_async_batch_skips_invalid_payloads():
+        event_helper = get_event_helper()
+
+        event_helper.trigger_async_batch(
+            event_type=EventType.OPTION_UPDATED,
+            event_source=EventSource.ORM,
+            event_id=0,
+            data_list=[{'option_id': 1}, {}, {'option_id': 2}],
+        )
+
+        assert event_helper.event_receivers[EventType.OPTION_UPDATED][0].data_list == [
+            {'option_id': 1},
+            {'option_id': 2},
+        ]
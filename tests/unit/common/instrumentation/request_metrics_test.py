@@ -0,0 +1,53 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from webapp.common.instrumentation import Histogram, normalize_sql
+
+
+class HistogramTest:
+    @staticmethod
+    def test_cumulative_buckets():
+        histogram = Histogram((1, 5, 10))
+
+        histogram.observe('endpoint', 0.5)
+        histogram.observe('endpoint', 1)
+        histogram.observe('endpoint', 7)
+        histogram.observe('endpoint', 50)
+
+        snapshot = histogram.get_snapshots()['endpoint']
+
+        assert snapshot.buckets == [(1, 2), (5, 2), (10, 3)]
+        assert snapshot.count == 4
+        assert snapshot.sum == 58.5
+
+    @staticmethod
+    def test_labels_are_separated():
+        histogram = Histogram((1,))
+
+        histogram.observe('first', 0.5)
+        histogram.observe('second', 2)
+
+        snapshots = histogram.get_snapshots()
+
+        assert snapshots['first'].buckets == [(1, 1)]
+        assert snapshots['second'].buckets == [(1, 0)]
+        assert snapshots['second'].count == 1
+
+
+class NormalizeSqlTest:
+    @staticmethod
+    def test_literals_and_parameters():
+        statement = "SELECT *\n  FROM parking_site\n  WHERE parking_site.name = 'Test' AND parking_site.capacity > 10"
+
+        assert (
+            normalize_sql(statement)
+            == 'SELECT * FROM parking_site WHERE parking_site.name = ? AND parking_site.capacity > ?'
+        )
+
+    @staticmethod
+    def test_parameter_lists_are_collapsed():
+        statement = 'SELECT * FROM parking_site_2 WHERE parking_site_2.id IN (%(id_1_1)s, %(id_1_2)s, %(id_1_3)s)'
+
+        assert normalize_sql(statement) == 'SELECT * FROM parking_site_2 WHERE parking_site_2.id IN (...)'
@@ -0,0 +1,150 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+import gzip
+import json
+import logging
+import os
+import signal
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from requests import ConnectionError
+
+from webapp.common.logging.batching_http_json_post_handler import (
+    BatchingHttpPostJsonHandler,
+    _reset_handlers_after_fork,
+    load_log_shipping_statistics,
+)
+
+
+def get_handler(**kwargs) -> BatchingHttpPostJsonHandler:
+    handler = BatchingHttpPostJsonHandler('http://loki/push', retry_backoff=0, **kwargs)
+    # Records are sent by flush() in the test thread instead of the background thread
+    handler._ensure_worker = lambda: None
+    handler._session = Mock()
+    handler._session.post.return_value = Mock(status_code=204, ok=True)
+    return handler
+
+
+def get_record(message: str) -> logging.LogRecord:
+    return logging.LogRecord('webapp', logging.INFO, __file__, 1, message, None, None)
+
+
+class BatchingHttpPostJsonHandlerTest:
+    @staticmethod
+    def test_flush_sends_compressed_batches():
+        handler = get_handler(max_batch_size=2)
+        handler.setFormatter(logging.Formatter('{"message": "%(message)s"}'))
+        for message in ['a', 'b', 'c']:
+            handler.emit(get_record(message))
+
+        handler.flush()
+
+        bodies = [json.loads(gzip.decompress(call.kwargs['data'])) for call in handler._session.post.call_args_list]
+        assert bodies == [[{'message': 'a'}, {'message': 'b'}], [{'message': 'c'}]]
+        assert handler.get_statistics().sent_count == 3
+        assert handler.get_statistics().batch_count == 2
+
+    @staticmethod
+    def test_loki_streams_are_merged():
+        handler = get_handler(batch_format='loki', compress=False)
+        handler.setFormatter(logging.Formatter('{"streams": [{"values": [["1", "%(message)s"]]}]}'))
+        handler.emit(get_record('a'))
+        handler.emit(get_record('b'))
+
+        handler.flush()
+
+        assert json.loads(handler._session.post.call_args.kwargs['data']) == {
+            'streams': [{'values': [['1', 'a']]}, {'values': [['1', 'b']]}],
+        }
+
+    @staticmethod
+    def test_full_buffer_drops_records():
+        handler = get_handler(max_queue_size=2)
+        for message in ['a', 'b', 'c', 'd']:
+            handler.emit(get_record(message))
+
+        statistics = handler.get_statistics()
+        assert statistics.queue_size == 2
+        assert statistics.dropped_count == 2
+
+    @staticmethod
+    def test_retries_and_counts_failures():
+        handler = get_handler(max_retries=2)
+        handler._session.post.side_effect = ConnectionError()
+        handler.emit(get_record('a'))
+
+        handler.flush()
+
+        assert handler._session.post.call_count == 3
+        assert handler.get_statistics().failed_count == 1
+        assert handler.get_statistics().sent_count == 0
+
+    @staticmethod
+    def test_statistics_are_shared_via_statistics_dir(tmp_path: Path):
+        handler = get_handler()
+        handler.emit(get_record('a'))
+        handler.flush()
+
+        with patch.object(BatchingHttpPostJsonHandler, 'statistics_dir', str(tmp_path)):
+            handler._write_statistics()
+
+        statistics_list = load_log_shipping_statistics(str(tmp_path), max_age=60)
+        assert statistics_list == [handler.get_statistics()]
+
+        # Statistics of processes which are gone are removed
+        statistics_path = next(tmp_path.glob('*.json'))
+        os.utime(statistics_path, (0, 0))
+
+        assert load_log_shipping_statistics(str(tmp_path), max_age=60) == []
+        assert not statistics_path.exists()
+
+    @staticmethod
+    def test_reset_after_fork():
+        handler = get_handler()
+        handler.emit(get_record('a'))
+        handler.emit(get_record('b'))
+        handler.flush()
+        handler.emit(get_record('c'))
+        queue, worker_lock, stop_event = handler._queue, handler._worker_lock, handler._stop_event
+
+        _reset_handlers_after_fork()
+
+        # Records buffered at fork time are left to the parent, and statistics start from zero
+        assert handler._queue is not queue
+        assert handler._worker_lock is not worker_lock
+        assert handler._stop_event is not stop_event
+        assert handler.get_statistics().queue_size == 0
+        assert handler.get_statistics().sent_count == 0
+        assert handler.get_statistics().batch_count == 0
+        # The parent still ships its buffered record
+        assert queue.qsize() == 1
+
+    @staticmethod
+    def test_emit_in_forked_child_while_parent_holds_queue_lock():
+        handler = get_handler()
+        handler.emit(get_record('a'))
+
+        read_fd, write_fd = os.pipe()
+        # Like the worker thread of the parent holding the queue lock at fork time
+        with handler._queue.mutex:
+            pid = os.fork()
+            if pid == 0:
+                # Child: a blocking emit is killed by the alarm instead of hanging the test run
+                os.close(read_fd)
+                signal.alarm(5)
+                handler.emit(get_record('b'))
+                os.write(write_fd, json.dumps([handler.get_statistics().queue_size, handler.dropped_count]).encode())
+                os._exit(0)
+
+        os.close(write_fd)
+        with os.fdopen(read_fd) as read_file:
+            child_result = read_file.read()
+        _, status = os.waitpid(pid, 0)
+
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert json.loads(child_result) == [1, 0]
+        assert handler.get_statistics().queue_size == 1
@@ -0,0 +1,44 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from datetime import datetime
+
+from webapp.common.opening_hours import OpeningHoursCache
+
+
+class OpeningHoursCacheTest:
+    @staticmethod
+    def test_parsed_opening_hours_are_reused():
+        opening_hours_cache = OpeningHoursCache()
+
+        opening_hours = opening_hours_cache.get_opening_hours('Mo-Su 08:00-18:00')
+
+        assert opening_hours is not None
+        assert opening_hours_cache.get_opening_hours('Mo-Su 08:00-18:00') is opening_hours
+
+    @staticmethod
+    def test_invalid_opening_hours():
+        opening_hours_cache = OpeningHoursCache()
+
+        assert opening_hours_cache.get_opening_hours('invalid') is None
+        assert opening_hours_cache.get_state('invalid', datetime(2026, 1, 5, 12, 0)) is None
+
+    @staticmethod
+    def test_get_state():
+        opening_hours_cache = OpeningHoursCache()
+
+        assert opening_hours_cache.get_state('Mo-Su 08:00-18:00', datetime(2026, 1, 5, 7, 59, 30)) == 'closed'
+        assert opening_hours_cache.get_state('Mo-Su 08:00-18:00', datetime(2026, 1, 5, 8, 0, 30)) == 'open'
+        assert opening_hours_cache.get_state('Mo-Su 08:00-18:00', datetime(2026, 1, 5, 8, 0, 59)) == 'open'
+        assert opening_hours_cache.get_state('Mo-Su 08:00-18:00', datetime(2026, 1, 5, 18, 0)) == 'closed'
+
+    @staticmethod
+    def test_lru_eviction():
+        opening_hours_cache = OpeningHoursCache(max_entries=1)
+
+        opening_hours = opening_hours_cache.get_opening_hours('24/7')
+        opening_hours_cache.get_opening_hours('Mo-Fr 08:00-18:00')
+
+        assert opening_hours_cache.get_opening_hours('24/7') is not opening_hours
@@ -0,0 +1,67 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+import pytest
+
+from webapp.common.pubsub import LocalPubSub, PubSubSubscriptionLimitException
+
+
+class LocalPubSubTest:
+    @staticmethod
+    def test_publish_fans_out_to_channel_subscriptions():
+        pubsub = LocalPubSub()
+        subscription_1 = pubsub.subscribe('channel')
+        subscription_2 = pubsub.subscribe('channel')
+        other_subscription = pubsub.subscribe('other-channel')
+
+        pubsub.publish('channel', {'value': 1})
+
+        assert subscription_1.get(timeout=0) == {'value': 1}
+        assert subscription_2.get(timeout=0) == {'value': 1}
+        assert other_subscription.get(timeout=0) is None
+
+    @staticmethod
+    def test_closed_subscription_gets_no_messages():
+        pubsub = LocalPubSub()
+        subscription = pubsub.subscribe('channel')
+        subscription.close()
+
+        pubsub.publish('channel', {'value': 1})
+
+        assert subscription.get(timeout=0) is None
+
+    @staticmethod
+    def test_subscription_limit():
+        pubsub = LocalPubSub(max_subscriptions=1)
+        subscription = pubsub.subscribe('channel')
+
+        with pytest.raises(PubSubSubscriptionLimitException):
+            pubsub.subscribe('channel')
+
+        subscription.close()
+        pubsub.subscribe('channel')
+
+    @staticmethod
+    def test_overflow():
+        pubsub = LocalPubSub(max_queue_size=1)
+        subscription = pubsub.subscribe('channel')
+
+        pubsub.publish('channel', {'value': 1})
+        pubsub.publish('channel', {'value': 2})
+
+        assert subscription.overflowed is True
+        assert subscription.get(timeout=0) == {'value': 1}
+
+    @staticmethod
+    def test_has_subscribers():
+        pubsub = LocalPubSub()
+        assert pubsub.has_subscribers('channel') is False
+
+        subscription = pubsub.subscribe('channel')
+        assert pubsub.has_subscribers('channel') is True
+        assert pubsub.has_subscribers('other-channel') is False
+
+        subscription.close()
+        assert pubsub.has_subscribers('channel') is False
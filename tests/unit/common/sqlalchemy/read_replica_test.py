@@ -0,0 +1,133 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from unittest.mock import MagicMock, Mock
+
+from flask import Flask
+from sqlalchemy import Column, Integer, MetaData, Table, insert, select
+from sqlalchemy.exc import OperationalError
+
+from webapp.common.sqlalchemy import READ_REPLICA_BIND_KEY, ReplicaLagGuard, RoutingSession, use_read_replica
+
+table = Table('parking_site', MetaData(), Column('id', Integer, primary_key=True))
+
+
+def get_session(*, usable: bool = True) -> tuple[RoutingSession, Mock, Mock]:
+    primary_engine = Mock(name='primary')
+    read_replica_engine = Mock(name='read_replica')
+    db = Mock()
+    db.engines = {None: primary_engine, READ_REPLICA_BIND_KEY: read_replica_engine}
+    db.read_replica_lag_guard.is_usable.return_value = usable
+
+    return RoutingSession(db), primary_engine, read_replica_engine
+
+
+def get_engine(dialect_name: str, result: object) -> MagicMock:
+    engine = MagicMock()
+    engine.dialect.name = dialect_name
+    connection = engine.connect.return_value.__enter__.return_value
+    if isinstance(result, Exception):
+        connection.execute.side_effect = result
+    else:
+        connection.execute.return_value.scalar.return_value = result
+        connection.execute.return_value.mappings.return_value.first.return_value = result
+    return engine
+
+
+class RoutingSessionTest:
+    @staticmethod
+    def test_reads_stay_at_primary_without_opt_in():
+        session, primary_engine, _ = get_session()
+
+        with Flask(__name__).app_context():
+            assert session.get_bind(clause=select(table)) is primary_engine
+
+        # Outside of app contexts, e.g. in celery tasks, there is no opt-in at all
+        assert session.get_bind(clause=select(table)) is primary_engine
+
+    @staticmethod
+    def test_reads_use_read_replica_with_opt_in():
+        session, _, read_replica_engine = get_session()
+
+        with Flask(__name__).app_context():
+            use_read_replica()
+
+            assert session.get_bind(clause=select(table)) is read_replica_engine
+
+    @staticmethod
+    def test_reads_stay_at_primary_after_write():
+        session, primary_engine, _ = get_session()
+
+        with Flask(__name__).app_context():
+            use_read_replica()
+
+            assert session.get_bind(clause=insert(table)) is primary_engine
+            assert session.get_bind(clause=select(table)) is primary_engine
+
+    @staticmethod
+    def test_reads_stay_at_primary_after_flush():
+        session, primary_engine, _ = get_session()
+
+        with Flask(__name__).app_context():
+            use_read_replica()
+            session._flushing = True
+            session.get_bind(mapper=None)
+            session._flushing = False
+
+            assert session.get_bind(clause=select(table)) is primary_engine
+
+    @staticmethod
+    def test_reads_fall_back_to_primary_while_lagging():
+        session, primary_engine, read_replica_engine = get_session(usable=False)
+
+        with Flask(__name__).app_context():
+            use_read_replica()
+
+            assert session.get_bind(clause=select(table)) is primary_engine
+            session._db.read_replica_lag_guard.is_usable.assert_called_with(read_replica_engine)
+
+
+class ReplicaLagGuardTest:
+    @staticmethod
+    def test_replica_within_max_lag_is_usable_and_checked_once_per_interval():
+        lag_guard = ReplicaLagGuard(max_lag=30, check_interval=60)
+        engine = get_engine('postgresql', 5)
+
+        assert lag_guard.is_usable(engine) is True
+        assert lag_guard.is_usable(engine) is True
+        assert engine.connect.call_count == 1
+
+    @staticmethod
+    def test_lagging_replica_is_not_usable():
+        lag_guard = ReplicaLagGuard(max_lag=30, check_interval=0)
+
+        assert lag_guard.is_usable(get_engine('postgresql', 31)) is False
+        # The lag is checked again after the check interval
+        assert lag_guard.is_usable(get_engine('postgresql', 0)) is True
+
+    @staticmethod
+    def test_replica_with_unknown_lag_is_not_usable():
+        lag_guard = ReplicaLagGuard(max_lag=30, check_interval=60)
+
+        assert lag_guard.is_usable(get_engine('postgresql', None)) is False
+        assert lag_guard.is_usable(get_engine('postgresql', OperationalError('', {}, Exception()))) is False
+
+    @staticmethod
+    def test_postgresql_replica_without_pending_wal_has_no_lag():
+        engine = get_engine('postgresql', 0)
+
+        assert ReplicaLagGuard._fetch_lag(engine) == 0
+
+        # The age of the last replayed transaction just counts while received WAL is not replayed yet
+        query = str(engine.connect.return_value.__enter__.return_value.execute.call_args.args[0])
+        assert 'WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0' in query
+        assert query.index('pg_last_wal_replay_lsn()') < query.index('pg_last_xact_replay_timestamp()')
+
+    @staticmethod
+    def test_mysql_replica_lag():
+        assert ReplicaLagGuard._fetch_lag(get_engine('mysql', {'Seconds_Behind_Source': 12})) == 12
+        assert ReplicaLagGuard._fetch_lag(get_engine('mysql', {'Seconds_Behind_Master': 7})) == 7
+        # Not a replica at all
+        assert ReplicaLagGuard._fetch_lag(get_engine('mysql', None)) == 0
@@ -0,0 +1,70 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from time import monotonic
+from unittest.mock import Mock
+
+import pytest
+from flask import Flask
+from sqlalchemy.orm import Session
+
+from webapp.models.change_log_entry import (
+    CHANGE_LOG_WRITTEN_AT_KEY,
+    ChangeLogTransactionTooLongException,
+    mark_change_log_written,
+)
+
+
+def get_flask_app() -> Flask:
+    flask_app = Flask(__name__)
+    flask_app.config['CHANGE_LOG_VISIBILITY_DELAY_SECONDS'] = 60
+    return flask_app
+
+
+class ChangeLogEntryTest:
+    @staticmethod
+    def test_mysql_transactions_are_refused_after_half_of_the_visibility_delay():
+        session = Session()
+        session.info[CHANGE_LOG_WRITTEN_AT_KEY] = monotonic() - 31
+
+        with get_flask_app().app_context(), pytest.raises(ChangeLogTransactionTooLongException):
+            session.commit()
+
+        session.rollback()
+
+        # The next transaction starts from scratch
+        assert CHANGE_LOG_WRITTEN_AT_KEY not in session.info
+
+    @staticmethod
+    def test_mysql_transactions_within_half_of_the_visibility_delay_commit():
+        session = Session()
+        session.info[CHANGE_LOG_WRITTEN_AT_KEY] = monotonic() - 29
+
+        with get_flask_app().app_context():
+            session.commit()
+
+        assert CHANGE_LOG_WRITTEN_AT_KEY not in session.info
+
+    @staticmethod
+    def test_mark_change_log_written_keeps_first_write_at_mysql():
+        session = Session()
+        mysql_connection = Mock()
+        mysql_connection.dialect.name = 'mysql'
+
+        mark_change_log_written(session, mysql_connection)
+        written_at = session.info[CHANGE_LOG_WRITTEN_AT_KEY]
+        mark_change_log_written(session, mysql_connection)
+
+        assert session.info[CHANGE_LOG_WRITTEN_AT_KEY] == written_at
+
+    @staticmethod
+    def test_mark_change_log_written_is_not_needed_at_postgresql():
+        session = Session()
+        postgresql_connection = Mock()
+        postgresql_connection.dialect.name = 'postgresql'
+
+        mark_change_log_written(session, postgresql_connection)
+
+        assert CHANGE_LOG_WRITTEN_AT_KEY not in session.info
@@ -0,0 +1,41 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+import math
+
+import pytest
+
+from webapp.repositories.spatial_repository_mixin import EARTH_RADIUS, get_radius_envelope
+
+
+def destination(lat: float, lon: float, bearing: float, distance: float) -> tuple[float, float]:
+    angular_distance = distance / EARTH_RADIUS
+    lat_radians = math.radians(lat)
+    destination_lat = math.asin(
+        math.sin(lat_radians) * math.cos(angular_distance)
+        + math.cos(lat_radians) * math.sin(angular_distance) * math.cos(bearing),
+    )
+    destination_lon = math.radians(lon) + math.atan2(
+        math.sin(bearing) * math.sin(angular_distance) * math.cos(lat_radians),
+        math.cos(angular_distance) - math.sin(lat_radians) * math.sin(destination_lat),
+    )
+    return math.degrees(destination_lat), math.degrees(destination_lon)
+
+
+class SpatialRepositoryMixinTest:
+    @staticmethod
+    @pytest.mark.parametrize('lat, lon, radius', [(48.77, 9.18, 1000), (-33.9, 151.2, 25000), (70.0, 20.0, 250000)])
+    def test_radius_envelope_contains_circle(lat: float, lon: float, radius: float):
+        lon_min, lat_min, lon_max, lat_max = get_radius_envelope(lat, lon, radius)
+
+        for bearing_degrees in range(0, 360, 5):
+            point_lat, point_lon = destination(lat, lon, math.radians(bearing_degrees), radius)
+            assert lat_min <= point_lat <= lat_max
+            assert lon_min <= point_lon <= lon_max
+
+    @staticmethod
+    @pytest.mark.parametrize('lat, lon, radius', [(89.9, 0, 50000), (0, 179.99, 5000), (0, -179.99, 5000)])
+    def test_radius_envelope_unbounded(lat: float, lon: float, radius: float):
+        assert get_radius_envelope(lat, lon, radius) is None
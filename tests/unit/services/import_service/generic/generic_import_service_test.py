@@ -0,0 +1,112 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from flask import Flask
+from parkapi_sources import ParkAPISources
+from parkapi_sources.converters import KarlsruhePullConverter
+from parkapi_sources.exceptions import MissingConfigException
+
+from webapp.common.rest.exceptions import UnknownSourceException
+from webapp.services.import_service.generic import GenericImportService
+
+PARK_API_SOURCES_PATH = 'webapp.services.import_service.generic.generic_import_service.ParkAPISources'
+
+
+def get_custom_converter(source_uid: str) -> Mock:
+    custom_converter = Mock()
+    custom_converter.source_info.uid = source_uid
+    custom_converter.required_config_keys = []
+    return custom_converter
+
+
+def get_generic_import_service(source_uids: list[str], custom_converters: list | None = None) -> GenericImportService:
+    flask_app = Flask(__name__)
+    flask_app.config.update(
+        PARKING_SITE_PATCH_DIR=None,
+        PARKING_SPOT_PATCH_DIR=None,
+        STATIC_GEOJSON_BASE_URL=None,
+        DEBUG_DUMP_DIR=None,
+        DEBUG_SOURCES=[],
+        PARK_API_CONVERTER=[{'uid': source_uid} for source_uid in source_uids],
+        PARK_API_SOURCES_CUSTOM_CONVERTERS=custom_converters,
+    )
+
+    generic_import_service = GenericImportService(
+        source_repository=MagicMock(),
+        generic_parking_site_import_service=MagicMock(),
+        generic_parking_spot_import_service=MagicMock(),
+        config_helper=MagicMock(),
+        context_helper=MagicMock(),
+        event_helper=MagicMock(),
+    )
+    generic_import_service.init_app(flask_app)
+
+    return generic_import_service
+
+
+class GenericImportServiceTest:
+    @staticmethod
+    def test_unknown_source_uid_raises():
+        # The second source is configured, but the library has no converter for it
+        generic_import_service = get_generic_import_service(['karlsruhe', 'unknown-library-source'])
+
+        with pytest.raises(UnknownSourceException):
+            generic_import_service.get_converter('unknown-source')
+        with pytest.raises(UnknownSourceException):
+            generic_import_service.get_converter_class('unknown-source')
+        with pytest.raises(UnknownSourceException):
+            generic_import_service.is_pull_source('unknown-library-source')
+
+    @staticmethod
+    def test_custom_converters_resolve_without_library_converters():
+        custom_converter = get_custom_converter('custom')
+        generic_import_service = get_generic_import_service(['karlsruhe'], [custom_converter])
+
+        with patch(PARK_API_SOURCES_PATH, side_effect=ParkAPISources) as park_api_sources_class:
+            assert generic_import_service.get_converter('custom') is custom_converter
+            assert generic_import_service.get_converter_class('custom') is type(custom_converter)
+
+        assert park_api_sources_class.call_args.kwargs['converter_uids'] == []
+        assert list(generic_import_service._converter_by_uid) == ['custom']
+
+    @staticmethod
+    def test_is_pull_source_instantiates_no_converter():
+        generic_import_service = get_generic_import_service(['karlsruhe', 'stuttgart'])
+
+        with patch(PARK_API_SOURCES_PATH) as park_api_sources_class:
+            park_api_sources_class.converter_classes = ParkAPISources.converter_classes
+
+            assert generic_import_service.is_pull_source('karlsruhe') is True
+            assert generic_import_service.is_pull_source('stuttgart') is False
+
+        park_api_sources_class.assert_not_called()
+        assert generic_import_service._converter_by_uid == {}
+
+    @staticmethod
+    def test_converters_are_built_once():
+        generic_import_service = get_generic_import_service(['karlsruhe', 'stuttgart'])
+
+        with patch(PARK_API_SOURCES_PATH, side_effect=ParkAPISources) as park_api_sources_class:
+            converter = generic_import_service.get_converter('karlsruhe')
+
+            assert isinstance(converter, KarlsruhePullConverter)
+            assert generic_import_service.get_converter('karlsruhe') is converter
+
+        # Just the requested converter is built
+        park_api_sources_class.assert_called_once()
+        assert park_api_sources_class.call_args.kwargs['converter_uids'] == ['karlsruhe']
+
+    @staticmethod
+    def test_check_credentials_raises_on_missing_config():
+        generic_import_service = get_generic_import_service(['karlsruhe', 'apcoa'])
+
+        with pytest.raises(MissingConfigException):
+            generic_import_service.check_credentials()
+
+        # Converters without missing config values are built anyway
+        assert list(generic_import_service._converter_by_uid) == ['karlsruhe']
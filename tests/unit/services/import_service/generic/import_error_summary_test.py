@@ -0,0 +1,79 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from unittest.mock import Mock
+
+from parkapi_sources.exceptions import ImportParkingSiteException
+
+from webapp.common.logging.models import LogMessageType
+from webapp.services.import_service.generic.import_error_summary import (
+    ImportErrorSummary,
+    TracebackRateLimiter,
+    get_message_template,
+)
+
+
+def raise_value_error(value: int):
+    raise ValueError(f'Invalid capacity {value}')
+
+
+class ImportErrorSummaryTest:
+    @staticmethod
+    def test_get_message_template():
+        assert get_message_template("Invalid capacity -3 at 'abc' for 4f1c2a9e-7b1d-4c3e-9a2f-0d1e2f3a4b5c") == (
+            'Invalid capacity -<num> at <str> for <id>'
+        )
+
+    @staticmethod
+    def test_errors_are_grouped_with_samples():
+        import_error_summary = ImportErrorSummary.from_errors(
+            [
+                ImportParkingSiteException(
+                    source_uid='source',
+                    parking_site_uid=f'site-{i}',
+                    message=f'Invalid capacity {i}',
+                )
+                for i in range(10)
+            ]
+            + [ImportParkingSiteException(source_uid='source', message='Missing name')],
+        )
+        logger = Mock()
+
+        import_error_summary.log(logger, 'Failed', type=LogMessageType.STATIC_PARKING_SITE_HANDLING)
+
+        assert import_error_summary.count == 11
+        assert len(import_error_summary.error_groups) == 2
+        error_group = import_error_summary.error_groups[('ImportParkingSiteException', 'Invalid capacity <num>')]
+        assert error_group.count == 10
+        assert error_group.samples == [
+            'site-0: Invalid capacity 0',
+            'site-1: Invalid capacity 1',
+            'site-2: Invalid capacity 2',
+        ]
+        logger.warning.assert_called_once()
+        assert logger.warning.call_args.args[0].startswith(
+            'Failed: 11 errors in 2 groups.\n10x ImportParkingSiteException'
+        )
+
+    @staticmethod
+    def test_tracebacks_are_rate_limited():
+        traceback_rate_limiter = TracebackRateLimiter(interval=3600)
+        exceptions = []
+        for value in range(2):
+            try:
+                raise_value_error(value)
+            except ValueError as e:
+                exceptions.append(e)
+
+        assert traceback_rate_limiter.allow(exceptions[0]) is True
+        assert traceback_rate_limiter.allow(exceptions[1]) is False
+
+    @staticmethod
+    def test_empty_summary_logs_nothing():
+        logger = Mock()
+
+        ImportErrorSummary().log(logger, 'Failed', type=LogMessageType.STATIC_PARKING_SITE_HANDLING)
+
+        logger.warning.assert_not_called()
@@ -0,0 +1,46 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+import random
+
+import pytest
+from pyproj import Geod
+
+from webapp.services.matching_service.location_grid import LocationGrid
+
+
+class LocationGridTest:
+    @staticmethod
+    @pytest.mark.parametrize('cell_size', [1, 100, 25000])
+    def test_candidates_contain_all_pairs_within_cell_size(cell_size: int):
+        random_generator = random.Random(cell_size)  # noqa: S311
+        geod = Geod(ellps='WGS84')
+        locations: list[tuple[float, float]] = []
+        for _ in range(400):
+            if locations and random_generator.random() < 0.5:
+                lon, lat = random_generator.choice(locations)
+                scale = cell_size / 50000
+                locations.append((
+                    lon + random_generator.uniform(-scale, scale),
+                    lat + random_generator.uniform(-scale, scale),
+                ))
+            else:
+                locations.append((random_generator.uniform(5, 15), random_generator.uniform(47, 55)))
+
+        location_grid = LocationGrid(cell_size=cell_size)
+        for index, (lon, lat) in enumerate(locations):
+            location_grid.add(index, lon, lat)
+        candidate_pairs = list(location_grid.iter_candidate_pairs())
+
+        expected_pairs = {
+            (i, j)
+            for i in range(len(locations))
+            for j in range(i + 1, len(locations))
+            if geod.inv(*locations[i], *locations[j])[2] <= cell_size
+        }
+
+        assert len(candidate_pairs) == len(set(candidate_pairs))
+        assert all(i < j for i, j in candidate_pairs)
+        assert expected_pairs <= set(candidate_pairs)
@@ -0,0 +1,98 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from unittest.mock import MagicMock
+
+from parkapi_sources.models.enums import PurposeType
+from pyproj import Geod
+
+from webapp.repositories.parking_site_repository import ParkingSiteLocation
+from webapp.services.matching_service import MatchingService
+
+
+class InMemoryParkingSiteRepository:
+    """
+    Selects locations like the MySQL envelope filter does.
+    """
+
+    def __init__(self, parking_site_locations: list[ParkingSiteLocation]):
+        self.parking_site_locations = parking_site_locations
+
+    def fetch_parking_site_locations(self) -> list[ParkingSiteLocation]:
+        return list(self.parking_site_locations)
+
+    def fetch_parking_site_locations_by_ids(self, parking_site_ids: list[int]) -> list[ParkingSiteLocation]:
+        return [location for location in self.parking_site_locations if location.id in parking_site_ids]
+
+    def fetch_parking_site_locations_within_envelopes(
+        self,
+        envelopes: list[tuple[float, float, float, float]],
+    ) -> list[ParkingSiteLocation]:
+        return [
+            location
+            for location in self.parking_site_locations
+            if any(
+                lon_min <= location.lon <= lon_max and lat_min <= location.lat <= lat_max
+                for lon_min, lat_min, lon_max, lat_max in envelopes
+            )
+        ]
+
+    @staticmethod
+    def fetch_parking_sites_duplicates(
+        source_ids: list[int] | None = None,
+        *,
+        parking_site_ids: list[int] | None = None,
+    ) -> list[tuple[int, int]]:
+        return []
+
+
+def get_pending_duplicates(
+    parking_site_locations: list[ParkingSiteLocation],
+    parking_site_ids: set[int] | None,
+) -> dict[tuple[int, int], float]:
+    pending_duplicate_repository = MagicMock()
+    pending_duplicate_repository.fetch_pending_duplicates_by_parking_site_ids.return_value = []
+    config_helper = MagicMock()
+    config_helper.get.side_effect = lambda key, default=None: default
+
+    MatchingService(
+        parking_site_repository=InMemoryParkingSiteRepository(parking_site_locations),
+        pending_duplicate_repository=pending_duplicate_repository,
+        config_helper=config_helper,
+        context_helper=MagicMock(),
+        event_helper=MagicMock(),
+    ).update_pending_duplicates(parking_site_ids)
+
+    pending_duplicates = [call.args[0] for call in pending_duplicate_repository.save_pending_duplicate.call_args_list]
+    return {
+        (pending_duplicate.parking_site_id, pending_duplicate.duplicate_parking_site_id): pending_duplicate.distance
+        for pending_duplicate in pending_duplicates
+    }
+
+
+class MatchingServiceTest:
+    @staticmethod
+    def test_update_pending_duplicates_matches_like_full_check_at_radius_edge() -> None:
+        geod = Geod(ellps='WGS84')
+        # 101.4 meters due north, which find_matches() measures as 99.95 meters, so within the default radius of 100 meters
+        _, north_lat, _ = geod.fwd(10.0, 50.0, 0, 101.4)
+        # 99.9 meters as measured by find_matches(), which passes lat as longitude and lon as latitude
+        _, east_lon, _ = geod.fwd(50.0, 10.0, 0, 99.9)
+        # Just outside of the radius as measured by find_matches()
+        _, far_east_lon, _ = geod.fwd(50.0, 10.0, 0, 100.5)
+
+        parking_site_locations = [
+            ParkingSiteLocation(id=1, source_id=1, lat=50.0, lon=10.0, purpose=PurposeType.CAR),
+            ParkingSiteLocation(id=2, source_id=2, lat=north_lat, lon=10.0, purpose=PurposeType.CAR),
+            ParkingSiteLocation(id=3, source_id=2, lat=50.0, lon=east_lon, purpose=PurposeType.CAR),
+            ParkingSiteLocation(id=4, source_id=2, lat=50.0, lon=far_east_lon, purpose=PurposeType.CAR),
+        ]
+
+        pending_duplicates = get_pending_duplicates(parking_site_locations, {1})
+
+        assert pending_duplicates == get_pending_duplicates(parking_site_locations, None)
+        assert list(pending_duplicates) == [(1, 2), (1, 3)]
+        assert 99 < pending_duplicates[(1, 2)] <= 100
+        assert 99 < pending_duplicates[(1, 3)] <= 100
@@ -0,0 +1,110 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from webapp.models.parking_site import OpeningStatus
+from webapp.services.parking_site_history_service.parking_site_history_rollup_builder import (
+    ParkingSiteHistoryChange,
+    ParkingSiteHistoryState,
+    build_hour_rollups,
+    iter_hour_rollups,
+)
+
+START = datetime(2026, 10, 19, 8, tzinfo=timezone.utc)
+
+
+class ParkingSiteHistoryRollupBuilderTest:
+    @staticmethod
+    def test_build_hour_rollups_weights_by_time() -> None:
+        rollups = build_hour_rollups(
+            1,
+            ParkingSiteHistoryState(realtime_opening_status=OpeningStatus.OPEN, realtime_free_capacity=10),
+            [
+                # Three quarters of the first hour with 10, one quarter with 50
+                ParkingSiteHistoryChange(
+                    parking_site_id=1,
+                    created_at=START + timedelta(minutes=45),
+                    state=ParkingSiteHistoryState(
+                        realtime_opening_status=OpeningStatus.CLOSED,
+                        realtime_free_capacity=50,
+                    ),
+                ),
+            ],
+            START,
+            START + timedelta(hours=2),
+        )
+
+        assert len(rollups) == 2
+        assert rollups[0]['period_start'] == START
+        assert rollups[0]['change_count'] == 1
+        assert rollups[0]['realtime_free_capacity_integral'] / rollups[0]['realtime_free_capacity_seconds'] == 20
+        assert rollups[0]['realtime_free_capacity_min'] == 10
+        assert rollups[0]['realtime_free_capacity_max'] == 50
+        assert rollups[0]['open_seconds'] / rollups[0]['opening_status_seconds'] == 0.75
+        assert rollups[0]['realtime_free_capacity_last'] == 50
+
+        # The second hour has no changes, so the last values are carried over for the whole hour
+        assert rollups[1]['period_start'] == START + timedelta(hours=1)
+        assert rollups[1]['change_count'] == 0
+        assert rollups[1]['realtime_free_capacity_seconds'] == 3600
+        assert rollups[1]['realtime_free_capacity_integral'] == 50 * 3600
+        assert rollups[1]['open_seconds'] == 0
+        assert rollups[1]['realtime_opening_status_last'] == OpeningStatus.CLOSED
+
+    @staticmethod
+    def test_build_hour_rollups_without_known_values() -> None:
+        rollups = build_hour_rollups(
+            1,
+            ParkingSiteHistoryState(),
+            [
+                ParkingSiteHistoryChange(
+                    parking_site_id=1,
+                    created_at=START + timedelta(minutes=30),
+                    state=ParkingSiteHistoryState(realtime_free_capacity=20),
+                ),
+            ],
+            START,
+            START + timedelta(hours=1),
+        )
+
+        # Unknown values before the first change are not weighted
+        assert len(rollups) == 1
+        assert rollups[0]['realtime_free_capacity_seconds'] == 1800
+        assert rollups[0]['realtime_free_capacity_min'] == 20
+        assert rollups[0]['opening_status_seconds'] == 0
+
+        # Hours without changes and without carried over values are skipped
+        assert build_hour_rollups(1, ParkingSiteHistoryState(), [], START, START + timedelta(hours=1)) == []
+
+    @staticmethod
+    def test_iter_hour_rollups_groups_by_parking_site() -> None:
+        rollups = list(
+            iter_hour_rollups(
+                {
+                    2: ParkingSiteHistoryState(realtime_free_capacity=5),
+                    3: ParkingSiteHistoryState(realtime_free_capacity=7),
+                },
+                [
+                    ParkingSiteHistoryChange(
+                        parking_site_id=1,
+                        created_at=START + timedelta(minutes=10),
+                        state=ParkingSiteHistoryState(realtime_free_capacity=1),
+                    ),
+                    ParkingSiteHistoryChange(
+                        parking_site_id=2,
+                        created_at=START + timedelta(minutes=30),
+                        state=ParkingSiteHistoryState(realtime_free_capacity=15),
+                    ),
+                ],
+                START,
+                START + timedelta(hours=1),
+            ),
+        )
+
+        assert [rollup['parking_site_id'] for rollup in rollups] == [1, 2, 3]
+        assert rollups[1]['realtime_free_capacity_integral'] == 5 * 1800 + 15 * 1800
+        assert rollups[2]['change_count'] == 0
+        assert rollups[2]['realtime_free_capacity_last'] == 7
@@ -0,0 +1,118 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from webapp.models.parking_site import OpeningStatus
+from webapp.services.parking_site_history_service import ParkingSiteHistoryService
+from webapp.services.parking_site_history_service.parking_site_history_service import (
+    add_months,
+    get_hour_start,
+    get_month_start,
+    get_partition_name,
+)
+
+
+class ParkingSiteHistoryPartitionTest:
+    @staticmethod
+    def test_get_month_start() -> None:
+        value = datetime(2026, 10, 31, 23, 30, tzinfo=timezone(timedelta(hours=-2)))
+
+        # Partitions are aligned to UTC months
+        assert get_month_start(value) == datetime(2026, 11, 1, tzinfo=timezone.utc)
+
+    @staticmethod
+    def test_add_months() -> None:
+        month_start = datetime(2026, 11, 1, tzinfo=timezone.utc)
+
+        assert add_months(month_start, 1) == datetime(2026, 12, 1, tzinfo=timezone.utc)
+        assert add_months(month_start, 2) == datetime(2027, 1, 1, tzinfo=timezone.utc)
+        assert add_months(month_start, -11) == datetime(2025, 12, 1, tzinfo=timezone.utc)
+
+    @staticmethod
+    def test_get_partition_name() -> None:
+        assert get_partition_name(datetime(2027, 1, 1, tzinfo=timezone.utc)) == 'parking_site_history_y2027m01'
+
+
+class ParkingSiteHistoryRollupTest:
+    @staticmethod
+    def test_rollup_history_steps_over_complete_hours() -> None:
+        first_created_at = datetime.now(tz=timezone.utc) - timedelta(days=2, minutes=30)
+        parking_site_history_repository = MagicMock()
+        # Continuous history: the first entry since any timestamp is right at that timestamp
+        parking_site_history_repository.fetch_first_created_at.side_effect = lambda since: (
+            first_created_at if since is None else since
+        )
+        parking_site_history_rollup_repository = MagicMock()
+        parking_site_history_rollup_repository.fetch_last_period_start.return_value = None
+        parking_site_history_rollup_repository.fetch_hour_rollup_last_values.return_value = []
+        parking_site_history_rollup_repository.insert_rollups.return_value = 0
+        parking_site_history_rollup_repository.rollup_days.return_value = 0
+        config_helper = MagicMock()
+        config_helper.get.side_effect = lambda key, default=None: default
+
+        ParkingSiteHistoryService(
+            parking_site_history_repository=parking_site_history_repository,
+            parking_site_history_rollup_repository=parking_site_history_rollup_repository,
+            config_helper=config_helper,
+            context_helper=MagicMock(),
+            event_helper=MagicMock(),
+        ).rollup_history()
+
+        hour_ranges = [call.args[1:] for call in parking_site_history_rollup_repository.delete_rollups.call_args_list]
+        assert hour_ranges[0][0] == get_hour_start(first_created_at)
+        assert hour_ranges[-1][1] == get_hour_start(datetime.now(tz=timezone.utc) - timedelta(minutes=5))
+        for (start, end), (next_start, _) in zip(hour_ranges, hour_ranges[1:]):
+            assert end == next_start
+        assert all(end - start <= timedelta(days=1) for start, end in hour_ranges)
+
+        # Daily rollups are rebuilt for all days touched by the hourly rollups
+        for (hour_start, hour_end), call in zip(
+            hour_ranges,
+            parking_site_history_rollup_repository.rollup_days.call_args_list,
+        ):
+            day_start, day_end = call.args
+            assert day_start <= hour_start and hour_end <= day_end
+            assert day_start.hour == 0 and day_end.hour == 0
+
+    @staticmethod
+    def test_rollup_history_carries_over_values_without_history() -> None:
+        last_period_start = get_hour_start(datetime.now(tz=timezone.utc) - timedelta(hours=4))
+        parking_site_history_repository = MagicMock()
+        parking_site_history_repository.iter_parking_site_history_changes.return_value = iter([])
+        parking_site_history_rollup_repository = MagicMock()
+        parking_site_history_rollup_repository.fetch_last_period_start.return_value = last_period_start
+        parking_site_history_rollup_repository.fetch_hour_rollup_last_values.return_value = [
+            SimpleNamespace(
+                parking_site_id=1,
+                realtime_opening_status_last=OpeningStatus.OPEN,
+                realtime_free_capacity_last=10,
+            ),
+        ]
+        parking_site_history_rollup_repository.insert_rollups.side_effect = lambda rollups: len(list(rollups))
+        parking_site_history_rollup_repository.rollup_days.return_value = 0
+        config_helper = MagicMock()
+        config_helper.get.side_effect = lambda key, default=None: default
+
+        ParkingSiteHistoryService(
+            parking_site_history_repository=parking_site_history_repository,
+            parking_site_history_rollup_repository=parking_site_history_rollup_repository,
+            config_helper=config_helper,
+            context_helper=MagicMock(),
+            event_helper=MagicMock(),
+        ).rollup_history()
+
+        # Hours without history are rolled up with the carried over values instead of being skipped
+        parking_site_history_repository.fetch_first_created_at.assert_not_called()
+        parking_site_history_rollup_repository.fetch_hour_rollup_last_values.assert_called_once_with(last_period_start)
+        hour_ranges = [call.args[1:] for call in parking_site_history_rollup_repository.delete_rollups.call_args_list]
+        assert hour_ranges == [
+            (
+                last_period_start + timedelta(hours=1),
+                get_hour_start(datetime.now(tz=timezone.utc) - timedelta(minutes=5)),
+            ),
+        ]
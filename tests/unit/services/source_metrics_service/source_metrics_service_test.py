@@ -0,0 +1,139 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from webapp.models import Source
+from webapp.services.source_metrics_service import SourceMetricDeltas, SourceMetricsService
+
+
+def get_source_metrics_service(**kwargs) -> SourceMetricsService:
+    config_helper = MagicMock()
+    config_helper.get.return_value = 30
+
+    return SourceMetricsService(
+        config_helper=config_helper,
+        context_helper=MagicMock(),
+        event_helper=MagicMock(),
+        **{
+            'source_repository': MagicMock(),
+            'parking_site_repository': MagicMock(),
+            'parking_spot_repository': MagicMock(),
+            **kwargs,
+        },
+    )
+
+
+def get_source(source_id: int, realtime_outdated_counted_before: datetime | None) -> Source:
+    source = Source()
+    source.id = source_id
+    source.uid = f'source-{source_id}'
+    source.parking_site_count = 10
+    source.parking_spot_count = 0
+    source.realtime_outdated_parking_site_count = 2
+    source.realtime_outdated_parking_spot_count = 0
+    source.realtime_outdated_counted_before = realtime_outdated_counted_before
+    return source
+
+
+class SourceMetricDeltasTest:
+    @staticmethod
+    def test_deltas_are_relative_to_counted_before() -> None:
+        counted_before = datetime(2026, 10, 19, 12, tzinfo=timezone.utc)
+        deltas = SourceMetricDeltas(realtime_outdated_counted_before=counted_before)
+
+        # Outdated parking site gets fresh realtime data
+        deltas.add_parking_site(counted_before - timedelta(hours=1), counted_before + timedelta(hours=1))
+        # New parking site without realtime data
+        deltas.add_parking_site(None, None, count_delta=1)
+        # Deleted outdated parking spot
+        deltas.add_parking_spot(counted_before - timedelta(minutes=1), None, count_delta=-1)
+
+        assert deltas.to_dict() == {
+            'parking_site_count': 1,
+            'parking_spot_count': -1,
+            'realtime_outdated_parking_site_count': -1,
+            'realtime_outdated_parking_spot_count': -1,
+        }
+
+
+class SourceMetricsServiceTest:
+    @staticmethod
+    def test_update_realtime_outdated_metrics_just_writes_changed_sources() -> None:
+        counted_before = datetime.now(tz=timezone.utc) - timedelta(minutes=40)
+        source_repository = MagicMock()
+        source_repository.fetch_sources.return_value = [
+            get_source(1, counted_before),
+            get_source(2, counted_before - timedelta(minutes=5)),
+            get_source(3, None),
+        ]
+        parking_site_repository = MagicMock()
+        parking_site_repository.fetch_newly_realtime_outdated_parking_site_count_by_source.return_value = {1: 3}
+        parking_spot_repository = MagicMock()
+        parking_spot_repository.fetch_newly_realtime_outdated_parking_spot_count_by_source.return_value = {}
+
+        get_source_metrics_service(
+            source_repository=source_repository,
+            parking_site_repository=parking_site_repository,
+            parking_spot_repository=parking_spot_repository,
+        ).update_realtime_outdated_metrics()
+
+        call = parking_site_repository.fetch_newly_realtime_outdated_parking_site_count_by_source.call_args
+        assert call.kwargs['since'] == counted_before - timedelta(minutes=5)
+
+        source_repository.add_source_metric_deltas.assert_called_once()
+        call = source_repository.add_source_metric_deltas.call_args
+        assert call.args == (
+            1,
+            {'realtime_outdated_parking_site_count': 3, 'realtime_outdated_parking_spot_count': 0},
+        )
+        assert call.kwargs['realtime_outdated_counted_before'] > counted_before
+        source_repository.save_source.assert_not_called()
+
+    @staticmethod
+    def test_repair_source_metrics_just_writes_drifted_sources() -> None:
+        counted_before = datetime.now(tz=timezone.utc) - timedelta(minutes=40)
+        sources = [get_source(1, counted_before), get_source(2, counted_before)]
+        source_repository = MagicMock()
+        source_repository.fetch_sources.return_value = sources
+        parking_site_repository = MagicMock()
+        parking_site_repository.count_by_source.return_value = {1: 10, 2: 11}
+        parking_site_repository.fetch_counted_realtime_outdated_parking_site_count_by_source.return_value = {1: 2, 2: 2}
+        parking_spot_repository = MagicMock()
+        parking_spot_repository.count_by_source.return_value = {}
+        parking_spot_repository.fetch_counted_realtime_outdated_parking_spot_count_by_source.return_value = {}
+
+        get_source_metrics_service(
+            source_repository=source_repository,
+            parking_site_repository=parking_site_repository,
+            parking_spot_repository=parking_spot_repository,
+        ).repair_source_metrics()
+
+        source_repository.save_source.assert_called_once_with(sources[1], commit=False)
+        assert sources[1].parking_site_count == 11
+        assert sources[1].realtime_outdated_counted_before == counted_before
+
+    @staticmethod
+    def test_apply_source_metric_deltas_counts_uncounted_sources() -> None:
+        source = get_source(1, None)
+        source_repository = MagicMock()
+        parking_site_repository = MagicMock()
+        parking_site_repository.count_by_source.return_value = {1: 12}
+        parking_site_repository.fetch_realtime_outdated_parking_site_count_by_source.return_value = {1: 4}
+        parking_spot_repository = MagicMock()
+        parking_spot_repository.count_by_source.return_value = {}
+        parking_spot_repository.fetch_realtime_outdated_parking_spot_count_by_source.return_value = {}
+
+        get_source_metrics_service(
+            source_repository=source_repository,
+            parking_site_repository=parking_site_repository,
+            parking_spot_repository=parking_spot_repository,
+        ).apply_source_metric_deltas(source, SourceMetricDeltas(realtime_outdated_counted_before=None))
+
+        source_repository.add_source_metric_deltas.assert_not_called()
+        assert source.parking_site_count == 12
+        assert source.realtime_outdated_parking_site_count == 4
+        assert source.realtime_outdated_counted_before is not None
@@ -0,0 +1,70 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+import csv
+from datetime import datetime, timezone
+from io import StringIO
+
+import pytest
+
+from webapp.models.parking_site import OpeningStatus
+from webapp.shared.parking_site_history import parking_site_history_export
+from webapp.shared.parking_site_history.parking_site_history_export import (
+    PARKING_SITE_HISTORY_EXPORT_DEFAULT_FIELDS,
+    ParkingSiteHistoryExportFormat,
+    iter_parking_site_history_export,
+)
+
+
+def get_rows(count: int) -> list[tuple]:
+    created_at = datetime(2026, 10, 19, 8, tzinfo=timezone.utc)
+    return [(index, 1, created_at, None, created_at, OpeningStatus.OPEN, 100, 100, index) for index in range(count)]
+
+
+class ParkingSiteHistoryExportTest:
+    @staticmethod
+    def test_csv_export_is_chunked(monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(parking_site_history_export, 'EXPORT_BATCH_SIZE', 3)
+
+        chunks = list(
+            iter_parking_site_history_export(
+                iter(get_rows(7)),
+                PARKING_SITE_HISTORY_EXPORT_DEFAULT_FIELDS,
+                ParkingSiteHistoryExportFormat.CSV,
+            ),
+        )
+
+        assert len(chunks) == 3
+        rows = list(csv.DictReader(StringIO(b''.join(chunks).decode())))
+        assert len(rows) == 7
+        assert rows[6] == {
+            'id': '6',
+            'parking_site_id': '1',
+            'created_at': '2026-10-19T08:00:00+00:00',
+            'static_data_updated_at': '',
+            'realtime_data_updated_at': '2026-10-19T08:00:00+00:00',
+            'realtime_opening_status': 'OPEN',
+            'capacity': '100',
+            'realtime_capacity': '100',
+            'realtime_free_capacity': '6',
+        }
+
+    @staticmethod
+    def test_parquet_export() -> None:
+        pyarrow = pytest.importorskip('pyarrow')
+        parquet = pytest.importorskip('pyarrow.parquet')
+
+        data = b''.join(
+            iter_parking_site_history_export(
+                iter(get_rows(7)),
+                PARKING_SITE_HISTORY_EXPORT_DEFAULT_FIELDS,
+                ParkingSiteHistoryExportFormat.PARQUET,
+            ),
+        )
+
+        table = parquet.read_table(pyarrow.BufferReader(data))
+        assert table.column_names == PARKING_SITE_HISTORY_EXPORT_DEFAULT_FIELDS
+        assert table.column('realtime_free_capacity').to_pylist() == list(range(7))
+        assert table.column('realtime_opening_status').to_pylist() == ['OPEN'] * 7
@@ -56,9 +56,11 @@ class AdminRestApi(Blueprint):
             if response.data and response.data.decode().strip():
                 log_fragments.append(f'<< {response.data.decode().strip()}')
 
+            request_statistics = dependencies.get_request_instrumentation().get_request_statistics()
             logger.info(
                 '\n'.join(log_fragments),
                 type=LogMessageType.REQUEST_IN,
+                **(request_statistics.to_log_attributes() if request_statistics else {}),
             )
 
             return response
@@ -6,9 +6,6 @@ Use of this source code is governed by an MIT-style license that can be found in
 from io import BytesIO, StringIO
 from zipfile import BadZipFile
 
-from lxml import etree
-from lxml.etree import ParseError
-from openpyxl.reader.excel import load_workbook
 from parkapi_sources.converters.base_converter.push import CsvConverter, JsonConverter, XlsxConverter, XmlConverter
 from parkapi_sources.exceptions import ImportParkingSiteException, ImportParkingSpotException
 from parkapi_sources.models import (
@@ -19,6 +16,7 @@ from parkapi_sources.models import (
 )
 
 from webapp.admin_rest_api import AdminApiBaseHandler
+from webapp.common.events import Event, EventSource, EventType
 from webapp.common.rest.exceptions import InvalidInputException
 from webapp.models import Source
 from webapp.models.source import SourceStatus
@@ -61,7 +59,7 @@ class GenericHandler(AdminApiBaseHandler):
         data: dict | list,
     ) -> tuple[list[StaticParkingSiteInput | RealtimeParkingSiteInput], list[ImportParkingSiteException]]:
         source = self.generic_import_service.get_upserted_source(source_uid)
-        import_service: JsonConverter = self.generic_import_service.park_api_sources.converter_by_uid[source_uid]  # type: ignore
+        import_service: JsonConverter = self.generic_import_service.get_converter(source_uid)  # type: ignore
 
         parking_inputs, parking_errors = import_service.handle_json(data)
 
@@ -75,11 +73,14 @@ class GenericHandler(AdminApiBaseHandler):
         data: bytes,
     ) -> tuple[list[StaticParkingSiteInput | RealtimeParkingSiteInput], list[ImportParkingSiteException]]:
         source = self.generic_import_service.get_upserted_source(source_uid)
-        import_service: XmlConverter = self.generic_import_service.park_api_sources.converter_by_uid[source_uid]  # type: ignore
+        import_service: XmlConverter = self.generic_import_service.get_converter(source_uid)  # type: ignore
+
+        # lxml and openpyxl are imported on first use, as most processes never handle pushed files
+        from lxml import etree
 
         try:
             root_element = etree.fromstring(data, parser=etree.XMLParser(resolve_entities=False))  # noqa: S320
-        except ParseError as e:
+        except etree.ParseError as e:
             raise InvalidInputException(message='Invalid XML file') from e
 
         parking_inputs, parking_errors = import_service.handle_xml(root_element)
@@ -94,7 +95,7 @@ class GenericHandler(AdminApiBaseHandler):
         data: str,
     ) -> tuple[list[StaticParkingSiteInput | RealtimeParkingSiteInput], list[ImportParkingSiteException]]:
         source = self.generic_import_service.get_upserted_source(source_uid)
-        import_service: CsvConverter = self.generic_import_service.park_api_sources.converter_by_uid[source_uid]  # type: ignore
+        import_service: CsvConverter = self.generic_import_service.get_converter(source_uid)  # type: ignore
 
         try:
             parking_inputs, parking_errors = import_service.handle_csv_string(StringIO(data))
@@ -111,7 +112,9 @@ class GenericHandler(AdminApiBaseHandler):
         data: bytes,
     ) -> tuple[list[StaticParkingSiteInput | RealtimeParkingSiteInput], list[ImportParkingSiteException]]:
         source = self.generic_import_service.get_upserted_source(source_uid)
-        import_service: XlsxConverter = self.generic_import_service.park_api_sources.converter_by_uid[source_uid]  # type: ignore
+        import_service: XlsxConverter = self.generic_import_service.get_converter(source_uid)  # type: ignore
+
+        from openpyxl.reader.excel import load_workbook
 
         try:
             workbook = load_workbook(filename=BytesIO(data))
@@ -135,6 +138,32 @@ class GenericHandler(AdminApiBaseHandler):
             StaticParkingSiteInput | RealtimeParkingSiteInput | StaticParkingSpotInput | RealtimeParkingSpotInput
         ],
         parking_errors: list[ImportParkingSiteException | ImportParkingSpotException],
+    ):
+        with self.event_helper.suppress_model_events():
+            self._save_import_results(source, parking_inputs, parking_errors)
+
+        if any(isinstance(item, (StaticParkingSiteInput, StaticParkingSpotInput)) for item in parking_inputs):
+            self.event_helper.record(
+                Event(
+                    type=EventType.SOURCE_STATIC_IMPORTED, source=EventSource.SERVICE, data={'source_uid': source.uid}
+                ),
+            )
+        if any(isinstance(item, (RealtimeParkingSiteInput, RealtimeParkingSpotInput)) for item in parking_inputs):
+            self.event_helper.record(
+                Event(
+                    type=EventType.SOURCE_REALTIME_IMPORTED,
+                    source=EventSource.SERVICE,
+                    data={'source_uid': source.uid},
+                ),
+            )
+
+    def _save_import_results(
+        self,
+        source: Source,
+        parking_inputs: list[
+            StaticParkingSiteInput | RealtimeParkingSiteInput | StaticParkingSpotInput | RealtimeParkingSpotInput
+        ],
+        parking_errors: list[ImportParkingSiteException | ImportParkingSpotException],
     ):
         # ParkingSites
         parking_site_errors = [item for item in parking_errors if isinstance(item, ImportParkingSiteException)]
@@ -147,6 +147,8 @@ class ParkingSiteHandler(AdminApiBaseHandler):
 
             response.items.append(self._map_parking_site(parking_site))
 
+        self.matching_service.check_pending_duplicates()
+
         return response
 
     def upsert_parking_site_item(
@@ -186,6 +188,9 @@ class ParkingSiteHandler(AdminApiBaseHandler):
             source_ids=source_ids,
         )
 
+    def get_pending_duplicates(self) -> list[DuplicatedParkingSite]:
+        return self.matching_service.get_pending_duplicates()
+
     def apply_duplicates(self, apply_duplicate_input: ApplyDuplicatesInput) -> list[DuplicatedParkingSite]:
         return self.matching_service.apply_duplicates(apply_duplicate_input.keep, apply_duplicate_input.ignore)
 
@@ -109,6 +109,13 @@ class ParkingSitesBlueprint(AdminApiBaseBlueprint):
                 **method_view_dependencies,
             ),
         )
+        self.add_url_rule(
+            '/duplicates/pending',
+            view_func=ParkingSiteDuplicatesPendingMethodView.as_view(
+                'admin-parking-site-duplicates-pending',
+                **method_view_dependencies,
+            ),
+        )
         self.add_url_rule(
             '/duplicates/apply',
             view_func=ParkingSiteDuplicatesApplyMethodView.as_view(
@@ -328,6 +335,18 @@ class ParkingSiteDuplicatesGenerateMethodView(ParkingSiteBaseMethodView):
         return {'items': duplicate_items, 'total_count': len(duplicate_items)}, HTTPStatus.OK
 
 
+class ParkingSiteDuplicatesPendingMethodView(ParkingSiteBaseMethodView):
+    @document(
+        description='Get ParkingSite duplicates found by imports for new and moved parking sites, which were not applied '
+        'so far.',
+        response=[generate_parking_site_duplicates_response, ErrorResponse(error_codes=[401])],
+    )
+    def get(self):
+        duplicate_items = self.parking_site_handler.get_pending_duplicates()
+
+        return {'items': duplicate_items, 'total_count': len(duplicate_items)}, HTTPStatus.OK
+
+
 class ParkingSiteDuplicatesApplyMethodView(ParkingSiteBaseMethodView):
     apply_duplicate_validator = DataclassValidator(ApplyDuplicatesInput)
 
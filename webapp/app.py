@@ -6,6 +6,7 @@ Use of this source code is governed by an MIT-style license that can be found in
 import os
 from logging.config import dictConfig
 
+from celery.schedules import crontab
 from flask import appcontext_pushed, request
 from flask_sqlalchemy.track_modifications import models_committed
 from werkzeug.middleware.proxy_fix import ProxyFix
@@ -15,6 +16,7 @@ from webapp.cli import register_cli_to_app
 from webapp.common.config import BaseConfig, ConfigLoader
 from webapp.common.error_handling import ErrorDispatcher
 from webapp.common.flask_app import App
+from webapp.common.logging.batching_http_json_post_handler import BatchingHttpPostJsonHandler
 from webapp.common.logging.structlog_config import configure_structlog
 from webapp.common.rest import RestApiErrorHandler
 from webapp.dependencies import dependencies
@@ -22,6 +24,15 @@ from webapp.event_receiver import event_receivers
 from webapp.extensions import celery, db, migrate, openapi
 from webapp.prometheus_api import PrometheusRestApi
 from webapp.public_rest_api import PublicRestApi
+from webapp.services.change_log_service.change_log_tasks import compact_change_log_task
+from webapp.services.parking_site_history_service.parking_site_history_tasks import (
+    maintain_parking_site_history_task,
+    rollup_parking_site_history_task,
+)
+from webapp.services.source_metrics_service.source_metrics_tasks import (
+    repair_source_metrics_task,
+    update_realtime_outdated_metrics_task,
+)
 from webapp.status_rest_api import StatusRestApi
 
 __all__ = ['launch']
@@ -59,6 +70,8 @@ def configure_logging(app: App):
     dictConfig(app.config['LOGGING'])
     configure_structlog()
 
+    BatchingHttpPostJsonHandler.statistics_dir = app.config['LOG_SHIPPING_STATISTICS_DIR']
+
 
 def configure_tracing(app: App) -> None:
     def configure_tracing_handler(*args, **kwargs):
@@ -74,6 +87,7 @@ def configure_extensions(app: App) -> None:
     celery.init_app(app)
     openapi.init_app(app)
     dependencies.get_config_helper().init_app(app)
+    dependencies.get_request_instrumentation().init_app(app)
     dependencies.get_generic_import_service().init_app(app)
 
 
@@ -119,3 +133,25 @@ def configure_error_handlers(app: App):
 def configure_periodic_tasks(**kwargs):
     task_runner = dependencies.get_generic_import_runner()
     task_runner.start()
+
+    config_helper = dependencies.get_config_helper()
+    celery.add_periodic_task(
+        crontab(minute='0', hour=str(config_helper.get('CHANGE_LOG_COMPACTION_HOUR', 3))),
+        compact_change_log_task,
+    )
+    celery.add_periodic_task(
+        config_helper.get('SOURCE_METRICS_UPDATE_INTERVAL', 60),
+        update_realtime_outdated_metrics_task,
+    )
+    celery.add_periodic_task(
+        crontab(minute='15', hour=str(config_helper.get('SOURCE_METRICS_REPAIR_HOUR', 2))),
+        repair_source_metrics_task,
+    )
+    celery.add_periodic_task(
+        crontab(minute='30', hour=str(config_helper.get('HISTORY_MAINTENANCE_HOUR', 4))),
+        maintain_parking_site_history_task,
+    )
+    celery.add_periodic_task(
+        crontab(minute=str(config_helper.get('HISTORY_ROLLUP_MINUTE', 10))),
+        rollup_parking_site_history_task,
+    )
@@ -0,0 +1,171 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+import json
+import random
+import subprocess  # noqa: S404
+import sys
+from statistics import median
+from time import perf_counter
+from typing import Any, Callable
+
+import click
+from flask.cli import AppGroup
+from parkapi_sources.models.enums import PurposeType
+from sqlalchemy import event
+
+from webapp.dependencies import dependencies
+from webapp.extensions import db
+from webapp.repositories.parking_site_repository import ParkingSiteLocation
+from webapp.shared.parking_site.parking_site_search_query import ParkingSiteSearchInput
+
+benchmark_cli = AppGroup('benchmark', help='Benchmark related commands')
+
+
+@benchmark_cli.command('parking-site-list', help='compares the ORM and the aggregated parking site list read paths')
+@click.option('--limit', type=int, default=1000, help='parking sites per page')
+@click.option('--iterations', type=int, default=10, help='runs per read path')
+def cli_benchmark_parking_site_list(limit: int, iterations: int):
+    parking_site_repository = dependencies.get_parking_site_repository()
+
+    read_paths: dict[str, Callable[[ParkingSiteSearchInput], list[dict]]] = {
+        'orm': lambda search_query: [
+            parking_site.to_dict()
+            for parking_site in parking_site_repository.fetch_parking_sites(
+                search_query=search_query,
+                include_restrictions=True,
+                include_external_identifiers=True,
+                include_tags=True,
+                include_parking_site_group=True,
+            )
+        ],
+        'aggregated': lambda search_query: [
+            parking_site_row.to_dict()
+            for parking_site_row in parking_site_repository.fetch_parking_site_rows(search_query=search_query)
+        ],
+    }
+
+    for name, read_path in read_paths.items():
+        durations, query_count, item_count = _benchmark(read_path, limit=limit, iterations=iterations)
+        click.echo(
+            f'{name}: {item_count} items, {query_count} queries per page, '
+            f'median {median(durations) * 1000:.1f} ms, max {max(durations) * 1000:.1f} ms',
+        )
+
+
+@benchmark_cli.command('duplicates', help='benchmarks duplicate matching with synthetic parking site locations')
+@click.option('--count', 'counts', type=int, multiple=True, default=[10000, 100000], help='parking sites per run')
+@click.option('--radius', type=int, default=100, help='match radius in meters')
+@click.option('--seed', type=int, default=0, help='random seed for the synthetic locations')
+def cli_benchmark_duplicates(counts: list[int], radius: int, seed: int):
+    matching_service = dependencies.get_matching_service()
+
+    for count in counts:
+        parking_site_locations = _generate_parking_site_locations(count, random.Random(seed))  # noqa: S311
+
+        start = perf_counter()
+        matches = matching_service.find_matches(
+            parking_site_locations,
+            existing_matches=[],
+            existing_matches_in_db=[],
+            match_radius=radius,
+        )
+        duration = perf_counter() - start
+
+        click.echo(f'{count} parking sites: {len(matches)} matches in {duration * 1000:.1f} ms')
+
+
+STARTUP_BENCHMARK_SCRIPT = """
+import json, resource, time
+start = time.perf_counter()
+from webapp.app import launch
+imported = time.perf_counter()
+app = launch()
+launched = time.perf_counter()
+app.test_client().get('/')
+first_request = time.perf_counter()
+print(json.dumps({
+    'import': imported - start,
+    'launch': launched - imported,
+    'first_request': first_request - launched,
+    'max_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}))
+"""
+
+
+@benchmark_cli.command('startup', help='measures import, launch() and first request of fresh web processes')
+@click.option('--iterations', type=int, default=5, help='number of fresh processes')
+def cli_benchmark_startup(iterations: int):
+    results: list[dict[str, float]] = []
+    for _ in range(iterations):
+        # Every run needs a fresh interpreter, as imports and converters are cached per process
+        output = subprocess.run(  # noqa: S603
+            [sys.executable, '-c', STARTUP_BENCHMARK_SCRIPT],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    for key in ['import', 'launch', 'first_request']:
+        durations = [result[key] for result in results]
+        click.echo(f'{key}: median {median(durations) * 1000:.1f} ms, max {max(durations) * 1000:.1f} ms')
+    click.echo(f'max rss: median {median(result["max_rss"] for result in results) / 1024:.1f} MiB')
+
+
+def _generate_parking_site_locations(count: int, random_generator: random.Random) -> list[ParkingSiteLocation]:
+    """
+    Spreads parking sites over an area of the size of Germany, with about a third of them close to another one, like
+    the same parking site at different sources.
+    """
+    parking_site_locations: list[ParkingSiteLocation] = []
+    for parking_site_id in range(1, count + 1):
+        if parking_site_locations and random_generator.random() < 0.3:
+            original = random_generator.choice(parking_site_locations)
+            lat = original.lat + random_generator.uniform(-0.001, 0.001)
+            lon = original.lon + random_generator.uniform(-0.001, 0.001)
+        else:
+            lat = random_generator.uniform(47.3, 55.0)
+            lon = random_generator.uniform(5.9, 15.0)
+
+        parking_site_locations.append(
+            ParkingSiteLocation(
+                id=parking_site_id,
+                source_id=random_generator.randint(1, 20),
+                lat=lat,
+                lon=lon,
+                purpose=random_generator.choice([PurposeType.CAR, PurposeType.BIKE]),
+            ),
+        )
+
+    return parking_site_locations
+
+
+def _benchmark(
+    read_path: Callable[[ParkingSiteSearchInput], list[dict]],
+    *,
+    limit: int,
+    iterations: int,
+) -> tuple[list[float], int, int]:
+    statements: list[str] = []
+
+    def count_statement(*args: Any, **kwargs: Any) -> None:
+        statements.append(args[2])
+
+    durations: list[float] = []
+    item_count = 0
+    event.listen(db.engine, 'before_cursor_execute', count_statement)
+    try:
+        for _ in range(iterations):
+            # Start every run with an empty identity map, so the ORM path has to load everything again
+            db.session.expire_all()
+            statements.clear()
+            start = perf_counter()
+            item_count = len(read_path(ParkingSiteSearchInput(limit=limit)))
+            durations.append(perf_counter() - start)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count_statement)
+
+    return durations, len(statements), item_count
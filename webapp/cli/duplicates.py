@@ -0,0 +1,20 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from flask.cli import AppGroup
+
+from webapp.dependencies import dependencies
+
+duplicates_cli = AppGroup('duplicates', help='Duplicate related commands')
+
+
+@duplicates_cli.command('check-pending', help='checks new and moved parking sites for duplicates')
+def cli_duplicates_check_pending():
+    dependencies.get_matching_service().check_pending_duplicates()
+
+
+@duplicates_cli.command('recompute', help='checks all parking sites for duplicates and updates pending duplicates')
+def cli_duplicates_recompute():
+    dependencies.get_matching_service().update_pending_duplicates()
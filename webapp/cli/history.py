@@ -0,0 +1,78 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from datetime import datetime, timezone
+from typing import BinaryIO
+
+import click
+from flask.cli import AppGroup
+
+from webapp.dependencies import dependencies
+from webapp.shared.parking_site_history.parking_site_history_export import (
+    EXPORT_BATCH_SIZE,
+    PARKING_SITE_HISTORY_EXPORT_DEFAULT_FIELDS,
+    PARKING_SITE_HISTORY_EXPORT_FIELDS,
+    ParkingSiteHistoryExportFormat,
+    iter_parking_site_history_export,
+)
+
+history_cli = AppGroup('history', help='Parking site history related commands')
+
+
+@history_cli.command('maintain', help='creates upcoming history partitions and removes expired history')
+def cli_history_maintain():
+    dependencies.get_parking_site_history_service().maintain_history()
+
+
+@history_cli.command('rollup', help='rolls up new history to hourly and daily rollups')
+def cli_history_rollup():
+    dependencies.get_parking_site_history_service().rollup_history()
+
+
+@history_cli.command('export', help='exports history to a file, use - for stdout')
+@click.argument('output', type=click.File('wb'))
+@click.option(
+    '--format',
+    'export_format',
+    type=click.Choice([item.value for item in ParkingSiteHistoryExportFormat]),
+    default=ParkingSiteHistoryExportFormat.CSV.value,
+    help='arrow and parquet require pyarrow',
+)
+@click.option('--source-uid', 'source_uids', multiple=True, help='just export history of these sources')
+@click.option('--parking-site-id', 'parking_site_ids', type=int, multiple=True, help='just export these parking sites')
+@click.option('--since', type=click.DateTime(), help='UTC, just export history created at or after this timestamp')
+@click.option('--until', type=click.DateTime(), help='UTC, just export history created before this timestamp')
+@click.option(
+    '--field',
+    'fields',
+    type=click.Choice(PARKING_SITE_HISTORY_EXPORT_FIELDS),
+    multiple=True,
+    help='exported fields, defaults to all fields which are not deprecated',
+)
+def cli_history_export(
+    output: BinaryIO,
+    export_format: str,
+    source_uids: tuple[str, ...],
+    parking_site_ids: tuple[int, ...],
+    since: datetime | None,
+    until: datetime | None,
+    fields: tuple[str, ...],
+):
+    parking_site_history_export_format = ParkingSiteHistoryExportFormat(export_format)
+    if not parking_site_history_export_format.is_available:
+        raise click.UsageError(f'Format {export_format} requires pyarrow, which is not installed.')
+
+    export_fields = list(fields) or PARKING_SITE_HISTORY_EXPORT_DEFAULT_FIELDS
+    rows = dependencies.get_parking_site_history_repository().iter_parking_site_history_columns(
+        export_fields,
+        source_uids=list(source_uids) or None,
+        parking_site_ids=list(parking_site_ids) or None,
+        created_at_since=None if since is None else since.replace(tzinfo=timezone.utc),
+        created_at_until=None if until is None else until.replace(tzinfo=timezone.utc),
+        batch_size=EXPORT_BATCH_SIZE,
+    )
+
+    for chunk in iter_parking_site_history_export(rows, export_fields, parking_site_history_export_format):
+        output.write(chunk)
@@ -5,8 +5,14 @@ Use of this source code is governed by an MIT-style license that can be found in
 
 from flask import Flask
 
+from webapp.cli.benchmark import benchmark_cli
+from webapp.cli.duplicates import duplicates_cli
+from webapp.cli.history import history_cli
 from webapp.cli.source import source_cli
 
 
 def register_cli_to_app(app: Flask):
     app.cli.add_command(source_cli)
+    app.cli.add_command(benchmark_cli)
+    app.cli.add_command(duplicates_cli)
+    app.cli.add_command(history_cli)
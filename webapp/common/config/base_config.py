@@ -25,6 +25,13 @@ class BaseConfig:
     REDIS_URL = 'redis://redis:6379/3'
     ENFORCE_CONFIG_VALUES = ['SQLALCHEMY_DATABASE_URI', 'CELERY_BROKER_URL']
 
+    # Public and Prometheus reads are sent to this read replica, if set. Everything else, and reads after a write within
+    # the same app context, stay at SQLALCHEMY_DATABASE_URI. If the replica lags behind more than READ_REPLICA_MAX_LAG
+    # seconds, reads fall back to the primary. The lag is checked every READ_REPLICA_LAG_CHECK_INTERVAL seconds.
+    SQLALCHEMY_READ_REPLICA_URI: str | None = None
+    READ_REPLICA_MAX_LAG = 30
+    READ_REPLICA_LAG_CHECK_INTERVAL = 10
+
     REMOTE_SERVERS: dict = {}
     SERVER_AUTH_USERS: dict = {}
 
@@ -66,11 +73,75 @@ class BaseConfig:
     STATIC_IMPORT_PULL_HOUR = 1
     REALTIME_IMPORT_PULL_FREQUENCY = 5 * 60
     REALTIME_OUTDATED_AFTER_MINUTES = 30
+    # Parking site / spot counts and realtime outdated counts per source are updated by imports, so metric scrapes just
+    # read them. Every SOURCE_METRICS_UPDATE_INTERVAL seconds, entries which got realtime outdated since the last run are
+    # added. A daily repair at SOURCE_METRICS_REPAIR_HOUR recounts everything and corrects changes outside of imports.
+    SOURCE_METRICS_UPDATE_INTERVAL = 60
+    SOURCE_METRICS_REPAIR_HOUR = 2
 
     # At the public API, has_realtime_data is unset (and all realtime_* fields are dropped) when the
     # realtime_data_updated_at timestamp is older than this many minutes.
     UNSET_REALTIME_AFTER_MINUTES = 30
 
+    # Rendered vector tiles are cached per web process until the data of a contained source changes, but at most
+    # VECTOR_TILE_CACHE_MAX_AGE seconds.
+    VECTOR_TILE_CACHE_MAX_ENTRIES = 10000
+    VECTOR_TILE_CACHE_MAX_AGE = 5 * 60
+
+    # Parsed OSM opening hours are cached per web process and opening hours string.
+    OPENING_HOURS_CACHE_MAX_ENTRIES = 10000
+
+    # The change log is compacted daily: before the retention window, just the latest entry per object is kept and
+    # tombstones are removed. Mirrors which did not sync within the retention window have to do a full sync.
+    CHANGE_LOG_RETENTION_DAYS = 7
+    CHANGE_LOG_COMPACTION_HOUR = 3
+    # At MySQL, entries are just published after this delay, so transactions which commit out of sequence order are not
+    # skipped. Transactions writing entries are refused to commit after half of this delay. PostgreSQL publishes entries
+    # as soon as all transactions before them completed, so transactions of any length are fine there.
+    CHANGE_LOG_VISIBILITY_DELAY_SECONDS = 60
+
+    # Parking site history is kept HISTORY_RETENTION_DAYS days, None keeps it forever. At PostgreSQL, the history is
+    # partitioned by month: the daily maintenance creates partitions HISTORY_PARTITIONS_AHEAD months in advance and drops
+    # partitions as soon as all their entries are expired. At MySQL, expired entries are deleted in batches.
+    HISTORY_RETENTION_DAYS = None
+    HISTORY_PARTITIONS_AHEAD = 3
+    HISTORY_MAINTENANCE_HOUR = 4
+    # History is rolled up hourly and daily per parking site at minute HISTORY_ROLLUP_MINUTE of every hour. Hours are
+    # rolled up HISTORY_ROLLUP_DELAY_SECONDS after they ended. Rollups are kept independent of HISTORY_RETENTION_DAYS, so
+    # raw history can be expired way earlier.
+    HISTORY_ROLLUP_MINUTE = 10
+    HISTORY_ROLLUP_DELAY_SECONDS = 5 * 60
+    # Maximum time range of one history export via API. The CLI export is not limited.
+    HISTORY_EXPORT_MAX_DAYS = 31
+
+    # Realtime imports publish changed parking sites to the realtime streams, as long as any stream is open. 'broker'
+    # fans out via CELERY_BROKER_URL to all web processes, 'local' just works within one process and is used for testing.
+    REALTIME_STREAM_ENABLED = True
+    PUBSUB_BACKEND = 'broker'
+    # Each open stream occupies a worker thread, so streams are limited per web process and closed after
+    # REALTIME_STREAM_MAX_DURATION seconds. Clients reconnect and resume via Last-Event-ID.
+    REALTIME_STREAM_MAX_CONNECTIONS = 16
+    REALTIME_STREAM_MAX_DURATION = 5 * 60
+    REALTIME_STREAM_HEARTBEAT_INTERVAL = 15
+    # Maximum number of events replayed on resume. If there are more, the stream closes after the replay, and the client
+    # continues with the next reconnect.
+    REALTIME_STREAM_RESUME_LIMIT = 1000
+
+    # Duration, SQL statement count and SQL duration of requests are recorded per endpoint and exposed at the metrics
+    # endpoint. Requests with more than REQUEST_SQL_STATEMENT_WARN_COUNT statements (usually N+1 queries) and requests
+    # slower than SLOW_REQUEST_THRESHOLD seconds are logged, as well as statements slower than SLOW_QUERY_THRESHOLD
+    # seconds with normalized SQL.
+    REQUEST_INSTRUMENTATION = True
+    REQUEST_SQL_STATEMENT_WARN_COUNT = 50
+    SLOW_REQUEST_THRESHOLD = 5.0
+    SLOW_QUERY_THRESHOLD = 1.0
+
+    # Batching log handlers write their statistics per process to this directory, so the metrics endpoint exposes the
+    # statistics of all processes sharing it, including celery workers. Set to None to just expose the statistics of the
+    # scraped process. Statistics not updated for LOG_SHIPPING_STATISTICS_MAX_AGE seconds are removed.
+    LOG_SHIPPING_STATISTICS_DIR = os.path.join(TEMP_DIR, 'log_shipping')
+    LOG_SHIPPING_STATISTICS_MAX_AGE = 5 * 60
+
     # Default log config
     LOGGING = {
         'version': 1,
@@ -18,3 +18,15 @@ def trigger_delayed_event(event_type: str, event_source_str: str, event_id: int,
         event_id=event_id,
         data=data,
     )
+
+
+@celery.task
+def trigger_delayed_events(event_type: str, event_source_str: str, event_id: int, data_list: list[dict]):
+    from webapp.dependencies import dependencies
+
+    dependencies.get_event_helper().trigger_async_batch(
+        event_type=EventType[event_type],
+        event_source=EventSource[event_source_str],
+        event_id=event_id,
+        data_list=data_list,
+    )
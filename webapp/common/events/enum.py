@@ -18,3 +18,6 @@ class EventType(Enum):
     OPTION_CREATED = 'OPTION_CREATED'
     OPTION_UPDATED = 'OPTION_UPDATED'
     OPTION_DELETED = 'OPTION_DELETED'
+    # Summary events of bulk imports, which suppress the events of single rows
+    SOURCE_STATIC_IMPORTED = 'SOURCE_STATIC_IMPORTED'
+    SOURCE_REALTIME_IMPORTED = 'SOURCE_REALTIME_IMPORTED'
@@ -3,7 +3,9 @@ Copyright 2023 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
-from typing import Dict, List, Optional, Sequence
+import json
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence
 
 import structlog
 
@@ -11,13 +13,16 @@ from webapp.common.celery import CeleryHelper
 from webapp.common.contexts import ContextHelper
 from webapp.common.logging.models import LogMessageType
 
-from .delayed_events import trigger_delayed_event
+from .delayed_events import trigger_delayed_event, trigger_delayed_events
 from .enum import EventSource, EventType
 from .event import Event
 from .event_receiver import EventReceiver
 
 logger = structlog.get_logger(__name__)
 
+# Maximum number of payloads per queued task, so single broker messages stay small
+EVENT_BATCH_SIZE = 1000
+
 
 class EventHelper:
     celery_helper: CeleryHelper
@@ -36,22 +41,72 @@ class EventHelper:
         return app_context.butterfly_events
 
     def record(self, event: Event):
+        if self.model_events_suppressed and event.source == EventSource.ORM:
+            return
         self._get_event_queue().append(event)
 
+    @property
+    def model_events_suppressed(self) -> bool:
+        app_context = self.context_helper.get_app_context()
+        return getattr(app_context, 'butterfly_model_events_suppressed', 0) > 0
+
+    @contextmanager
+    def suppress_model_events(self) -> Iterator[None]:
+        """
+        Drops all ORM events recorded within the block, including the ones of commits. Meant for bulk imports, which
+        should record one summary event instead of one event per changed row. Blocks may be nested.
+        """
+        app_context = self.context_helper.get_app_context()
+        app_context.butterfly_model_events_suppressed = getattr(app_context, 'butterfly_model_events_suppressed', 0) + 1
+        try:
+            yield
+        finally:
+            app_context.butterfly_model_events_suppressed -= 1
+
     def publish_events(self):
-        # deduplicate events from app context
-        deduplicated_events = []
-        for event in self._get_event_queue():
-            if event not in deduplicated_events:
-                deduplicated_events.append(event)
+        event_queue = self._get_event_queue()
+
+        # deduplicate events from app context, keeping the order of their first occurrence
+        event_keys: set[tuple] = set()
+        deduplicated_events: list[Event] = []
+        for event in event_queue:
+            event_key = self._get_event_key(event)
+            if event_key in event_keys:
+                continue
+            event_keys.add(event_key)
+            deduplicated_events.append(event)
+
+        event_queue.clear()
 
-        # trigger deduplicated events
+        # coalesce payloads per event type, source and receiver, so each receiver gets one task instead of one per event
+        payloads_by_receiver: dict[tuple[EventType, EventSource, int], list[dict]] = {}
         for event in deduplicated_events:
-            self.trigger(
-                event_type=event.type,
-                event_source=event.source,
-                data=event.data,
-            )
+            for event_id in self._get_event_receiver_ids(event.type, event.source):
+                payloads_by_receiver.setdefault((event.type, event.source, event_id), []).append(event.data or {})
+
+        for (event_type, event_source, event_id), data_list in payloads_by_receiver.items():
+            delay_seconds = self.event_receivers[event_type][event_id].delay_seconds or 0
+            for offset in range(0, len(data_list), EVENT_BATCH_SIZE):
+                self.celery_helper.with_delay(
+                    task=trigger_delayed_events,
+                    delay_seconds=delay_seconds,
+                    event_type=event_type.name,
+                    event_source_str=event_source.name,
+                    event_id=event_id,
+                    data_list=data_list[offset : offset + EVENT_BATCH_SIZE],
+                )
+
+    @staticmethod
+    def _get_event_key(event: Event) -> tuple:
+        # data is a dict and therefore not hashable, so it's serialized with sorted keys for comparison
+        return event.type, event.source, json.dumps(event.data, sort_keys=True, default=str)
+
+    def _get_event_receiver_ids(self, event_type: EventType, event_source: EventSource) -> list[int]:
+        return [
+            event_id
+            for event_id, event_receiver in enumerate(self.event_receivers.get(event_type, []))
+            if event_receiver.listen_to_event_source is None or event_receiver.listen_to_event_source == event_source
+        ]
 
     def trigger(
         self,
@@ -67,28 +122,14 @@ class EventHelper:
         Because events are async it gives the event with its position in our event list to celery, then it will be
         triggered in our celery worker by trigger_async() below.
         """
-        if event_type not in self.event_receivers:
-            return
-
-        for i in range(len(self.event_receivers[event_type])):
-            # check for event source
-            if (
-                self.event_receivers[event_type][i].listen_to_event_source is not None
-                and self.event_receivers[event_type][i].listen_to_event_source != event_source
-            ):
-                continue
-
-            delay_seconds = self.event_receivers[event_type][i].delay_seconds
-            if delay_seconds is None:
-                delay_seconds = 0
-
+        for event_id in self._get_event_receiver_ids(event_type, event_source):
             # push async events in celery queue which will trigger trigger_async() afterwards
             self.celery_helper.with_delay(
                 task=trigger_delayed_event,
-                delay_seconds=delay_seconds,
+                delay_seconds=self.event_receivers[event_type][event_id].delay_seconds or 0,
                 event_type=event_type.name,
                 event_source_str=event_source.name,
-                event_id=i,
+                event_id=event_id,
                 data=data or {},
             )
 
@@ -109,6 +150,31 @@ class EventHelper:
                 return
         self.event_receivers[event_type][event_id].run(event_source=event_source, data=data)
 
+    def trigger_async_batch(
+        self,
+        event_type: EventType,
+        event_source: EventSource,
+        event_id: int,
+        data_list: list[dict],
+    ):
+        event_receiver = self.event_receivers[event_type][event_id]
+        valid_data_list: list[dict] = []
+        for data in data_list:
+            missing_parameters = [
+                parameter for parameter in event_receiver.required_parameters if parameter not in data
+            ]
+            if missing_parameters:
+                logger.error(
+                    f'got event {event_type} with missing required parameters: {data}, '
+                    f'required: {event_receiver.required_parameters}',
+                    type=LogMessageType.EXCEPTION,
+                )
+                continue
+            valid_data_list.append(data)
+
+        if valid_data_list:
+            event_receiver.run_batch(event_source=event_source, data_list=valid_data_list)
+
     def register_receivers(self, event_receivers: Sequence[EventReceiver]):
         for event_receiver in event_receivers:
             for event_type in event_receiver.listen_to_event_types:
@@ -42,3 +42,11 @@ class EventReceiver(ABC):
     @abstractmethod
     def run(self, event_source: EventSource, data: dict):
         pass
+
+    def run_batch(self, event_source: EventSource, data_list: List[dict]):
+        """
+        Events are delivered in batches. Receivers which can handle many payloads at once (e.g. with one query) opt
+        into batch delivery by overriding this method, all others get their payloads one by one.
+        """
+        for data in data_list:
+            self.run(event_source=event_source, data=data)
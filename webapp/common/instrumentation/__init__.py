@@ -0,0 +1,8 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from .request_instrumentation import RequestInstrumentation, RequestStatistics
+from .request_metrics import Histogram, HistogramSnapshot, RequestMetrics
+from .sql_normalizer import normalize_sql
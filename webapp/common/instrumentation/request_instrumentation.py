@@ -0,0 +1,138 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any
+
+import structlog
+from flask import Flask, Response, g, has_request_context, request
+from sqlalchemy import Connection, Engine, event
+
+from webapp.common.logging.models import LogMessageType
+
+from .request_metrics import RequestMetrics
+from .sql_normalizer import normalize_sql
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class RequestStatistics:
+    started_at: float = field(default_factory=perf_counter)
+    sql_statement_count: int = 0
+    sql_duration: float = 0
+
+    def get_duration(self) -> float:
+        return perf_counter() - self.started_at
+
+    def to_log_attributes(self) -> dict[str, Any]:
+        return {
+            'duration_ms': round(self.get_duration() * 1000, 1),
+            'sql_statement_count': self.sql_statement_count,
+            'sql_duration_ms': round(self.sql_duration * 1000, 1),
+        }
+
+
+class RequestInstrumentation:
+    """
+    Records duration, SQL statement count and SQL duration of every request by endpoint, warns about requests with more
+    statements than `sql_statement_warn_count` (usually N+1 queries) and logs statements slower than
+    `slow_query_threshold` seconds with normalized SQL. Slow statements are logged outside of requests, too, e.g. in
+    Celery tasks.
+
+    Streamed responses are measured until the response object is returned, not until the stream is completed.
+    """
+
+    request_metrics: RequestMetrics
+    sql_statement_warn_count: int
+    slow_query_threshold: float
+    slow_request_threshold: float
+
+    def __init__(self, request_metrics: RequestMetrics | None = None):
+        self.request_metrics = request_metrics or RequestMetrics()
+
+    def init_app(self, app: Flask) -> None:
+        if not app.config.get('REQUEST_INSTRUMENTATION', True):
+            return
+
+        self.sql_statement_warn_count = app.config.get('REQUEST_SQL_STATEMENT_WARN_COUNT', 50)
+        self.slow_query_threshold = app.config.get('SLOW_QUERY_THRESHOLD', 1.0)
+        self.slow_request_threshold = app.config.get('SLOW_REQUEST_THRESHOLD', 5.0)
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+        # Listening at the Engine class covers the primary and the read replica engine
+        if not event.contains(Engine, 'before_cursor_execute', self._before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    @staticmethod
+    def get_request_statistics() -> RequestStatistics | None:
+        if not has_request_context():
+            return None
+        return g.get('request_statistics')
+
+    @staticmethod
+    def _before_request() -> None:
+        g.request_statistics = RequestStatistics()
+
+    def _after_request(self, response: Response) -> Response:
+        request_statistics = self.get_request_statistics()
+        if request_statistics is None:
+            return response
+
+        duration = request_statistics.get_duration()
+        # Unmatched URLs don't have an endpoint, and should not blow up the label cardinality
+        endpoint = request.endpoint or 'unknown'
+
+        self.request_metrics.observe(
+            endpoint,
+            duration=duration,
+            sql_statement_count=request_statistics.sql_statement_count,
+            sql_duration=request_statistics.sql_duration,
+        )
+
+        if request_statistics.sql_statement_count > self.sql_statement_warn_count:
+            logger.warning(
+                f'{request.method.upper()} {request.full_path} issued {request_statistics.sql_statement_count} SQL '
+                f'statements, which is more than {self.sql_statement_warn_count}. This might be an N+1 query.',
+                type=LogMessageType.REQUEST_IN,
+                endpoint=endpoint,
+                **request_statistics.to_log_attributes(),
+            )
+        elif duration > self.slow_request_threshold:
+            logger.warning(
+                f'{request.method.upper()} {request.full_path} took {round(duration, 3)} seconds.',
+                type=LogMessageType.REQUEST_IN,
+                endpoint=endpoint,
+                **request_statistics.to_log_attributes(),
+            )
+
+        return response
+
+    @staticmethod
+    def _before_cursor_execute(conn: Connection, cursor: Any, statement: str, *args: Any) -> None:
+        conn.info.setdefault('query_started_at', []).append(perf_counter())
+
+    def _after_cursor_execute(self, conn: Connection, cursor: Any, statement: str, *args: Any) -> None:
+        query_started_at = conn.info.get('query_started_at')
+        if not query_started_at:
+            return
+        duration = perf_counter() - query_started_at.pop()
+
+        request_statistics = self.get_request_statistics()
+        if request_statistics is not None:
+            request_statistics.sql_statement_count += 1
+            request_statistics.sql_duration += duration
+
+        if duration > self.slow_query_threshold:
+            logger.warning(
+                f'Slow SQL statement took {round(duration, 3)} seconds: {normalize_sql(statement)}',
+                type=LogMessageType.SLOW_QUERY,
+                sql_duration_ms=round(duration * 1000, 1),
+                endpoint=request.endpoint if has_request_context() else None,
+            )
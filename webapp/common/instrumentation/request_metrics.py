@@ -0,0 +1,83 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from threading import Lock
+
+REQUEST_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_STATEMENT_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+@dataclass
+class HistogramSnapshot:
+    # Cumulative counts per upper bound, like Prometheus expects them, without the +Inf bucket (which equals count)
+    buckets: list[tuple[float, int]]
+    sum: float
+    count: int
+
+
+class Histogram:
+    """
+    Thread-safe histogram with fixed buckets per label. Observing is a bisect and three additions, so it's cheap enough
+    to be used for every request.
+    """
+
+    bucket_bounds: tuple[float, ...]
+    _bucket_counts: dict[str, list[int]]
+    _sums: dict[str, float]
+    _lock: Lock
+
+    def __init__(self, bucket_bounds: tuple[float, ...]):
+        self.bucket_bounds = bucket_bounds
+        self._bucket_counts = {}
+        self._sums = {}
+        self._lock = Lock()
+
+    def observe(self, label: str, value: float) -> None:
+        # The last slot counts values above the highest bound
+        bucket_index = bisect_left(self.bucket_bounds, value)
+        with self._lock:
+            if label not in self._bucket_counts:
+                self._bucket_counts[label] = [0] * (len(self.bucket_bounds) + 1)
+                self._sums[label] = 0
+            self._bucket_counts[label][bucket_index] += 1
+            self._sums[label] += value
+
+    def get_snapshots(self) -> dict[str, HistogramSnapshot]:
+        with self._lock:
+            bucket_counts = {label: list(counts) for label, counts in self._bucket_counts.items()}
+            sums = dict(self._sums)
+
+        snapshots: dict[str, HistogramSnapshot] = {}
+        for label, counts in bucket_counts.items():
+            cumulative_buckets: list[tuple[float, int]] = []
+            cumulative_count = 0
+            for bound, count in zip(self.bucket_bounds, counts):
+                cumulative_count += count
+                cumulative_buckets.append((bound, cumulative_count))
+            snapshots[label] = HistogramSnapshot(buckets=cumulative_buckets, sum=sums[label], count=sum(counts))
+
+        return snapshots
+
+
+class RequestMetrics:
+    """
+    Per-process request metrics by endpoint: request duration, SQL statement count and SQL duration per request.
+    """
+
+    request_durations: Histogram
+    sql_statement_counts: Histogram
+    sql_durations: Histogram
+
+    def __init__(self):
+        self.request_durations = Histogram(REQUEST_DURATION_BUCKETS)
+        self.sql_statement_counts = Histogram(SQL_STATEMENT_COUNT_BUCKETS)
+        self.sql_durations = Histogram(REQUEST_DURATION_BUCKETS)
+
+    def observe(self, endpoint: str, *, duration: float, sql_statement_count: int, sql_duration: float) -> None:
+        self.request_durations.observe(endpoint, duration)
+        self.sql_statement_counts.observe(endpoint, sql_statement_count)
+        self.sql_durations.observe(endpoint, sql_duration)
@@ -0,0 +1,26 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+import re
+
+# Order matters: literals are replaced before placeholder lists get collapsed
+_SQL_NORMALIZATIONS: list[tuple[re.Pattern, str]] = [
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'%\(\w+\)s|%s|\?'), '?'),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)'), '(...)'),
+    (re.compile(r'\s+'), ' '),
+]
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Normalizes an SQL statement for logging and grouping: literals and bind parameters become `?`, lists of them (like
+    expanded IN clauses) become `(...)`, and whitespace is collapsed. Identifiers containing digits stay untouched.
+    """
+    for pattern, replacement in _SQL_NORMALIZATIONS:
+        statement = pattern.sub(replacement, statement)
+
+    return statement.strip()
@@ -4,5 +4,6 @@ Use of this source code is governed by an MIT-style license that can be found in
 """
 
 from .default_json_encoder import DefaultJSONEncoder
+from .geojson import geojson_feature, geojson_point
 from .json_provider import JSONProvider
 from .responses import empty_json_response
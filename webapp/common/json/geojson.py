@@ -0,0 +1,27 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+import json
+from decimal import Decimal
+
+from .default_json_encoder import DefaultJSONEncoder
+
+
+def geojson_point(lat: Decimal | float, lon: Decimal | float) -> str:
+    """
+    Returns a GeoJSON Point geometry as JSON string. Please keep in mind that GeoJSON uses lon / lat order.
+    """
+    return json.dumps({'type': 'Point', 'coordinates': [float(lon), float(lat)]})
+
+
+def geojson_feature(*, feature_id: int, geometry: str, properties: dict) -> str:
+    """
+    Returns a GeoJSON Feature as JSON string. The geometry has to be a JSON string already, which allows splicing in
+    stored GeoJSON text without a parse / dump round trip.
+    """
+    return (
+        f'{{"type": "Feature", "id": {feature_id}, "geometry": {geometry}, '
+        f'"properties": {json.dumps(properties, cls=DefaultJSONEncoder)}}}'
+    )
@@ -0,0 +1,341 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+import gzip
+import json
+import os
+import socket
+from dataclasses import asdict, dataclass
+from hashlib import sha256
+from logging import NOTSET, Handler, LogRecord
+from pathlib import Path
+from queue import Empty, Full, Queue
+from threading import Event, Lock, Thread
+from time import monotonic, time
+from typing import ClassVar
+from weakref import WeakSet
+
+from requests import RequestException, Session
+
+
+@dataclass
+class LogShippingStatistics:
+    url: str
+    process: str
+    sent_count: int
+    dropped_count: int
+    failed_count: int
+    queue_size: int
+    last_latency: float | None
+    latency_sum: float
+    batch_count: int
+
+
+class BatchingHttpPostJsonHandler(Handler):
+    """
+    Non-blocking alternative to `HttpPostJsonHandler`: records are formatted in the logging thread, buffered in a
+    bounded queue and shipped as gzip-compressed batches by a background thread. A batch is sent as soon as it has
+    `max_batch_size` records or its oldest record waited `max_batch_interval` seconds. If the queue is full, records are
+    dropped and counted instead of blocking the logging thread.
+
+    `batch_format` defines how formatted records are combined:
+    - `json_array`: a JSON array of all records
+    - `json_lines`: one JSON document per line
+    - `loki`: the `streams` of all records are merged to one Loki push request
+    """
+
+    # All handlers of this process, so their statistics can be exposed as metrics
+    instances: ClassVar[WeakSet['BatchingHttpPostJsonHandler']] = WeakSet()
+    # If set, statistics are written to one file per process and handler in this directory, so the metrics endpoint can
+    # expose the statistics of all processes sharing it, e.g. of celery workers. Set from LOG_SHIPPING_STATISTICS_DIR.
+    statistics_dir: ClassVar[str | None] = None
+    # Unchanged statistics are rewritten after this many seconds, so files of running processes don't look stale
+    statistics_refresh_interval: ClassVar[int] = 60
+
+    url: str
+    credentials: tuple[str, str] | None
+    batch_format: str
+    max_batch_size: int
+    max_batch_interval: float
+    max_retries: int
+    retry_backoff: float
+    timeout: float
+    compress: bool
+
+    sent_count: int = 0
+    dropped_count: int = 0
+    failed_count: int = 0
+    batch_count: int = 0
+    latency_sum: float = 0.0
+    last_latency: float | None = None
+
+    _queue: Queue
+    _session: Session | None = None
+    _worker: Thread | None = None
+    _worker_pid: int | None = None
+    _worker_lock: Lock
+    _stop_event: Event
+    _written_statistics: LogShippingStatistics | None = None
+    _statistics_written_at: float = 0.0
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        level: int = NOTSET,
+        credentials: tuple[str, str] | None = None,
+        batch_format: str = 'json_array',
+        max_queue_size: int = 10000,
+        max_batch_size: int = 500,
+        max_batch_interval: float = 2.0,
+        max_retries: int = 5,
+        retry_backoff: float = 0.5,
+        timeout: float = 10.0,
+        compress: bool = True,
+    ):
+        super().__init__(level=level)
+
+        if batch_format not in ('json_array', 'json_lines', 'loki'):
+            raise ValueError(f'Unknown batch format {batch_format}.')
+
+        self.url = url
+        self.credentials = credentials
+        self.batch_format = batch_format
+        self.max_batch_size = max_batch_size
+        self.max_batch_interval = max_batch_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.timeout = timeout
+        self.compress = compress
+
+        self._queue = Queue(maxsize=max_queue_size)
+        self._worker_lock = Lock()
+        self._stop_event = Event()
+
+        self.instances.add(self)
+
+    @property
+    def session(self) -> Session:
+        if self._session is None:
+            self._session = Session()
+            self._session.auth = self.credentials
+
+        return self._session
+
+    def emit(self, record: LogRecord):
+        try:
+            data = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+
+        self._ensure_worker()
+
+        try:
+            self._queue.put_nowait(data)
+        except Full:
+            self.dropped_count += 1
+
+    def get_statistics(self) -> LogShippingStatistics:
+        return LogShippingStatistics(
+            url=self.url,
+            process=f'{socket.gethostname()}-{os.getpid()}',
+            sent_count=self.sent_count,
+            dropped_count=self.dropped_count,
+            failed_count=self.failed_count,
+            queue_size=self._queue.qsize(),
+            last_latency=self.last_latency,
+            latency_sum=self.latency_sum,
+            batch_count=self.batch_count,
+        )
+
+    def _reset_after_fork(self):
+        """
+        Called in child processes after a fork. The child gets its own queue, so records buffered by the parent at fork
+        time are just shipped by the parent, and its own locks, as the parent's worker thread might have held them at
+        fork time. Statistics start from zero, as they are exposed per process.
+        """
+        self._queue = Queue(maxsize=self._queue.maxsize)
+        self._worker_lock = Lock()
+        self._stop_event = Event()
+        self._worker = None
+        self._worker_pid = None
+        self._session = None
+
+        self.sent_count = 0
+        self.dropped_count = 0
+        self.failed_count = 0
+        self.batch_count = 0
+        self.latency_sum = 0.0
+        self.last_latency = None
+        self._written_statistics = None
+        self._statistics_written_at = 0.0
+
+    def _ensure_worker(self):
+        # Threads don't survive forks, so worker processes which inherited the handler start their own thread
+        if self._worker_pid == os.getpid() and self._worker is not None and self._worker.is_alive():
+            return
+
+        with self._worker_lock:
+            if self._worker_pid == os.getpid() and self._worker is not None and self._worker.is_alive():
+                return
+
+            self._session = None
+            self._worker = Thread(target=self._run, name='batching-http-log-handler', daemon=True)
+            self._worker_pid = os.getpid()
+            self._worker.start()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            batch = self._collect_batch()
+            if batch:
+                self._send_batch(batch)
+            self._write_statistics()
+
+    def _write_statistics(self):
+        if self.statistics_dir is None:
+            return
+
+        statistics = self.get_statistics()
+        if (
+            statistics == self._written_statistics
+            and monotonic() - self._statistics_written_at < self.statistics_refresh_interval
+        ):
+            return
+
+        try:
+            statistics_dir = Path(self.statistics_dir)
+            statistics_dir.mkdir(parents=True, exist_ok=True)
+            url_hash = sha256(self.url.encode()).hexdigest()[:12]
+            path = Path(statistics_dir, f'{statistics.process}-{url_hash}.json')
+            temp_path = path.with_suffix('.tmp')
+            temp_path.write_text(json.dumps(asdict(statistics)))
+            # Replacing is atomic, so readers never see partial files
+            temp_path.replace(path)
+        except OSError:
+            # Logging the error would log via this handler again
+            return
+
+        self._written_statistics = statistics
+        self._statistics_written_at = monotonic()
+
+    def _collect_batch(self) -> list[str]:
+        try:
+            batch = [self._queue.get(timeout=self.max_batch_interval)]
+        except Empty:
+            return []
+
+        deadline = monotonic() + self.max_batch_interval
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except Empty:
+                break
+
+        return batch
+
+    def _send_batch(self, batch: list[str]):
+        body = self._build_body(batch).encode()
+        headers = {
+            'Content-Type': 'application/x-ndjson' if self.batch_format == 'json_lines' else 'application/json',
+        }
+        if self.compress:
+            body = gzip.compress(body)
+            headers['Content-Encoding'] = 'gzip'
+
+        for attempt in range(self.max_retries + 1):
+            start = monotonic()
+            try:
+                response = self.session.post(self.url, data=body, headers=headers, timeout=self.timeout)
+                # Client errors won't get better by retrying
+                if response.status_code < 500:
+                    self.last_latency = monotonic() - start
+                    self.latency_sum += self.last_latency
+                    self.batch_count += 1
+                    if response.ok:
+                        self.sent_count += len(batch)
+                    else:
+                        self.failed_count += len(batch)
+                    return
+            except RequestException:
+                pass
+
+            if attempt < self.max_retries and self._stop_event.wait(self.retry_backoff * 2**attempt):
+                break
+
+        self.failed_count += len(batch)
+
+    def _build_body(self, batch: list[str]) -> str:
+        if self.batch_format == 'json_lines':
+            return '\n'.join(batch)
+
+        if self.batch_format == 'loki':
+            streams: list[dict] = []
+            for item in batch:
+                streams += json.loads(item).get('streams', [])
+            return json.dumps({'streams': streams})
+
+        return f'[{",".join(batch)}]'
+
+    def flush(self):
+        """
+        Sends all buffered records from the calling thread, e.g. at shutdown.
+        """
+        batch: list[str] = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except Empty:
+                break
+            if len(batch) >= self.max_batch_size:
+                self._send_batch(batch)
+                batch = []
+
+        if batch:
+            self._send_batch(batch)
+
+    def close(self):
+        self._stop_event.set()
+        if self._worker is not None and self._worker_pid == os.getpid():
+            self._worker.join(timeout=self.timeout)
+        self.flush()
+        self._write_statistics()
+
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+        self.instances.discard(self)
+        super().close()
+
+
+def _reset_handlers_after_fork():
+    for handler in list(BatchingHttpPostJsonHandler.instances):
+        handler._reset_after_fork()
+
+
+os.register_at_fork(after_in_child=_reset_handlers_after_fork)
+
+
+def load_log_shipping_statistics(statistics_dir: str, max_age: int) -> list[LogShippingStatistics]:
+    """
+    Loads the statistics all processes wrote to `statistics_dir`. Files which were not updated for `max_age` seconds
+    belong to processes which are gone, so they are removed.
+    """
+    statistics_list: list[LogShippingStatistics] = []
+    for path in sorted(Path(statistics_dir).glob('*.json')):
+        try:
+            if path.stat().st_mtime < time() - max_age:
+                path.unlink(missing_ok=True)
+                continue
+            statistics_list.append(LogShippingStatistics(**json.loads(path.read_text())))
+        except (OSError, ValueError, TypeError):
+            # Files might be removed or replaced concurrently
+            continue
+
+    return statistics_list
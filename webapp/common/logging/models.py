@@ -12,6 +12,7 @@ class LogMessageType(Enum):
     DATABASE_CREATE = 'database-create'
     DATABASE_UPDATE = 'database-update'
     DATABASE_DELETE = 'database-delete'
+    SLOW_QUERY = 'slow-query'
     EXCEPTION = 'exception'
     SOURCE_HANDLING = 'source-handling'
     STATIC_SOURCE_HANDLING = 'static-source-handling'
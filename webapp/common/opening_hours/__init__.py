@@ -0,0 +1,6 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from .opening_hours_cache import OpeningHoursCache
@@ -0,0 +1,79 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+
+from opening_hours import OpeningHours
+from opening_hours.opening_hours import ParserError
+
+
+class OpeningHoursCache:
+    """
+    In-process LRU cache for parsed OSM opening hours, keyed by the opening hours string. Most parking sites share a few
+    hundred distinct strings, so parsing is done once per string and process. Invalid strings are cached as well, so
+    they don't get parsed over and over again.
+
+    Evaluated states are cached per string, too, until the minute changes: OSM opening hours have a resolution of one
+    minute, so the state can't change within a minute.
+    """
+
+    max_entries: int
+    _opening_hours: OrderedDict[str, OpeningHours | None]
+    _states: dict[str, str | None]
+    _state_minute: datetime | None
+    _lock: Lock
+
+    def __init__(self, *, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._opening_hours = OrderedDict()
+        self._states = {}
+        self._state_minute = None
+        self._lock = Lock()
+
+    def get_opening_hours(self, value: str) -> OpeningHours | None:
+        """
+        Returns the parsed opening hours, or None if the value is not a valid OSM opening hours string.
+        """
+        with self._lock:
+            if value in self._opening_hours:
+                self._opening_hours.move_to_end(value)
+                return self._opening_hours[value]
+
+        try:
+            opening_hours = OpeningHours(value)
+        except ParserError:
+            opening_hours = None
+
+        with self._lock:
+            self._opening_hours[value] = opening_hours
+            while len(self._opening_hours) > self.max_entries:
+                self._opening_hours.popitem(last=False)
+
+        return opening_hours
+
+    def get_state(self, value: str, at: datetime | None = None) -> str | None:
+        """
+        Returns the state at `at` (defaults to now) as 'open', 'closed' or 'unknown', or None if the value is not a
+        valid OSM opening hours string.
+        """
+        minute = (at or datetime.now()).replace(second=0, microsecond=0)
+
+        with self._lock:
+            if minute != self._state_minute:
+                self._states = {}
+                self._state_minute = minute
+            elif value in self._states:
+                return self._states[value]
+
+        opening_hours = self.get_opening_hours(value)
+        state = None if opening_hours is None else str(opening_hours.state(minute)[0])
+
+        with self._lock:
+            if minute == self._state_minute and len(self._states) < self.max_entries:
+                self._states[value] = state
+
+        return state
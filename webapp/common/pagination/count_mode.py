@@ -0,0 +1,26 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from enum import Enum
+
+from validataclass.dataclasses import Default, validataclass
+from validataclass.validators import EnumValidator
+
+
+class CountMode(Enum):
+    EXACT = 'exact'
+    ESTIMATED = 'estimated'
+    NONE = 'none'
+
+
+@validataclass
+class CountModeMixin:
+    """
+    Mixin for paginated search queries which adds the `count` parameter. It controls how `total_count` is calculated:
+    `exact` runs a count query over the full filtered query, `estimated` uses the row estimate of the query planner, and
+    `none` skips the count completely.
+    """
+
+    count: CountMode = EnumValidator(CountMode), Default(CountMode.EXACT)
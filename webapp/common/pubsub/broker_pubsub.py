@@ -0,0 +1,121 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+import socket
+import time
+from threading import Lock, Thread
+
+import structlog
+from kombu import Connection, Exchange, Queue
+from kombu.pools import connections, producers
+
+from .local_pubsub import LocalPubSub, PubSubSubscription
+
+logger = structlog.get_logger(__name__)
+
+
+class BrokerPubSub(LocalPubSub):
+    """
+    Publish / subscribe via fanout exchanges at the message broker which is used by celery anyway, so messages
+    published by celery workers reach all web processes.
+
+    Each process consumes a channel with a single exclusive queue, started with the first subscription, and fans the
+    messages out to its local subscriptions. Messages published while a process is reconnecting are lost, so
+    consumers have to be able to catch up on their own.
+
+    Listening processes additionally consume a shared presence queue of the channel, so publishers can tell by its
+    consumer count if anyone listens at all. A process stops listening once its last subscription is closed.
+    """
+
+    reconnect_delay: int = 5
+    drain_timeout: int = 10
+
+    def __init__(self, *, broker_url: str, exchange_prefix: str = 'pubsub', **kwargs):
+        super().__init__(**kwargs)
+        self.broker_url = broker_url
+        self.exchange_prefix = exchange_prefix
+        # Publishing uses pooled connections, so it does not connect to the broker every time
+        self._connection = Connection(broker_url)
+        self._listener_threads: dict[str, Thread] = {}
+        self._listener_lock = Lock()
+
+    def publish(self, channel: str, message: dict) -> None:
+        exchange = self._get_exchange(channel)
+        with producers[self._connection].acquire(block=True) as producer:
+            producer.publish(
+                message,
+                exchange=exchange,
+                declare=[exchange],
+                serializer='json',
+                retry=True,
+                retry_policy={'max_retries': 3},
+            )
+
+    def has_subscribers(self, channel: str) -> bool:
+        if self._has_local_subscriptions(channel):
+            return True
+
+        with connections[self._connection].acquire(block=True) as connection:
+            # Declaring is idempotent and returns the number of listening processes as consumer count
+            declare_result = self._get_presence_queue(channel).bind(connection.default_channel).queue_declare()
+
+        return declare_result.consumer_count > 0
+
+    def subscribe(self, channel: str) -> PubSubSubscription:
+        subscription = super().subscribe(channel)
+
+        with self._listener_lock:
+            if channel not in self._listener_threads:
+                self._listener_threads[channel] = Thread(
+                    target=self._listen,
+                    args=(channel,),
+                    name=f'pubsub-{channel}',
+                    daemon=True,
+                )
+                self._listener_threads[channel].start()
+
+        return subscription
+
+    def _get_exchange(self, channel: str) -> Exchange:
+        return Exchange(f'{self.exchange_prefix}.{channel}', type='fanout', durable=False)
+
+    def _get_presence_queue(self, channel: str) -> Queue:
+        # Nothing is ever published to the presence queue, it just counts consumers
+        return Queue(f'{self.exchange_prefix}.{channel}.listeners', durable=False, auto_delete=False)
+
+    def _is_listening(self, channel: str) -> bool:
+        # Checked under the listener lock, so subscribe() starts a new listener if this one stops
+        with self._listener_lock:
+            if self._has_local_subscriptions(channel):
+                return True
+            self._listener_threads.pop(channel, None)
+            return False
+
+    def _listen(self, channel: str) -> None:
+        exchange = self._get_exchange(channel)
+
+        def handle_message(body: dict, message) -> None:
+            message.ack()
+            self._dispatch(channel, body)
+
+        while True:
+            try:
+                with Connection(self.broker_url, heartbeat=30) as connection:
+                    queue = Queue(exchange=exchange, exclusive=True, auto_delete=True, durable=False)
+                    with connection.Consumer(
+                        [queue, self._get_presence_queue(channel)],
+                        callbacks=[handle_message],
+                        accept=['json'],
+                    ):
+                        while True:
+                            if not self._is_listening(channel):
+                                return
+                            try:
+                                connection.drain_events(timeout=self.drain_timeout)
+                            except socket.timeout:
+                                connection.heartbeat_check()
+            except Exception as e:
+                logger.warning(f'Lost connection to pubsub channel {channel}, reconnecting: {e}')
+                time.sleep(self.reconnect_delay)
@@ -0,0 +1,8 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+
+class PubSubSubscriptionLimitException(Exception):
+    pass
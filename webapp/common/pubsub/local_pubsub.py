@@ -0,0 +1,86 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from queue import Empty, Full, Queue
+from threading import Lock
+
+from .exceptions import PubSubSubscriptionLimitException
+
+
+class PubSubSubscription:
+    """
+    Subscription to a channel. Messages are buffered up to `max_queue_size`, further messages are dropped and
+    `overflowed` is set, so slow consumers can't exhaust memory and can resume from their last known state instead.
+    """
+
+    channel: str
+    overflowed: bool = False
+
+    def __init__(self, pubsub: 'LocalPubSub', channel: str, max_queue_size: int):
+        self.pubsub = pubsub
+        self.channel = channel
+        self.queue: Queue[dict] = Queue(maxsize=max_queue_size)
+
+    def put(self, message: dict) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except Full:
+            self.overflowed = True
+
+    def get(self, timeout: float) -> dict | None:
+        try:
+            return self.queue.get(timeout=timeout)
+        except Empty:
+            return None
+
+    def close(self) -> None:
+        self.pubsub.unsubscribe(self)
+
+
+class LocalPubSub:
+    """
+    In-process publish / subscribe. Used as stand-in for tests and single process setups, and as local fan-out of
+    `BrokerPubSub`.
+    """
+
+    def __init__(self, *, max_subscriptions: int = 100, max_queue_size: int = 100):
+        self.max_subscriptions = max_subscriptions
+        self.max_queue_size = max_queue_size
+        self._subscriptions: dict[str, set[PubSubSubscription]] = {}
+        self._lock = Lock()
+
+    def publish(self, channel: str, message: dict) -> None:
+        self._dispatch(channel, message)
+
+    def subscribe(self, channel: str) -> PubSubSubscription:
+        with self._lock:
+            if sum(len(subscriptions) for subscriptions in self._subscriptions.values()) >= self.max_subscriptions:
+                raise PubSubSubscriptionLimitException(f'Reached maximum of {self.max_subscriptions} subscriptions.')
+
+            subscription = PubSubSubscription(self, channel, self.max_queue_size)
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: PubSubSubscription) -> None:
+        with self._lock:
+            self._subscriptions.get(subscription.channel, set()).discard(subscription)
+
+    def has_subscribers(self, channel: str) -> bool:
+        """
+        Returns if anyone listens to the channel, so publishers can skip building messages nobody receives.
+        """
+        return self._has_local_subscriptions(channel)
+
+    def _has_local_subscriptions(self, channel: str) -> bool:
+        with self._lock:
+            return bool(self._subscriptions.get(channel))
+
+    def _dispatch(self, channel: str, message: dict) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, set()))
+
+        for subscription in subscriptions:
+            subscription.put(message)
@@ -3,9 +3,10 @@ Copyright 2023 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
-from typing import Any, Optional
+import json
+from typing import Any, Callable, Iterator, Optional
 
-from flask import Response, jsonify
+from flask import Response, jsonify, stream_with_context
 from flask.views import MethodView
 from validataclass.exceptions import ValidationError
 from validataclass.validators import DataclassValidator, T_Dataclass
@@ -101,12 +102,53 @@ class BaseMethodView(MethodView):
 
         When using cursor pagination, there are cases where the last page cannot be determined, namely if the last page
         is a full page. In that case, you will get a "next_id" that will result in an empty last page.
+
+        If the total count was skipped (see `CountModeMixin`), "total_count" is left out.
+        """
+        response_data = paginated_api_response(
+            paginated_result,
+            search_query,
+            request_path=self.request_helper.get_path(),
+            original_params=self.request_helper.get_query_args(skip_empty=True),
+        )
+        # The total count is None if counting was skipped by count=none
+        if response_data['total_count'] is None:
+            response_data.pop('total_count')
+
+        return jsonify(response_data)
+
+    def stream_geojson_paginated_response(
+        self,
+        paginated_result: PaginatedResult[Any],
+        search_query: Optional[BaseSearchQuery],
+        feature_mapper: Callable[[Any], str],
+    ) -> Response:
+        """
+        Generate a streamed GeoJSON FeatureCollection from (potentially) paginated data. `feature_mapper` has to map
+        each item to a GeoJSON Feature JSON string, which is written to the response as it is, without a parse / dump
+        round trip.
+
+        Pagination information ("total_count", "next_id" and "next_path") is added as foreign members to the
+        FeatureCollection, following the same rules as `jsonify_paginated_response`.
         """
-        return jsonify(
-            paginated_api_response(
-                paginated_result,
-                search_query,
-                request_path=self.request_helper.get_path(),
-                original_params=self.request_helper.get_query_args(skip_empty=True),
-            )
+        pagination_data = paginated_api_response(
+            paginated_result,
+            search_query,
+            recursive_to_dict=False,
+            request_path=self.request_helper.get_path(),
+            original_params=self.request_helper.get_query_args(skip_empty=True),
         )
+        pagination_data.pop('items')
+        if pagination_data['total_count'] is None:
+            pagination_data.pop('total_count')
+
+        def generate() -> Iterator[str]:
+            yield '{"type": "FeatureCollection", '
+            for key, value in pagination_data.items():
+                yield f'{json.dumps(key)}: {json.dumps(value)}, '
+            yield '"features": ['
+            for index, item in enumerate(paginated_result):
+                yield feature_mapper(item) if index == 0 else f', {feature_mapper(item)}'
+            yield ']}'
+
+        return Response(stream_with_context(generate()), mimetype='application/geo+json')
@@ -50,3 +50,8 @@ class InvalidInputException(RestApiException):
 class UnknownSourceException(RestApiException):
     code = 'unknown_source'
     http_status = 400
+
+
+class ServiceUnavailableException(RestApiException):
+    code = 'service_unavailable'
+    http_status = 503
@@ -54,12 +54,20 @@ class RequestHelper:
     def get_path(self) -> str:
         return self.request.path
 
+    def get_base_url(self) -> str:
+        # Full URL without query string
+        return self.request.base_url
+
     def get_method(self) -> str:
         return self.request.method
 
     def get_headers(self) -> dict:
         return dict(self.request.headers)
 
+    def get_header(self, name: str) -> Optional[str]:
+        # Case-insensitive, other than get_headers()
+        return self.request.headers.get(name)
+
     def get_client_ip(self):
         return self.request.headers.get('X-Forwarded-For', None)
 
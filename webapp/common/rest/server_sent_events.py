@@ -0,0 +1,28 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+
+def format_server_sent_event(data: str, *, event_id: str | None = None, event: str | None = None) -> str:
+    """
+    Formats an event in text/event-stream format. `data` must not contain line breaks, which is the case for JSON dumped
+    without indentation.
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    if event is not None:
+        lines.append(f'event: {event}')
+    lines.append(f'data: {data}')
+
+    return '\n'.join(lines) + '\n\n'
+
+
+def format_server_sent_comment(comment: str) -> str:
+    # Comments are ignored by clients, but keep proxies from closing idle connections
+    return f': {comment}\n\n'
+
+
+def format_server_sent_retry(retry_milliseconds: int) -> str:
+    return f'retry: {retry_milliseconds}\n\n'
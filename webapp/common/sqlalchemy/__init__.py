@@ -4,5 +4,8 @@ Use of this source code is governed by an MIT-style license that can be found in
 """
 
 from .duration import SqlalchemyDuration
+from .explain import Explain
 from .model_events import ModelEventAction
+from .read_replica import READ_REPLICA_BIND_KEY, ReplicaLagGuard, RoutingSession, use_read_replica
 from .sqlalchemy import SQLAlchemy
+from .transaction_id import CurrentTransactionId, OldestRunningTransactionId
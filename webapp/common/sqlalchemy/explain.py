@@ -0,0 +1,34 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from typing import Any
+
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class Explain(Executable, ClauseElement):
+    """
+    Wraps a statement into an EXPLAIN statement. Parameters of the statement are bound the usual way.
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement: ClauseElement, *, json_format: bool = False):
+        self.statement = statement
+        self.json_format = json_format
+
+
+@compiles(Explain, 'postgresql')
+def compile_explain_postgresql(element: Explain, compiler: SQLCompiler, **kwargs: Any) -> str:
+    prefix = 'EXPLAIN (FORMAT JSON)' if element.json_format else 'EXPLAIN'
+    return f'{prefix} {compiler.process(element.statement, **kwargs)}'
+
+
+@compiles(Explain)
+def compile_explain(element: Explain, compiler: SQLCompiler, **kwargs: Any) -> str:
+    prefix = 'EXPLAIN FORMAT=JSON' if element.json_format else 'EXPLAIN'
+    return f'{prefix} {compiler.process(element.statement, **kwargs)}'
@@ -0,0 +1,115 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from threading import Lock
+from time import monotonic
+from typing import Any
+
+import structlog
+from flask import g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Engine, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.sql.expression import UpdateBase
+
+logger = structlog.get_logger(__name__)
+
+READ_REPLICA_BIND_KEY = 'read_replica'
+
+
+def use_read_replica() -> None:
+    """
+    Routes reads of the current app context to the read replica, if one is configured. Meant to be called in
+    `before_request` hooks of read-only blueprints.
+    """
+    g.use_read_replica = True
+
+
+class ReplicaLagGuard:
+    """
+    Tracks the replication lag of the read replica. The lag is checked at most every `check_interval` seconds per
+    process, and the replica is considered unusable while the lag is above `max_lag` seconds or unknown.
+    """
+
+    max_lag: int
+    check_interval: int
+    _usable: bool
+    _checked_at: float | None
+    _lock: Lock
+
+    def __init__(self, *, max_lag: int, check_interval: int):
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._usable = False
+        self._checked_at = None
+        self._lock = Lock()
+
+    def is_usable(self, engine: Engine) -> bool:
+        with self._lock:
+            if self._checked_at is not None and monotonic() - self._checked_at < self.check_interval:
+                return self._usable
+
+            lag = self._fetch_lag(engine)
+            self._usable = lag is not None and lag <= self.max_lag
+            self._checked_at = monotonic()
+
+            if not self._usable:
+                logger.warning(f'Read replica is not usable, lag is {lag} seconds. Falling back to primary.')
+
+            return self._usable
+
+    @staticmethod
+    def _fetch_lag(engine: Engine) -> float | None:
+        try:
+            with engine.connect() as connection:
+                if engine.dialect.name == 'postgresql':
+                    # On a primary (e.g. a local stand-in database), there is no lag at all. The last replayed
+                    # transaction gets older while the primary has no commits, so a replica which replayed all
+                    # received WAL has no lag as well.
+                    return connection.execute(
+                        text(
+                            'SELECT CASE '
+                            'WHEN NOT pg_is_in_recovery() THEN 0 '
+                            'WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+                            'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END',
+                        ),
+                    ).scalar()
+
+                if engine.dialect.name == 'mysql':
+                    replica_status = connection.execute(text('SHOW REPLICA STATUS')).mappings().first()
+                    if replica_status is None:
+                        return 0
+                    # MySQL renamed the field, MariaDB still uses the old name
+                    return replica_status.get('Seconds_Behind_Source', replica_status.get('Seconds_Behind_Master'))
+        except SQLAlchemyError as e:
+            logger.warning(f'Could not fetch read replica lag: {e}')
+            return None
+
+        raise NotImplementedError('The application just supports mysql, mariadb and postgresql.')
+
+
+class RoutingSession(Session):
+    """
+    Session which routes reads to the read replica bind, if the current app context opted in via `use_read_replica()`
+    and the replica doesn't lag behind. As soon as the session writes anything, it stays at the primary for the rest of
+    the app context, so it always reads its own writes.
+    """
+
+    _has_writes: bool = False
+
+    def get_bind(self, mapper: Any | None = None, clause: Any | None = None, bind: Any | None = None, **kwargs: Any):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self._has_writes = True
+
+        if bind is None and not self._has_writes and self._is_read_replica_requested():
+            read_replica_engine = self._db.engines.get(READ_REPLICA_BIND_KEY)
+            if read_replica_engine is not None and self._db.read_replica_lag_guard.is_usable(read_replica_engine):
+                return read_replica_engine
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    @staticmethod
+    def _is_read_replica_requested() -> bool:
+        return has_app_context() and g.get('use_read_replica', False)
@@ -3,9 +3,12 @@ Copyright 2023 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
+from flask import Flask
 from flask_sqlalchemy import SQLAlchemy as BaseSQLAlchemy
 from sqlalchemy import MetaData
 
+from .read_replica import READ_REPLICA_BIND_KEY, ReplicaLagGuard, RoutingSession
+
 
 class SQLAlchemy(BaseSQLAlchemy):
     """
@@ -21,11 +24,28 @@ class SQLAlchemy(BaseSQLAlchemy):
         'pk': 'pk_%(table_name)s',
     }
 
+    read_replica_lag_guard: ReplicaLagGuard | None = None
+
     def __init__(self, *args, **kwargs):
-        # Set custom query class and metadata
+        # Set custom query class, metadata and session class
         kwargs.update(
             metadata=MetaData(naming_convention=self._naming_convention),
+            session_options={'class_': RoutingSession},
         )
 
         # Initialize Flask SQLAlchemy
         super().__init__(*args, **kwargs)
+
+    def init_app(self, app: Flask) -> None:
+        # The read replica is an additional bind without any models, so it's just used via RoutingSession
+        if app.config.get('SQLALCHEMY_READ_REPLICA_URI'):
+            app.config['SQLALCHEMY_BINDS'] = {
+                **app.config.get('SQLALCHEMY_BINDS', {}),
+                READ_REPLICA_BIND_KEY: app.config['SQLALCHEMY_READ_REPLICA_URI'],
+            }
+            self.read_replica_lag_guard = ReplicaLagGuard(
+                max_lag=app.config['READ_REPLICA_MAX_LAG'],
+                check_interval=app.config['READ_REPLICA_LAG_CHECK_INTERVAL'],
+            )
+
+        super().init_app(app)
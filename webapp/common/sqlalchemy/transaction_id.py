@@ -0,0 +1,63 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from typing import Any
+
+from sqlalchemy import BigInteger
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class CurrentTransactionId(FunctionElement):
+    """
+    ID of the current top-level transaction. Transaction IDs are just available at PostgreSQL, other databases get NULL.
+    """
+
+    type = BigInteger()
+    inherit_cache = True
+
+
+class OldestRunningTransactionId(FunctionElement):
+    """
+    Lowest transaction ID still running at the snapshot of the current statement, so all transactions with a lower ID
+    are completed and their changes are visible. Just available at PostgreSQL.
+    """
+
+    type = BigInteger()
+    inherit_cache = True
+
+
+@compiles(CurrentTransactionId, 'postgresql')
+def compile_current_transaction_id_postgresql(
+    element: CurrentTransactionId,
+    compiler: SQLCompiler,
+    **kwargs: Any,
+) -> str:
+    # xid8 can't be cast to bigint directly
+    return 'CAST(CAST(pg_current_xact_id() AS TEXT) AS BIGINT)'
+
+
+@compiles(CurrentTransactionId)
+def compile_current_transaction_id(element: CurrentTransactionId, compiler: SQLCompiler, **kwargs: Any) -> str:
+    return 'NULL'
+
+
+@compiles(OldestRunningTransactionId, 'postgresql')
+def compile_oldest_running_transaction_id_postgresql(
+    element: OldestRunningTransactionId,
+    compiler: SQLCompiler,
+    **kwargs: Any,
+) -> str:
+    return 'CAST(CAST(pg_snapshot_xmin(pg_current_snapshot()) AS TEXT) AS BIGINT)'
+
+
+@compiles(OldestRunningTransactionId)
+def compile_oldest_running_transaction_id(
+    element: OldestRunningTransactionId,
+    compiler: SQLCompiler,
+    **kwargs: Any,
+) -> str:
+    raise NotImplementedError('Transaction IDs are just available at postgresql.')
@@ -0,0 +1,9 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from .vector_tile_cache import SourceGeneration, VectorTileCache
+from .vector_tile_encoder import encode_vector_tile
+from .vector_tile_models import VectorTile, VectorTileFeature
+from .vector_tile_projection import get_tile_bounds, is_valid_tile, project_to_tile
@@ -0,0 +1,114 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Lock
+from time import monotonic
+from typing import Callable
+
+from .vector_tile_models import VectorTile
+
+
+@dataclass(frozen=True)
+class SourceGeneration:
+    static_data_updated_at: datetime | None
+    realtime_data_updated_at: datetime | None
+
+
+@dataclass
+class VectorTileCacheEntry:
+    data: bytes
+    created_at: float
+    source_generations: dict[int, SourceGeneration]
+    latest_static_data_updated_at: datetime | None
+
+
+class VectorTileCache:
+    """
+    In-process LRU cache for rendered vector tiles, invalidated per source data generation.
+
+    A cached tile stays valid as long as every source with features in this tile has the same static and realtime
+    update timestamps as at render time. New features can just appear by static imports, so a static import of any
+    source invalidates all tiles, while a realtime import just invalidates tiles containing data of this source. As
+    single datasets can be changed via the admin API without touching the source, entries expire after `max_age`
+    seconds, too.
+    """
+
+    max_entries: int
+    max_age: int
+    _entries: OrderedDict[tuple, VectorTileCacheEntry]
+    _lock: Lock
+
+    def __init__(self, *, max_entries: int, max_age: int):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get_or_render(
+        self,
+        key: tuple,
+        *,
+        source_generations: dict[int, SourceGeneration],
+        render: Callable[[], VectorTile],
+    ) -> bytes:
+        data = self.get(key, source_generations)
+        if data is not None:
+            return data
+
+        vector_tile = render()
+        self.set(key, vector_tile, source_generations)
+
+        return vector_tile.data
+
+    def get(self, key: tuple, source_generations: dict[int, SourceGeneration]) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            if not self._is_valid(entry, source_generations):
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return entry.data
+
+    def set(self, key: tuple, vector_tile: VectorTile, source_generations: dict[int, SourceGeneration]) -> None:
+        entry = VectorTileCacheEntry(
+            data=vector_tile.data,
+            created_at=monotonic(),
+            source_generations={source_id: source_generations.get(source_id) for source_id in vector_tile.source_ids},
+            latest_static_data_updated_at=self._get_latest_static_data_updated_at(source_generations),
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _is_valid(self, entry: VectorTileCacheEntry, source_generations: dict[int, SourceGeneration]) -> bool:
+        if monotonic() - entry.created_at > self.max_age:
+            return False
+
+        if entry.latest_static_data_updated_at != self._get_latest_static_data_updated_at(source_generations):
+            return False
+
+        for source_id, source_generation in entry.source_generations.items():
+            if source_generations.get(source_id) != source_generation:
+                return False
+
+        return True
+
+    @staticmethod
+    def _get_latest_static_data_updated_at(source_generations: dict[int, SourceGeneration]) -> datetime | None:
+        static_data_updated_ats = [
+            source_generation.static_data_updated_at
+            for source_generation in source_generations.values()
+            if source_generation.static_data_updated_at is not None
+        ]
+        return max(static_data_updated_ats, default=None)
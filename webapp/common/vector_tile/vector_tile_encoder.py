@@ -0,0 +1,118 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+import struct
+from enum import Enum
+
+from .vector_tile_models import VectorTileFeature
+from .vector_tile_projection import project_to_tile
+
+# Protobuf wire types
+WIRE_TYPE_VARINT = 0
+WIRE_TYPE_FIXED64 = 1
+WIRE_TYPE_LENGTH_DELIMITED = 2
+
+# Mapbox Vector Tile specification 2.1 constants
+VECTOR_TILE_VERSION = 2
+GEOMETRY_TYPE_POINT = 1
+COMMAND_MOVE_TO = 1
+
+
+def encode_vector_tile(
+    layer_name: str,
+    features: list[VectorTileFeature],
+    *,
+    z: int,
+    x: int,
+    y: int,
+    extent: int = 4096,
+) -> bytes:
+    """
+    Encodes point features as Mapbox Vector Tile with a single layer. This is the fallback for databases without
+    `ST_AsMVT`, so it just supports what we need: point geometries and flat properties. Properties with value None are
+    omitted, just like `ST_AsMVT` does. Features outside the tile are skipped.
+    """
+    keys: dict[str, int] = {}
+    values: dict[tuple[type, str | int | float | bool], int] = {}
+    encoded_features: list[bytes] = []
+
+    for feature in features:
+        tile_x, tile_y = project_to_tile(feature.lat, feature.lon, z, x, y, extent)
+        if not (0 <= tile_x <= extent and 0 <= tile_y <= extent):
+            continue
+
+        tags: list[int] = []
+        for key, value in feature.properties.items():
+            if value is None:
+                continue
+            if isinstance(value, Enum):
+                value = value.value
+            tags.append(keys.setdefault(key, len(keys)))
+            # The type is part of the key, as True == 1 in Python, but not in vector tiles
+            tags.append(values.setdefault((type(value), value), len(values)))
+
+        geometry = [(COMMAND_MOVE_TO & 0x7) | (1 << 3), _zigzag(tile_x), _zigzag(tile_y)]
+
+        encoded_features.append(
+            _encode_varint_field(1, feature.id)
+            + _encode_packed_field(2, tags)
+            + _encode_varint_field(3, GEOMETRY_TYPE_POINT)
+            + _encode_packed_field(4, geometry),
+        )
+
+    if not encoded_features:
+        return b''
+
+    layer = _encode_varint_field(15, VECTOR_TILE_VERSION) + _encode_bytes_field(1, layer_name.encode())
+    for encoded_feature in encoded_features:
+        layer += _encode_bytes_field(2, encoded_feature)
+    for key in keys:
+        layer += _encode_bytes_field(3, key.encode())
+    for _, value in values:
+        layer += _encode_bytes_field(4, _encode_value(value))
+    layer += _encode_varint_field(5, extent)
+
+    return _encode_bytes_field(3, layer)
+
+
+def _encode_value(value: str | int | float | bool) -> bytes:
+    if isinstance(value, bool):
+        return _encode_varint_field(7, int(value))
+    if isinstance(value, int):
+        return _encode_varint_field(4, value)
+    if isinstance(value, float):
+        return _encode_key(3, WIRE_TYPE_FIXED64) + struct.pack('<d', value)
+    return _encode_bytes_field(1, str(value).encode())
+
+
+def _encode_varint(value: int) -> bytes:
+    # Negative values are encoded as 64 bit two's complement, like protobuf does for int64
+    value &= 0xFFFFFFFFFFFFFFFF
+    result = bytearray()
+    while value > 0x7F:
+        result.append((value & 0x7F) | 0x80)
+        value >>= 7
+    result.append(value)
+    return bytes(result)
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _encode_key(field_number: int, wire_type: int) -> bytes:
+    return _encode_varint((field_number << 3) | wire_type)
+
+
+def _encode_varint_field(field_number: int, value: int) -> bytes:
+    return _encode_key(field_number, WIRE_TYPE_VARINT) + _encode_varint(value)
+
+
+def _encode_bytes_field(field_number: int, value: bytes) -> bytes:
+    return _encode_key(field_number, WIRE_TYPE_LENGTH_DELIMITED) + _encode_varint(len(value)) + value
+
+
+def _encode_packed_field(field_number: int, values: list[int]) -> bytes:
+    return _encode_bytes_field(field_number, b''.join(_encode_varint(value) for value in values))
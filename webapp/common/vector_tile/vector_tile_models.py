@@ -0,0 +1,21 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class VectorTileFeature:
+    id: int
+    lat: float
+    lon: float
+    properties: dict = field(default_factory=dict)
+
+
+@dataclass
+class VectorTile:
+    data: bytes
+    # Sources with at least one feature in this tile, used for cache invalidation
+    source_ids: set[int] = field(default_factory=set)
@@ -0,0 +1,37 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+import math
+
+MAX_ZOOM = 24
+
+
+def is_valid_tile(z: int, x: int, y: int) -> bool:
+    return 0 <= z <= MAX_ZOOM and 0 <= x < 2**z and 0 <= y < 2**z
+
+
+def get_tile_bounds(z: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """
+    Returns the WGS84 bounds of a web mercator tile as (lat_min, lon_min, lat_max, lon_max).
+    """
+    tile_count = 2**z
+    lon_min = x / tile_count * 360 - 180
+    lon_max = (x + 1) / tile_count * 360 - 180
+    lat_max = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / tile_count))))
+    lat_min = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / tile_count))))
+
+    return lat_min, lon_min, lat_max, lon_max
+
+
+def project_to_tile(lat: float, lon: float, z: int, x: int, y: int, extent: int) -> tuple[int, int]:
+    """
+    Projects WGS84 coordinates to integer tile coordinates with the origin in the upper left corner, like
+    `ST_AsMVTGeom` does.
+    """
+    tile_count = 2**z
+    world_x = (lon + 180) / 360 * tile_count
+    world_y = (1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * tile_count
+
+    return round((world_x - x) * extent), round((world_y - y) * extent)
@@ -11,21 +11,31 @@ from sqlalchemy.orm import scoped_session
 from webapp.common.celery import CeleryHelper
 from webapp.common.config import ConfigHelper
 from webapp.common.contexts import ContextHelper
+from webapp.common.instrumentation import RequestInstrumentation
+from webapp.common.opening_hours import OpeningHoursCache
+from webapp.common.pubsub import BrokerPubSub, LocalPubSub
 from webapp.common.remote_helper import RemoteHelper
 from webapp.common.rest import RequestHelper
 from webapp.common.server_auth import ServerAuthHelper
+from webapp.common.vector_tile import VectorTileCache
 from webapp.repositories import (
     BaseRepository,
+    ChangeLogEntryRepository,
     OfficialRegionCodeRepository,
     ParkingSiteGroupRepository,
     ParkingSiteHistoryRepository,
+    ParkingSiteHistoryRollupRepository,
     ParkingSiteRepository,
     ParkingSpotRepository,
+    PendingDuplicateRepository,
     SourceRepository,
 )
+from webapp.services.change_log_service import ChangeLogService
 from webapp.services.import_service import GenericImportService
 from webapp.services.import_service.generic import GenericParkingSiteImportService, GenericParkingSpotImportService
 from webapp.services.matching_service import MatchingService
+from webapp.services.parking_site_history_service import ParkingSiteHistoryService
+from webapp.services.source_metrics_service import SourceMetricsService
 from webapp.services.sqlalchemy_service import SqlalchemyService
 
 if TYPE_CHECKING:
@@ -101,6 +111,33 @@ class Dependencies:
             context_helper=self.get_context_helper(),
         )
 
+    @cache_dependency
+    def get_vector_tile_cache(self) -> VectorTileCache:
+        return VectorTileCache(
+            max_entries=self.get_config_helper().get('VECTOR_TILE_CACHE_MAX_ENTRIES'),
+            max_age=self.get_config_helper().get('VECTOR_TILE_CACHE_MAX_AGE'),
+        )
+
+    @cache_dependency
+    def get_opening_hours_cache(self) -> OpeningHoursCache:
+        return OpeningHoursCache(max_entries=self.get_config_helper().get('OPENING_HOURS_CACHE_MAX_ENTRIES'))
+
+    @cache_dependency
+    def get_request_instrumentation(self) -> RequestInstrumentation:
+        return RequestInstrumentation()
+
+    @cache_dependency
+    def get_pubsub(self) -> LocalPubSub:
+        config_helper = self.get_config_helper()
+        if config_helper.get('TESTING') or config_helper.get('PUBSUB_BACKEND') == 'local':
+            return LocalPubSub(max_subscriptions=config_helper.get('REALTIME_STREAM_MAX_CONNECTIONS'))
+
+        return BrokerPubSub(
+            broker_url=config_helper.get('CELERY_BROKER_URL'),
+            exchange_prefix=config_helper.get('PROJECT_NAME'),
+            max_subscriptions=config_helper.get('REALTIME_STREAM_MAX_CONNECTIONS'),
+        )
+
     @cache_dependency
     def get_event_helper(self) -> 'EventHelper':
         from webapp.common.events import EventHelper
@@ -137,6 +174,10 @@ class Dependencies:
     def get_parking_site_history_repository(self) -> ParkingSiteHistoryRepository:
         return self._create_repository(ParkingSiteHistoryRepository)
 
+    @cache_dependency
+    def get_parking_site_history_rollup_repository(self) -> ParkingSiteHistoryRollupRepository:
+        return self._create_repository(ParkingSiteHistoryRollupRepository)
+
     @cache_dependency
     def get_parking_site_group_repository(self) -> ParkingSiteGroupRepository:
         return self._create_repository(ParkingSiteGroupRepository)
@@ -145,10 +186,18 @@ class Dependencies:
     def get_source_repository(self) -> SourceRepository:
         return self._create_repository(SourceRepository)
 
+    @cache_dependency
+    def get_pending_duplicate_repository(self) -> PendingDuplicateRepository:
+        return self._create_repository(PendingDuplicateRepository)
+
     @cache_dependency
     def get_official_region_code_repository(self) -> OfficialRegionCodeRepository:
         return OfficialRegionCodeRepository(session=self.get_db_session())
 
+    @cache_dependency
+    def get_change_log_entry_repository(self) -> ChangeLogEntryRepository:
+        return self._create_repository(ChangeLogEntryRepository)
+
     def get_base_service_dependencies(self) -> dict:
         return {
             'context_helper': self.get_context_helper(),
@@ -162,6 +211,15 @@ class Dependencies:
             **self.get_base_service_dependencies(),
         )
 
+    @cache_dependency
+    def get_source_metrics_service(self) -> SourceMetricsService:
+        return SourceMetricsService(
+            source_repository=self.get_source_repository(),
+            parking_site_repository=self.get_parking_site_repository(),
+            parking_spot_repository=self.get_parking_spot_repository(),
+            **self.get_base_service_dependencies(),
+        )
+
     @cache_dependency
     def get_generic_parking_site_import_service(self) -> GenericParkingSiteImportService:
         return GenericParkingSiteImportService(
@@ -169,7 +227,10 @@ class Dependencies:
             parking_site_repository=self.get_parking_site_repository(),
             parking_site_history_repository=self.get_parking_site_history_repository(),
             parking_site_group_repository=self.get_parking_site_group_repository(),
+            pubsub=self.get_pubsub(),
+            matching_service=self.get_matching_service(),
             official_region_code_repository=self.get_official_region_code_repository(),
+            source_metrics_service=self.get_source_metrics_service(),
             **self.get_base_service_dependencies(),
         )
 
@@ -180,6 +241,7 @@ class Dependencies:
             parking_site_repository=self.get_parking_site_repository(),
             parking_spot_repository=self.get_parking_spot_repository(),
             official_region_code_repository=self.get_official_region_code_repository(),
+            source_metrics_service=self.get_source_metrics_service(),
             **self.get_base_service_dependencies(),
         )
 
@@ -196,6 +258,22 @@ class Dependencies:
     def get_matching_service(self) -> MatchingService:
         return MatchingService(
             parking_site_repository=self.get_parking_site_repository(),
+            pending_duplicate_repository=self.get_pending_duplicate_repository(),
+            **self.get_base_service_dependencies(),
+        )
+
+    @cache_dependency
+    def get_change_log_service(self) -> ChangeLogService:
+        return ChangeLogService(
+            change_log_entry_repository=self.get_change_log_entry_repository(),
+            **self.get_base_service_dependencies(),
+        )
+
+    @cache_dependency
+    def get_parking_site_history_service(self) -> ParkingSiteHistoryService:
+        return ParkingSiteHistoryService(
+            parking_site_history_repository=self.get_parking_site_history_repository(),
+            parking_site_history_rollup_repository=self.get_parking_site_history_rollup_repository(),
             **self.get_base_service_dependencies(),
         )
 
@@ -4,6 +4,10 @@ Use of this source code is governed by an MIT-style license that can be found in
 """
 
 from .app import launch
+from .dependencies import dependencies
 
 application = launch()
 from .extensions import celery  # noqa: E402, F401
+
+# Converters are built lazily, but workers import data, so they should fail at startup if config values are missing
+dependencies.get_generic_import_service().check_credentials()
@@ -4,10 +4,13 @@ Use of this source code is governed by an MIT-style license that can be found in
 """
 
 from .base import BaseModel
+from .change_log_entry import ChangeLogAction, ChangeLogEntry, ChangeLogObjectType
 from .external_identifier import ExternalIdentifier
 from .parking_restriction import ParkingRestriction
 from .parking_site import ParkingSite
 from .parking_site_history import ParkingSiteHistory
+from .parking_site_history_rollup import ParkingSiteHistoryResolution, ParkingSiteHistoryRollup
 from .parking_spot import ParkingSpot
+from .pending_duplicate import PendingDuplicate, PendingDuplicateCheck
 from .source import Source
 from .tag import Tag
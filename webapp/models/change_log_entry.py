@@ -0,0 +1,170 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from enum import Enum as PythonEnum
+from time import monotonic
+from typing import Optional
+
+from flask import current_app, has_app_context
+from sqlalchemy import BigInteger, Connection, event, insert
+from sqlalchemy import Enum as SqlalchemyEnum
+from sqlalchemy.orm import Mapped, Session, SessionTransaction, mapped_column, object_session
+from sqlalchemy.schema import Index
+
+from webapp.common.error_handling.exceptions import AppException
+from webapp.common.sqlalchemy import CurrentTransactionId
+from webapp.extensions import db
+
+from .base import BaseModel
+from .parking_site import ParkingSite
+from .parking_spot import ParkingSpot
+
+
+class ChangeLogObjectType(PythonEnum):
+    PARKING_SITE = 'PARKING_SITE'
+    PARKING_SPOT = 'PARKING_SPOT'
+
+
+class ChangeLogAction(PythonEnum):
+    CREATED = 'CREATED'
+    UPDATED = 'UPDATED'
+    # Tombstone: the object does not exist anymore
+    DELETED = 'DELETED'
+
+
+# Session info key of the time the current transaction wrote its first change log entry
+CHANGE_LOG_WRITTEN_AT_KEY = 'change_log_written_at'
+
+
+class ChangeLogTransactionTooLongException(AppException):
+    """
+    A transaction which wrote change log entries took too long to commit, so mirrors might have skipped its entries.
+    """
+
+    code = 'change_log_transaction_too_long'
+
+
+class ChangeLogEntry(BaseModel):
+    """
+    Append-only log of parking site and parking spot changes. The id is the sequence number mirrors use as cursor.
+    Entries are written in the same transaction as the change itself by the ORM listeners below, so every write path
+    (imports, admin API, CLI) is covered.
+
+    At PostgreSQL, entries are ordered by the transaction which wrote them and then by id, and just entries of completed
+    transactions are published. So transactions of any length never commit entries before already published ones. At
+    MySQL, entries are ordered by id and published after CHANGE_LOG_VISIBILITY_DELAY_SECONDS, which is enforced as upper
+    bound for transactions writing change log entries by check_change_log_transaction_duration().
+    """
+
+    __tablename__ = 'change_log_entry'
+
+    __table_args__ = (
+        # Used by log compaction to find superseded entries of the same object
+        Index(
+            'ix_change_log_entry_object',
+            'object_type',
+            'object_id',
+            'id',
+        ),
+        # Order of the change log at PostgreSQL
+        Index(
+            'ix_change_log_entry_transaction',
+            'transaction_id',
+            'id',
+        ),
+    )
+
+    object_type: Mapped[ChangeLogObjectType] = mapped_column(SqlalchemyEnum(ChangeLogObjectType), nullable=False)
+    object_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # No foreign keys, as tombstones have to outlive the objects and sources they refer to
+    source_id: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
+    action: Mapped[ChangeLogAction] = mapped_column(SqlalchemyEnum(ChangeLogAction), nullable=False)
+    # Set at insert by the database, NULL at MySQL
+    transaction_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True, default=CurrentTransactionId())
+
+
+def _is_change_log_column(key: str) -> bool:
+    # Realtime updates are covered by the realtime delta feed, logging them would add an entry per object and import
+    return not key.startswith(('realtime_', '_realtime_')) and key != 'modified_at'
+
+
+def _has_column_changes(target: ParkingSite | ParkingSpot) -> bool:
+    state = db.inspect(target)
+    return any(
+        state.attrs[column_attribute.key].history.has_changes()
+        for column_attribute in state.mapper.column_attrs
+        if _is_change_log_column(column_attribute.key)
+    )
+
+
+def mark_change_log_written(session: Session | None, connection: Connection) -> None:
+    """
+    Has to be called by every write path of change log entries, see check_change_log_transaction_duration().
+    """
+    if session is not None and connection.dialect.name == 'mysql':
+        session.info.setdefault(CHANGE_LOG_WRITTEN_AT_KEY, monotonic())
+
+
+def _add_change_log_entry(connection, target: ParkingSite | ParkingSpot, action: ChangeLogAction) -> None:
+    mark_change_log_written(object_session(target), connection)
+    connection.execute(
+        insert(ChangeLogEntry).values(
+            object_type=(
+                ChangeLogObjectType.PARKING_SITE
+                if isinstance(target, ParkingSite)
+                else ChangeLogObjectType.PARKING_SPOT
+            ),
+            object_id=target.id,
+            source_id=target.source_id,
+            action=action,
+        ),
+    )
+
+
+@event.listens_for(ParkingSite, 'after_insert')
+@event.listens_for(ParkingSpot, 'after_insert')
+def add_created_change_log_entry(mapper, connection, target: ParkingSite | ParkingSpot):
+    _add_change_log_entry(connection, target, ChangeLogAction.CREATED)
+
+
+@event.listens_for(ParkingSite, 'after_update')
+@event.listens_for(ParkingSpot, 'after_update')
+def add_updated_change_log_entry(mapper, connection, target: ParkingSite | ParkingSpot):
+    # after_update is called for every dirty object, even without net changes or with just realtime changes
+    if not _has_column_changes(target):
+        return
+    _add_change_log_entry(connection, target, ChangeLogAction.UPDATED)
+
+
+@event.listens_for(ParkingSite, 'after_delete')
+@event.listens_for(ParkingSpot, 'after_delete')
+def add_deleted_change_log_entry(mapper, connection, target: ParkingSite | ParkingSpot):
+    _add_change_log_entry(connection, target, ChangeLogAction.DELETED)
+
+
+@event.listens_for(Session, 'before_commit')
+def check_change_log_transaction_duration(session: Session):
+    """
+    At MySQL, mirrors might have passed entries which are committed later than CHANGE_LOG_VISIBILITY_DELAY_SECONDS after
+    they were written, so such transactions are refused. Just half of the delay is allowed, as the final flush and the
+    commit itself follow.
+    """
+    written_at = session.info.get(CHANGE_LOG_WRITTEN_AT_KEY)
+    if written_at is None or not has_app_context():
+        return
+
+    max_duration = current_app.config.get('CHANGE_LOG_VISIBILITY_DELAY_SECONDS', 60) / 2
+    duration = monotonic() - written_at
+    if duration > max_duration:
+        raise ChangeLogTransactionTooLongException(
+            message=f'Transaction wrote change log entries {round(duration)} seconds ago, which is more than the allowed '
+            f'{round(max_duration)} seconds. Split it up into smaller transactions.',
+        )
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def reset_change_log_written_at(session: Session, transaction: SessionTransaction):
+    if transaction.parent is None:
+        session.info.pop(CHANGE_LOG_WRITTEN_AT_KEY, None)
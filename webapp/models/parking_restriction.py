@@ -26,7 +26,12 @@ class ParkingRestriction(BaseModel):
     parking_site: Mapped[Optional['ParkingSite']] = relationship('ParkingSite', back_populates='restrictions')
     parking_spot: Mapped[Optional['ParkingSpot']] = relationship('ParkingSpot', back_populates='restrictions')
 
-    parking_site_id: Mapped[int | None] = mapped_column(BigInteger, ForeignKey('parking_site.id'), nullable=True)
+    parking_site_id: Mapped[int | None] = mapped_column(
+        BigInteger,
+        ForeignKey('parking_site.id'),
+        nullable=True,
+        index=True,
+    )
     parking_spot_id: Mapped[int | None] = mapped_column(BigInteger, ForeignKey('parking_spot.id'), nullable=True)
 
     type: Mapped[ParkingAudience | None] = mapped_column(SqlalchemyEnum(ParkingAudience), nullable=True)
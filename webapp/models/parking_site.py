@@ -39,7 +39,7 @@ from sqlalchemy.schema import Index
 from sqlalchemy_utc import UtcDateTime
 
 from webapp.common.dataclass import filter_unset_value_and_none
-from webapp.common.json import DefaultJSONEncoder
+from webapp.common.json import DefaultJSONEncoder, geojson_feature, geojson_point
 from webapp.common.sqlalchemy.point import Point
 from webapp.extensions import db
 
@@ -54,6 +54,16 @@ if TYPE_CHECKING:
     from .source import Source
     from .tag import Tag
 
+# Restriction fields which are part of the parking site output
+PARKING_SITE_RESTRICTION_FIELDS = [
+    'type',
+    'hours',
+    'max_stay',
+    'capacity',
+    'realtime_capacity',
+    'realtime_free_capacity',
+]
+
 
 class ParkingSite(BaseModel):
     __tablename__ = 'parking_site'
@@ -65,6 +75,12 @@ class ParkingSite(BaseModel):
             'original_uid',
             unique=True,
         ),
+        # Backs the realtime delta feed, which is ordered by realtime_data_updated_at and id
+        Index(
+            'ix_parking_site_realtime_data_updated_at_id',
+            'realtime_data_updated_at',
+            'id',
+        ),
     )
 
     source: Mapped['Source'] = relationship('Source', back_populates='parking_sites')
@@ -212,13 +228,64 @@ class ParkingSite(BaseModel):
         include_group: bool = False,
         unset_realtime_after_minutes: int | None = None,
     ) -> dict:
-        if ignore is None:
-            ignore = []
+        restrictions = None
+        if include_restrictions:
+            restrictions = [
+                restriction.to_dict(fields=PARKING_SITE_RESTRICTION_FIELDS) for restriction in self.restrictions
+            ]
+
+        external_identifiers = None
+        if include_external_identifiers:
+            external_identifiers = [
+                {'type': external_identifier.type, 'value': external_identifier.value}
+                for external_identifier in self.external_identifiers
+            ]
+
+        group = None
+        if include_group and self.parking_site_group:
+            group = self.parking_site_group.to_dict(ignore=['parking_site_id'])
+
+        # Ignored fields are not read at all, so e.g. the geojson hybrid property is not parsed just to be dropped.
+        # Fields build_dict() derives other output from are read anyway.
+        skipped_fields = set(ignore or []) - {'supervision_type', 'has_realtime_data', 'realtime_data_updated_at'}
+
+        return self.build_dict(
+            {
+                field: getattr(self, field)
+                for field in self.metadata.tables[self.__tablename__].c.keys()
+                if field not in skipped_fields
+            },
+            fields=fields,
+            ignore=ignore,
+            restrictions=restrictions,
+            external_identifiers=external_identifiers,
+            tags=[tag.value for tag in self.tags] if include_tags else None,
+            group=group,
+            unset_realtime_after_minutes=unset_realtime_after_minutes,
+        )
+
+    @staticmethod
+    def build_dict(
+        values: dict,
+        *,
+        fields: list[str] | None = None,
+        ignore: list[str] | None = None,
+        restrictions: list[dict] | None = None,
+        external_identifiers: list[dict] | None = None,
+        tags: list[str] | None = None,
+        group: dict | None = None,
+        unset_realtime_after_minutes: int | None = None,
+    ) -> dict:
+        """
+        Builds the output dict of a parking site from its column values and already serialized children. Used by
+        `to_dict()`, and by list endpoints which load plain rows instead of ORM instances.
+        """
         # Geometry is an internal geo-indexed field, so it should not be part of the default output
-        ignore.append('geometry')
-        ignore.append('parking_site_group_id')
+        ignore = [*(ignore or []), 'geometry', 'parking_site_group_id']
 
-        result = super().to_dict(fields, ignore)
+        result = {
+            key: value for key, value in values.items() if (fields is None or key in fields) and key not in ignore
+        }
 
         # Output coordinates as numbers instead of decimal strings
         if result.get('lat') is not None:
@@ -227,53 +294,37 @@ class ParkingSite(BaseModel):
             result['lon'] = float(result['lon'])
 
         # Add legacy field is_supervised
-        if self.supervision_type is not None:
-            result['is_supervised'] = self.supervision_type != SupervisionType.NO
-
-        if include_restrictions and len(self.restrictions):
-            result['restrictions'] = []
-            for restrictions in self.restrictions:
-                result['restrictions'].append(
-                    restrictions.to_dict(
-                        fields=['type', 'hours', 'max_stay', 'capacity', 'realtime_capacity', 'realtime_free_capacity'],
-                    ),
-                )
-
-            # Legacy output
-            result['restricted_to'] = []
-            for restrictions in self.restrictions:
-                # It would be misleading to output a restriction without capacity at the legacy field
-                if restrictions.capacity is not None:
-                    continue
-                result['restricted_to'].append(restrictions.to_dict(fields=['type', 'hours', 'max_stay']))
-
-        if include_external_identifiers and len(self.external_identifiers):
-            result['external_identifiers'] = []
-            for external_identifier in self.external_identifiers:
-                result['external_identifiers'].append({
-                    'type': external_identifier.type,
-                    'value': external_identifier.value,
-                })
-
-        if include_tags and len(self.tags):
-            result['tags'] = []
-            for tag in self.tags:
-                result['tags'].append(tag.value)
+        if values.get('supervision_type') is not None:
+            result['is_supervised'] = values['supervision_type'] != SupervisionType.NO
 
-        if include_group and self.parking_site_group:
-            result['group'] = self.parking_site_group.to_dict(
-                ignore=['parking_site_id'],
-            )
+        if restrictions:
+            result['restrictions'] = restrictions
+
+            # Legacy output. It would be misleading to output a restriction with capacity at the legacy field.
+            result['restricted_to'] = [
+                {key: restriction[key] for key in ['type', 'hours', 'max_stay']}
+                for restriction in restrictions
+                if restriction['capacity'] is None
+            ]
+
+        if external_identifiers:
+            result['external_identifiers'] = external_identifiers
+
+        if tags:
+            result['tags'] = tags
+
+        if group:
+            result['group'] = group
 
         # Realtime data is considered outdated once realtime_data_updated_at is older than the configured
         # threshold. In that case we behave as if there was no realtime data at all.
-        has_realtime_data = self.has_realtime_data
+        has_realtime_data = values.get('has_realtime_data')
         if (
             has_realtime_data
             and unset_realtime_after_minutes is not None
             and (
-                self.realtime_data_updated_at is None
-                or self.realtime_data_updated_at
+                values.get('realtime_data_updated_at') is None
+                or values['realtime_data_updated_at']
                 < datetime.now(tz=timezone.utc) - timedelta(minutes=unset_realtime_after_minutes)
             )
         ):
@@ -288,6 +339,21 @@ class ParkingSite(BaseModel):
 
         return filter_unset_value_and_none(result)
 
+    def to_geojson_feature(self, fields: list[str] | None = None, **kwargs) -> str:
+        """
+        Returns the parking site as GeoJSON Feature string. The stored GeoJSON geometry is spliced in as it is, so it does
+        not need to be parsed and dumped again. Without stored geometry, a Point based on lat / lon is used.
+        """
+        properties = self.to_dict(ignore=['geojson'], **kwargs)
+        if fields is not None:
+            properties = {key: value for key, value in properties.items() if key in fields}
+
+        return geojson_feature(
+            feature_id=self.id,
+            geometry=self._geojson if self._geojson is not None else geojson_point(self.lat, self.lon),
+            properties=properties,
+        )
+
     @hybrid_property
     def geojson(self) -> Mapped[dict | None]:
         if self._geojson is None:
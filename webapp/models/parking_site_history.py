@@ -3,12 +3,13 @@ Copyright 2024 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
 from sqlalchemy import BigInteger, Integer
 from sqlalchemy import Enum as SqlalchemyEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.schema import Index
 from sqlalchemy_utc import UtcDateTime
 
 from webapp.extensions import db
@@ -18,8 +19,35 @@ from .parking_site import OpeningStatus, ParkingSite
 
 
 class ParkingSiteHistory(BaseModel):
+    """
+    At PostgreSQL, the table is partitioned by month of `created_at`, see `ParkingSiteHistoryService`. The partitioning
+    is just done by the migration, so tables created from the models (e.g. for tests) are not partitioned.
+    """
+
     __tablename__ = 'parking_site_history'
 
+    __table_args__ = (
+        # Used by the history of one parking site
+        Index(
+            'ix_parking_site_history_parking_site_id_created_at',
+            'parking_site_id',
+            'created_at',
+        ),
+        # History is appended in created_at order, so a BRIN index is a tiny fraction of a B-tree index at PostgreSQL
+        Index(
+            'ix_parking_site_history_created_at',
+            'created_at',
+            postgresql_using='brin',
+        ),
+    )
+
+    # The index is defined above
+    created_at: Mapped[datetime] = mapped_column(
+        UtcDateTime,
+        nullable=False,
+        default=lambda: datetime.now(tz=timezone.utc),
+    )
+
     parking_site: Mapped['ParkingSite'] = relationship('ParkingSite', back_populates='parking_site_history')
     parking_site_id: Mapped[int] = mapped_column(BigInteger(), db.ForeignKey('parking_site.id'), nullable=False)
 
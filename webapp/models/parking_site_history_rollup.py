@@ -0,0 +1,100 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from sqlalchemy import BigInteger, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy import Enum as SqlalchemyEnum
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.schema import Index
+from sqlalchemy_utc import UtcDateTime
+
+from .base import BaseModel
+from .parking_site import OpeningStatus
+
+
+class ParkingSiteHistoryResolution(Enum):
+    HOUR = 'hour'
+    DAY = 'day'
+
+
+class ParkingSiteHistoryRollup(BaseModel):
+    """
+    Hourly and daily aggregates of `ParkingSiteHistory` per parking site, starting at full UTC hours and days.
+
+    History entries are just written when values change, so the values of an entry are valid until the next entry.
+    Rollups weight values by the seconds they were valid within the period, and values are carried over from earlier
+    periods, so periods without changes get rollups as well. Durations and time integrals are stored instead of
+    averages and shares, so daily rollups can be aggregated from hourly rollups. Hourly rollups keep the values valid at
+    their end, which are carried over to the next hour.
+    """
+
+    __tablename__ = 'parking_site_history_rollup'
+
+    __table_args__ = (
+        UniqueConstraint('parking_site_id', 'resolution', 'period_start', name='uq_parking_site_history_rollup_period'),
+        # Used to find the last rolled up period
+        Index(
+            'ix_parking_site_history_rollup_resolution_period_start',
+            'resolution',
+            'period_start',
+        ),
+    )
+
+    parking_site_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey('parking_site.id', ondelete='CASCADE'),
+        nullable=False,
+    )
+    resolution: Mapped[ParkingSiteHistoryResolution] = mapped_column(
+        SqlalchemyEnum(ParkingSiteHistoryResolution),
+        nullable=False,
+    )
+    period_start: Mapped[datetime] = mapped_column(UtcDateTime(), nullable=False)
+
+    # History entries, so changes, within the period
+    change_count: Mapped[int] = mapped_column(Integer(), nullable=False)
+    # Seconds with any opening status, and seconds with opening status OPEN
+    opening_status_seconds: Mapped[int] = mapped_column(Integer(), nullable=False)
+    open_seconds: Mapped[int] = mapped_column(Integer(), nullable=False)
+
+    # Seconds with known realtime_free_capacity, and the sum of realtime_free_capacity times seconds
+    realtime_free_capacity_seconds: Mapped[int] = mapped_column(Integer(), nullable=False)
+    realtime_free_capacity_integral: Mapped[Optional[int]] = mapped_column(BigInteger(), nullable=True)
+    realtime_free_capacity_min: Mapped[Optional[int]] = mapped_column(Integer(), nullable=True)
+    realtime_free_capacity_max: Mapped[Optional[int]] = mapped_column(Integer(), nullable=True)
+
+    # Values valid at the end of the period, just set at hourly rollups
+    realtime_opening_status_last: Mapped[Optional[OpeningStatus]] = mapped_column(
+        SqlalchemyEnum(OpeningStatus, name='history_rollup_openingstatus'),
+        nullable=True,
+    )
+    realtime_free_capacity_last: Mapped[Optional[int]] = mapped_column(Integer(), nullable=True)
+
+    @property
+    def realtime_free_capacity_avg(self) -> Optional[float]:
+        if not self.realtime_free_capacity_seconds or self.realtime_free_capacity_integral is None:
+            return None
+        return self.realtime_free_capacity_integral / self.realtime_free_capacity_seconds
+
+    @property
+    def open_share(self) -> Optional[float]:
+        if not self.opening_status_seconds:
+            return None
+        return self.open_seconds / self.opening_status_seconds
+
+    def to_dict(self) -> dict:
+        return {
+            'parking_site_id': self.parking_site_id,
+            'resolution': self.resolution,
+            'period_start': self.period_start,
+            'change_count': self.change_count,
+            'realtime_free_capacity_min': self.realtime_free_capacity_min,
+            'realtime_free_capacity_max': self.realtime_free_capacity_max,
+            'realtime_free_capacity_avg': self.realtime_free_capacity_avg,
+            'open_share': self.open_share,
+        }
@@ -28,7 +28,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy_utc import UtcDateTime
 
 from webapp.common.dataclass import filter_unset_value_and_none
-from webapp.common.json import DefaultJSONEncoder
+from webapp.common.json import DefaultJSONEncoder, geojson_feature, geojson_point
 from webapp.common.sqlalchemy.point import Point
 from webapp.extensions import db
 
@@ -51,6 +51,12 @@ class ParkingSpot(BaseModel):
             'original_uid',
             unique=True,
         ),
+        # Backs the realtime delta feed, which is ordered by realtime_data_updated_at and id
+        Index(
+            'ix_parking_spot_realtime_data_updated_at_id',
+            'realtime_data_updated_at',
+            'id',
+        ),
     )
 
     source: Mapped['Source'] = relationship('Source', back_populates='parking_spots')
@@ -177,6 +183,21 @@ class ParkingSpot(BaseModel):
 
         return filter_unset_value_and_none(result)
 
+    def to_geojson_feature(self, fields: list[str] | None = None, **kwargs) -> str:
+        """
+        Returns the parking spot as GeoJSON Feature string. The stored GeoJSON geometry is spliced in as it is, so it does
+        not need to be parsed and dumped again. Without stored geometry, a Point based on lat / lon is used.
+        """
+        properties = self.to_dict(ignore=['geojson'], **kwargs)
+        if fields is not None:
+            properties = {key: value for key, value in properties.items() if key in fields}
+
+        return geojson_feature(
+            feature_id=self.id,
+            geometry=self._geojson if self._geojson is not None else geojson_point(self.lat, self.lon),
+            properties=properties,
+        )
+
 
 @event.listens_for(ParkingSpot, 'before_insert')
 @event.listens_for(ParkingSpot, 'before_update')
@@ -0,0 +1,83 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from sqlalchemy import BigInteger, Boolean, Float, ForeignKey, UniqueConstraint, event, insert
+from sqlalchemy.orm import Mapped, mapped_column
+
+from webapp.extensions import db
+
+from .base import BaseModel
+from .parking_site import ParkingSite
+
+
+class PendingDuplicate(BaseModel):
+    """
+    Duplicate candidate pair found by the incremental duplicate check, with the smaller parking site id first. Dismissed
+    candidates were decided on by an operator and are not listed anymore, until one of the parking sites moves away.
+    """
+
+    __tablename__ = 'pending_duplicate'
+
+    __table_args__ = (UniqueConstraint('parking_site_id', 'duplicate_parking_site_id'),)
+
+    parking_site_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey('parking_site.id', ondelete='CASCADE'),
+        nullable=False,
+    )
+    duplicate_parking_site_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey('parking_site.id', ondelete='CASCADE'),
+        nullable=False,
+        index=True,
+    )
+    distance: Mapped[float] = mapped_column(Float, nullable=False)
+    dismissed: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+
+class PendingDuplicateCheck(BaseModel):
+    """
+    Queue of new and moved parking sites, which still have to be checked for duplicates. Entries are written in the same
+    transaction as the parking site by the ORM listeners below, so every write path is covered.
+    """
+
+    __tablename__ = 'pending_duplicate_check'
+
+    parking_site_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey('parking_site.id', ondelete='CASCADE'),
+        nullable=False,
+        index=True,
+    )
+
+
+def _has_location_changes(parking_site: ParkingSite) -> bool:
+    state = db.inspect(parking_site)
+    for key in ('lat', 'lon'):
+        history = state.attrs[key].history
+        if not history.added:
+            continue
+        # Inputs often have more decimal places than stored, which must not count as a move on every import
+        if history.deleted and round(float(history.added[0]), 7) == round(float(history.deleted[0]), 7):
+            continue
+        return True
+
+    return False
+
+
+def _add_pending_duplicate_check(connection, parking_site: ParkingSite) -> None:
+    connection.execute(insert(PendingDuplicateCheck).values(parking_site_id=parking_site.id))
+
+
+@event.listens_for(ParkingSite, 'after_insert')
+def add_created_pending_duplicate_check(mapper, connection, target: ParkingSite):
+    _add_pending_duplicate_check(connection, target)
+
+
+@event.listens_for(ParkingSite, 'after_update')
+def add_moved_pending_duplicate_check(mapper, connection, target: ParkingSite):
+    if not _has_location_changes(target):
+        return
+    _add_pending_duplicate_check(connection, target)
@@ -72,8 +72,22 @@ class Source(BaseModel):
     static_parking_spot_error_count: Mapped[int | None] = mapped_column(Integer(), nullable=True, default=0)
     realtime_parking_spot_error_count: Mapped[int | None] = mapped_column(Integer(), nullable=True, default=0)
 
+    # Metrics, maintained by imports and SourceMetricsService, so metric scrapes don't need to aggregate
+    parking_site_count: Mapped[int | None] = mapped_column(Integer(), nullable=True)
+    parking_spot_count: Mapped[int | None] = mapped_column(Integer(), nullable=True)
+    realtime_outdated_parking_site_count: Mapped[int | None] = mapped_column(Integer(), nullable=True)
+    realtime_outdated_parking_spot_count: Mapped[int | None] = mapped_column(Integer(), nullable=True)
+    # Realtime outdated counts contain all entries with realtime_data_updated_at before this timestamp
+    realtime_outdated_counted_before: Mapped[datetime | None] = mapped_column(UtcDateTime(), nullable=True)
+
     def to_dict(self, *args, ignore: Optional[list[str]] = None, **kwargs) -> dict:
-        ignore = ignore or []
+        ignore = (ignore or []) + [
+            'parking_site_count',
+            'parking_spot_count',
+            'realtime_outdated_parking_site_count',
+            'realtime_outdated_parking_spot_count',
+            'realtime_outdated_counted_before',
+        ]
         if self.static_status in [SourceStatus.PROVISIONED, SourceStatus.DISABLED]:
             ignore += ['static_data_updated_at', 'static_parking_site_error_count', 'static_parking_spot_error_count']
         if self.realtime_status in [SourceStatus.PROVISIONED, SourceStatus.DISABLED]:
@@ -3,14 +3,39 @@ Copyright 2023 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
+from threading import Lock
 
 from webapp.common.config import ConfigHelper
 from webapp.common.events import EventHelper
+from webapp.common.instrumentation import RequestMetrics
+from webapp.common.logging.batching_http_json_post_handler import (
+    BatchingHttpPostJsonHandler,
+    LogShippingStatistics,
+    load_log_shipping_statistics,
+)
+from webapp.models import ParkingSite, Source
 from webapp.models.source import SourceStatus
-from webapp.prometheus_api.prometheus_models import Metrics, MetricType, ParkingSiteMetric, SourceMetric
+from webapp.prometheus_api.prometheus_models import (
+    EndpointHistogramMetric,
+    LogHandlerMetric,
+    Metrics,
+    MetricType,
+    ParkingSiteMetric,
+    SourceMetric,
+)
 from webapp.repositories import ParkingSiteRepository, ParkingSpotRepository, SourceRepository
 
+PARKING_SITE_METRIC_COLUMNS = [
+    ParkingSite.source_id,
+    ParkingSite.original_uid,
+    ParkingSite.name,
+    ParkingSite.capacity,
+    ParkingSite.has_realtime_data,
+    ParkingSite.realtime_capacity,
+    ParkingSite.realtime_free_capacity,
+]
+
 
 class PrometheusHandler:
     config_helper: ConfigHelper
@@ -18,6 +43,10 @@ class PrometheusHandler:
     source_repository: SourceRepository
     parking_site_repository: ParkingSiteRepository
     parking_spot_repository: ParkingSpotRepository
+    request_metrics: RequestMetrics
+
+    _parking_site_metrics_cache: tuple[tuple, str] | None
+    _parking_site_metrics_lock: Lock
 
     def __init__(
         self,
@@ -26,30 +55,21 @@ class PrometheusHandler:
         source_repository: SourceRepository,
         parking_site_repository: ParkingSiteRepository,
         parking_spot_repository: ParkingSpotRepository,
+        request_metrics: RequestMetrics,
     ):
         self.config_helper = config_helper
         self.event_helper = event_helper
         self.source_repository = source_repository
         self.parking_site_repository = parking_site_repository
         self.parking_spot_repository = parking_spot_repository
+        self.request_metrics = request_metrics
+        self._parking_site_metrics_cache = None
+        self._parking_site_metrics_lock = Lock()
 
     def get_metrics(self) -> str:
+        # Counts are maintained at the sources by imports and SourceMetricsService, so no aggregation is needed here
         sources = self.source_repository.fetch_sources()
 
-        older_then_delta = timedelta(minutes=self.config_helper.get('REALTIME_OUTDATED_AFTER_MINUTES'))
-        older_then = datetime.now(tz=timezone.utc) - older_then_delta
-
-        parking_site_count_by_source = self.parking_site_repository.count_by_source()
-        parking_spot_count_by_source = self.parking_spot_repository.count_by_source()
-
-        realtime_outdated_parking_sites_by_source = (
-            self.parking_site_repository.fetch_realtime_outdated_parking_site_count_by_source(older_then)
-        )
-
-        realtime_outdated_parking_spots_by_source = (
-            self.parking_spot_repository.fetch_realtime_outdated_parking_spot_count_by_source(older_then)
-        )
-
         last_static_update_metrics = Metrics(
             help='Last static update in seconds from now',
             type=MetricType.gauge,
@@ -125,19 +145,19 @@ class PrometheusHandler:
             if source.static_status in [SourceStatus.DISABLED, SourceStatus.PROVISIONED]:
                 continue
 
-            if source.id in parking_site_count_by_source:
+            if source.parking_site_count:
                 source_parking_site_count.metrics.append(
                     SourceMetric(
                         source=source.uid,
-                        value=parking_site_count_by_source[source.id],
+                        value=source.parking_site_count,
                     ),
                 )
 
-            if source.id in parking_spot_count_by_source:
+            if source.parking_spot_count:
                 source_parking_spot_count.metrics.append(
                     SourceMetric(
                         source=source.uid,
-                        value=parking_spot_count_by_source[source.id],
+                        value=source.parking_spot_count,
                     ),
                 )
 
@@ -214,13 +234,13 @@ class PrometheusHandler:
             outdated_realtime_parking_sites.metrics.append(
                 SourceMetric(
                     source=source.uid,
-                    value=realtime_outdated_parking_sites_by_source.get(source.id, 0),
+                    value=source.realtime_outdated_parking_site_count or 0,
                 ),
             )
             outdated_realtime_parking_spots.metrics.append(
                 SourceMetric(
                     source=source.uid,
-                    value=realtime_outdated_parking_spots_by_source.get(source.id, 0),
+                    value=source.realtime_outdated_parking_spot_count or 0,
                 ),
             )
 
@@ -239,15 +259,132 @@ class PrometheusHandler:
             + source_realtime_parking_spot_errors.to_metrics()
             + outdated_realtime_parking_sites.to_metrics()
             + outdated_realtime_parking_spots.to_metrics()
+            + self.get_request_metrics()
+            + self.get_log_shipping_metrics()
         )
 
+        result = '\n'.join(metrics)
+
         if self.config_helper.get('PARKING_SITE_METRICS', False):
-            metrics += self.get_parking_site_metrics()
+            result += '\n' + self.get_parking_site_metrics(sources)
+
+        return result
+
+    def get_request_metrics(self) -> list[str]:
+        histograms = [
+            (
+                'Request duration in seconds by endpoint',
+                'app_park_api_request_duration_seconds',
+                self.request_metrics.request_durations,
+            ),
+            (
+                'SQL statements per request by endpoint',
+                'app_park_api_request_sql_statements',
+                self.request_metrics.sql_statement_counts,
+            ),
+            (
+                'SQL duration per request in seconds by endpoint',
+                'app_park_api_request_sql_duration_seconds',
+                self.request_metrics.sql_durations,
+            ),
+        ]
+
+        lines: list[str] = []
+        for help_text, identifier, histogram in histograms:
+            histogram_metrics = Metrics(help=help_text, type=MetricType.histogram, identifier=identifier)
+            for endpoint, snapshot in sorted(histogram.get_snapshots().items()):
+                histogram_metrics.metrics.append(
+                    EndpointHistogramMetric(
+                        endpoint=endpoint,
+                        buckets=snapshot.buckets,
+                        sum=snapshot.sum,
+                        count=snapshot.count,
+                    ),
+                )
+            lines += histogram_metrics.to_metrics()
+
+        return lines
+
+    def get_log_shipping_metrics(self) -> list[str]:
+        statistics_list: list[LogShippingStatistics]
+        # Without a shared statistics directory, just the handlers of this process are known
+        if BatchingHttpPostJsonHandler.statistics_dir is None:
+            statistics_list = [handler.get_statistics() for handler in BatchingHttpPostJsonHandler.instances]
+        else:
+            statistics_list = load_log_shipping_statistics(
+                BatchingHttpPostJsonHandler.statistics_dir,
+                max_age=self.config_helper.get('LOG_SHIPPING_STATISTICS_MAX_AGE'),
+            )
+        if not statistics_list:
+            return []
+
+        counters = [
+            ('Log records sent by handler and process', 'app_park_api_log_records_sent_total', 'sent_count'),
+            (
+                'Log records dropped because of a full buffer by handler and process',
+                'app_park_api_log_records_dropped_total',
+                'dropped_count',
+            ),
+            (
+                'Log records failed to send by handler and process',
+                'app_park_api_log_records_failed_total',
+                'failed_count',
+            ),
+            ('Log batch requests by handler and process', 'app_park_api_log_batches_total', 'batch_count'),
+            (
+                'Log batch request latency in seconds by handler and process',
+                'app_park_api_log_batch_latency_seconds_total',
+                'latency_sum',
+            ),
+        ]
+
+        lines: list[str] = []
+        for help_text, identifier, field_name in counters:
+            counter_metrics = Metrics(help=help_text, type=MetricType.counter, identifier=identifier)
+            for statistics in statistics_list:
+                counter_metrics.metrics.append(
+                    LogHandlerMetric(
+                        value=getattr(statistics, field_name),
+                        handler=statistics.url,
+                        process=statistics.process,
+                    ),
+                )
+            lines += counter_metrics.to_metrics()
+
+        queue_size_metrics = Metrics(
+            help='Buffered log records by handler and process',
+            type=MetricType.gauge,
+            identifier='app_park_api_log_records_buffered',
+        )
+        for statistics in statistics_list:
+            queue_size_metrics.metrics.append(
+                LogHandlerMetric(value=statistics.queue_size, handler=statistics.url, process=statistics.process),
+            )
+
+        return lines + queue_size_metrics.to_metrics()
+
+    def get_parking_site_metrics(self, sources: list[Source]) -> str:
+        """
+        Returns the rendered parking site metrics. They can just change by imports (or single admin changes, which are
+        picked up by the next import), so they are rendered at most once per import generation of all sources.
+        """
+        generation = tuple(
+            (source.id, source.static_data_updated_at, source.realtime_data_updated_at) for source in sources
+        )
+        with self._parking_site_metrics_lock:
+            if self._parking_site_metrics_cache is not None and self._parking_site_metrics_cache[0] == generation:
+                return self._parking_site_metrics_cache[1]
+
+        parking_site_metrics = '\n'.join(self._render_parking_site_metrics(sources))
+
+        with self._parking_site_metrics_lock:
+            self._parking_site_metrics_cache = (generation, parking_site_metrics)
 
-        return '\n'.join(metrics)
+        return parking_site_metrics
 
-    def get_parking_site_metrics(self) -> list[str]:
-        parking_sites = self.parking_site_repository.fetch_parking_sites(include_source=True)
+    def _render_parking_site_metrics(self, sources: list[Source]) -> list[str]:
+        source_uids_by_id = {source.id: source.uid for source in sources}
+        parking_sites = self.parking_site_repository.iter_parking_site_columns(*PARKING_SITE_METRIC_COLUMNS)
 
         parking_site_static_capacity = Metrics(
             help='Parking site static capacity',
@@ -271,7 +408,7 @@ class PrometheusHandler:
             parking_site_static_capacity.metrics.append(
                 ParkingSiteMetric(
                     parking_site_uid=parking_site.original_uid,
-                    source=parking_site.source.uid,
+                    source=source_uids_by_id[parking_site.source_id],
                     value=parking_site.capacity,
                     parking_site_name=parking_site.name,
                 )
@@ -284,7 +421,7 @@ class PrometheusHandler:
             parking_site_realtime_capacity.metrics.append(
                 ParkingSiteMetric(
                     parking_site_uid=parking_site.original_uid,
-                    source=parking_site.source.uid,
+                    source=source_uids_by_id[parking_site.source_id],
                     value=parking_site.realtime_capacity,
                     parking_site_name=parking_site.name,
                 )
@@ -294,7 +431,7 @@ class PrometheusHandler:
             parking_site_realtime_free_capacity.metrics.append(
                 ParkingSiteMetric(
                     parking_site_uid=parking_site.original_uid,
-                    source=parking_site.source.uid,
+                    source=source_uids_by_id[parking_site.source_id],
                     value=parking_site.realtime_free_capacity,
                     parking_site_name=parking_site.name,
                 )
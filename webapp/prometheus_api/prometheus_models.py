@@ -9,7 +9,9 @@ from typing import List
 
 
 class MetricType(Enum):
+    counter = 'counter'
     gauge = 'gauge'
+    histogram = 'histogram'
 
 
 @dataclass
@@ -26,6 +28,9 @@ class BaseMetric:
             label_list.append(f'{key}="{value}"')
         return f'{identifier}{{{",".join(label_list)}}} {self.value}'
 
+    def to_metric_lines(self, identifier: str) -> List[str]:
+        return [self.to_metric(identifier)]
+
 
 @dataclass
 class SourceMetric(BaseMetric):
@@ -39,14 +44,38 @@ class ParkingSiteMetric(BaseMetric):
     parking_site_name: str
 
 
+@dataclass
+class LogHandlerMetric(BaseMetric):
+    handler: str
+    process: str
+
+
+@dataclass
+class EndpointHistogramMetric:
+    endpoint: str
+    buckets: List[tuple[float, int]]
+    sum: float
+    count: int
+
+    def to_metric_lines(self, identifier: str) -> List[str]:
+        endpoint = self.endpoint.replace('"', '')
+        return [
+            f'{identifier}_bucket{{endpoint="{endpoint}",le="{bound}"}} {count}' for bound, count in self.buckets
+        ] + [
+            f'{identifier}_bucket{{endpoint="{endpoint}",le="+Inf"}} {self.count}',
+            f'{identifier}_sum{{endpoint="{endpoint}"}} {self.sum}',
+            f'{identifier}_count{{endpoint="{endpoint}"}} {self.count}',
+        ]
+
+
 @dataclass
 class Metrics:
     help: str
     type: MetricType
     identifier: str
-    metrics: List[BaseMetric] = field(default_factory=list)
+    metrics: List[BaseMetric | EndpointHistogramMetric] = field(default_factory=list)
 
     def to_metrics(self) -> List[str]:
         return [f'# HELP {self.identifier} {self.help}', f'# TYPE {self.identifier} {self.type.name}'] + [
-            metric.to_metric(self.identifier) for metric in self.metrics
+            line for metric in self.metrics for line in metric.to_metric_lines(self.identifier)
         ]
@@ -7,6 +7,7 @@ from flask import make_response
 
 from webapp.common.blueprint import Blueprint
 from webapp.common.rest import BaseMethodView
+from webapp.common.sqlalchemy import use_read_replica
 from webapp.dependencies import dependencies
 from webapp.prometheus_api.prometheus_handler import PrometheusHandler
 
@@ -17,11 +18,14 @@ class PrometheusRestApi(Blueprint):
     def __init__(self):
         super().__init__('prometheus', __name__, url_prefix='/metrics')
 
+        self.before_request(use_read_replica)
+
         prometheus_handler = PrometheusHandler(
             **self.get_base_handler_dependencies(),
             source_repository=dependencies.get_source_repository(),
             parking_site_repository=dependencies.get_parking_site_repository(),
             parking_spot_repository=dependencies.get_parking_spot_repository(),
+            request_metrics=dependencies.get_request_instrumentation().request_metrics,
         )
 
         self.add_url_rule(
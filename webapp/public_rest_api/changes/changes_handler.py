@@ -0,0 +1,32 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from webapp.models import ChangeLogEntry
+from webapp.public_rest_api.base_handler import PublicApiBaseHandler
+from webapp.public_rest_api.changes.changes_validators import ChangesInput
+from webapp.repositories import ChangeLogEntryRepository
+
+
+class ChangesHandler(PublicApiBaseHandler):
+    change_log_entry_repository: ChangeLogEntryRepository
+
+    def __init__(self, *args, change_log_entry_repository: ChangeLogEntryRepository, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.change_log_entry_repository = change_log_entry_repository
+
+    def get_changes(self, changes_input: ChangesInput) -> list[ChangeLogEntry]:
+        # Just used at MySQL, see ChangeLogEntryRepository.fetch_change_log_entries()
+        created_before = datetime.now(tz=timezone.utc) - timedelta(
+            seconds=self.config_helper.get('CHANGE_LOG_VISIBILITY_DELAY_SECONDS', 60),
+        )
+
+        return self.change_log_entry_repository.fetch_change_log_entries(
+            after=changes_input.after,
+            limit=changes_input.limit,
+            created_before=created_before,
+            source_id=changes_input.source_id,
+        )
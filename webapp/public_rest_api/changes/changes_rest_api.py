@@ -0,0 +1,92 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from flask import jsonify
+from flask_openapi.decorator import Parameter, document
+from flask_openapi.schema import IntegerField
+from validataclass.validators import DataclassValidator
+
+from webapp.dependencies import dependencies
+from webapp.public_rest_api.base_blueprint import PublicApiBaseBlueprint
+from webapp.public_rest_api.base_method_view import PublicApiBaseMethodView
+from webapp.public_rest_api.changes.changes_handler import ChangesHandler
+from webapp.public_rest_api.changes.changes_schema import changes_response
+from webapp.public_rest_api.changes.changes_validators import ChangesInput
+
+
+class ChangesBlueprint(PublicApiBaseBlueprint):
+    documented: bool = True
+    changes_handler: ChangesHandler
+
+    def __init__(self):
+        super().__init__('changes', __name__, url_prefix='/v3/changes')
+
+        self.changes_handler = ChangesHandler(
+            **self.get_base_handler_dependencies(),
+            change_log_entry_repository=dependencies.get_change_log_entry_repository(),
+        )
+
+        self.add_url_rule(
+            '',
+            view_func=ChangesMethodView.as_view(
+                'changes',
+                **self.get_base_method_view_dependencies(),
+                changes_handler=self.changes_handler,
+            ),
+        )
+
+
+class ChangesMethodView(PublicApiBaseMethodView):
+    changes_handler: ChangesHandler
+    changes_validator = DataclassValidator(ChangesInput)
+
+    def __init__(self, *, changes_handler: ChangesHandler, **kwargs):
+        super().__init__(**kwargs)
+        self.changes_handler = changes_handler
+
+    @document(
+        description='Get the change log of Parking Sites and Parking Spots in commit order. Made for incremental '
+        'mirroring: pass next_after of the last response as after to get just the changes since then. Changes are '
+        'just returned as soon as all changes before them are committed, so no change is ever added before a '
+        'returned one. Sequence numbers are assigned when a change is written, so they are not strictly increasing. '
+        'Changes contain no data: mirrors fetch CREATED and UPDATED objects, and objects which do not exist anymore '
+        'were deleted by a later change. Before the retention window, the log is compacted to the latest change per '
+        'object and tombstones are removed, so mirrors which did not sync within the retention window have to do a '
+        'full sync. Changes of just realtime fields are not logged, mirrors get them from the realtime endpoints of '
+        'Parking Sites and Parking Spots.',
+        query=[
+            Parameter(
+                'after',
+                schema=IntegerField(),
+                description='Just return changes after the change with this sequence number.',
+            ),
+            Parameter('limit', schema=IntegerField(), description='Limit results, default is 1000, maximum is 10000.'),
+            Parameter('source_id', schema=IntegerField(), description='Just return changes of this source.'),
+        ],
+        response=[changes_response],
+    )
+    def get(self):
+        changes_input = self.validate_query_args(self.changes_validator)
+
+        change_log_entries = self.changes_handler.get_changes(changes_input)
+
+        response: dict = {
+            'items': [
+                change_log_entry.to_dict(ignore=['modified_at', 'transaction_id'])
+                for change_log_entry in change_log_entries
+            ],
+            'next_after': change_log_entries[-1].id if change_log_entries else changes_input.after,
+        }
+
+        if len(change_log_entries) >= changes_input.limit:
+            next_params = {
+                **self.request_helper.get_query_args(skip_empty=True),
+                'after': response['next_after'],
+            }
+            response['next_path'] = (
+                f'{self.request_helper.get_path()}?{"&".join(f"{key}={value}" for key, value in next_params.items())}'
+            )
+
+        return jsonify(response)
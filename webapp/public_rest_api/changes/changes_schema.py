@@ -0,0 +1,66 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from flask_openapi.decorator import Response, ResponseData
+from flask_openapi.schema import (
+    ArrayField,
+    DateTimeField,
+    EnumField,
+    IntegerField,
+    JsonSchema,
+    ObjectField,
+    StringField,
+)
+
+from webapp.models import ChangeLogAction, ChangeLogObjectType
+
+changes_schema = JsonSchema(
+    title='Changes Response',
+    properties={
+        'items': ArrayField(
+            items=ObjectField(
+                properties={
+                    'id': IntegerField(
+                        description='Sequence number of the change, unique, but not strictly increasing.'
+                    ),
+                    'object_type': EnumField(enum=ChangeLogObjectType),
+                    'object_id': IntegerField(description='ID of the changed Parking Site or Parking Spot.'),
+                    'source_id': IntegerField(),
+                    'action': EnumField(
+                        enum=ChangeLogAction,
+                        description='DELETED entries are tombstones: the object has to be removed from the mirror.',
+                    ),
+                    'created_at': DateTimeField(),
+                },
+            ),
+        ),
+        'next_after': IntegerField(description='Use this value as after parameter for the next poll.'),
+        'next_path': StringField(required=False, description='Path to the next page, if the result was limited.'),
+    },
+)
+
+changes_example = {
+    'items': [
+        {
+            'id': 4711,
+            'object_type': 'PARKING_SITE',
+            'object_id': 1,
+            'source_id': 1,
+            'action': 'UPDATED',
+            'created_at': '2026-10-19T08:10:12Z',
+        },
+        {
+            'id': 4712,
+            'object_type': 'PARKING_SPOT',
+            'object_id': 23,
+            'source_id': 2,
+            'action': 'DELETED',
+            'created_at': '2026-10-19T08:10:13Z',
+        },
+    ],
+    'next_after': 4712,
+}
+
+changes_response = Response(ResponseData(changes_schema, changes_example))
@@ -0,0 +1,14 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from validataclass.dataclasses import Default, validataclass
+from validataclass.validators import IntegerValidator
+
+
+@validataclass
+class ChangesInput:
+    after: int = IntegerValidator(min_value=0, allow_strings=True), Default(0)
+    limit: int = IntegerValidator(min_value=1, max_value=10000, allow_strings=True), Default(1000)
+    source_id: int | None = IntegerValidator(min_value=1, allow_strings=True), Default(None)
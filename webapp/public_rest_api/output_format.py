@@ -0,0 +1,23 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from enum import Enum
+
+from validataclass.dataclasses import Default, validataclass
+from validataclass.validators import EnumValidator, StringValidator
+
+from webapp.common.validation.list_validators import CommaSeparatedListValidator
+
+
+class OutputFormat(Enum):
+    JSON = 'json'
+    GEOJSON = 'geojson'
+
+
+@validataclass
+class OutputFormatInput:
+    format: OutputFormat = EnumValidator(OutputFormat), Default(OutputFormat.JSON)
+    # Sparse fieldset for GeoJSON feature properties
+    fields: list[str] | None = CommaSeparatedListValidator(StringValidator(min_length=1)), Default(None)
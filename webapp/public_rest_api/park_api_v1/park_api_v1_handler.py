@@ -3,9 +3,7 @@ Copyright 2023 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
-from opening_hours import OpeningHours
-from opening_hours.opening_hours import ParserError
-
+from webapp.common.opening_hours import OpeningHoursCache
 from webapp.models.parking_site import ParkingSiteType
 from webapp.repositories import SourceRepository
 from webapp.shared.parking_site.generic_parking_site_handler import GenericParkingSiteHandler
@@ -14,6 +12,7 @@ from webapp.shared.parking_site.parking_site_search_query import ParkingSiteSear
 
 class ParkApiV1Handler(GenericParkingSiteHandler):
     source_repository: SourceRepository
+    opening_hours_cache: OpeningHoursCache
 
     key_mapping: dict[str, str] = {
         'name': 'name',
@@ -30,9 +29,16 @@ class ParkApiV1Handler(GenericParkingSiteHandler):
         ParkingSiteType.CAR_PARK: 'garage',
     }
 
-    def __init__(self, *args, source_repository: SourceRepository, **kwargs):
+    def __init__(
+        self,
+        *args,
+        source_repository: SourceRepository,
+        opening_hours_cache: OpeningHoursCache,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         self.source_repository = source_repository
+        self.opening_hours_cache = opening_hours_cache
 
     def get_sources_as_dict(self) -> dict:
         sources = self.source_repository.fetch_sources()
@@ -73,12 +79,7 @@ class ParkApiV1Handler(GenericParkingSiteHandler):
             if parking_site.has_realtime_data and parking_site.realtime_opening_status is not None:
                 lot['state'] = parking_site.realtime_opening_status.name.lower()
             elif parking_site.opening_hours:
-                try:
-                    oh = OpeningHours(parking_site.opening_hours)
-                    lot['state'] = str(oh.state()[0])
-                except ParserError:
-                    lot['state'] = 'unknown'
-
+                lot['state'] = self.opening_hours_cache.get_state(parking_site.opening_hours) or 'unknown'
             else:
                 lot['state'] = 'unknown'
 
@@ -30,6 +30,7 @@ class ParkApiV1Blueprint(PublicApiBaseBlueprint):
             **self.get_base_handler_dependencies(),
             parking_site_repository=dependencies.get_parking_site_repository(),
             source_repository=dependencies.get_source_repository(),
+            opening_hours_cache=dependencies.get_opening_hours_cache(),
         )
 
         self.add_url_rule(
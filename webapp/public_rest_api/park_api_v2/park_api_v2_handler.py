@@ -3,19 +3,22 @@ Copyright 2023 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
-from typing import Any
+from typing import Any, Iterator
 
-from opening_hours import OpeningHours  # noqa
-from opening_hours.opening_hours import ParserError
+from validataclass_search_queries.pagination import PaginatedResult
 
+from webapp.common.opening_hours import OpeningHoursCache
+from webapp.models import ParkingSite
 from webapp.models.parking_site import ParkingSiteType
 from webapp.repositories import SourceRepository
 from webapp.shared.parking_site.generic_parking_site_handler import GenericParkingSiteHandler
-from webapp.shared.parking_site.parking_site_search_query import ParkingSiteSearchInput
+
+from .park_api_v2_validator import ParkApiV2SearchInput
 
 
 class ParkApiV2Handler(GenericParkingSiteHandler):
     source_repository: SourceRepository
+    opening_hours_cache: OpeningHoursCache
     key_mapping: dict[str, str] = {
         'created_at': 'date_created',
         'modified_at': 'date_updated',
@@ -32,9 +35,16 @@ class ParkApiV2Handler(GenericParkingSiteHandler):
         ParkingSiteType.CAR_PARK: 'garage',
     }
 
-    def __init__(self, *args, source_repository: SourceRepository, **kwargs):
+    def __init__(
+        self,
+        *args,
+        source_repository: SourceRepository,
+        opening_hours_cache: OpeningHoursCache,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         self.source_repository = source_repository
+        self.opening_hours_cache = opening_hours_cache
 
     def get_source_as_dict(self, source_uid: str) -> dict:
         source = self.source_repository.fetch_source_by_uid(source_uid)
@@ -50,55 +60,53 @@ class ParkApiV2Handler(GenericParkingSiteHandler):
 
         return result
 
-    def get_parking_site_list_as_dict(self, search_query: ParkingSiteSearchInput) -> dict:
-        parking_sites = self.get_parking_site_list(search_query)
-
-        lots = []
-        for parking_site in parking_sites:
-            lot: dict[str, Any] = {
-                'coordinates': [float(parking_site.lon), float(parking_site.lat)],
-                'has_live_capacity': parking_site.has_realtime_data,
-                'pool_id': parking_site.source.uid,
-                'type': self.type_mapping.get(parking_site.type, 'unknown'),
-            }
-            for source_key, destination_key in self.key_mapping.items():
-                if getattr(parking_site, source_key) is None or getattr(parking_site, source_key) == '':
-                    continue
-                lot[destination_key] = getattr(parking_site, source_key)
-
-            if parking_site.opening_hours or (
-                parking_site.has_realtime_data and parking_site.realtime_free_capacity is not None
-            ):
-                lot['latest_data'] = {'timestamp': parking_site.modified_at}
-
-            if parking_site.opening_hours:
-                try:
-                    oh = OpeningHours(parking_site.opening_hours)
-                    state = str(oh.state()[0])
-                    # The v2 spec only allows 'open' and 'closed' as status values.
-                    if state in ('open', 'closed'):
-                        lot['latest_data']['status'] = state
-                except ParserError:
-                    pass
-
-            if parking_site.has_realtime_data and parking_site.realtime_free_capacity is not None:
-                lot['latest_data']['lot_timestamp'] = (parking_site.realtime_data_updated_at,)
-                if parking_site.realtime_capacity is None:
-                    capacity = parking_site.capacity
-                else:
-                    capacity = parking_site.realtime_capacity
-
-                if capacity:
-                    lot['latest_data']['capacity'] = capacity
-                    lot['latest_data']['num_free'] = parking_site.realtime_free_capacity
-                    lot['latest_data']['num_occupied'] = capacity - parking_site.realtime_free_capacity
-                    lot['latest_data']['percent_free'] = round(parking_site.realtime_free_capacity / capacity * 100, 2)
-
-            lots.append(lot)
-
-        return {
-            'count': len(lots),
-            'next': None,
-            'previous': None,
-            'results': lots,
+    def get_lot_page(self, search_query: ParkApiV2SearchInput) -> tuple[PaginatedResult[dict], int | None]:
+        """
+        Returns a page of lots together with the cursor start value of the previous page.
+        """
+        parking_sites = self.parking_site_repository.fetch_parking_sites(search_query=search_query)
+        previous_start = self.parking_site_repository.fetch_previous_parking_site_start(search_query=search_query)
+
+        return parking_sites.map(self._map_lot), previous_start
+
+    def iter_lots(self, search_query: ParkApiV2SearchInput) -> Iterator[dict]:
+        for parking_site in self.parking_site_repository.iter_parking_sites(search_query=search_query):
+            yield self._map_lot(parking_site)
+
+    def _map_lot(self, parking_site: ParkingSite) -> dict:
+        lot: dict[str, Any] = {
+            'coordinates': [float(parking_site.lon), float(parking_site.lat)],
+            'has_live_capacity': parking_site.has_realtime_data,
+            'pool_id': parking_site.source.uid,
+            'type': self.type_mapping.get(parking_site.type, 'unknown'),
         }
+        for source_key, destination_key in self.key_mapping.items():
+            if getattr(parking_site, source_key) is None or getattr(parking_site, source_key) == '':
+                continue
+            lot[destination_key] = getattr(parking_site, source_key)
+
+        if parking_site.opening_hours or (
+            parking_site.has_realtime_data and parking_site.realtime_free_capacity is not None
+        ):
+            lot['latest_data'] = {'timestamp': parking_site.modified_at}
+
+        if parking_site.opening_hours:
+            state = self.opening_hours_cache.get_state(parking_site.opening_hours)
+            # The v2 spec only allows 'open' and 'closed' as status values.
+            if state in ('open', 'closed'):
+                lot['latest_data']['status'] = state
+
+        if parking_site.has_realtime_data and parking_site.realtime_free_capacity is not None:
+            lot['latest_data']['lot_timestamp'] = (parking_site.realtime_data_updated_at,)
+            if parking_site.realtime_capacity is None:
+                capacity = parking_site.capacity
+            else:
+                capacity = parking_site.realtime_capacity
+
+            if capacity:
+                lot['latest_data']['capacity'] = capacity
+                lot['latest_data']['num_free'] = parking_site.realtime_free_capacity
+                lot['latest_data']['num_occupied'] = capacity - parking_site.realtime_free_capacity
+                lot['latest_data']['percent_free'] = round(parking_site.realtime_free_capacity / capacity * 100, 2)
+
+        return lot
@@ -3,11 +3,16 @@ Copyright 2023 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
-from flask import jsonify
+import json
+from typing import Iterator
+from urllib.parse import urlencode
+
+from flask import Response, jsonify, stream_with_context
 from flask_openapi.decorator import Parameter, document
 from flask_openapi.schema import ArrayField, DecimalField, IntegerField, StringField
 from validataclass.validators import DataclassValidator
 
+from webapp.common.json import DefaultJSONEncoder
 from webapp.dependencies import dependencies
 from webapp.public_rest_api.base_blueprint import PublicApiBaseBlueprint
 from webapp.public_rest_api.base_method_view import PublicApiBaseMethodView
@@ -31,6 +36,7 @@ class ParkApiV2Blueprint(PublicApiBaseBlueprint):
             **self.get_base_handler_dependencies(),
             parking_site_repository=dependencies.get_parking_site_repository(),
             source_repository=dependencies.get_source_repository(),
+            opening_hours_cache=dependencies.get_opening_hours_cache(),
         )
 
         self.add_url_rule(
@@ -94,12 +100,52 @@ class ParkApiV2LotsMethodView(ParkApiV2BaseMethodView):
                 description='Comma separated lon and lat.',
             ),
             Parameter('radius', schema=IntegerField()),
+            Parameter(
+                'limit',
+                schema=IntegerField(),
+                description='Enables pagination with the given page size, maximum is 1000. Without limit, all lots are '
+                'returned.',
+            ),
+            Parameter('start', schema=IntegerField(), description='Start of search query, see next and previous.'),
         ],
         response=[park_api_v2_parking_sites_response],
     )
     def get(self):
         search_query = self.validate_query_args(self.parking_site_search_query_validator)
 
-        response = self.park_api_v2_handler.get_parking_site_list_as_dict(search_query=search_query)
+        # Without limit, all lots are streamed in the same shape as a single page
+        if not search_query.limit:
+            return self._stream_lots(search_query)
 
-        return jsonify(response)
+        lots, previous_start = self.park_api_v2_handler.get_lot_page(search_query=search_query)
+
+        return jsonify({
+            'count': lots.total_count,
+            'next': self._get_page_url(search_query, search_query.get_next_start_value(lots)),
+            'previous': self._get_page_url(search_query, previous_start),
+            'results': list(lots),
+        })
+
+    def _stream_lots(self, search_query: ParkApiV2SearchInput) -> Response:
+        lots = self.park_api_v2_handler.iter_lots(search_query=search_query)
+
+        def generate() -> Iterator[str]:
+            yield '{"next": null, "previous": null, "results": ['
+            count = 0
+            for lot in lots:
+                lot_json = json.dumps(lot, cls=DefaultJSONEncoder)
+                yield lot_json if count == 0 else f', {lot_json}'
+                count += 1
+            # The count is just known after streaming all lots
+            yield f'], "count": {count}}}'
+
+        return Response(stream_with_context(generate()), mimetype='application/json')
+
+    def _get_page_url(self, search_query: ParkApiV2SearchInput, start: int | None) -> str | None:
+        if start is None:
+            return None
+
+        query_args = self.request_helper.get_query_args(skip_empty=True)
+        query_args.update({'start': start, 'limit': search_query.limit})
+
+        return f'{self.request_helper.get_base_url()}?{urlencode(query_args)}'
@@ -0,0 +1,68 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from flask_openapi.decorator import Response, ResponseData
+from flask_openapi.schema import (
+    ArrayField,
+    DateTimeField,
+    EnumField,
+    IntegerField,
+    JsonSchema,
+    ObjectField,
+    StringField,
+)
+from parkapi_sources.models.enums import OpeningStatus, ParkingAudience
+
+parking_site_realtime_schema = JsonSchema(
+    title='ParkingSiteRealtime Response',
+    properties={
+        'items': ArrayField(
+            items=ObjectField(
+                properties={
+                    'id': IntegerField(description='Internal ID, generated by ParkAPI Service.'),
+                    'realtime_data_updated_at': DateTimeField(),
+                    'realtime_capacity': IntegerField(minimum=0, required=False),
+                    'realtime_free_capacity': IntegerField(minimum=0, required=False),
+                    'realtime_opening_status': EnumField(enum=OpeningStatus, required=False),
+                    'restrictions': ArrayField(
+                        items=ObjectField(
+                            properties={
+                                'type': EnumField(enum=ParkingAudience, required=False),
+                                'realtime_capacity': IntegerField(minimum=0, required=False),
+                                'realtime_free_capacity': IntegerField(minimum=0, required=False),
+                            },
+                        ),
+                        required=False,
+                    ),
+                },
+            ),
+        ),
+        'next_since': DateTimeField(
+            required=False,
+            description='Use this value as since parameter for the next poll. Contains microseconds.',
+        ),
+        'next_since_id': IntegerField(
+            required=False,
+            description='Set if the result was limited. Use it together with next_since to get the next page.',
+        ),
+        'next_path': StringField(required=False, description='Path to the next page, if the result was limited.'),
+    },
+)
+
+parking_site_realtime_example = {
+    'items': [
+        {
+            'id': 1,
+            'realtime_data_updated_at': '2026-10-19T08:10:12Z',
+            'realtime_capacity': 100,
+            'realtime_free_capacity': 42,
+            'realtime_opening_status': 'OPEN',
+            'restrictions': [{'type': 'DISABLED', 'realtime_free_capacity': 2}],
+        },
+    ],
+    'next_since': '2026-10-19T08:10:12.123456Z',
+}
+
+parking_site_realtime_response = Response(ResponseData(parking_site_realtime_schema, parking_site_realtime_example))
@@ -3,18 +3,63 @@ Copyright 2024 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+from validataclass.exceptions import ValidationError
 from validataclass_search_queries.pagination import PaginatedResult
 
-from webapp.models import ParkingSiteHistory
-from webapp.public_rest_api.parking_sites.parking_sites_validators import ParkingSiteHistorySearchQueryInput
-from webapp.repositories import ParkingSiteHistoryRepository
+from webapp.common.json import DefaultJSONEncoder
+from webapp.common.pubsub import LocalPubSub, PubSubSubscription, PubSubSubscriptionLimitException
+from webapp.common.rest.exceptions import InvalidInputException, ServiceUnavailableException
+from webapp.common.rest.server_sent_events import (
+    format_server_sent_comment,
+    format_server_sent_event,
+    format_server_sent_retry,
+)
+from webapp.common.vector_tile import VectorTileCache, is_valid_tile
+from webapp.models import ParkingSiteHistory, ParkingSiteHistoryRollup
+from webapp.public_rest_api.parking_sites.parking_sites_validators import (
+    ParkingSiteHistoryExportInput,
+    ParkingSiteHistoryRollupSearchQueryInput,
+    ParkingSiteHistorySearchQueryInput,
+    ParkingSiteStreamInput,
+)
+from webapp.public_rest_api.realtime_delta import RealtimeDeltaInput
+from webapp.repositories import ParkingSiteHistoryRepository, ParkingSiteHistoryRollupRepository, SourceRepository
+from webapp.repositories.parking_site_repository import ParkingSiteRealtime
 from webapp.shared.parking_site.generic_parking_site_handler import GenericParkingSiteHandler
+from webapp.shared.parking_site.parking_site_realtime_event import (
+    PARKING_SITE_REALTIME_CHANNEL,
+    ParkingSiteRealtimeEvent,
+    get_parking_site_realtime_event_id,
+    parse_parking_site_realtime_event_id,
+)
+from webapp.shared.parking_site_history.parking_site_history_export import (
+    EXPORT_BATCH_SIZE,
+    iter_parking_site_history_export,
+)
 
 
 class ParkingSiteHandler(GenericParkingSiteHandler):
-    def __init__(self, *args, parking_site_history_repository: ParkingSiteHistoryRepository, **kwargs):
+    def __init__(
+        self,
+        *args,
+        parking_site_history_repository: ParkingSiteHistoryRepository,
+        parking_site_history_rollup_repository: ParkingSiteHistoryRollupRepository,
+        source_repository: SourceRepository,
+        vector_tile_cache: VectorTileCache,
+        pubsub: LocalPubSub,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         self.parking_site_history_repository = parking_site_history_repository
+        self.parking_site_history_rollup_repository = parking_site_history_rollup_repository
+        self.source_repository = source_repository
+        self.vector_tile_cache = vector_tile_cache
+        self.pubsub = pubsub
 
     def get_parking_site_history_list(
         self,
@@ -24,3 +69,139 @@ class ParkingSiteHandler(GenericParkingSiteHandler):
         search_query.parking_site_id = parking_site_id
 
         return self.parking_site_history_repository.fetch_parking_site_history(search_query=search_query)
+
+    def get_parking_site_history_rollup_list(
+        self,
+        parking_site_id: int,
+        search_query: ParkingSiteHistoryRollupSearchQueryInput,
+    ) -> PaginatedResult[ParkingSiteHistoryRollup]:
+        search_query.parking_site_id = parking_site_id
+
+        return self.parking_site_history_rollup_repository.fetch_parking_site_history_rollups(search_query=search_query)
+
+    def get_parking_site_history_export(self, export_input: ParkingSiteHistoryExportInput) -> Iterator[bytes]:
+        created_at_until = export_input.created_at_until or datetime.now(tz=timezone.utc)
+        max_days = self.config_helper.get('HISTORY_EXPORT_MAX_DAYS', 31)
+        if created_at_until - export_input.created_at_since > timedelta(days=max_days):
+            raise InvalidInputException(message=f'Exports are limited to {max_days} days, please split your export.')
+
+        rows = self.parking_site_history_repository.iter_parking_site_history_columns(
+            export_input.fields,
+            source_uids=export_input.source_uids,
+            parking_site_ids=export_input.parking_site_ids,
+            created_at_since=export_input.created_at_since,
+            created_at_until=created_at_until,
+            batch_size=EXPORT_BATCH_SIZE,
+        )
+
+        return iter_parking_site_history_export(rows, export_input.fields, export_input.format)
+
+    def get_parking_site_realtime_list(self, realtime_delta_input: RealtimeDeltaInput) -> list[ParkingSiteRealtime]:
+        return self.parking_site_repository.fetch_parking_site_realtime_data(
+            since=realtime_delta_input.since,
+            since_id=realtime_delta_input.since_id,
+            limit=realtime_delta_input.limit,
+        )
+
+    def open_parking_site_stream(
+        self,
+        stream_input: ParkingSiteStreamInput,
+        last_event_id: str | None,
+    ) -> tuple[PubSubSubscription, Iterator[str]]:
+        """
+        Opens a realtime stream in text/event-stream format. All database queries are done before streaming, so open
+        streams neither hold a database connection nor an app context. The subscription has to be closed when the
+        response is closed.
+        """
+        if not self.config_helper.get('REALTIME_STREAM_ENABLED', True):
+            raise ServiceUnavailableException(message='Realtime streams are disabled.')
+
+        source_id: int | None = None
+        if stream_input.source_uid is not None:
+            source_id = self.source_repository.fetch_source_by_uid(stream_input.source_uid).id
+
+        resume_limit: int = self.config_helper.get('REALTIME_STREAM_RESUME_LIMIT')
+        heartbeat_interval: int = self.config_helper.get('REALTIME_STREAM_HEARTBEAT_INTERVAL')
+        max_duration: int = self.config_helper.get('REALTIME_STREAM_MAX_DURATION')
+
+        try:
+            subscription = self.pubsub.subscribe(PARKING_SITE_REALTIME_CHANNEL)
+        except PubSubSubscriptionLimitException as e:
+            raise ServiceUnavailableException(message='Too many open streams, please retry later.') from e
+
+        # Subscribe before replaying, so no events get lost in between. Events might be sent twice instead. Until the
+        # stream takes over, the subscription is closed on any failure.
+        try:
+            replay_events: list[str] = []
+            if last_event_id is not None:
+                try:
+                    since, since_id = parse_parking_site_realtime_event_id(last_event_id)
+                except ValidationError as e:
+                    raise InvalidInputException(message=f'Invalid Last-Event-ID {last_event_id}.') from e
+
+                replay_events = [
+                    format_server_sent_event(
+                        json.dumps(parking_site_realtime.to_dict(), cls=DefaultJSONEncoder),
+                        event_id=get_parking_site_realtime_event_id(
+                            parking_site_realtime.realtime_data_updated_at,
+                            parking_site_realtime.id,
+                        ),
+                        event='realtime',
+                    )
+                    for parking_site_realtime in self.parking_site_repository.fetch_parking_site_realtime_data(
+                        since=since,
+                        since_id=since_id,
+                        limit=resume_limit,
+                        source_id=source_id,
+                        parking_site_ids=stream_input.ids,
+                        bbox=stream_input.get_bbox(),
+                    )
+                ]
+        except BaseException:
+            subscription.close()
+            raise
+
+        def generate() -> Iterator[str]:
+            try:
+                yield format_server_sent_retry(1000)
+                yield from replay_events
+
+                # If the replay was limited, the client continues the replay with the next reconnect
+                if len(replay_events) >= resume_limit:
+                    return
+
+                started_at = time.monotonic()
+                while time.monotonic() - started_at < max_duration and not subscription.overflowed:
+                    message = subscription.get(timeout=heartbeat_interval)
+                    if message is None:
+                        yield format_server_sent_comment('heartbeat')
+                        continue
+
+                    for event_dict in message['events']:
+                        event = ParkingSiteRealtimeEvent.from_dict(event_dict)
+                        if not stream_input.matches(source_id, event):
+                            continue
+                        yield format_server_sent_event(event.data, event_id=event.event_id, event='realtime')
+            finally:
+                subscription.close()
+
+        return subscription, generate()
+
+    def get_parking_site_vector_tile(self, z: int, x: int, y: int) -> bytes:
+        if not is_valid_tile(z, x, y):
+            raise InvalidInputException(message=f'Invalid tile {z}/{x}/{y}.')
+
+        realtime_data_updated_since = datetime.now(tz=timezone.utc) - timedelta(
+            minutes=self.config_helper.get('UNSET_REALTIME_AFTER_MINUTES', 30),
+        )
+
+        return self.vector_tile_cache.get_or_render(
+            ('parking_sites', z, x, y),
+            source_generations=self.source_repository.fetch_source_generations(),
+            render=lambda: self.parking_site_repository.fetch_parking_site_vector_tile(
+                z,
+                x,
+                y,
+                realtime_data_updated_since=realtime_data_updated_since,
+            ),
+        )
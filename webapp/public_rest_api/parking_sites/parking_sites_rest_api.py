@@ -3,7 +3,7 @@ Copyright 2023 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
-from flask import jsonify
+from flask import jsonify, make_response, stream_with_context
 from flask_openapi.decorator import (
     ExampleListReference,
     ExampleReference,
@@ -19,16 +19,33 @@ from parkapi_sources.models import ParkingSiteType
 from parkapi_sources.models.enums import PurposeType
 from validataclass.validators import BooleanValidator, DataclassValidator
 
+from webapp.common.pagination import CountMode
+from webapp.common.rest.exceptions import InvalidInputException
 from webapp.dependencies import dependencies
-from webapp.models import ParkingSite, ParkingSiteHistory
+from webapp.models import ParkingSite, ParkingSiteHistory, ParkingSiteHistoryResolution, ParkingSiteHistoryRollup
 from webapp.public_rest_api.base_blueprint import PublicApiBaseBlueprint
 from webapp.public_rest_api.base_method_view import PublicApiBaseMethodView
+from webapp.public_rest_api.output_format import OutputFormat, OutputFormatInput
+from webapp.public_rest_api.parking_sites.parking_site_realtime_schema import parking_site_realtime_response
 from webapp.public_rest_api.parking_sites.parking_sites_handler import ParkingSiteHandler
-from webapp.public_rest_api.parking_sites.parking_sites_validators import ParkingSiteHistorySearchQueryInput
+from webapp.public_rest_api.parking_sites.parking_sites_validators import (
+    ParkingSiteHistoryExportInput,
+    ParkingSiteHistoryRollupSearchQueryInput,
+    ParkingSiteHistorySearchQueryInput,
+    ParkingSiteStreamInput,
+)
+from webapp.public_rest_api.realtime_delta import RealtimeDeltaInput, realtime_delta_response
+from webapp.repositories.parking_site_repository import ParkingSiteRow
+from webapp.shared.nearest_search import nearest_api_response
 from webapp.shared.parking_restriction.parking_restriction_schema import parking_site_restriction_component
 from webapp.shared.parking_site.parking_site_search_query import ParkingSiteGeoSearchInput
 from webapp.shared.parking_site.parking_sites_schema import parking_site_component
 from webapp.shared.parking_site_group.parking_sites_group_schema import parking_site_group_component
+from webapp.shared.parking_site_history.parking_site_history_export import (
+    PARKING_SITE_HISTORY_EXPORT_DEFAULT_FIELDS,
+    ParkingSiteHistoryExportFormat,
+)
+from webapp.shared.parking_site_history.parking_site_history_rollup_schema import parking_site_history_rollup_component
 from webapp.shared.parking_site_history.parking_sites_schema import parking_site_history_component
 from webapp.shared.sources.source_schema import source_component
 
@@ -44,6 +61,10 @@ class ParkingSiteBlueprint(PublicApiBaseBlueprint):
             **self.get_base_handler_dependencies(),
             parking_site_repository=dependencies.get_parking_site_repository(),
             parking_site_history_repository=dependencies.get_parking_site_history_repository(),
+            parking_site_history_rollup_repository=dependencies.get_parking_site_history_rollup_repository(),
+            source_repository=dependencies.get_source_repository(),
+            vector_tile_cache=dependencies.get_vector_tile_cache(),
+            pubsub=dependencies.get_pubsub(),
         )
 
         self.add_url_rule(
@@ -55,6 +76,33 @@ class ParkingSiteBlueprint(PublicApiBaseBlueprint):
             ),
         )
 
+        self.add_url_rule(
+            '/realtime',
+            view_func=ParkingSiteRealtimeListMethodView.as_view(
+                'parking-sites-realtime',
+                **self.get_base_method_view_dependencies(),
+                parking_site_handler=self.parking_site_handler,
+            ),
+        )
+
+        self.add_url_rule(
+            '/stream',
+            view_func=ParkingSiteStreamMethodView.as_view(
+                'parking-sites-stream',
+                **self.get_base_method_view_dependencies(),
+                parking_site_handler=self.parking_site_handler,
+            ),
+        )
+
+        self.add_url_rule(
+            '/tiles/<int:z>/<int:x>/<int:y>.mvt',
+            view_func=ParkingSiteVectorTileMethodView.as_view(
+                'parking-sites-vector-tile',
+                **self.get_base_method_view_dependencies(),
+                parking_site_handler=self.parking_site_handler,
+            ),
+        )
+
         self.add_url_rule(
             '/<int:parking_site_id>',
             view_func=ParkingSiteItemMethodView.as_view(
@@ -64,6 +112,15 @@ class ParkingSiteBlueprint(PublicApiBaseBlueprint):
             ),
         )
 
+        self.add_url_rule(
+            '/history/export',
+            view_func=ParkingSiteHistoryExportMethodView.as_view(
+                'parking-site-history-export',
+                **self.get_base_method_view_dependencies(),
+                parking_site_handler=self.parking_site_handler,
+            ),
+        )
+
         self.add_url_rule(
             '/<int:parking_site_id>/history',
             view_func=ParkingSiteHistoryListMethodView.as_view(
@@ -89,22 +146,45 @@ class ParkingSiteBaseMethodView(PublicApiBaseMethodView):
 
         return self.calculate_has_realtime_data_validator.validate(raw_value)
 
-    def _map_parking_site(self, parking_site: ParkingSite, *, calculate_has_realtime_data: bool = True) -> dict:
-        unset_realtime_after_minutes = None
-        if calculate_has_realtime_data:
-            unset_realtime_after_minutes = self.config_helper.get('UNSET_REALTIME_AFTER_MINUTES', 30)
+    def _get_unset_realtime_after_minutes(self, calculate_has_realtime_data: bool) -> int | None:
+        if not calculate_has_realtime_data:
+            return None
+        return self.config_helper.get('UNSET_REALTIME_AFTER_MINUTES', 30)
 
+    def _map_parking_site(
+        self,
+        parking_site: ParkingSite | ParkingSiteRow,
+        *,
+        calculate_has_realtime_data: bool = True,
+    ) -> dict:
         return parking_site.to_dict(
             include_restrictions=True,
             include_external_identifiers=True,
             include_tags=True,
             include_group=True,
-            unset_realtime_after_minutes=unset_realtime_after_minutes,
+            unset_realtime_after_minutes=self._get_unset_realtime_after_minutes(calculate_has_realtime_data),
+        )
+
+    def _map_parking_site_feature(
+        self,
+        parking_site: ParkingSite,
+        *,
+        fields: list[str] | None = None,
+        calculate_has_realtime_data: bool = True,
+    ) -> str:
+        return parking_site.to_geojson_feature(
+            fields=fields,
+            include_restrictions=True,
+            include_external_identifiers=True,
+            include_tags=True,
+            include_group=True,
+            unset_realtime_after_minutes=self._get_unset_realtime_after_minutes(calculate_has_realtime_data),
         )
 
 
 class ParkingSiteListMethodView(ParkingSiteBaseMethodView):
     parking_site_search_query_validator = DataclassValidator(ParkingSiteGeoSearchInput)
+    output_format_validator = DataclassValidator(OutputFormatInput)
 
     @document(
         description='Get Parking Sites. This endpoint is paginated, which means that you can set a limit and iterate over pages. To '
@@ -125,8 +205,30 @@ class ParkingSiteListMethodView(ParkingSiteBaseMethodView):
             Parameter('lat_max', schema=NumericField(), example=55.5, description='Bounding box'),
             Parameter('lon_min', schema=NumericField(), example=5.0, description='Bounding box'),
             Parameter('lon_max', schema=NumericField(), example=5.5, description='Bounding box'),
+            Parameter(
+                'nearest',
+                schema=IntegerField(minimum=1, maximum=1000),
+                description='Requires lat and lon. Returns the nearest N ParkingSites ordered by distance, each with '
+                'an additional distance field in m. Replaces limit / start pagination by nearest_after_distance and '
+                'nearest_after_id, which are set in next_path. Not available for format geojson.',
+                example=10,
+            ),
+            Parameter('nearest_after_distance', schema=NumericField(), description='Nearest search pagination.'),
+            Parameter('nearest_after_id', schema=IntegerField(), description='Nearest search pagination.'),
             Parameter('limit', schema=IntegerField(), description='Limit results'),
             Parameter('start', schema=IntegerField(), description='Start of search query.'),
+            Parameter(
+                'count',
+                schema=EnumField(enum=CountMode),
+                description='Defaults to exact. How total_count is calculated: exact counts all matching '
+                'ParkingSites, estimated uses the estimate of the database query planner, which is way faster at large '
+                'results, and none skips total_count completely.',
+            ),
+            Parameter(
+                'has_free_capacity',
+                schema=BooleanField(),
+                description='If set to true, just ParkingSites with realtime data and free capacity are returned.',
+            ),
             Parameter('purpose', schema=EnumField(enum=PurposeType)),
             Parameter('type', schema=EnumField(enum=ParkingSiteType)),
             Parameter('not_type', schema=EnumField(enum=ParkingSiteType)),
@@ -143,6 +245,18 @@ class ParkingSiteListMethodView(ParkingSiteBaseMethodView):
                 'has_realtime_data=false and dropping its realtime fields. If set to false, this calculation is '
                 'skipped and the raw has_realtime_data value is returned.',
             ),
+            Parameter(
+                'format',
+                schema=EnumField(enum=OutputFormat),
+                description='Defaults to json. If set to geojson, a GeoJSON FeatureCollection is streamed instead, '
+                'with pagination information as foreign members.',
+            ),
+            Parameter(
+                'fields',
+                schema=ArrayField(items=StringField()),
+                description='Just for format geojson: limits the feature properties to the given fields.',
+                example='name,capacity,realtime_free_capacity',
+            ),
         ],
         response=[
             Response(
@@ -161,13 +275,50 @@ class ParkingSiteListMethodView(ParkingSiteBaseMethodView):
     )
     def get(self):
         search_query = self.validate_query_args(self.parking_site_search_query_validator)
+        output_format_input = self.validate_query_args(self.output_format_validator)
         calculate_has_realtime_data = self._get_calculate_has_realtime_data()
 
-        parking_sites = self.parking_site_handler.get_parking_site_list(search_query=search_query)
+        if search_query.nearest is not None:
+            if output_format_input.format == OutputFormat.GEOJSON:
+                raise InvalidInputException(message='Format geojson is not available for nearest search.')
 
-        parking_sites = parking_sites.map(
-            lambda parking_site: self._map_parking_site(
-                parking_site,
+            nearest_parking_sites = self.parking_site_handler.get_nearest_parking_site_list(search_query=search_query)
+            return jsonify(
+                nearest_api_response(
+                    [
+                        {
+                            **self._map_parking_site(
+                                parking_site,
+                                calculate_has_realtime_data=calculate_has_realtime_data,
+                            ),
+                            'distance': distance,
+                        }
+                        for parking_site, distance in nearest_parking_sites
+                    ],
+                    search_query,
+                    request_path=self.request_helper.get_path(),
+                    original_params=self.request_helper.get_query_args(skip_empty=True),
+                ),
+            )
+
+        if output_format_input.format == OutputFormat.GEOJSON:
+            parking_sites = self.parking_site_handler.get_parking_site_list(search_query=search_query)
+
+            return self.stream_geojson_paginated_response(
+                parking_sites,
+                search_query,
+                lambda parking_site: self._map_parking_site_feature(
+                    parking_site,
+                    fields=output_format_input.fields,
+                    calculate_has_realtime_data=calculate_has_realtime_data,
+                ),
+            )
+
+        parking_site_rows = self.parking_site_handler.get_parking_site_row_list(search_query=search_query)
+
+        parking_sites = parking_site_rows.map(
+            lambda parking_site_row: self._map_parking_site(
+                parking_site_row,
                 calculate_has_realtime_data=calculate_has_realtime_data,
             ),
         )
@@ -217,10 +368,34 @@ class ParkingSiteItemMethodView(ParkingSiteBaseMethodView):
 
 class ParkingSiteHistoryListMethodView(ParkingSiteBaseMethodView):
     parking_site_history_search_query_validator = DataclassValidator(ParkingSiteHistorySearchQueryInput)
+    parking_site_history_rollup_search_query_validator = DataclassValidator(ParkingSiteHistoryRollupSearchQueryInput)
 
     @document(
-        description='Get Parking Site History.',
+        description='Get Parking Site History. If resolution is set, hourly or daily ParkingSiteHistoryRollups are '
+        'returned instead of raw ParkingSiteHistory entries, which is way faster for longer periods. Rollups are '
+        'aggregated per full UTC hour or day, and are available a few minutes after an hour ended. History entries are '
+        'just written on changes, so each value is valid until the next entry: averages and open shares are weighted '
+        'by the time each value was valid, and periods without changes carry over the last values.',
         path=[Parameter('parking_site_id', schema=int, example=1)],
+        query=[
+            Parameter(
+                'resolution',
+                schema=EnumField(enum=ParkingSiteHistoryResolution),
+                description='Returns ParkingSiteHistoryRollups of this resolution.',
+            ),
+            Parameter(
+                'period_start_since',
+                schema=StringField(),
+                description='Just for resolution: just return rollups starting at or after this timestamp.',
+                example='2026-10-01T00:00:00Z',
+            ),
+            Parameter(
+                'period_start_until',
+                schema=StringField(),
+                description='Just for resolution: just return rollups starting at or before this timestamp.',
+                example='2026-10-19T00:00:00Z',
+            ),
+        ],
         response=[
             Response(
                 ResponseData(
@@ -234,9 +409,22 @@ class ParkingSiteHistoryListMethodView(ParkingSiteBaseMethodView):
             parking_site_restriction_component,
             parking_site_group_component,
             parking_site_history_component,
+            parking_site_history_rollup_component,
         ],
     )
     def get(self, parking_site_id: int):
+        rollup_search_query = self.validate_query_args(self.parking_site_history_rollup_search_query_validator)
+
+        if rollup_search_query.resolution is not None:
+            parking_site_history_rollups = self.parking_site_handler.get_parking_site_history_rollup_list(
+                parking_site_id,
+                search_query=rollup_search_query,
+            )
+
+            parking_site_history_rollups = parking_site_history_rollups.map(ParkingSiteHistoryRollup.to_dict)
+
+            return self.jsonify_paginated_response(parking_site_history_rollups, rollup_search_query)
+
         search_query = self.validate_query_args(self.parking_site_history_search_query_validator)
 
         parking_site_history_items = self.parking_site_handler.get_parking_site_history_list(
@@ -247,3 +435,141 @@ class ParkingSiteHistoryListMethodView(ParkingSiteBaseMethodView):
         parking_site_history_items = parking_site_history_items.map(ParkingSiteHistory.to_dict)
 
         return self.jsonify_paginated_response(parking_site_history_items, search_query)
+
+
+class ParkingSiteHistoryExportMethodView(ParkingSiteBaseMethodView):
+    parking_site_history_export_validator = DataclassValidator(ParkingSiteHistoryExportInput)
+
+    @document(
+        description='Export Parking Site History of many Parking Sites at once, streamed as one file. Formats arrow '
+        '(Arrow IPC stream) and parquet are just available if the server has pyarrow installed. Exports are limited '
+        'to 31 days by default.',
+        query=[
+            Parameter(
+                'format',
+                schema=EnumField(enum=ParkingSiteHistoryExportFormat),
+                description='Defaults to csv.',
+            ),
+            Parameter(
+                'source_uids',
+                schema=ArrayField(items=StringField()),
+                example='source-uid-1,source-uid-2',
+            ),
+            Parameter('parking_site_ids', schema=ArrayField(items=IntegerField()), example='1,2'),
+            Parameter(
+                'created_at_since',
+                schema=StringField(),
+                description='Required. Just export history created at or after this timestamp.',
+                example='2026-10-01T00:00:00Z',
+            ),
+            Parameter(
+                'created_at_until',
+                schema=StringField(),
+                description='Defaults to now. Just export history created before this timestamp.',
+                example='2026-11-01T00:00:00Z',
+            ),
+            Parameter(
+                'fields',
+                schema=ArrayField(items=StringField()),
+                description='Exported fields. Defaults to all fields which are not deprecated.',
+                example=','.join(PARKING_SITE_HISTORY_EXPORT_DEFAULT_FIELDS),
+            ),
+        ],
+    )
+    def get(self):
+        export_input = self.validate_query_args(self.parking_site_history_export_validator)
+
+        chunks = self.parking_site_handler.get_parking_site_history_export(export_input)
+
+        response = make_response(stream_with_context(chunks))
+        response.mimetype = export_input.format.mimetype
+        response.headers['Content-Disposition'] = (
+            f'attachment; filename="parking-site-history.{export_input.format.value}"'
+        )
+
+        return response
+
+
+class ParkingSiteRealtimeListMethodView(ParkingSiteBaseMethodView):
+    realtime_delta_validator = DataclassValidator(RealtimeDeltaInput)
+
+    @document(
+        description='Get just the realtime data of Parking Sites and realtime values of restrictions, ordered by '
+        'realtime_data_updated_at. Made for frequent polling: pass next_since of the last response as since to get '
+        'just realtime data which changed in the meantime.',
+        query=[
+            Parameter(
+                'since',
+                schema=StringField(),
+                description='Just return realtime data updated after this timestamp. Microseconds are supported.',
+                example='2026-10-19T08:10:12.123456Z',
+            ),
+            Parameter('since_id', schema=IntegerField(), description='Continues a limited page, requires since.'),
+            Parameter('limit', schema=IntegerField(), description='Limit results, maximum is 10000.'),
+        ],
+        response=[parking_site_realtime_response],
+    )
+    def get(self):
+        realtime_delta_input = self.validate_query_args(self.realtime_delta_validator)
+
+        parking_sites_realtime = self.parking_site_handler.get_parking_site_realtime_list(realtime_delta_input)
+
+        return jsonify(
+            realtime_delta_response(
+                parking_sites_realtime,
+                realtime_delta_input,
+                request_path=self.request_helper.get_path(),
+                original_params=self.request_helper.get_query_args(skip_empty=True),
+            ),
+        )
+
+
+class ParkingSiteStreamMethodView(ParkingSiteBaseMethodView):
+    parking_site_stream_validator = DataclassValidator(ParkingSiteStreamInput)
+
+    @document(
+        description='Stream realtime changes of Parking Sites as Server-Sent Events. Each `realtime` event contains the '
+        'same data as an item of /parking-sites/realtime, and is sent when a realtime import committed. A comment is '
+        'sent as heartbeat if there were no events for some seconds. Streams are closed after a few minutes: '
+        'reconnect with the Last-Event-ID header to resume without missing events, which EventSource clients do '
+        'automatically. If there are too many open streams, 503 is returned.',
+        query=[
+            Parameter('source_uid', schema=StringField(), description='Just stream Parking Sites of this source.'),
+            Parameter('ids', schema=StringField(), description='Comma separated list of Parking Site ids.'),
+            Parameter('lat_min', schema=NumericField(), description='Bounding box, requires all four parameters.'),
+            Parameter('lat_max', schema=NumericField()),
+            Parameter('lon_min', schema=NumericField()),
+            Parameter('lon_max', schema=NumericField()),
+        ],
+    )
+    def get(self):
+        stream_input = self.validate_query_args(self.parking_site_stream_validator)
+
+        subscription, events = self.parking_site_handler.open_parking_site_stream(
+            stream_input,
+            last_event_id=self.request_helper.get_header('Last-Event-ID'),
+        )
+
+        response = make_response(events)
+        response.mimetype = 'text/event-stream'
+        response.headers['Cache-Control'] = 'no-cache'
+        # Disables response buffering at nginx
+        response.headers['X-Accel-Buffering'] = 'no'
+        response.call_on_close(subscription.close)
+        return response
+
+
+class ParkingSiteVectorTileMethodView(ParkingSiteBaseMethodView):
+    @document(
+        description='Get Parking Sites as Mapbox Vector Tile with a layer `parking_sites`. Features just contain minimal '
+        'static and realtime attributes, details can be fetched via the feature id.',
+        path=[
+            Parameter('z', schema=int, example=14),
+            Parameter('x', schema=int, example=8710),
+            Parameter('y', schema=int, example=5627),
+        ],
+    )
+    def get(self, z: int, x: int, y: int):
+        response = make_response(self.parking_site_handler.get_parking_site_vector_tile(z, x, y))
+        response.mimetype = 'application/vnd.mapbox-vector-tile'
+        return response
@@ -3,13 +3,104 @@ Copyright 2024 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
+from datetime import datetime
+from decimal import Decimal
 from typing import Optional
 
-from validataclass.validators import IntegerValidator
-from validataclass_search_queries.filters import SearchParamEquals
+from validataclass.dataclasses import Default, validataclass
+from validataclass.exceptions import ValidationError
+from validataclass.validators import (
+    AnyOfValidator,
+    EnumValidator,
+    IntegerValidator,
+    NumericValidator,
+    StringValidator,
+)
+from validataclass_search_queries.filters import SearchParamEquals, SearchParamSince, SearchParamUntil
 from validataclass_search_queries.search_queries import BaseSearchQuery, search_query_dataclass
 
+from webapp.common.validation import DateTimeToUtcValidator
+from webapp.common.validation.list_validators import CommaSeparatedListValidator
+from webapp.models import ParkingSiteHistoryResolution
+from webapp.shared.parking_site.parking_site_realtime_event import ParkingSiteRealtimeEvent
+from webapp.shared.parking_site_history.parking_site_history_export import (
+    PARKING_SITE_HISTORY_EXPORT_DEFAULT_FIELDS,
+    PARKING_SITE_HISTORY_EXPORT_FIELDS,
+    ParkingSiteHistoryExportFormat,
+)
+
 
 @search_query_dataclass
 class ParkingSiteHistorySearchQueryInput(BaseSearchQuery):
     parking_site_id: Optional[int] = SearchParamEquals(), IntegerValidator(min_value=1)
+
+
+@search_query_dataclass
+class ParkingSiteHistoryRollupSearchQueryInput(BaseSearchQuery):
+    parking_site_id: Optional[int] = SearchParamEquals(), IntegerValidator(min_value=1)
+    resolution: Optional[ParkingSiteHistoryResolution] = (
+        SearchParamEquals(),
+        EnumValidator(ParkingSiteHistoryResolution),
+    )
+    period_start_since: Optional[datetime] = SearchParamSince('period_start'), DateTimeToUtcValidator()
+    period_start_until: Optional[datetime] = SearchParamUntil('period_start'), DateTimeToUtcValidator()
+
+
+@validataclass
+class ParkingSiteHistoryExportInput:
+    format: ParkingSiteHistoryExportFormat = (
+        EnumValidator(ParkingSiteHistoryExportFormat),
+        Default(ParkingSiteHistoryExportFormat.CSV),
+    )
+    source_uids: list[str] | None = CommaSeparatedListValidator(StringValidator(min_length=1)), Default(None)
+    parking_site_ids: list[int] | None = (
+        CommaSeparatedListValidator(IntegerValidator(min_value=1, allow_strings=True)),
+        Default(None),
+    )
+    created_at_since: datetime = DateTimeToUtcValidator()
+    created_at_until: datetime | None = DateTimeToUtcValidator(), Default(None)
+    fields: list[str] = (
+        CommaSeparatedListValidator(AnyOfValidator(PARKING_SITE_HISTORY_EXPORT_FIELDS)),
+        Default(PARKING_SITE_HISTORY_EXPORT_DEFAULT_FIELDS),
+    )
+
+    def __post_init__(self):
+        if not self.format.is_available:
+            raise ValidationError(reason=f'format {self.format.value} is not available at this server')
+        if self.created_at_until is not None and self.created_at_until <= self.created_at_since:
+            raise ValidationError(reason='created_at_until has to be after created_at_since')
+
+
+@validataclass
+class ParkingSiteStreamInput:
+    source_uid: str | None = StringValidator(min_length=1), Default(None)
+    ids: list[int] | None = (
+        CommaSeparatedListValidator(IntegerValidator(min_value=1, allow_strings=True)),
+        Default(None),
+    )
+    lat_min: Decimal | None = NumericValidator(), Default(None)
+    lat_max: Decimal | None = NumericValidator(), Default(None)
+    lon_min: Decimal | None = NumericValidator(), Default(None)
+    lon_max: Decimal | None = NumericValidator(), Default(None)
+
+    def __post_init__(self):
+        bbox = [self.lat_min, self.lat_max, self.lon_min, self.lon_max]
+        if any(value is not None for value in bbox) and any(value is None for value in bbox):
+            raise ValidationError(reason='lat_min, lat_max, lon_min and lon_max have all to be set if one is set')
+
+    def get_bbox(self) -> tuple[Decimal, Decimal, Decimal, Decimal] | None:
+        if self.lat_min is None:
+            return None
+        return self.lat_min, self.lat_max, self.lon_min, self.lon_max
+
+    def matches(self, source_id: int | None, event: ParkingSiteRealtimeEvent) -> bool:
+        if source_id is not None and event.source_id != source_id:
+            return False
+        if self.ids is not None and event.parking_site_id not in self.ids:
+            return False
+        if self.lat_min is not None and not (
+            self.lat_min <= Decimal(str(event.lat)) <= self.lat_max
+            and self.lon_min <= Decimal(str(event.lon)) <= self.lon_max
+        ):
+            return False
+        return True
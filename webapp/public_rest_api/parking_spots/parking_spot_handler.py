@@ -3,18 +3,33 @@ Copyright 2025 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
+from datetime import datetime, timedelta, timezone
+
 from validataclass_search_queries.pagination import PaginatedResult
 
+from webapp.common.rest.exceptions import InvalidInputException
+from webapp.common.vector_tile import VectorTileCache, is_valid_tile
 from webapp.models import ParkingSpot
 from webapp.public_rest_api.base_handler import PublicApiBaseHandler
 from webapp.public_rest_api.parking_spots.parking_spot_validators import ParkingSpotSearchInput
-from webapp.repositories import ParkingSpotRepository
+from webapp.public_rest_api.realtime_delta import RealtimeDeltaInput
+from webapp.repositories import ParkingSpotRepository, SourceRepository
+from webapp.repositories.parking_spot_repository import ParkingSpotRealtime
 
 
 class ParkingSpotHandler(PublicApiBaseHandler):
-    def __init__(self, *args, parking_spot_repository: ParkingSpotRepository, **kwargs):
+    def __init__(
+        self,
+        *args,
+        parking_spot_repository: ParkingSpotRepository,
+        source_repository: SourceRepository,
+        vector_tile_cache: VectorTileCache,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         self.parking_spot_repository = parking_spot_repository
+        self.source_repository = source_repository
+        self.vector_tile_cache = vector_tile_cache
 
     def get_parking_spot_list(self, search_query: ParkingSpotSearchInput) -> PaginatedResult:
         return self.parking_spot_repository.fetch_parking_spots(
@@ -24,6 +39,14 @@ class ParkingSpotHandler(PublicApiBaseHandler):
             include_tags=True,
         )
 
+    def get_nearest_parking_spot_list(self, search_query: ParkingSpotSearchInput) -> list[tuple[ParkingSpot, float]]:
+        return self.parking_spot_repository.fetch_nearest_parking_spots(
+            search_query=search_query,
+            include_restrictions=True,
+            include_external_identifiers=True,
+            include_tags=True,
+        )
+
     def get_parking_spot_item(self, parking_spot_id: int) -> ParkingSpot:
         return self.parking_spot_repository.fetch_parking_spot_by_id(
             parking_spot_id,
@@ -31,3 +54,29 @@ class ParkingSpotHandler(PublicApiBaseHandler):
             include_external_identifiers=True,
             include_tags=True,
         )
+
+    def get_parking_spot_realtime_list(self, realtime_delta_input: RealtimeDeltaInput) -> list[ParkingSpotRealtime]:
+        return self.parking_spot_repository.fetch_parking_spot_realtime_data(
+            since=realtime_delta_input.since,
+            since_id=realtime_delta_input.since_id,
+            limit=realtime_delta_input.limit,
+        )
+
+    def get_parking_spot_vector_tile(self, z: int, x: int, y: int) -> bytes:
+        if not is_valid_tile(z, x, y):
+            raise InvalidInputException(message=f'Invalid tile {z}/{x}/{y}.')
+
+        realtime_data_updated_since = datetime.now(tz=timezone.utc) - timedelta(
+            minutes=self.config_helper.get('UNSET_REALTIME_AFTER_MINUTES', 30),
+        )
+
+        return self.vector_tile_cache.get_or_render(
+            ('parking_spots', z, x, y),
+            source_generations=self.source_repository.fetch_source_generations(),
+            render=lambda: self.parking_spot_repository.fetch_parking_spot_vector_tile(
+                z,
+                x,
+                y,
+                realtime_data_updated_since=realtime_data_updated_since,
+            ),
+        )
@@ -3,7 +3,7 @@ Copyright 2025 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
-from flask import jsonify
+from flask import jsonify, make_response
 from flask_openapi.decorator import (
     ExampleListReference,
     ExampleReference,
@@ -14,18 +14,24 @@ from flask_openapi.decorator import (
     SchemaReference,
     document,
 )
-from flask_openapi.schema import ArrayField, BooleanField, IntegerField, NumericField, StringField
+from flask_openapi.schema import ArrayField, BooleanField, EnumField, IntegerField, NumericField, StringField
 from validataclass.validators import BooleanValidator, DataclassValidator
 
+from webapp.common.pagination import CountMode
+from webapp.common.rest.exceptions import InvalidInputException
 from webapp.dependencies import dependencies
 from webapp.models import ParkingSpot
 from webapp.public_rest_api.base_blueprint import PublicApiBaseBlueprint
 from webapp.public_rest_api.base_method_view import PublicApiBaseMethodView
+from webapp.public_rest_api.output_format import OutputFormat, OutputFormatInput
+from webapp.public_rest_api.realtime_delta import RealtimeDeltaInput, realtime_delta_response
+from webapp.shared.nearest_search import nearest_api_response
 from webapp.shared.parking_restriction.parking_restriction_schema import parking_spot_restriction_component
 from webapp.shared.parking_spot.parking_spot_schema import parking_spot_component
 from webapp.shared.sources.source_schema import source_component
 
 from .parking_spot_handler import ParkingSpotHandler
+from .parking_spot_realtime_schema import parking_spot_realtime_response
 from .parking_spot_validators import ParkingSpotSearchInput
 
 
@@ -39,6 +45,8 @@ class ParkingSpotBlueprint(PublicApiBaseBlueprint):
         self.parking_spot_handler = ParkingSpotHandler(
             **self.get_base_handler_dependencies(),
             parking_spot_repository=dependencies.get_parking_spot_repository(),
+            source_repository=dependencies.get_source_repository(),
+            vector_tile_cache=dependencies.get_vector_tile_cache(),
         )
 
         self.add_url_rule(
@@ -50,6 +58,24 @@ class ParkingSpotBlueprint(PublicApiBaseBlueprint):
             ),
         )
 
+        self.add_url_rule(
+            '/realtime',
+            view_func=ParkingSpotRealtimeListMethodView.as_view(
+                'parking-spots-realtime',
+                **self.get_base_method_view_dependencies(),
+                parking_spot_handler=self.parking_spot_handler,
+            ),
+        )
+
+        self.add_url_rule(
+            '/tiles/<int:z>/<int:x>/<int:y>.mvt',
+            view_func=ParkingSpotVectorTileMethodView.as_view(
+                'parking-spots-vector-tile',
+                **self.get_base_method_view_dependencies(),
+                parking_spot_handler=self.parking_spot_handler,
+            ),
+        )
+
         self.add_url_rule(
             '/<int:parking_spot_id>',
             view_func=ParkingSpotItemMethodView.as_view(
@@ -74,21 +100,38 @@ class ParkingSpotBaseMethodView(PublicApiBaseMethodView):
         raw_value = self.request_helper.get_query_args(skip_empty=True).get('calculate_has_realtime_data', 'true')
         return self.calculate_has_realtime_data_validator.validate(raw_value)
 
-    def _map_parking_spot(self, parking_spot: ParkingSpot, *, calculate_has_realtime_data: bool = True) -> dict:
-        unset_realtime_after_minutes = None
-        if calculate_has_realtime_data:
-            unset_realtime_after_minutes = self.config_helper.get('UNSET_REALTIME_AFTER_MINUTES', 30)
+    def _get_unset_realtime_after_minutes(self, calculate_has_realtime_data: bool) -> int | None:
+        if not calculate_has_realtime_data:
+            return None
+        return self.config_helper.get('UNSET_REALTIME_AFTER_MINUTES', 30)
 
+    def _map_parking_spot(self, parking_spot: ParkingSpot, *, calculate_has_realtime_data: bool = True) -> dict:
         return parking_spot.to_dict(
             include_restrictions=True,
             include_external_identifiers=True,
             include_tags=True,
-            unset_realtime_after_minutes=unset_realtime_after_minutes,
+            unset_realtime_after_minutes=self._get_unset_realtime_after_minutes(calculate_has_realtime_data),
+        )
+
+    def _map_parking_spot_feature(
+        self,
+        parking_spot: ParkingSpot,
+        *,
+        fields: list[str] | None = None,
+        calculate_has_realtime_data: bool = True,
+    ) -> str:
+        return parking_spot.to_geojson_feature(
+            fields=fields,
+            include_restrictions=True,
+            include_external_identifiers=True,
+            include_tags=True,
+            unset_realtime_after_minutes=self._get_unset_realtime_after_minutes(calculate_has_realtime_data),
         )
 
 
 class ParkingSpotListMethodView(ParkingSpotBaseMethodView):
     parking_spot_search_query_validator = DataclassValidator(ParkingSpotSearchInput)
+    output_format_validator = DataclassValidator(OutputFormatInput)
 
     @document(
         description=(
@@ -106,8 +149,30 @@ class ParkingSpotListMethodView(ParkingSpotBaseMethodView):
             Parameter('lat', schema=NumericField(), example=55.5),
             Parameter('lon', schema=NumericField(), example=55.5),
             Parameter('radius', schema=NumericField(), description='Radius, in m', example='3500'),
+            Parameter(
+                'nearest',
+                schema=IntegerField(minimum=1, maximum=1000),
+                description='Requires lat and lon. Returns the nearest N ParkingSpots ordered by distance, each with '
+                'an additional distance field in m. Replaces limit / start pagination by nearest_after_distance and '
+                'nearest_after_id, which are set in next_path. Not available for format geojson.',
+                example=10,
+            ),
+            Parameter('nearest_after_distance', schema=NumericField(), description='Nearest search pagination.'),
+            Parameter('nearest_after_id', schema=IntegerField(), description='Nearest search pagination.'),
             Parameter('limit', schema=IntegerField(), description='Limit results'),
             Parameter('start', schema=IntegerField(), description='Start of search query.'),
+            Parameter(
+                'count',
+                schema=EnumField(enum=CountMode),
+                description='Defaults to exact. How total_count is calculated: exact counts all matching '
+                'ParkingSpots, estimated uses the estimate of the database query planner, which is way faster at large '
+                'results, and none skips total_count completely.',
+            ),
+            Parameter(
+                'has_free_capacity',
+                schema=BooleanField(),
+                description='If set to true, just ParkingSpots with realtime status available are returned.',
+            ),
             Parameter('lat_min', schema=NumericField(), example=55.0, description='Bounding box'),
             Parameter('lat_max', schema=NumericField(), example=55.5, description='Bounding box'),
             Parameter('lon_min', schema=NumericField(), example=5.0, description='Bounding box'),
@@ -120,6 +185,18 @@ class ParkingSpotListMethodView(ParkingSpotBaseMethodView):
                 'has_realtime_data=false and dropping its realtime fields. If set to false, this calculation is '
                 'skipped and the raw has_realtime_data value is returned.',
             ),
+            Parameter(
+                'format',
+                schema=EnumField(enum=OutputFormat),
+                description='Defaults to json. If set to geojson, a GeoJSON FeatureCollection is streamed instead, '
+                'with pagination information as foreign members.',
+            ),
+            Parameter(
+                'fields',
+                schema=ArrayField(items=StringField()),
+                description='Just for format geojson: limits the feature properties to the given fields.',
+                example='name,realtime_status',
+            ),
         ],
         response=[
             Response(
@@ -133,10 +210,45 @@ class ParkingSpotListMethodView(ParkingSpotBaseMethodView):
     )
     def get(self):
         search_query = self.validate_query_args(self.parking_spot_search_query_validator)
+        output_format_input = self.validate_query_args(self.output_format_validator)
         calculate_has_realtime_data = self._get_calculate_has_realtime_data()
 
+        if search_query.nearest is not None:
+            if output_format_input.format == OutputFormat.GEOJSON:
+                raise InvalidInputException(message='Format geojson is not available for nearest search.')
+
+            nearest_parking_spots = self.parking_spot_handler.get_nearest_parking_spot_list(search_query=search_query)
+            return jsonify(
+                nearest_api_response(
+                    [
+                        {
+                            **self._map_parking_spot(
+                                parking_spot,
+                                calculate_has_realtime_data=calculate_has_realtime_data,
+                            ),
+                            'distance': distance,
+                        }
+                        for parking_spot, distance in nearest_parking_spots
+                    ],
+                    search_query,
+                    request_path=self.request_helper.get_path(),
+                    original_params=self.request_helper.get_query_args(skip_empty=True),
+                ),
+            )
+
         parking_spots = self.parking_spot_handler.get_parking_spot_list(search_query=search_query)
 
+        if output_format_input.format == OutputFormat.GEOJSON:
+            return self.stream_geojson_paginated_response(
+                parking_spots,
+                search_query,
+                lambda parking_spot: self._map_parking_spot_feature(
+                    parking_spot,
+                    fields=output_format_input.fields,
+                    calculate_has_realtime_data=calculate_has_realtime_data,
+                ),
+            )
+
         parking_spots = parking_spots.map(
             lambda parking_spot: self._map_parking_spot(
                 parking_spot,
@@ -179,3 +291,53 @@ class ParkingSpotItemMethodView(ParkingSpotBaseMethodView):
                 calculate_has_realtime_data=self._get_calculate_has_realtime_data(),
             ),
         )
+
+
+class ParkingSpotRealtimeListMethodView(ParkingSpotBaseMethodView):
+    realtime_delta_validator = DataclassValidator(RealtimeDeltaInput)
+
+    @document(
+        description='Get just the realtime data of Parking Spots, ordered by '
+        'realtime_data_updated_at. Made for frequent polling: pass next_since of the last response as since to get '
+        'just realtime data which changed in the meantime.',
+        query=[
+            Parameter(
+                'since',
+                schema=StringField(),
+                description='Just return realtime data updated after this timestamp. Microseconds are supported.',
+                example='2026-10-19T08:10:12.123456Z',
+            ),
+            Parameter('since_id', schema=IntegerField(), description='Continues a limited page, requires since.'),
+            Parameter('limit', schema=IntegerField(), description='Limit results, maximum is 10000.'),
+        ],
+        response=[parking_spot_realtime_response],
+    )
+    def get(self):
+        realtime_delta_input = self.validate_query_args(self.realtime_delta_validator)
+
+        parking_spots_realtime = self.parking_spot_handler.get_parking_spot_realtime_list(realtime_delta_input)
+
+        return jsonify(
+            realtime_delta_response(
+                parking_spots_realtime,
+                realtime_delta_input,
+                request_path=self.request_helper.get_path(),
+                original_params=self.request_helper.get_query_args(skip_empty=True),
+            ),
+        )
+
+
+class ParkingSpotVectorTileMethodView(ParkingSpotBaseMethodView):
+    @document(
+        description='Get Parking Spots as Mapbox Vector Tile with a layer `parking_spots`. Features just contain minimal '
+        'static and realtime attributes, details can be fetched via the feature id.',
+        path=[
+            Parameter('z', schema=int, example=14),
+            Parameter('x', schema=int, example=8710),
+            Parameter('y', schema=int, example=5627),
+        ],
+    )
+    def get(self, z: int, x: int, y: int):
+        response = make_response(self.parking_spot_handler.get_parking_spot_vector_tile(z, x, y))
+        response.mimetype = 'application/vnd.mapbox-vector-tile'
+        return response
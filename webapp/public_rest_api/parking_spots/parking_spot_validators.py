@@ -9,15 +9,24 @@ from typing import Optional
 from parkapi_sources.models import ParkingSiteType
 from validataclass.dataclasses import Default
 from validataclass.exceptions import ValidationError
-from validataclass.validators import EnumValidator, IntegerValidator, NumericValidator, StringValidator
+from validataclass.validators import (
+    BooleanValidator,
+    EnumValidator,
+    IntegerValidator,
+    NumericValidator,
+    StringValidator,
+)
 from validataclass_search_queries.filters import SearchParamCustom, SearchParamEquals, SearchParamMultiSelect
 from validataclass_search_queries.pagination import CursorPaginationMixin, PaginationLimitValidator
 from validataclass_search_queries.search_queries import BaseSearchQuery, search_query_dataclass
 from validataclass_search_queries.validators import MultiSelectValidator
 
+from webapp.common.pagination import CountModeMixin
+from webapp.shared.nearest_search import validate_nearest_search
+
 
 @search_query_dataclass
-class ParkingSpotSearchInput(CursorPaginationMixin, BaseSearchQuery):
+class ParkingSpotSearchInput(CountModeMixin, CursorPaginationMixin, BaseSearchQuery):
     source_id: Optional[int] = SearchParamEquals(), IntegerValidator(allow_strings=True)
     parking_site_id: Optional[int] = SearchParamEquals(), IntegerValidator(allow_strings=True)
     source_uid: Optional[str] = SearchParamEquals(), StringValidator()
@@ -34,10 +43,18 @@ class ParkingSpotSearchInput(CursorPaginationMixin, BaseSearchQuery):
     lon_min: Optional[Decimal] = SearchParamCustom(), NumericValidator()
     lon_max: Optional[Decimal] = SearchParamCustom(), NumericValidator()
 
+    has_free_capacity: bool | None = SearchParamCustom(), BooleanValidator(allow_strings=True)
+
+    nearest: int | None = SearchParamCustom(), IntegerValidator(min_value=1, max_value=1000, allow_strings=True)
+    nearest_after_distance: Decimal | None = SearchParamCustom(), NumericValidator(min_value=0)
+    nearest_after_id: int | None = SearchParamCustom(), IntegerValidator(min_value=0, allow_strings=True)
+
     limit: int | None = PaginationLimitValidator(max_value=1000), Default(None)
 
     def __post_init__(self):
-        if (self.lat is not None or self.lon is not None or self.radius is not None) and not (
+        if self.nearest is not None:
+            validate_nearest_search(self)
+        elif (self.lat is not None or self.lon is not None or self.radius is not None) and not (
             (self.lat and self.lon) and self.radius
         ):
             raise ValidationError(reason='lat, lon and radius have all to be set if one is set')
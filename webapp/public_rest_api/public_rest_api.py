@@ -4,8 +4,10 @@ Use of this source code is governed by an MIT-style license that can be found in
 """
 
 from webapp.common.blueprint import Blueprint
+from webapp.common.sqlalchemy import use_read_replica
 
 from .base_blueprint import PublicApiBaseBlueprint
+from .changes import ChangesBlueprint
 from .datex2 import Datex2Blueprint
 from .park_api_v1 import ParkApiV1Blueprint
 from .park_api_v2 import ParkApiV2Blueprint
@@ -18,6 +20,7 @@ class PublicRestApi(Blueprint):
     documentation_base = True
 
     blueprints_classes: list[type[PublicApiBaseBlueprint]] = [
+        ChangesBlueprint,
         Datex2Blueprint,
         ParkApiV1Blueprint,
         ParkApiV2Blueprint,
@@ -29,5 +32,8 @@ class PublicRestApi(Blueprint):
     def __init__(self):
         super().__init__('public', __name__, url_prefix='/api/public')
 
+        # The public API just reads, so it's served by the read replica, if configured
+        self.before_request(use_read_replica)
+
         for blueprint_class in self.blueprints_classes:
             self.register_blueprint(blueprint_class())
@@ -0,0 +1,64 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from datetime import datetime
+
+from validataclass.dataclasses import Default, validataclass
+from validataclass.exceptions import ValidationError
+from validataclass.validators import IntegerValidator
+
+from webapp.common.validation import DateTimeToUtcValidator
+
+
+@validataclass
+class RealtimeDeltaInput:
+    # Milliseconds are kept, as the cursor has to be exact
+    since: datetime | None = DateTimeToUtcValidator(discard_milliseconds=False), Default(None)
+    since_id: int | None = IntegerValidator(min_value=0, allow_strings=True), Default(None)
+    limit: int | None = IntegerValidator(min_value=1, max_value=10000, allow_strings=True), Default(None)
+
+    def __post_init__(self):
+        if self.since_id is not None and self.since is None:
+            raise ValidationError(reason='since_id requires since')
+
+
+def format_cursor_datetime(value: datetime) -> str:
+    # Default JSON output drops microseconds, which would break the cursor
+    return value.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def realtime_delta_response(
+    items: list,
+    realtime_delta_input: RealtimeDeltaInput,
+    *,
+    request_path: str,
+    original_params: dict,
+) -> dict:
+    """
+    Builds the realtime delta response. Items have to provide `id`, `realtime_data_updated_at` and `to_dict()`, and
+    have to be ordered by `realtime_data_updated_at` and `id`.
+
+    `next_since` is the cursor for the next poll. If the result was limited and the page is full, `next_since_id` and
+    `next_path` are set in addition, as there might be more items with the same timestamp.
+    """
+    response: dict = {'items': [item.to_dict() for item in items]}
+
+    if not items:
+        if realtime_delta_input.since is not None:
+            response['next_since'] = format_cursor_datetime(realtime_delta_input.since)
+        return response
+
+    response['next_since'] = format_cursor_datetime(items[-1].realtime_data_updated_at)
+
+    if realtime_delta_input.limit is not None and len(items) >= realtime_delta_input.limit:
+        response['next_since_id'] = items[-1].id
+        next_params = {
+            **original_params,
+            'since': response['next_since'],
+            'since_id': items[-1].id,
+        }
+        response['next_path'] = f'{request_path}?{"&".join(f"{key}={value}" for key, value in next_params.items())}'
+
+    return response
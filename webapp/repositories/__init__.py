@@ -4,9 +4,12 @@ Use of this source code is governed by an MIT-style license that can be found in
 """
 
 from .base_repository import BaseRepository
+from .change_log_entry_repository import ChangeLogEntryRepository
 from .official_region_code_repository import OfficialRegionCodeRepository
 from .parking_site_group_repository import ParkingSiteGroupRepository
 from .parking_site_history_repository import ParkingSiteHistoryRepository
+from .parking_site_history_rollup_repository import ParkingSiteHistoryRollupRepository
 from .parking_site_repository import ParkingSiteRepository
 from .parking_spot_repository import ParkingSpotRepository
+from .pending_duplicate_repository import PendingDuplicateRepository
 from .source_repository import SourceRepository
@@ -3,12 +3,17 @@ Copyright 2023 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
+import json
 from abc import ABC, abstractmethod
 from typing import Any, Generic, Optional, Type, TypeVar
 
-from sqlalchemy.orm import scoped_session
+from sqlalchemy.orm import Query, scoped_session
+from validataclass_search_queries.pagination import AbstractPaginationMixin, PaginatedResult
 from validataclass_search_queries.repositories import SearchQueryRepositoryMixin
+from validataclass_search_queries.search_queries import BaseSearchQuery
 
+from webapp.common.pagination import CountMode
+from webapp.common.sqlalchemy import Explain
 from webapp.models import BaseModel
 from webapp.repositories.exceptions import ObjectNotFoundException
 
@@ -76,6 +81,68 @@ class BaseRepository(SearchQueryRepositoryMixin[T_Model], Generic[T_Model], ABC)
             f'{resource_name or self.model_cls.__name__} with ID {resource_id} was not found.',
         )
 
+    def _paginate_result(
+        self,
+        query: Query,
+        search_query: Optional[BaseSearchQuery],
+        *,
+        count_query: Optional[Query] = None,
+    ) -> PaginatedResult[T_Model]:
+        """
+        Extends the default pagination by the count modes of `CountModeMixin`. Independent of the count mode, the count
+        query is skipped if the page itself tells the total count, which is the case for unpaginated queries and for
+        first pages which are not full.
+
+        `count_query` replaces `query` for counting, e.g. to leave out expensive columns which don't change the count.
+        """
+        paginated_query = query
+        limit = None
+        if search_query is not None and isinstance(search_query, AbstractPaginationMixin):
+            paginated_query = search_query.apply_pagination_to_query(query, self.model_cls)
+            limit = search_query.limit
+
+        items = paginated_query.all()
+
+        is_first_page = not getattr(search_query, 'start', None) and not getattr(search_query, 'offset', None)
+        if limit is None or (is_first_page and len(items) < limit):
+            return PaginatedResult(items, total_count=len(items))
+
+        if count_query is None:
+            count_query = query
+
+        count_mode = getattr(search_query, 'count', CountMode.EXACT)
+        if count_mode == CountMode.NONE:
+            total_count = None
+        elif count_mode == CountMode.ESTIMATED:
+            total_count = max(self._estimate_count(count_query), len(items))
+        else:
+            total_count = count_query.count()
+
+        return PaginatedResult(items, total_count=total_count)
+
+    def _estimate_count(self, query: Query) -> int:
+        """
+        Returns the row estimate of the query planner, which is based on table statistics and doesn't scan any rows.
+        """
+        statement = query.with_entities(self.model_cls.id).order_by(None).statement
+        connection = self.session.connection()
+
+        engine_name = connection.dialect.name
+        if engine_name == 'postgresql':
+            plan = connection.execute(Explain(statement, json_format=True)).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+
+        if engine_name == 'mysql':
+            # Rows of joined tables multiply, filtered is the estimated percentage of rows matching the conditions
+            estimate = 1.0
+            for row in connection.execute(Explain(statement)).mappings():
+                estimate *= (row['rows'] or 0) * (row['filtered'] or 100) / 100
+            return int(estimate)
+
+        raise NotImplementedError('The application just supports mysql, mariadb and postgresql.')
+
     @staticmethod
     def _or_raise(
         resource: Optional[Any],
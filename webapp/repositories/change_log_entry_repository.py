@@ -0,0 +1,87 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.orm import aliased
+
+from webapp.common.sqlalchemy import OldestRunningTransactionId
+from webapp.models import ChangeLogAction, ChangeLogEntry
+from webapp.repositories import BaseRepository
+
+
+class ChangeLogEntryRepository(BaseRepository[ChangeLogEntry]):
+    model_cls = ChangeLogEntry
+
+    def fetch_change_log_entries(
+        self,
+        *,
+        after: int = 0,
+        limit: int,
+        created_before: datetime | None = None,
+        source_id: int | None = None,
+    ) -> list[ChangeLogEntry]:
+        """
+        Returns the entries after the entry with id `after` in change log order. Sequence numbers are assigned at insert
+        time, but transactions commit in a different order, so entries which might still get entries of running
+        transactions before them are hidden:
+        - At PostgreSQL, entries are ordered by transaction and id, and just entries of transactions older than the
+          oldest running one are returned. All later commits are ordered after them.
+        - At MySQL, entries are ordered by id, and just entries created before `created_before` are returned.
+        """
+        engine_name = self.session.connection().dialect.name
+        if engine_name == 'postgresql':
+            query = select(ChangeLogEntry).where(ChangeLogEntry.transaction_id < OldestRunningTransactionId())
+            if after:
+                # Cursors which were compacted away start from the beginning of the log
+                after_transaction_id = (
+                    select(ChangeLogEntry.transaction_id).where(ChangeLogEntry.id == after).scalar_subquery()
+                )
+                query = query.where(
+                    tuple_(ChangeLogEntry.transaction_id, ChangeLogEntry.id)
+                    > tuple_(func.coalesce(after_transaction_id, 0), after),
+                )
+            order_by = [ChangeLogEntry.transaction_id, ChangeLogEntry.id]
+        elif engine_name == 'mysql':
+            query = select(ChangeLogEntry).where(ChangeLogEntry.id > after)
+            if created_before is not None:
+                query = query.where(ChangeLogEntry.created_at < created_before)
+            order_by = [ChangeLogEntry.id]
+        else:
+            raise NotImplementedError('The application just supports mysql, mariadb and postgresql.')
+
+        if source_id is not None:
+            query = query.where(ChangeLogEntry.source_id == source_id)
+
+        return list(self.session.scalars(query.order_by(*order_by).limit(limit)))
+
+    def delete_superseded_change_log_entries(self, created_before: datetime) -> int:
+        """
+        Compacts the log before `created_before`: just the latest entry per object is kept.
+        """
+        newer_change_log_entry = aliased(ChangeLogEntry)
+        result = self.session.execute(
+            delete(ChangeLogEntry)
+            .where(
+                ChangeLogEntry.created_at < created_before,
+                newer_change_log_entry.object_type == ChangeLogEntry.object_type,
+                newer_change_log_entry.object_id == ChangeLogEntry.object_id,
+                newer_change_log_entry.id > ChangeLogEntry.id,
+            )
+            .execution_options(synchronize_session=False),
+        )
+        return result.rowcount
+
+    def delete_tombstones(self, created_before: datetime) -> int:
+        result = self.session.execute(
+            delete(ChangeLogEntry)
+            .where(
+                ChangeLogEntry.created_at < created_before,
+                ChangeLogEntry.action == ChangeLogAction.DELETED,
+            )
+            .execution_options(synchronize_session=False),
+        )
+        return result.rowcount
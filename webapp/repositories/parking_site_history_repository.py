@@ -3,14 +3,21 @@ Copyright 2024 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
-from typing import Optional
+import re
+from datetime import datetime
+from typing import Iterator, Optional
 
+from sqlalchemy import Row, delete, func, select, text
 from validataclass_search_queries.pagination import PaginatedResult
 from validataclass_search_queries.search_queries import BaseSearchQuery
 
-from webapp.models import ParkingSiteHistory
+from webapp.models import ParkingSite, ParkingSiteHistory, Source
 from webapp.repositories import BaseRepository
 
+PARTITION_UPPER_BOUND_PATTERN = re.compile(r"TO \('([^']+)'\)")
+# Catches inserts if no partition was created in time
+DEFAULT_PARTITION_NAME = 'parking_site_history_default'
+
 
 class ParkingSiteHistoryRepository(BaseRepository):
     model_cls = ParkingSiteHistory
@@ -26,3 +33,184 @@ class ParkingSiteHistoryRepository(BaseRepository):
 
     def save_parking_site_history(self, parking_site_history: ParkingSiteHistory, *, commit: bool = True):
         self._save_resources(parking_site_history, commit=commit)
+
+    def iter_parking_site_history_columns(
+        self,
+        fields: list[str],
+        *,
+        source_uids: list[str] | None = None,
+        parking_site_ids: list[int] | None = None,
+        created_at_since: datetime | None = None,
+        created_at_until: datetime | None = None,
+        batch_size: int = 10000,
+    ) -> Iterator[Row]:
+        """
+        Streams the given history fields as plain rows, ordered by id. Rows are fetched from a server-side cursor in
+        batches of `batch_size`, so memory is bounded for any number of rows. The session has to stay open while
+        iterating.
+        """
+        query = select(*(getattr(ParkingSiteHistory, field) for field in fields))
+
+        if source_uids is not None:
+            query = query.where(
+                ParkingSiteHistory.parking_site_id.in_(
+                    select(ParkingSite.id).join(Source).where(Source.uid.in_(source_uids)),
+                ),
+            )
+        if parking_site_ids is not None:
+            query = query.where(ParkingSiteHistory.parking_site_id.in_(parking_site_ids))
+        if created_at_since is not None:
+            query = query.where(ParkingSiteHistory.created_at >= created_at_since)
+        if created_at_until is not None:
+            query = query.where(ParkingSiteHistory.created_at < created_at_until)
+
+        return iter(
+            self.session.execute(query.order_by(ParkingSiteHistory.id).execution_options(yield_per=batch_size)),
+        )
+
+    def iter_parking_site_history_changes(
+        self,
+        created_at_since: datetime,
+        created_at_until: datetime,
+        *,
+        batch_size: int = 10000,
+    ) -> Iterator[Row]:
+        """
+        Streams the realtime values of all history entries in [created_at_since, created_at_until), ordered by parking
+        site and created_at, from a server-side cursor in batches of `batch_size`.
+        """
+        query = (
+            select(
+                ParkingSiteHistory.parking_site_id,
+                ParkingSiteHistory.created_at,
+                ParkingSiteHistory.realtime_opening_status,
+                ParkingSiteHistory.realtime_free_capacity,
+            )
+            .where(
+                ParkingSiteHistory.created_at >= created_at_since,
+                ParkingSiteHistory.created_at < created_at_until,
+            )
+            .order_by(ParkingSiteHistory.parking_site_id, ParkingSiteHistory.created_at, ParkingSiteHistory.id)
+        )
+
+        return iter(self.session.execute(query.execution_options(yield_per=batch_size)))
+
+    def fetch_first_created_at(self, *, since: datetime | None = None) -> datetime | None:
+        query = select(func.min(ParkingSiteHistory.created_at))
+        if since is not None:
+            query = query.where(ParkingSiteHistory.created_at >= since)
+
+        return self.session.scalar(query)
+
+    def is_partitioned(self) -> bool:
+        if self.session.connection().dialect.name != 'postgresql':
+            return False
+
+        return self.session.execute(
+            text(
+                'SELECT EXISTS (SELECT 1 FROM pg_partitioned_table '
+                "WHERE partrelid = to_regclass('parking_site_history'))",
+            ),
+        ).scalar()
+
+    def fetch_partition_upper_bounds(self) -> dict[str, datetime | None]:
+        """
+        Returns the upper bound of each partition by name. The default partition has no upper bound.
+        """
+        rows = self.session.execute(
+            text(
+                'SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) FROM pg_inherits '
+                'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+                "WHERE pg_inherits.inhparent = to_regclass('parking_site_history')",
+            ),
+        ).all()
+
+        partition_upper_bounds: dict[str, datetime | None] = {}
+        for partition_name, partition_bound in rows:
+            match = PARTITION_UPPER_BOUND_PATTERN.search(partition_bound)
+            partition_upper_bounds[partition_name] = None if match is None else datetime.fromisoformat(match.group(1))
+
+        return partition_upper_bounds
+
+    def create_partition(self, partition_name: str, lower_bound: datetime, upper_bound: datetime) -> int:
+        """
+        Creates a partition. If entries of its range already went to the default partition, PostgreSQL refuses to
+        create it, so the default partition is detached, the entries are moved to the new partition and the default
+        partition is attached again, all within the transaction. Returns the number of moved entries.
+        """
+        partition_bounds = f"FROM ('{lower_bound.isoformat()}') TO ('{upper_bound.isoformat()}')"
+        range_params = {'lower_bound': lower_bound, 'upper_bound': upper_bound}
+
+        has_default_partition = self.session.execute(
+            text(f"SELECT to_regclass('{DEFAULT_PARTITION_NAME}') IS NOT NULL"),
+        ).scalar()
+        has_default_entries = (
+            has_default_partition
+            and self.session.execute(
+                text(
+                    f'SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION_NAME} '  # noqa: S608
+                    'WHERE created_at >= :lower_bound AND created_at < :upper_bound)',
+                ),
+                range_params,
+            ).scalar()
+        )
+        if not has_default_entries:
+            self.session.execute(
+                text(
+                    f'CREATE TABLE IF NOT EXISTS {partition_name} PARTITION OF parking_site_history '
+                    f'FOR VALUES {partition_bounds}',
+                ),
+            )
+            return 0
+
+        self.session.execute(text(f'ALTER TABLE parking_site_history DETACH PARTITION {DEFAULT_PARTITION_NAME}'))
+        self.session.execute(
+            text(f'CREATE TABLE {partition_name} PARTITION OF parking_site_history FOR VALUES {partition_bounds}'),
+        )
+        moved_count = self.session.execute(
+            text(
+                f'INSERT INTO {partition_name} SELECT * FROM {DEFAULT_PARTITION_NAME} '  # noqa: S608
+                'WHERE created_at >= :lower_bound AND created_at < :upper_bound',
+            ),
+            range_params,
+        ).rowcount
+        self.session.execute(
+            text(
+                f'DELETE FROM {DEFAULT_PARTITION_NAME} '  # noqa: S608
+                'WHERE created_at >= :lower_bound AND created_at < :upper_bound',
+            ),
+            range_params,
+        )
+        self.session.execute(
+            text(f'ALTER TABLE parking_site_history ATTACH PARTITION {DEFAULT_PARTITION_NAME} DEFAULT'),
+        )
+
+        return moved_count
+
+    def drop_partition(self, partition_name: str):
+        self.session.execute(text(f'ALTER TABLE parking_site_history DETACH PARTITION {partition_name}'))
+        self.session.execute(text(f'DROP TABLE {partition_name}'))
+
+    def delete_parking_site_history_before(self, created_before: datetime, *, limit: int) -> int:
+        """
+        Deletes at most `limit` history entries created before `created_before`, so unpartitioned tables can be cleaned
+        up in batches without long-running locks.
+        """
+        engine_name = self.session.connection().dialect.name
+        if engine_name == 'postgresql':
+            query = delete(ParkingSiteHistory).where(
+                ParkingSiteHistory.id.in_(
+                    select(ParkingSiteHistory.id).where(ParkingSiteHistory.created_at < created_before).limit(limit),
+                ),
+            )
+        elif engine_name == 'mysql':
+            query = (
+                delete(ParkingSiteHistory)
+                .where(ParkingSiteHistory.created_at < created_before)
+                .with_dialect_options(mysql_limit=limit)
+            )
+        else:
+            raise NotImplementedError('The application just supports mysql, mariadb and postgresql.')
+
+        result = self.session.execute(query.execution_options(synchronize_session=False))
+        return result.rowcount
@@ -0,0 +1,153 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from datetime import datetime, timezone
+from itertools import batched
+from typing import Iterable, Optional
+
+from sqlalchemy import Row, delete, func, insert, literal, select
+from sqlalchemy.sql import ColumnElement
+from sqlalchemy_utc import UtcDateTime
+from validataclass_search_queries.pagination import PaginatedResult
+from validataclass_search_queries.search_queries import BaseSearchQuery
+
+from webapp.models import ParkingSiteHistoryResolution, ParkingSiteHistoryRollup
+from webapp.repositories import BaseRepository
+
+ROLLUP_COLUMN_NAMES = [
+    'parking_site_id',
+    'resolution',
+    'period_start',
+    'change_count',
+    'opening_status_seconds',
+    'open_seconds',
+    'realtime_free_capacity_seconds',
+    'realtime_free_capacity_integral',
+    'realtime_free_capacity_min',
+    'realtime_free_capacity_max',
+    'created_at',
+    'modified_at',
+]
+
+
+class ParkingSiteHistoryRollupRepository(BaseRepository[ParkingSiteHistoryRollup]):
+    model_cls = ParkingSiteHistoryRollup
+
+    def fetch_parking_site_history_rollups(
+        self,
+        *,
+        search_query: Optional[BaseSearchQuery] = None,
+    ) -> PaginatedResult[ParkingSiteHistoryRollup]:
+        query = self.session.query(ParkingSiteHistoryRollup).order_by(ParkingSiteHistoryRollup.period_start)
+
+        return self._search_and_paginate(query, search_query)
+
+    def fetch_last_period_start(self, resolution: ParkingSiteHistoryResolution) -> datetime | None:
+        return self.session.scalar(
+            select(func.max(ParkingSiteHistoryRollup.period_start)).where(
+                ParkingSiteHistoryRollup.resolution == resolution,
+            ),
+        )
+
+    def fetch_hour_rollup_last_values(self, period_start: datetime) -> list[Row]:
+        """
+        Returns the values valid at the end of the hour starting at `period_start` of all parking sites with a rollup in
+        this hour, which are carried over to the next hour.
+        """
+        return self.session.execute(
+            select(
+                ParkingSiteHistoryRollup.parking_site_id,
+                ParkingSiteHistoryRollup.realtime_opening_status_last,
+                ParkingSiteHistoryRollup.realtime_free_capacity_last,
+            ).where(
+                ParkingSiteHistoryRollup.resolution == ParkingSiteHistoryResolution.HOUR,
+                ParkingSiteHistoryRollup.period_start == period_start,
+            ),
+        ).all()
+
+    def insert_rollups(self, rollups: Iterable[dict], *, batch_size: int = 10000) -> int:
+        """
+        Inserts rollups given as column dicts in batches of `batch_size`, without loading them as models.
+        """
+        rollup_count = 0
+        for rollup_batch in batched(rollups, batch_size):
+            self.session.execute(insert(ParkingSiteHistoryRollup), list(rollup_batch))
+            rollup_count += len(rollup_batch)
+
+        return rollup_count
+
+    def rollup_days(self, start: datetime, end: datetime) -> int:
+        """
+        (Re)builds the daily rollups in [start, end), which has to be at full days, from the hourly rollups. Durations
+        and time integrals add up, so the daily averages and shares are time-weighted as well. Values valid at the end
+        are just kept at hourly rollups.
+        """
+        self.delete_rollups(ParkingSiteHistoryResolution.DAY, start, end)
+
+        hour_rollup_query = (
+            select(
+                ParkingSiteHistoryRollup.parking_site_id,
+                self._get_period_start(ParkingSiteHistoryRollup.period_start, ParkingSiteHistoryResolution.DAY).label(
+                    'period_start',
+                ),
+                ParkingSiteHistoryRollup.change_count,
+                ParkingSiteHistoryRollup.opening_status_seconds,
+                ParkingSiteHistoryRollup.open_seconds,
+                ParkingSiteHistoryRollup.realtime_free_capacity_seconds,
+                ParkingSiteHistoryRollup.realtime_free_capacity_integral,
+                ParkingSiteHistoryRollup.realtime_free_capacity_min,
+                ParkingSiteHistoryRollup.realtime_free_capacity_max,
+            )
+            .where(
+                ParkingSiteHistoryRollup.resolution == ParkingSiteHistoryResolution.HOUR,
+                ParkingSiteHistoryRollup.period_start >= start,
+                ParkingSiteHistoryRollup.period_start < end,
+            )
+            .subquery()
+        )
+        now = datetime.now(tz=timezone.utc)
+        rollup_query = select(
+            hour_rollup_query.c.parking_site_id,
+            literal(ParkingSiteHistoryResolution.DAY, ParkingSiteHistoryRollup.resolution.type),
+            hour_rollup_query.c.period_start,
+            func.sum(hour_rollup_query.c.change_count),
+            func.sum(hour_rollup_query.c.opening_status_seconds),
+            func.sum(hour_rollup_query.c.open_seconds),
+            func.sum(hour_rollup_query.c.realtime_free_capacity_seconds),
+            func.sum(hour_rollup_query.c.realtime_free_capacity_integral),
+            func.min(hour_rollup_query.c.realtime_free_capacity_min),
+            func.max(hour_rollup_query.c.realtime_free_capacity_max),
+            literal(now, UtcDateTime()),
+            literal(now, UtcDateTime()),
+        ).group_by(hour_rollup_query.c.parking_site_id, hour_rollup_query.c.period_start)
+
+        result = self.session.execute(
+            insert(ParkingSiteHistoryRollup).from_select(ROLLUP_COLUMN_NAMES, rollup_query, include_defaults=False),
+        )
+        return result.rowcount
+
+    def delete_rollups(self, resolution: ParkingSiteHistoryResolution, start: datetime, end: datetime):
+        self.session.execute(
+            delete(ParkingSiteHistoryRollup)
+            .where(
+                ParkingSiteHistoryRollup.resolution == resolution,
+                ParkingSiteHistoryRollup.period_start >= start,
+                ParkingSiteHistoryRollup.period_start < end,
+            )
+            .execution_options(synchronize_session=False),
+        )
+
+    def _get_period_start(self, column: ColumnElement, resolution: ParkingSiteHistoryResolution) -> ColumnElement:
+        engine_name = self.session.connection().dialect.name
+        if engine_name == 'postgresql':
+            return func.date_trunc(resolution.value, column, 'UTC')
+
+        if engine_name == 'mysql':
+            # Timestamps are stored in UTC without timezone at MySQL
+            if resolution == ParkingSiteHistoryResolution.HOUR:
+                return func.date_format(column, '%Y-%m-%d %H:00:00')
+            return func.date_format(column, '%Y-%m-%d 00:00:00')
+
+        raise NotImplementedError('The application just supports mysql, mariadb and postgresql.')
@@ -3,20 +3,65 @@ Copyright 2023 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
-from dataclasses import dataclass
+import json
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
-
-from parkapi_sources.models.enums import PurposeType
-from sqlalchemy import func, or_, select
+from decimal import Decimal
+from itertools import batched
+from typing import Any, Callable, Iterator, Optional
+
+from parkapi_sources.models.enums import OpeningStatus, ParkAndRideType, ParkingAudience, PurposeType
+from sqlalchemy import (
+    Dialect,
+    Row,
+    String,
+    and_,
+    bindparam,
+    case,
+    cast,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    update,
+)
 from sqlalchemy.orm import Query, aliased, joinedload, selectinload
 from sqlalchemy.orm.interfaces import LoaderOption
 from validataclass_search_queries.filters import BoundSearchFilter
-from validataclass_search_queries.pagination import PaginatedResult
+from validataclass_search_queries.pagination import CursorPaginationMixin, PaginatedResult
 from validataclass_search_queries.search_queries import BaseSearchQuery
 
-from webapp.models import ParkingSite, Source
+from webapp.common.dataclass import filter_unset_value_and_none, recursive_to_dict
+from webapp.common.vector_tile import VectorTile
+from webapp.models import (
+    ChangeLogAction,
+    ChangeLogEntry,
+    ChangeLogObjectType,
+    ExternalIdentifier,
+    ParkingRestriction,
+    ParkingSite,
+    Source,
+    Tag,
+)
+from webapp.models.change_log_entry import mark_change_log_written
+from webapp.models.parking_site import PARKING_SITE_RESTRICTION_FIELDS
+from webapp.models.parking_site_group import ParkingSiteGroup
 from webapp.repositories import BaseRepository
+from webapp.repositories.exceptions import ObjectNotFoundException
+from webapp.repositories.spatial_repository_mixin import SpatialRepositoryMixin
+from webapp.repositories.vector_tile_repository_mixin import VectorTileRepositoryMixin
+
+PARKING_SITE_BATCH_SIZE = 1000
+# Number of envelopes combined in one candidate query
+PARKING_SITE_ENVELOPE_BATCH_SIZE = 100
+PARKING_SITE_LOCATION_COLUMNS = [
+    ParkingSite.id,
+    ParkingSite.lat,
+    ParkingSite.lon,
+    ParkingSite.source_id,
+    ParkingSite.purpose,
+]
 
 
 @dataclass
@@ -28,7 +73,87 @@ class ParkingSiteLocation:
     purpose: PurposeType
 
 
-class ParkingSiteRepository(BaseRepository):
+@dataclass
+class ParkingRestrictionRealtime:
+    type: ParkingAudience | None
+    realtime_capacity: int | None
+    realtime_free_capacity: int | None
+
+
+@dataclass
+class ParkingSiteRealtime:
+    id: int
+    realtime_data_updated_at: datetime
+    realtime_capacity: int | None
+    realtime_free_capacity: int | None
+    realtime_opening_status: OpeningStatus | None
+    restrictions: list[ParkingRestrictionRealtime] = field(default_factory=list)
+
+    @classmethod
+    def from_parking_site(cls, parking_site: ParkingSite) -> 'ParkingSiteRealtime':
+        return cls(
+            id=parking_site.id,
+            realtime_data_updated_at=parking_site.realtime_data_updated_at,
+            realtime_capacity=parking_site.realtime_capacity,
+            realtime_free_capacity=parking_site.realtime_free_capacity,
+            realtime_opening_status=parking_site.realtime_opening_status,
+            restrictions=[
+                ParkingRestrictionRealtime(
+                    type=restriction.type,
+                    realtime_capacity=restriction.realtime_capacity,
+                    realtime_free_capacity=restriction.realtime_free_capacity,
+                )
+                for restriction in parking_site.restrictions
+                if restriction.realtime_capacity is not None or restriction.realtime_free_capacity is not None
+            ],
+        )
+
+    def to_dict(self) -> dict:
+        result = recursive_to_dict(self)
+        if not self.restrictions:
+            result.pop('restrictions')
+        return filter_unset_value_and_none(result)
+
+
+@dataclass
+class ParkingSiteRow:
+    """
+    Parking site loaded as plain row, with its children aggregated within the same statement instead of ORM instances.
+    """
+
+    values: dict
+    restrictions: list[dict]
+    external_identifiers: list[dict]
+    tags: list[str]
+    group: dict | None
+
+    @property
+    def id(self) -> int:
+        return self.values['id']
+
+    def to_dict(
+        self,
+        fields: list[str] | None = None,
+        ignore: list[str] | None = None,
+        include_restrictions: bool = False,
+        include_external_identifiers: bool = False,
+        include_tags: bool = False,
+        include_group: bool = False,
+        unset_realtime_after_minutes: int | None = None,
+    ) -> dict:
+        return ParkingSite.build_dict(
+            self.values,
+            fields=fields,
+            ignore=ignore,
+            restrictions=self.restrictions if include_restrictions else None,
+            external_identifiers=self.external_identifiers if include_external_identifiers else None,
+            tags=self.tags if include_tags else None,
+            group=self.group if include_group else None,
+            unset_realtime_after_minutes=unset_realtime_after_minutes,
+        )
+
+
+class ParkingSiteRepository(SpatialRepositoryMixin, VectorTileRepositoryMixin, BaseRepository):
     model_cls = ParkingSite
 
     def fetch_parking_sites(
@@ -45,6 +170,132 @@ class ParkingSiteRepository(BaseRepository):
 
         return self._search_and_paginate(query, search_query)
 
+    def fetch_parking_site_rows(
+        self,
+        *,
+        search_query: Optional[BaseSearchQuery] = None,
+    ) -> PaginatedResult[ParkingSiteRow]:
+        """
+        Alternative to `fetch_parking_sites()` for list endpoints, which loads plain rows instead of ORM instances.
+        Restrictions, external identifiers and tags are aggregated to JSON arrays and the group is joined, so each page
+        takes just one statement.
+        """
+        query = self._filter_by_search_query(self.session.query(ParkingSite), search_query)
+
+        row_query = query.with_entities(
+            *[column for column in ParkingSite.__table__.c if column.key != 'geometry'],
+            *[column.label(f'group_{column.key}') for column in ParkingSiteGroup.__table__.c],
+            self._get_json_array_aggregate(
+                ParkingRestriction.parking_site_id,
+                PARKING_SITE_RESTRICTION_FIELDS,
+            ).label('restrictions'),
+            self._get_json_array_aggregate(ExternalIdentifier.parking_site_id, ['type', 'value']).label(
+                'external_identifiers',
+            ),
+            self._get_json_array_aggregate(Tag.parking_site_id, ['value']).label('tags'),
+        ).outerjoin(ParkingSiteGroup, ParkingSiteGroup.id == ParkingSite.parking_site_group_id)
+
+        rows = self._paginate_result(row_query, search_query, count_query=query)
+
+        dialect = self.session.connection().dialect
+        restriction_processors = self._get_result_processors(
+            ParkingRestriction,
+            PARKING_SITE_RESTRICTION_FIELDS,
+            dialect,
+        )
+        external_identifier_processors = self._get_result_processors(ExternalIdentifier, ['type', 'value'], dialect)
+
+        return rows.map(
+            lambda row: ParkingSiteRow(
+                values=self._get_parking_site_row_values(row),
+                restrictions=self._decode_json_array_aggregate(row._mapping['restrictions'], restriction_processors),
+                external_identifiers=self._decode_json_array_aggregate(
+                    row._mapping['external_identifiers'],
+                    external_identifier_processors,
+                ),
+                tags=[
+                    item['value'] for item in self._decode_json_array_aggregate(row._mapping['tags'], {'value': None})
+                ],
+                group=self._get_parking_site_group_row_values(row),
+            ),
+        )
+
+    def iter_parking_sites(
+        self,
+        *,
+        search_query: Optional[BaseSearchQuery] = None,
+        batch_size: int = 1000,
+        **kwargs,
+    ) -> Iterator[ParkingSite]:
+        """
+        Unpaginated alternative to `fetch_parking_sites()`, which loads parking sites in batches of `batch_size` while
+        iterating, so memory is bounded even for large result sets.
+        """
+        query = self._filter_by_search_query(self.session.query(ParkingSite), search_query)
+
+        loader_options = self._get_loader_options(**kwargs)
+        if loader_options:
+            query = query.options(*loader_options)
+
+        return iter(query.order_by(ParkingSite.id).yield_per(batch_size))
+
+    def iter_parking_site_columns(
+        self,
+        *columns: Any,
+        search_query: Optional[BaseSearchQuery] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Row]:
+        """
+        Streams just the given parking site columns as plain rows, loaded in batches of `batch_size` while iterating.
+        """
+        query = self._filter_by_search_query(self.session.query(*columns), search_query)
+
+        return iter(query.order_by(ParkingSite.id).yield_per(batch_size))
+
+    def fetch_previous_parking_site_start(self, *, search_query: CursorPaginationMixin) -> int | None:
+        """
+        Returns the cursor start value of the page before the current page, or None if the current page is the first one.
+        """
+        if not search_query.limit or not search_query.start:
+            return None
+
+        previous_ids = (
+            self
+            ._filter_by_search_query(self.session.query(ParkingSite.id), search_query)
+            .filter(ParkingSite.id < search_query.start)
+            .order_by(ParkingSite.id.desc())
+            .limit(search_query.limit)
+            .subquery()
+        )
+
+        return self.session.query(func.min(previous_ids.c.id)).scalar()
+
+    def fetch_nearest_parking_sites(
+        self,
+        *,
+        search_query: BaseSearchQuery,
+        **kwargs,
+    ) -> list[tuple[ParkingSite, float]]:
+        query = self.session.query(ParkingSite)
+
+        loader_options = self._get_loader_options(**kwargs)
+        if loader_options:
+            query = query.options(*loader_options)
+
+        query = self._filter_by_search_query(query, search_query)
+
+        return self._fetch_nearest(
+            query,
+            ParkingSite,
+            lat=float(search_query.lat),
+            lon=float(search_query.lon),
+            limit=search_query.nearest,
+            after_distance=None
+            if search_query.nearest_after_distance is None
+            else float(search_query.nearest_after_distance),
+            after_id=search_query.nearest_after_id,
+        )
+
     def fetch_parking_site_by_id(
         self,
         parking_site_id: int,
@@ -82,6 +333,79 @@ class ParkingSiteRepository(BaseRepository):
 
         return query.all()
 
+    def fetch_parking_site_ids(self, *, search_query: Optional[BaseSearchQuery] = None) -> list[int]:
+        query = self._filter_by_search_query(self.session.query(ParkingSite.id), search_query)
+        return [item.id for item in query.order_by(ParkingSite.id)]
+
+    def fetch_duplicate_of_parking_site_ids(self, parking_site_ids: list[int]) -> dict[int, Optional[int]]:
+        """
+        Returns the current `duplicate_of_parking_site_id` of all given parking sites in one statement. Raises
+        ObjectNotFoundException listing all ids which don't exist.
+        """
+        query = select(ParkingSite.id, ParkingSite.duplicate_of_parking_site_id).where(
+            ParkingSite.id.in_(parking_site_ids),
+        )
+        duplicate_of_parking_site_ids: dict[int, Optional[int]] = {
+            item.id: item.duplicate_of_parking_site_id for item in self.session.execute(query)
+        }
+
+        missing_parking_site_ids = sorted(set(parking_site_ids) - set(duplicate_of_parking_site_ids))
+        if missing_parking_site_ids:
+            raise ObjectNotFoundException(
+                message=f'ParkingSites with IDs {missing_parking_site_ids} were not found.',
+            )
+
+        return duplicate_of_parking_site_ids
+
+    def update_duplicate_of_parking_site_ids(
+        self,
+        duplicate_of_parking_site_ids: dict[int, Optional[int]],
+        *,
+        commit: bool = True,
+    ) -> None:
+        """
+        Sets `duplicate_of_parking_site_id` of many parking sites with set-based UPDATEs instead of loading and flushing
+        each ORM instance. As this bypasses the ORM listeners, the change log entries are written here as well.
+        """
+        parking_site_table = ParkingSite.__table__
+        parking_site_ids = list(duplicate_of_parking_site_ids)
+
+        for offset in range(0, len(parking_site_ids), PARKING_SITE_BATCH_SIZE):
+            batch = parking_site_ids[offset : offset + PARKING_SITE_BATCH_SIZE]
+            # One statement executed with many parameter sets, so the driver can batch it
+            self.session.execute(
+                update(parking_site_table)
+                .where(parking_site_table.c.id == bindparam('b_id'))
+                .values(duplicate_of_parking_site_id=bindparam('b_duplicate_of_parking_site_id')),
+                [
+                    {
+                        'b_id': parking_site_id,
+                        'b_duplicate_of_parking_site_id': duplicate_of_parking_site_ids[parking_site_id],
+                    }
+                    for parking_site_id in batch
+                ],
+            )
+
+            source_id_query = select(ParkingSite.id, ParkingSite.source_id).where(ParkingSite.id.in_(batch))
+            change_log_entries = [
+                {
+                    'object_type': ChangeLogObjectType.PARKING_SITE,
+                    'object_id': item.id,
+                    'source_id': item.source_id,
+                    'action': ChangeLogAction.UPDATED,
+                }
+                for item in self.session.execute(source_id_query)
+            ]
+            if change_log_entries:
+                mark_change_log_written(self.session, self.session.connection())
+                self.session.execute(insert(ChangeLogEntry), change_log_entries)
+
+        # Instances loaded before don't know about the UPDATEs
+        self.session.expire_all()
+
+        if commit:
+            self.session.commit()
+
     def fetch_parking_site_by_source_id_and_original_uid(
         self,
         source_id: int,
@@ -104,28 +428,202 @@ class ParkingSiteRepository(BaseRepository):
     def fetch_parking_site_ids_by_source_id(self, source_id: int) -> list[int]:
         return self.session.scalars(select(ParkingSite.id).where(ParkingSite.source_id == source_id)).all()
 
-    def fetch_realtime_outdated_parking_site_count_by_source(self, older_then: datetime) -> dict[int, int]:
+    def fetch_realtime_outdated_parking_site_count_by_source(
+        self,
+        older_then: datetime,
+        *,
+        source_id: int | None = None,
+    ) -> dict[int, int]:
         query = self.session.query(ParkingSite.source_id, func.count(ParkingSite.id))
 
         query = query.filter(ParkingSite.realtime_data_updated_at < older_then)
+        if source_id is not None:
+            query = query.filter(ParkingSite.source_id == source_id)
 
         result = query.group_by(ParkingSite.source_id).all()
 
         return {key: value for key, value in result}
 
-    def count_by_source(self) -> dict[int, int]:
-        result: dict[int, int] = {}
-        parking_sites = (
+    def fetch_counted_realtime_outdated_parking_site_count_by_source(
+        self, uncounted_older_then: datetime
+    ) -> dict[int, int]:
+        """
+        Counts realtime outdated parking sites per source as of realtime_outdated_counted_before of their source, or as of
+        `uncounted_older_then` for sources which were not counted yet.
+        """
+        query = (
             self.session
-            .query(ParkingSite.source_id, func.count(ParkingSite.id).label('count'))
-            .group_by(ParkingSite.source_id)
-            .all()
+            .query(ParkingSite.source_id, func.count(ParkingSite.id))
+            .join(Source, Source.id == ParkingSite.source_id)
+            .filter(
+                ParkingSite.realtime_data_updated_at
+                < func.coalesce(Source.realtime_outdated_counted_before, uncounted_older_then),
+            )
         )
+
+        return {key: value for key, value in query.group_by(ParkingSite.source_id).all()}
+
+    def fetch_newly_realtime_outdated_parking_site_count_by_source(
+        self,
+        older_then: datetime,
+        *,
+        since: datetime,
+    ) -> dict[int, int]:
+        """
+        Counts parking sites per source which got realtime outdated between realtime_outdated_counted_before of their source
+        and `older_then`. `since` is the earliest realtime_outdated_counted_before, so just this range of the
+        realtime_data_updated_at index is read.
+        """
+        query = (
+            self.session
+            .query(ParkingSite.source_id, func.count(ParkingSite.id))
+            .join(Source, Source.id == ParkingSite.source_id)
+            .filter(
+                ParkingSite.realtime_data_updated_at >= since,
+                ParkingSite.realtime_data_updated_at < older_then,
+                ParkingSite.realtime_data_updated_at >= Source.realtime_outdated_counted_before,
+            )
+        )
+
+        return {key: value for key, value in query.group_by(ParkingSite.source_id).all()}
+
+    def count_by_source(self, *, source_id: int | None = None) -> dict[int, int]:
+        result: dict[int, int] = {}
+        query = self.session.query(ParkingSite.source_id, func.count(ParkingSite.id).label('count'))
+        if source_id is not None:
+            query = query.filter(ParkingSite.source_id == source_id)
+        parking_sites = query.group_by(ParkingSite.source_id).all()
         for parking_site in parking_sites:
             result[parking_site.source_id] = parking_site.count
 
         return result
 
+    def fetch_parking_site_realtime_data(
+        self,
+        *,
+        since: datetime | None = None,
+        since_id: int | None = None,
+        limit: int | None = None,
+        source_id: int | None = None,
+        parking_site_ids: list[int] | None = None,
+        bbox: tuple[Decimal, Decimal, Decimal, Decimal] | None = None,
+    ) -> list[ParkingSiteRealtime]:
+        """
+        Fetches just the realtime fields of parking sites with realtime data, ordered by `realtime_data_updated_at` and
+        `id`. With `since`, just newer realtime data is returned. `since_id` continues a limited page with the same
+        `realtime_data_updated_at`. Backed by the index `ix_parking_site_realtime_data_updated_at_id`.
+
+        The result can be filtered by `source_id`, `parking_site_ids` and a `bbox` (lat_min, lat_max, lon_min, lon_max).
+        """
+        query = select(
+            ParkingSite.id,
+            ParkingSite.realtime_data_updated_at,
+            ParkingSite.realtime_capacity,
+            ParkingSite.realtime_free_capacity,
+            ParkingSite.realtime_opening_status,
+        ).where(
+            ParkingSite.has_realtime_data.is_(True),
+            ParkingSite.realtime_data_updated_at.is_not(None),
+        )
+        if since is not None and since_id is not None:
+            query = query.where(
+                or_(
+                    ParkingSite.realtime_data_updated_at > since,
+                    and_(ParkingSite.realtime_data_updated_at == since, ParkingSite.id > since_id),
+                ),
+            )
+        elif since is not None:
+            query = query.where(ParkingSite.realtime_data_updated_at > since)
+
+        if source_id is not None:
+            query = query.where(ParkingSite.source_id == source_id)
+        if parking_site_ids is not None:
+            query = query.where(ParkingSite.id.in_(parking_site_ids))
+        if bbox is not None:
+            lat_min, lat_max, lon_min, lon_max = bbox
+            query = query.where(ParkingSite.lat.between(lat_min, lat_max), ParkingSite.lon.between(lon_min, lon_max))
+
+        query = query.order_by(ParkingSite.realtime_data_updated_at, ParkingSite.id)
+        if limit is not None:
+            query = query.limit(limit)
+
+        parking_sites_realtime: dict[int, ParkingSiteRealtime] = {
+            row.id: ParkingSiteRealtime(
+                id=row.id,
+                realtime_data_updated_at=row.realtime_data_updated_at,
+                realtime_capacity=row.realtime_capacity,
+                realtime_free_capacity=row.realtime_free_capacity,
+                realtime_opening_status=row.realtime_opening_status,
+            )
+            for row in self.session.execute(query)
+        }
+        if not parking_sites_realtime:
+            return []
+
+        restriction_query = select(
+            ParkingRestriction.parking_site_id,
+            ParkingRestriction.type,
+            ParkingRestriction.realtime_capacity,
+            ParkingRestriction.realtime_free_capacity,
+        ).where(
+            ParkingRestriction.parking_site_id.in_(parking_sites_realtime.keys()),
+            or_(
+                ParkingRestriction.realtime_capacity.is_not(None),
+                ParkingRestriction.realtime_free_capacity.is_not(None),
+            ),
+        )
+        for row in self.session.execute(restriction_query.order_by(ParkingRestriction.id)):
+            parking_sites_realtime[row.parking_site_id].restrictions.append(
+                ParkingRestrictionRealtime(
+                    type=row.type,
+                    realtime_capacity=row.realtime_capacity,
+                    realtime_free_capacity=row.realtime_free_capacity,
+                ),
+            )
+
+        return list(parking_sites_realtime.values())
+
+    def fetch_parking_site_vector_tile(
+        self,
+        z: int,
+        x: int,
+        y: int,
+        *,
+        realtime_data_updated_since: datetime | None = None,
+    ) -> VectorTile:
+        """
+        Renders a vector tile with minimal static and realtime attributes. Realtime data older than
+        `realtime_data_updated_since` is handled as if there was no realtime data at all.
+        """
+        has_realtime_data = ParkingSite.has_realtime_data.is_(True)
+        if realtime_data_updated_since is not None:
+            has_realtime_data = and_(
+                has_realtime_data,
+                ParkingSite.realtime_data_updated_at >= realtime_data_updated_since,
+            )
+
+        return self._fetch_vector_tile(
+            model_cls=ParkingSite,
+            layer_name='parking_sites',
+            z=z,
+            x=x,
+            y=y,
+            columns=[
+                ParkingSite.id.label('id'),
+                ParkingSite.source_id.label('source_id'),
+                ParkingSite.name.label('name'),
+                cast(ParkingSite.type, String).label('type'),
+                cast(ParkingSite.purpose, String).label('purpose'),
+                ParkingSite.capacity.label('capacity'),
+                case((has_realtime_data, True), else_=False).label('has_realtime_data'),
+                case((has_realtime_data, ParkingSite.realtime_free_capacity)).label('realtime_free_capacity'),
+                case((has_realtime_data, cast(ParkingSite.realtime_opening_status, String))).label(
+                    'realtime_opening_status',
+                ),
+            ],
+            filters=[ParkingSite.duplicate_of_parking_site_id.is_(None)],
+        )
+
     def save_parking_site(self, parking_site: ParkingSite, *, commit: bool = True):
         self._save_resources(parking_site, commit=commit)
 
@@ -138,7 +636,19 @@ class ParkingSiteRepository(BaseRepository):
 
         # Apply all search filters one-by-one
         for _param_name, bound_filter in search_query.get_search_filters():
-            if _param_name in ['location', 'radius', 'lat', 'lon', 'lat_min', 'lat_max', 'lon_min', 'lon_max']:
+            if _param_name in [
+                'location',
+                'radius',
+                'lat',
+                'lon',
+                'lat_min',
+                'lat_max',
+                'lon_min',
+                'lon_max',
+                'nearest',
+                'nearest_after_distance',
+                'nearest_after_id',
+            ]:
                 continue
             query = self._apply_bound_search_filter(query, bound_filter)
 
@@ -157,20 +667,7 @@ class ParkingSiteRepository(BaseRepository):
             lon = float(search_query.lon)
 
         if lat is not None and lon is not None and radius is not None:
-            engine_name = self.session.connection().dialect.name
-            if engine_name == 'postgresql':
-                distance_function = func.ST_DistanceSphere(
-                    ParkingSite.geometry,
-                    func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326),
-                )
-            elif engine_name == 'mysql':
-                distance_function = func.ST_DISTANCE_SPHERE(
-                    ParkingSite.geometry,
-                    func.ST_GeomFromText(f'POINT({lon} {lat})', 4326),
-                )
-            else:
-                raise NotImplementedError('The application just supports mysql, mariadb and postgresql.')
-            query = query.filter(distance_function < int(radius))
+            query = self._filter_by_radius(query, ParkingSite, lat=lat, lon=lon, radius=radius)
 
         if (
             getattr(search_query, 'lat_min', None)
@@ -178,17 +675,13 @@ class ParkingSiteRepository(BaseRepository):
             and getattr(search_query, 'lon_min', None)
             and getattr(search_query, 'lon_max', None)
         ):
-            query = query.filter(
-                func.ST_Within(
-                    ParkingSite.geometry,
-                    func.ST_MakeEnvelope(
-                        getattr(search_query, 'lon_min'),
-                        getattr(search_query, 'lat_min'),
-                        getattr(search_query, 'lon_max'),
-                        getattr(search_query, 'lat_max'),
-                        4326,
-                    ),
-                ),
+            query = self._filter_by_bbox(
+                query,
+                ParkingSite,
+                lat_min=getattr(search_query, 'lat_min'),
+                lat_max=getattr(search_query, 'lat_max'),
+                lon_min=getattr(search_query, 'lon_min'),
+                lon_max=getattr(search_query, 'lon_max'),
             )
 
         return query
@@ -204,17 +697,122 @@ class ParkingSiteRepository(BaseRepository):
             return query.filter(ParkingSite.duplicate_of_parking_site_id.is_(None))
         if bound_filter.param_name == 'not_type':
             return query.filter(ParkingSite.type != bound_filter.value)
+        if bound_filter.param_name == 'has_free_capacity':
+            if bound_filter.value is False:
+                return query
+            return query.filter(ParkingSite.has_realtime_data.is_(True), ParkingSite.realtime_free_capacity > 0)
         return super()._apply_bound_search_filter(query, bound_filter)
 
+    def _get_json_array_aggregate(self, foreign_key_column: Any, fields: list[str]) -> Any:
+        """
+        Returns a scalar subquery which aggregates the given fields of all children of a parking site to a JSON array.
+        The child id is included, so children can be ordered like the ORM would load them.
+        """
+        key_value_pairs = []
+        for field_name in ['id', *fields]:
+            key_value_pairs += [literal_column(f"'{field_name}'"), foreign_key_column.table.c[field_name]]
+
+        engine_name = self.session.connection().dialect.name
+        if engine_name == 'postgresql':
+            aggregate = func.json_agg(func.json_build_object(*key_value_pairs))
+        elif engine_name == 'mysql':
+            aggregate = func.JSON_ARRAYAGG(func.JSON_OBJECT(*key_value_pairs))
+        else:
+            raise NotImplementedError('The application just supports mysql, mariadb and postgresql.')
+
+        return select(aggregate).where(foreign_key_column == ParkingSite.id).scalar_subquery()
+
+    @staticmethod
+    def _get_result_processors(
+        model_cls: type,
+        fields: list[str],
+        dialect: Dialect,
+    ) -> dict[str, Callable[[Any], Any] | None]:
+        # JSON aggregates contain raw database values, so column types like enums have to be applied by hand
+        return {
+            field_name: model_cls.__table__.c[field_name].type.result_processor(dialect, None) for field_name in fields
+        }
+
+    @staticmethod
+    def _decode_json_array_aggregate(
+        value: str | list | None,
+        processors: dict[str, Callable[[Any], Any] | None],
+    ) -> list[dict]:
+        if value is None:
+            return []
+        # PostgreSQL drivers decode JSON, MySQL drivers return it as string
+        if isinstance(value, str):
+            value = json.loads(value)
+
+        return [
+            {
+                field_name: item[field_name]
+                if processor is None or item[field_name] is None
+                else processor(item[field_name])
+                for field_name, processor in processors.items()
+            }
+            for item in sorted(value, key=lambda item: item['id'])
+        ]
+
+    @staticmethod
+    def _get_parking_site_row_values(row: Row) -> dict:
+        values = {
+            column.key: getattr(row, column.key) for column in ParkingSite.__table__.c if column.key != 'geometry'
+        }
+
+        # Mirrors the hybrid properties of ParkingSite
+        if values['geojson'] is not None:
+            values['geojson'] = json.loads(values['geojson'])
+        if values['park_and_ride_type']:
+            values['park_and_ride_type'] = [ParkAndRideType[item] for item in values['park_and_ride_type'].split('|')]
+        else:
+            values['park_and_ride_type'] = None
+
+        return values
+
+    @staticmethod
+    def _get_parking_site_group_row_values(row: Row) -> dict | None:
+        if row._mapping['group_id'] is None:
+            return None
+
+        return {
+            column.key: row._mapping[f'group_{column.key}']
+            for column in ParkingSiteGroup.__table__.c
+            if column.key != 'parking_site_id'
+        }
+
     def fetch_parking_site_locations(self) -> list[ParkingSiteLocation]:
-        query = self.session.query(
-            ParkingSite.id,
-            ParkingSite.lat,
-            ParkingSite.lon,
-            ParkingSite.source_id,
-            ParkingSite.purpose,
-        )
+        return self._fetch_parking_site_locations(self.session.query(*PARKING_SITE_LOCATION_COLUMNS))
 
+    def fetch_parking_site_locations_by_ids(self, parking_site_ids: list[int]) -> list[ParkingSiteLocation]:
+        result: list[ParkingSiteLocation] = []
+        for parking_site_id_batch in batched(parking_site_ids, PARKING_SITE_BATCH_SIZE):
+            result += self._fetch_parking_site_locations(
+                self.session.query(*PARKING_SITE_LOCATION_COLUMNS).filter(ParkingSite.id.in_(parking_site_id_batch)),
+            )
+        return result
+
+    def fetch_parking_site_locations_within_envelopes(
+        self,
+        envelopes: list[tuple[float, float, float, float]],
+    ) -> list[ParkingSiteLocation]:
+        """
+        Returns the locations of all parking sites within any of the envelopes (lon_min, lat_min, lon_max, lat_max),
+        ordered by id. Candidates are selected by the index, so just the neighbourhood of the envelopes is read.
+        """
+        locations_by_id: dict[int, ParkingSiteLocation] = {}
+        for envelope_batch in batched(envelopes, PARKING_SITE_ENVELOPE_BATCH_SIZE):
+            for location in self._fetch_parking_site_locations(
+                self.session.query(*PARKING_SITE_LOCATION_COLUMNS).filter(
+                    or_(*(self._get_envelope_filter(ParkingSite, envelope) for envelope in envelope_batch)),
+                ),
+            ):
+                locations_by_id[location.id] = location
+
+        return sorted(locations_by_id.values(), key=lambda location: location.id)
+
+    @staticmethod
+    def _fetch_parking_site_locations(query: Query) -> list[ParkingSiteLocation]:
         result: list[ParkingSiteLocation] = []
         for item in query.all():
             result.append(
@@ -228,11 +826,28 @@ class ParkingSiteRepository(BaseRepository):
             )
         return result
 
-    def fetch_parking_sites_duplicates(self, source_ids: list[int] | None = None) -> list[tuple[int, int]]:
+    def fetch_parking_sites_duplicates(
+        self,
+        source_ids: list[int] | None = None,
+        *,
+        parking_site_ids: list[int] | None = None,
+    ) -> list[tuple[int, int]]:
+        """
+        Returns all pairs of duplicates and the parking sites they are a duplicate of. If `parking_site_ids` is set, just
+        pairs with at least one of these parking sites are returned.
+        """
         query = self.session.query(ParkingSite.id, ParkingSite.duplicate_of_parking_site_id)
 
         query = query.filter(ParkingSite.duplicate_of_parking_site_id.isnot(None))
 
+        if parking_site_ids is not None:
+            query = query.filter(
+                or_(
+                    ParkingSite.id.in_(parking_site_ids),
+                    ParkingSite.duplicate_of_parking_site_id.in_(parking_site_ids),
+                ),
+            )
+
         if source_ids is not None:
             duplicate_parking_site = aliased(ParkingSite)
             query = query.join(
@@ -3,21 +3,37 @@ Copyright 2025 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import func, select
+from parkapi_sources.models.enums import ParkingSpotStatus
+from sqlalchemy import String, and_, case, cast, func, or_, select
 from sqlalchemy.orm import Query, joinedload, selectinload
 from sqlalchemy.orm.interfaces import LoaderOption
 from validataclass_search_queries.filters import BoundSearchFilter
 from validataclass_search_queries.pagination import PaginatedResult
 from validataclass_search_queries.search_queries import BaseSearchQuery
 
+from webapp.common.dataclass import filter_unset_value_and_none, recursive_to_dict
+from webapp.common.vector_tile import VectorTile
 from webapp.models import ParkingSpot, Source
 from webapp.repositories import BaseRepository
+from webapp.repositories.spatial_repository_mixin import SpatialRepositoryMixin
+from webapp.repositories.vector_tile_repository_mixin import VectorTileRepositoryMixin
 
 
-class ParkingSpotRepository(BaseRepository[ParkingSpot]):
+@dataclass
+class ParkingSpotRealtime:
+    id: int
+    realtime_data_updated_at: datetime
+    realtime_status: ParkingSpotStatus | None
+
+    def to_dict(self) -> dict:
+        return filter_unset_value_and_none(recursive_to_dict(self))
+
+
+class ParkingSpotRepository(SpatialRepositoryMixin, VectorTileRepositoryMixin, BaseRepository[ParkingSpot]):
     model_cls = ParkingSpot
 
     def fetch_parking_spots(
@@ -34,6 +50,32 @@ class ParkingSpotRepository(BaseRepository[ParkingSpot]):
 
         return self._search_and_paginate(query, search_query)
 
+    def fetch_nearest_parking_spots(
+        self,
+        *,
+        search_query: BaseSearchQuery,
+        **kwargs,
+    ) -> list[tuple[ParkingSpot, float]]:
+        query = self.session.query(ParkingSpot)
+
+        loader_options = self._get_loader_options(**kwargs)
+        if loader_options:
+            query = query.options(*loader_options)
+
+        query = self._filter_by_search_query(query, search_query)
+
+        return self._fetch_nearest(
+            query,
+            ParkingSpot,
+            lat=float(search_query.lat),
+            lon=float(search_query.lon),
+            limit=search_query.nearest,
+            after_distance=None
+            if search_query.nearest_after_distance is None
+            else float(search_query.nearest_after_distance),
+            after_id=search_query.nearest_after_id,
+        )
+
     def fetch_parking_spot_ids_by_source_id(self, source_id: int) -> list[int]:
         return self.session.scalars(select(ParkingSpot.id).where(ParkingSpot.source_id == source_id)).all()
 
@@ -75,28 +117,156 @@ class ParkingSpotRepository(BaseRepository[ParkingSpot]):
             f'ParkingSpot with source uid {source_uid} and original_uid {original_uid} not found',
         )
 
-    def fetch_realtime_outdated_parking_spot_count_by_source(self, older_then: datetime) -> dict[int, int]:
+    def fetch_realtime_outdated_parking_spot_count_by_source(
+        self,
+        older_then: datetime,
+        *,
+        source_id: int | None = None,
+    ) -> dict[int, int]:
         query = self.session.query(ParkingSpot.source_id, func.count(ParkingSpot.id))
 
         query = query.filter(ParkingSpot.realtime_data_updated_at < older_then)
+        if source_id is not None:
+            query = query.filter(ParkingSpot.source_id == source_id)
 
         result = query.group_by(ParkingSpot.source_id).all()
 
         return {key: value for key, value in result}
 
-    def count_by_source(self) -> dict[int, int]:
-        result: dict[int, int] = {}
-        parking_spots = (
+    def fetch_counted_realtime_outdated_parking_spot_count_by_source(
+        self, uncounted_older_then: datetime
+    ) -> dict[int, int]:
+        """
+        Counts realtime outdated parking spots per source as of realtime_outdated_counted_before of their source, or as of
+        `uncounted_older_then` for sources which were not counted yet.
+        """
+        query = (
             self.session
-            .query(ParkingSpot.source_id, func.count(ParkingSpot.id).label('count'))
-            .group_by(ParkingSpot.source_id)
-            .all()
+            .query(ParkingSpot.source_id, func.count(ParkingSpot.id))
+            .join(Source, Source.id == ParkingSpot.source_id)
+            .filter(
+                ParkingSpot.realtime_data_updated_at
+                < func.coalesce(Source.realtime_outdated_counted_before, uncounted_older_then),
+            )
         )
+
+        return {key: value for key, value in query.group_by(ParkingSpot.source_id).all()}
+
+    def fetch_newly_realtime_outdated_parking_spot_count_by_source(
+        self,
+        older_then: datetime,
+        *,
+        since: datetime,
+    ) -> dict[int, int]:
+        """
+        Counts parking spots per source which got realtime outdated between realtime_outdated_counted_before of their source
+        and `older_then`. `since` is the earliest realtime_outdated_counted_before, so just this range of the
+        realtime_data_updated_at index is read.
+        """
+        query = (
+            self.session
+            .query(ParkingSpot.source_id, func.count(ParkingSpot.id))
+            .join(Source, Source.id == ParkingSpot.source_id)
+            .filter(
+                ParkingSpot.realtime_data_updated_at >= since,
+                ParkingSpot.realtime_data_updated_at < older_then,
+                ParkingSpot.realtime_data_updated_at >= Source.realtime_outdated_counted_before,
+            )
+        )
+
+        return {key: value for key, value in query.group_by(ParkingSpot.source_id).all()}
+
+    def count_by_source(self, *, source_id: int | None = None) -> dict[int, int]:
+        result: dict[int, int] = {}
+        query = self.session.query(ParkingSpot.source_id, func.count(ParkingSpot.id).label('count'))
+        if source_id is not None:
+            query = query.filter(ParkingSpot.source_id == source_id)
+        parking_spots = query.group_by(ParkingSpot.source_id).all()
         for parking_spot in parking_spots:
             result[parking_spot.source_id] = parking_spot.count
 
         return result
 
+    def fetch_parking_spot_realtime_data(
+        self,
+        *,
+        since: datetime | None = None,
+        since_id: int | None = None,
+        limit: int | None = None,
+    ) -> list[ParkingSpotRealtime]:
+        """
+        Fetches just the realtime fields of parking spots with realtime data, ordered by `realtime_data_updated_at` and
+        `id`. With `since`, just newer realtime data is returned. `since_id` continues a limited page with the same
+        `realtime_data_updated_at`. Backed by the index `ix_parking_spot_realtime_data_updated_at_id`.
+        """
+        query = select(
+            ParkingSpot.id,
+            ParkingSpot.realtime_data_updated_at,
+            ParkingSpot.realtime_status,
+        ).where(
+            ParkingSpot.has_realtime_data.is_(True),
+            ParkingSpot.realtime_data_updated_at.is_not(None),
+        )
+        if since is not None and since_id is not None:
+            query = query.where(
+                or_(
+                    ParkingSpot.realtime_data_updated_at > since,
+                    and_(ParkingSpot.realtime_data_updated_at == since, ParkingSpot.id > since_id),
+                ),
+            )
+        elif since is not None:
+            query = query.where(ParkingSpot.realtime_data_updated_at > since)
+
+        query = query.order_by(ParkingSpot.realtime_data_updated_at, ParkingSpot.id)
+        if limit is not None:
+            query = query.limit(limit)
+
+        return [
+            ParkingSpotRealtime(
+                id=row.id,
+                realtime_data_updated_at=row.realtime_data_updated_at,
+                realtime_status=row.realtime_status,
+            )
+            for row in self.session.execute(query)
+        ]
+
+    def fetch_parking_spot_vector_tile(
+        self,
+        z: int,
+        x: int,
+        y: int,
+        *,
+        realtime_data_updated_since: datetime | None = None,
+    ) -> VectorTile:
+        """
+        Renders a vector tile with minimal static and realtime attributes. Realtime data older than
+        `realtime_data_updated_since` is handled as if there was no realtime data at all.
+        """
+        has_realtime_data = ParkingSpot.has_realtime_data.is_(True)
+        if realtime_data_updated_since is not None:
+            has_realtime_data = and_(
+                has_realtime_data,
+                ParkingSpot.realtime_data_updated_at >= realtime_data_updated_since,
+            )
+
+        return self._fetch_vector_tile(
+            model_cls=ParkingSpot,
+            layer_name='parking_spots',
+            z=z,
+            x=x,
+            y=y,
+            columns=[
+                ParkingSpot.id.label('id'),
+                ParkingSpot.source_id.label('source_id'),
+                ParkingSpot.parking_site_id.label('parking_site_id'),
+                cast(ParkingSpot.type, String).label('type'),
+                cast(ParkingSpot.purpose, String).label('purpose'),
+                case((has_realtime_data, True), else_=False).label('has_realtime_data'),
+                case((has_realtime_data, cast(ParkingSpot.realtime_status, String))).label('realtime_status'),
+            ],
+            filters=[],
+        )
+
     def save_parking_spot(self, parking_spot: ParkingSpot, *, commit: bool = True):
         self._save_resources(parking_spot, commit=commit)
 
@@ -109,7 +279,18 @@ class ParkingSpotRepository(BaseRepository[ParkingSpot]):
 
         # Apply all search filters one-by-one
         for _param_name, bound_filter in search_query.get_search_filters():
-            if _param_name in ['radius', 'lat', 'lon', 'lat_min', 'lat_max', 'lon_min', 'lon_max']:
+            if _param_name in [
+                'radius',
+                'lat',
+                'lon',
+                'lat_min',
+                'lat_max',
+                'lon_min',
+                'lon_max',
+                'nearest',
+                'nearest_after_distance',
+                'nearest_after_id',
+            ]:
                 continue
             query = self._apply_bound_search_filter(query, bound_filter)
 
@@ -118,21 +299,7 @@ class ParkingSpotRepository(BaseRepository[ParkingSpot]):
             lat = float(getattr(search_query, 'lat'))
             lon = float(getattr(search_query, 'lon'))
 
-            engine_name = self.session.connection().dialect.name
-            if engine_name == 'postgresql':
-                distance_function = func.ST_DistanceSphere(
-                    ParkingSpot.geometry,
-                    func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326),
-                )
-            elif engine_name == 'mysql':
-                distance_function = func.ST_DISTANCE_SPHERE(
-                    ParkingSpot.geometry,
-                    func.ST_GeomFromText(f'POINT({lon} {lat})', 4326),
-                )
-            else:
-                raise NotImplementedError('The application just supports mysql, mariadb and postgresql.')
-
-            query = query.filter(distance_function < int(radius))
+            query = self._filter_by_radius(query, ParkingSpot, lat=lat, lon=lon, radius=radius)
 
         if (
             getattr(search_query, 'lat_min', None)
@@ -140,17 +307,13 @@ class ParkingSpotRepository(BaseRepository[ParkingSpot]):
             and getattr(search_query, 'lon_min', None)
             and getattr(search_query, 'lon_max', None)
         ):
-            query = query.filter(
-                func.ST_Within(
-                    ParkingSpot.geometry,
-                    func.ST_MakeEnvelope(
-                        getattr(search_query, 'lon_min'),
-                        getattr(search_query, 'lat_min'),
-                        getattr(search_query, 'lon_max'),
-                        getattr(search_query, 'lat_max'),
-                        4326,
-                    ),
-                ),
+            query = self._filter_by_bbox(
+                query,
+                ParkingSpot,
+                lat_min=getattr(search_query, 'lat_min'),
+                lat_max=getattr(search_query, 'lat_max'),
+                lon_min=getattr(search_query, 'lon_min'),
+                lon_max=getattr(search_query, 'lon_max'),
             )
         return query
 
@@ -159,6 +322,13 @@ class ParkingSpotRepository(BaseRepository[ParkingSpot]):
             return query.join(Source, Source.id == ParkingSpot.source_id).filter(Source.uid == bound_filter.value)
         if bound_filter.param_name == 'source_uids':
             return query.join(Source, Source.id == ParkingSpot.source_id).filter(Source.uid.in_(bound_filter.value))
+        if bound_filter.param_name == 'has_free_capacity':
+            if bound_filter.value is False:
+                return query
+            return query.filter(
+                ParkingSpot.has_realtime_data.is_(True),
+                ParkingSpot.realtime_status == ParkingSpotStatus.AVAILABLE,
+            )
         return super()._apply_bound_search_filter(query, bound_filter)
 
     @staticmethod
@@ -0,0 +1,87 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from sqlalchemy import delete, or_, select, tuple_, update
+
+from webapp.models import PendingDuplicate, PendingDuplicateCheck
+from webapp.repositories import BaseRepository
+
+# Limits the size of IN clauses when working with many parking sites, e.g. at a full recomputation
+PENDING_DUPLICATE_BATCH_SIZE = 1000
+
+
+class PendingDuplicateRepository(BaseRepository[PendingDuplicate]):
+    model_cls = PendingDuplicate
+
+    def fetch_pending_duplicates(self, *, include_dismissed: bool = False) -> list[PendingDuplicate]:
+        query = select(PendingDuplicate)
+
+        if not include_dismissed:
+            query = query.where(PendingDuplicate.dismissed.is_(False))
+
+        return list(self.session.scalars(query.order_by(PendingDuplicate.id)))
+
+    def fetch_pending_duplicates_by_parking_site_ids(self, parking_site_ids: list[int]) -> list[PendingDuplicate]:
+        """
+        Returns all pending duplicates, including dismissed ones, with one of the parking sites on either side.
+        """
+        pending_duplicates: dict[int, PendingDuplicate] = {}
+        for offset in range(0, len(parking_site_ids), PENDING_DUPLICATE_BATCH_SIZE):
+            batch = parking_site_ids[offset : offset + PENDING_DUPLICATE_BATCH_SIZE]
+            query = select(PendingDuplicate).where(
+                or_(
+                    PendingDuplicate.parking_site_id.in_(batch),
+                    PendingDuplicate.duplicate_parking_site_id.in_(batch),
+                ),
+            )
+            for pending_duplicate in self.session.scalars(query):
+                pending_duplicates[pending_duplicate.id] = pending_duplicate
+
+        return list(pending_duplicates.values())
+
+    def save_pending_duplicate(self, pending_duplicate: PendingDuplicate, *, commit: bool = True) -> None:
+        self._save_resources(pending_duplicate, commit=commit)
+
+    def delete_pending_duplicate(self, pending_duplicate: PendingDuplicate, *, commit: bool = True) -> None:
+        self._delete_resources(pending_duplicate, commit=commit)
+
+    def dismiss_pending_duplicates(
+        self,
+        parking_site_id_pairs: list[tuple[int, int]],
+        *,
+        commit: bool = True,
+    ) -> None:
+        # Pairs are stored with the smaller id first, but operators may send them in any order
+        normalized_pairs = list({(min(pair), max(pair)) for pair in parking_site_id_pairs})
+        for offset in range(0, len(normalized_pairs), PENDING_DUPLICATE_BATCH_SIZE):
+            self.session.execute(
+                update(PendingDuplicate)
+                .where(
+                    tuple_(PendingDuplicate.parking_site_id, PendingDuplicate.duplicate_parking_site_id).in_(
+                        normalized_pairs[offset : offset + PENDING_DUPLICATE_BATCH_SIZE],
+                    ),
+                )
+                .values(dismissed=True)
+                .execution_options(synchronize_session=False),
+            )
+        if commit:
+            self.session.commit()
+
+    def fetch_pending_duplicate_checks(self) -> list[tuple[int, int]]:
+        """
+        Returns id and parking site id of all queued duplicate checks, ordered by id.
+        """
+        query = select(PendingDuplicateCheck.id, PendingDuplicateCheck.parking_site_id).order_by(
+            PendingDuplicateCheck.id,
+        )
+        return [(item.id, item.parking_site_id) for item in self.session.execute(query)]
+
+    def delete_pending_duplicate_checks(self, *, up_to_id: int) -> None:
+        # Checks queued while the duplicate check was running stay in the queue
+        self.session.execute(
+            delete(PendingDuplicateCheck)
+            .where(PendingDuplicateCheck.id <= up_to_id)
+            .execution_options(synchronize_session=False),
+        )
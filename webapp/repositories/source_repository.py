@@ -3,11 +3,14 @@ Copyright 2023 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
+from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import update
 from validataclass_search_queries.pagination import PaginatedResult
 from validataclass_search_queries.search_queries import BaseSearchQuery
 
+from webapp.common.vector_tile import SourceGeneration
 from webapp.models import Source
 from webapp.repositories import BaseRepository
 from webapp.repositories.exceptions import ObjectNotFoundException
@@ -34,6 +37,42 @@ class SourceRepository(BaseRepository):
 
         return [source_id for (source_id,) in sources]
 
+    def fetch_source_generations(self) -> dict[int, SourceGeneration]:
+        sources = self.session.query(Source.id, Source.static_data_updated_at, Source.realtime_data_updated_at).all()
+
+        return {
+            source.id: SourceGeneration(
+                static_data_updated_at=source.static_data_updated_at,
+                realtime_data_updated_at=source.realtime_data_updated_at,
+            )
+            for source in sources
+        }
+
+    def add_source_metric_deltas(
+        self,
+        source_id: int,
+        deltas: dict[str, int],
+        *,
+        realtime_outdated_counted_before: datetime | None = None,
+        commit: bool = True,
+    ):
+        """
+        Adds the deltas to the metric columns within the database, so concurrent imports and metric updates of the same
+        source don't overwrite each other.
+        """
+        values: dict = {getattr(Source, key): getattr(Source, key) + delta for key, delta in deltas.items() if delta}
+        if realtime_outdated_counted_before is not None:
+            values[Source.realtime_outdated_counted_before] = realtime_outdated_counted_before
+        if not values:
+            return
+
+        self.session.execute(
+            update(Source).where(Source.id == source_id).values(values).execution_options(synchronize_session=False),
+        )
+
+        if commit:
+            self.session.commit()
+
     def save_source(self, source: Source, *, commit: bool = True):
         return self._save_resources(source, commit=commit)
 
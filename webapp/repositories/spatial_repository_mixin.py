@@ -0,0 +1,174 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+import math
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import ColumnElement, and_, func, or_
+from sqlalchemy.orm import Query, scoped_session
+
+# Sphere radius used by ST_DistanceSphere, in meters
+EARTH_RADIUS = 6370986
+# Widens the radius envelope a bit, so floating point errors never drop a row the exact distance check would keep
+RADIUS_ENVELOPE_MARGIN = 1.001
+# Initial search radius of nearest searches without KNN index support, in meters. Quadruples until enough results are
+# found.
+NEAREST_INITIAL_RADIUS = 2000
+
+
+def get_radius_envelope(lat: float, lon: float, radius: float) -> tuple[float, float, float, float] | None:
+    """
+    Returns the smallest bounding box (lon_min, lat_min, lon_max, lat_max) containing all points within `radius` meters
+    on the sphere. Returns None if the circle touches a pole or the antimeridian, as the box can't be expressed then.
+    """
+    angular_radius = radius / EARTH_RADIUS * RADIUS_ENVELOPE_MARGIN
+    lat_delta = math.degrees(angular_radius)
+    if abs(lat) + lat_delta >= 90:
+        return None
+
+    lon_delta = math.degrees(math.asin(math.sin(angular_radius) / math.cos(math.radians(lat))))
+    if lon - lon_delta < -180 or lon + lon_delta > 180:
+        return None
+
+    return lon - lon_delta, lat - lat_delta, lon + lon_delta, lat + lat_delta
+
+
+class SpatialRepositoryMixin:
+    """
+    Mixin for repositories of models with a `geometry` column, which is backed by a GiST (PostgreSQL) or SPATIAL
+    (MySQL) index.
+    """
+
+    session: scoped_session
+
+    def _filter_by_radius(self, query: Query, model_cls: type, *, lat: float, lon: float, radius: float) -> Query:
+        engine_name = self.session.connection().dialect.name
+        if engine_name == 'postgresql':
+            # ST_DistanceSphere can't use an index, so candidates are selected by the index-backed bounding box
+            # operator first. As the envelope contains the whole circle, the result is the same.
+            radius_envelope = get_radius_envelope(lat, lon, radius)
+            if radius_envelope is not None:
+                query = query.filter(self._get_envelope_filter(model_cls, radius_envelope))
+
+            distance_function = func.ST_DistanceSphere(
+                model_cls.geometry,
+                func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326),
+            )
+        elif engine_name == 'mysql':
+            distance_function = func.ST_DISTANCE_SPHERE(
+                model_cls.geometry,
+                func.ST_GeomFromText(f'POINT({lon} {lat})', 4326),
+            )
+        else:
+            raise NotImplementedError('The application just supports mysql, mariadb and postgresql.')
+
+        return query.filter(distance_function < int(radius))
+
+    def _fetch_nearest(
+        self,
+        query: Query,
+        model_cls: type,
+        *,
+        lat: float,
+        lon: float,
+        limit: int,
+        after_distance: float | None = None,
+        after_id: int | None = None,
+    ) -> list[tuple[Any, float]]:
+        """
+        Returns up to `limit` objects of `query` with their distance to lat / lon in meters, ordered by distance and id.
+        `after_distance` and `after_id` continue after the last item of the previous page.
+        """
+        engine_name = self.session.connection().dialect.name
+        if engine_name == 'postgresql':
+            # KNN ordering, backed by the GiST index on geography(geometry)
+            distance = func.geography(model_cls.geometry).op('<->')(
+                func.geography(func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326)),
+            )
+            return self._fetch_ordered_by_distance(query, model_cls, distance, limit, after_distance, after_id)
+
+        if engine_name == 'mysql':
+            # Points are built from lat / lon, so the result does not depend on the axis order of the geometry column
+            distance = func.ST_Distance_Sphere(func.Point(model_cls.lon, model_cls.lat), func.Point(lon, lat))
+
+            # No KNN support: search within expanding envelopes until the page is full. All objects within the radius
+            # are part of the envelope, so the order is exact.
+            radius = (after_distance or 0) + NEAREST_INITIAL_RADIUS
+            while True:
+                radius_envelope = get_radius_envelope(lat, lon, radius)
+                if radius_envelope is None:
+                    return self._fetch_ordered_by_distance(query, model_cls, distance, limit, after_distance, after_id)
+
+                envelope_query = query.filter(self._get_envelope_filter(model_cls, radius_envelope), distance <= radius)
+                results = self._fetch_ordered_by_distance(
+                    envelope_query,
+                    model_cls,
+                    distance,
+                    limit,
+                    after_distance,
+                    after_id,
+                )
+                if len(results) >= limit:
+                    return results
+                radius *= 4
+
+        raise NotImplementedError('The application just supports mysql, mariadb and postgresql.')
+
+    def _get_envelope_filter(
+        self,
+        model_cls: type,
+        envelope: tuple[float, float, float, float],
+    ) -> ColumnElement[bool]:
+        """
+        Returns a filter for all objects within the envelope (lon_min, lat_min, lon_max, lat_max), which can use the
+        index. Envelopes from `get_radius_envelope()` contain all candidates of a radius search.
+        """
+        engine_name = self.session.connection().dialect.name
+        if engine_name == 'postgresql':
+            return model_cls.geometry.op('&&')(func.ST_MakeEnvelope(*envelope, 4326))
+
+        if engine_name == 'mysql':
+            # Points have no SRID at MySQL, so the SPATIAL index would not be used anyway
+            lon_min, lat_min, lon_max, lat_max = envelope
+            return and_(model_cls.lat.between(lat_min, lat_max), model_cls.lon.between(lon_min, lon_max))
+
+        raise NotImplementedError('The application just supports mysql, mariadb and postgresql.')
+
+    @staticmethod
+    def _fetch_ordered_by_distance(
+        query: Query,
+        model_cls: type,
+        distance: ColumnElement,
+        limit: int,
+        after_distance: float | None,
+        after_id: int | None,
+    ) -> list[tuple[Any, float]]:
+        if after_distance is not None and after_id is not None:
+            query = query.filter(
+                or_(distance > after_distance, and_(distance == after_distance, model_cls.id > after_id)),
+            )
+
+        query = query.add_columns(distance.label('distance')).order_by(distance, model_cls.id).limit(limit)
+
+        return [(item, float(item_distance)) for item, item_distance in query.all()]
+
+    @staticmethod
+    def _filter_by_bbox(
+        query: Query,
+        model_cls: type,
+        *,
+        lat_min: Decimal,
+        lat_max: Decimal,
+        lon_min: Decimal,
+        lon_max: Decimal,
+    ) -> Query:
+        # ST_Within implies the index-backed bounding box check
+        return query.filter(
+            func.ST_Within(
+                model_cls.geometry,
+                func.ST_MakeEnvelope(lon_min, lat_min, lon_max, lat_max, 4326),
+            ),
+        )
@@ -0,0 +1,128 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from sqlalchemy import ColumnElement, distinct, func, select
+from sqlalchemy.orm import scoped_session
+
+from webapp.common.vector_tile import VectorTile, VectorTileFeature, encode_vector_tile, get_tile_bounds
+
+VECTOR_TILE_EXTENT = 4096
+
+
+class VectorTileRepositoryMixin:
+    """
+    Mixin for repositories of models with `geometry`, `lat` and `lon` columns which can be rendered as Mapbox Vector
+    Tiles. PostgreSQL renders the tile via `ST_AsMVT`, other databases fall back to our own point encoder.
+    """
+
+    session: scoped_session
+
+    def _fetch_vector_tile(
+        self,
+        *,
+        model_cls: type,
+        layer_name: str,
+        z: int,
+        x: int,
+        y: int,
+        columns: list[ColumnElement],
+        filters: list[ColumnElement],
+    ) -> VectorTile:
+        """
+        Renders a tile with one point feature per row. `columns` have to contain labeled columns `id` (used as feature
+        id) and `source_id`, all other columns are set as feature properties.
+        """
+        engine_name = self.session.connection().dialect.name
+        if engine_name == 'postgresql':
+            return self._fetch_postgresql_vector_tile(
+                model_cls=model_cls,
+                layer_name=layer_name,
+                z=z,
+                x=x,
+                y=y,
+                columns=columns,
+                filters=filters,
+            )
+        if engine_name == 'mysql':
+            return self._fetch_generic_vector_tile(
+                model_cls=model_cls,
+                layer_name=layer_name,
+                z=z,
+                x=x,
+                y=y,
+                columns=columns,
+                filters=filters,
+            )
+        raise NotImplementedError('The application just supports mysql, mariadb and postgresql.')
+
+    def _fetch_postgresql_vector_tile(
+        self,
+        *,
+        model_cls: type,
+        layer_name: str,
+        z: int,
+        x: int,
+        y: int,
+        columns: list[ColumnElement],
+        filters: list[ColumnElement],
+    ) -> VectorTile:
+        tile_envelope = func.ST_TileEnvelope(z, x, y)
+        tile_features = (
+            select(
+                func.ST_AsMVTGeom(
+                    func.ST_Transform(model_cls.geometry, 3857),
+                    tile_envelope,
+                    VECTOR_TILE_EXTENT,
+                    0,
+                ).label('geom'),
+                *columns,
+            )
+            .where(model_cls.geometry.op('&&')(func.ST_Transform(tile_envelope, 4326)), *filters)
+            .subquery('tile_features')
+        )
+        query = select(
+            func.ST_AsMVT(tile_features.table_valued(), layer_name, VECTOR_TILE_EXTENT, 'geom', 'id'),
+            func.array_agg(distinct(tile_features.c.source_id)),
+        ).select_from(tile_features)
+
+        data, source_ids = self.session.execute(query).one()
+
+        return VectorTile(data=bytes(data) if data else b'', source_ids=set(source_ids or []))
+
+    def _fetch_generic_vector_tile(
+        self,
+        *,
+        model_cls: type,
+        layer_name: str,
+        z: int,
+        x: int,
+        y: int,
+        columns: list[ColumnElement],
+        filters: list[ColumnElement],
+    ) -> VectorTile:
+        lat_min, lon_min, lat_max, lon_max = get_tile_bounds(z, x, y)
+        query = select(model_cls.lat.label('lat'), model_cls.lon.label('lon'), *columns).where(
+            model_cls.lat.between(lat_min, lat_max),
+            model_cls.lon.between(lon_min, lon_max),
+            *filters,
+        )
+
+        features: list[VectorTileFeature] = []
+        source_ids: set[int] = set()
+        for row in self.session.execute(query).mappings():
+            source_ids.add(row['source_id'])
+            features.append(
+                VectorTileFeature(
+                    id=row['id'],
+                    lat=float(row['lat']),
+                    lon=float(row['lon']),
+                    properties={key: value for key, value in row.items() if key not in ('id', 'lat', 'lon')},
+                ),
+            )
+
+        return VectorTile(
+            data=encode_vector_tile(layer_name, features, z=z, x=x, y=y, extent=VECTOR_TILE_EXTENT),
+            source_ids=source_ids,
+        )
@@ -0,0 +1,36 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import structlog
+
+from webapp.repositories import ChangeLogEntryRepository
+from webapp.services.base_service import BaseService
+
+logger = structlog.get_logger(__name__)
+
+
+class ChangeLogService(BaseService):
+    change_log_entry_repository: ChangeLogEntryRepository
+
+    def __init__(self, *args, change_log_entry_repository: ChangeLogEntryRepository, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.change_log_entry_repository = change_log_entry_repository
+
+    def compact_change_log(self):
+        created_before = datetime.now(tz=timezone.utc) - timedelta(
+            days=self.config_helper.get('CHANGE_LOG_RETENTION_DAYS', 7),
+        )
+
+        # Superseded entries first, so that tombstones of re-created objects are not left behind
+        superseded_count = self.change_log_entry_repository.delete_superseded_change_log_entries(created_before)
+        tombstone_count = self.change_log_entry_repository.delete_tombstones(created_before)
+        self.change_log_entry_repository.commit_transaction()
+
+        logger.info(
+            f'Compacted change log before {created_before.isoformat()}: removed {superseded_count} superseded entries '
+            f'and {tombstone_count} tombstones.',
+        )
@@ -0,0 +1,13 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from webapp.dependencies import dependencies
+from webapp.extensions import celery
+
+
+@celery.task()
+def compact_change_log_task():
+    change_log_service = dependencies.get_change_log_service()
+    change_log_service.compact_change_log()
@@ -5,11 +5,8 @@ Use of this source code is governed by an MIT-style license that can be found in
 
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, List
 
-from openpyxl.cell import Cell
-from openpyxl.reader.excel import load_workbook
-from openpyxl.worksheet.worksheet import Worksheet
 from validataclass.exceptions import ValidationError
 from validataclass.validators import DataclassValidator
 
@@ -26,6 +23,10 @@ from webapp.services.import_service.exceptions import (
 
 from .parking_site_import_xlsx_validator import ParkingSiteInput
 
+if TYPE_CHECKING:
+    from openpyxl.cell import Cell
+    from openpyxl.worksheet.worksheet import Worksheet
+
 
 class ParkingSiteXlsxImportService(BaseService):
     parking_site_repository: ParkingSiteRepository
@@ -104,10 +105,13 @@ class ParkingSiteXlsxImportService(BaseService):
         self.source_repository.save_source(source)
 
     @staticmethod
-    def load_parking_sites(import_file_path: Path) -> Worksheet:
+    def load_parking_sites(import_file_path: Path) -> 'Worksheet':
+        # openpyxl is imported on first use, as it's just needed for this rarely used import
+        from openpyxl.reader.excel import load_workbook
+
         return load_workbook(filename=str(import_file_path)).active
 
-    def get_mapping_by_header(self, row: tuple[Cell]) -> list[str]:
+    def get_mapping_by_header(self, row: tuple['Cell', ...]) -> list[str]:
         header_keys = self.header_row.keys()
         mapping: list[str] = []
         for col in row:
@@ -119,7 +123,7 @@ class ParkingSiteXlsxImportService(BaseService):
     def import_parking_sites(
         self,
         source: Source,
-        worksheet: Worksheet,
+        worksheet: 'Worksheet',
         mapping: list[str],
     ) -> List[ImportDatasetException]:
         validation_exceptions: List[ImportDatasetException] = []
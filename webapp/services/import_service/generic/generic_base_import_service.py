@@ -4,7 +4,6 @@ Use of this source code is governed by an MIT-style license that can be found in
 """
 
 import structlog
-from parkapi_sources import ParkAPISources
 from parkapi_sources.models import StaticBaseParkingInput, StaticParkingSpotInput
 
 from webapp.common.logging.models import LogMessageType
@@ -12,6 +11,7 @@ from webapp.models import ExternalIdentifier, ParkingRestriction, ParkingSite, P
 from webapp.repositories import OfficialRegionCodeRepository, SourceRepository
 from webapp.repositories.exceptions import ObjectNotFoundException
 from webapp.services.base_service import BaseService
+from webapp.services.source_metrics_service import SourceMetricsService
 
 logger = structlog.get_logger(__name__)
 
@@ -19,7 +19,7 @@ logger = structlog.get_logger(__name__)
 class GenericBaseImportService(BaseService):
     source_repository: SourceRepository
     official_region_code_repository: OfficialRegionCodeRepository
-    park_api_sources: ParkAPISources
+    source_metrics_service: SourceMetricsService
 
     # Cached list of countries for which an official region code database is available. Empty until a database is found,
     # so it keeps re-checking until the regionalschluessel table has been imported.
@@ -30,11 +30,13 @@ class GenericBaseImportService(BaseService):
         *args,
         source_repository: SourceRepository,
         official_region_code_repository: OfficialRegionCodeRepository,
+        source_metrics_service: SourceMetricsService,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
         self.source_repository = source_repository
         self.official_region_code_repository = official_region_code_repository
+        self.source_metrics_service = source_metrics_service
 
     def assign_official_region_code(self, entity: ParkingSite | ParkingSpot) -> None:
         """
@@ -4,7 +4,6 @@ Use of this source code is governed by an MIT-style license that can be found in
 """
 
 from celery.schedules import crontab
-from parkapi_sources.converters.base_converter.pull import PullConverter
 
 from webapp.common.celery import CeleryHelper
 from webapp.common.config import ConfigHelper
@@ -32,12 +31,9 @@ class GenericImportRunner:
     def start(self):
         if self.config_helper.get('PREVENT_AUTO_IMPORT'):
             return
-        for source_uid in self.generic_import_service.park_api_sources.converter_by_uid.keys():
+        for source_uid in self.generic_import_service.source_uids:
             # Don't try to pull push-endpoints
-            if not isinstance(
-                self.generic_import_service.park_api_sources.converter_by_uid[source_uid],
-                PullConverter,
-            ):
+            if not self.generic_import_service.is_pull_source(source_uid):
                 continue
 
             celery.add_periodic_task(
@@ -3,9 +3,12 @@ Copyright 2023 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
+from threading import Lock
+
 import structlog
 from flask import Flask
 from parkapi_sources import ParkAPISources
+from parkapi_sources.converters.base_converter import BaseConverter
 from parkapi_sources.converters.base_converter.pull import (
     ParkingSitePullConverter,
     ParkingSpotPullConverter,
@@ -13,6 +16,7 @@ from parkapi_sources.converters.base_converter.pull import (
 )
 
 from webapp.common.contexts import TelemetryContext
+from webapp.common.events import Event, EventSource, EventType
 from webapp.common.logging.models import LogMessageType
 from webapp.common.rest.exceptions import UnknownSourceException
 from webapp.models import Source
@@ -23,6 +27,7 @@ from webapp.services.base_service import BaseService
 
 from .generic_parking_site_import_service import GenericParkingSiteImportService
 from .generic_parking_spot_import_service import GenericParkingSpotImportService
+from .import_error_summary import ImportErrorSummary
 
 logger = structlog.get_logger(__name__)
 
@@ -32,7 +37,11 @@ class GenericImportService(BaseService):
     generic_parking_site_import_service: GenericParkingSiteImportService
     generic_parking_spot_import_service: GenericParkingSpotImportService
 
-    park_api_sources: ParkAPISources
+    park_api_source_uids: list[str]
+    park_api_sources_config: dict[str, str]
+    custom_converter_by_uid: dict[str, BaseConverter]
+    _converter_by_uid: dict[str, BaseConverter]
+    _converter_lock: Lock
 
     def __init__(
         self,
@@ -46,6 +55,8 @@ class GenericImportService(BaseService):
         self.source_repository = source_repository
         self.generic_parking_site_import_service = generic_parking_site_import_service
         self.generic_parking_spot_import_service = generic_parking_spot_import_service
+        self._converter_by_uid = {}
+        self._converter_lock = Lock()
 
     def init_app(self, app: Flask):
         park_api_source_uids: list[str] = []
@@ -63,28 +74,96 @@ class GenericImportService(BaseService):
             if 'env' in source_dict:
                 park_api_sources_config.update(source_dict['env'])
 
-        self.park_api_sources = ParkAPISources(
-            converter_uids=park_api_source_uids,
-            config=park_api_sources_config,
-            custom_converters=app.config.get('PARK_API_SOURCES_CUSTOM_CONVERTERS'),
-        )
-        self.park_api_sources.check_credentials()
+        # Converters are just instantiated on first use, so web processes only build the ones data is pushed to
+        self.park_api_source_uids = park_api_source_uids
+        self.park_api_sources_config = park_api_sources_config
+        self.custom_converter_by_uid = {
+            converter.source_info.uid: converter
+            for converter in app.config.get('PARK_API_SOURCES_CUSTOM_CONVERTERS') or []
+        }
+
+    @property
+    def source_uids(self) -> list[str]:
+        return [
+            *self.park_api_source_uids,
+            *[source_uid for source_uid in self.custom_converter_by_uid if source_uid not in self.park_api_source_uids],
+        ]
+
+    def get_converter_class(self, source_uid: str) -> type[BaseConverter]:
+        """
+        Returns the converter class without instantiating the converter, e.g. to decide whether a source gets pulled.
+        """
+        if source_uid in self.custom_converter_by_uid:
+            return type(self.custom_converter_by_uid[source_uid])
+
+        if source_uid in self.park_api_source_uids:
+            for converter_class in ParkAPISources.converter_classes:
+                if converter_class.source_info.uid == source_uid:
+                    return converter_class
+
+        raise UnknownSourceException(message=f'Source {source_uid} is not supported.')
+
+    def get_converter(self, source_uid: str) -> BaseConverter:
+        converter = self._converter_by_uid.get(source_uid)
+        if converter is not None:
+            return converter
+
+        with self._converter_lock:
+            if source_uid not in self._converter_by_uid:
+                if source_uid not in self.source_uids:
+                    raise UnknownSourceException(message=f'Source {source_uid} is not supported.')
+
+                if source_uid in self.custom_converter_by_uid:
+                    park_api_sources = ParkAPISources(
+                        converter_uids=[],
+                        config=self.park_api_sources_config,
+                        custom_converters=[self.custom_converter_by_uid[source_uid]],
+                    )
+                else:
+                    park_api_sources = ParkAPISources(
+                        converter_uids=[source_uid],
+                        config=self.park_api_sources_config,
+                    )
+                park_api_sources.check_credentials()
+
+                self._converter_by_uid[source_uid] = park_api_sources.converter_by_uid[source_uid]
+
+            return self._converter_by_uid[source_uid]
+
+    def is_pull_source(self, source_uid: str) -> bool:
+        return issubclass(self.get_converter_class(source_uid), PullConverter)
+
+    def check_credentials(self):
+        """
+        Builds all converters, which raises MissingConfigException if any of them misses config values. Meant for
+        processes which import data, so they fail at startup instead of at the first import.
+        """
+        for source_uid in self.source_uids:
+            self.get_converter(source_uid)
 
     def update_sources_static(self):
-        for source_uid in self.park_api_sources.converter_by_uid.keys():
-            if isinstance(self.park_api_sources.converter_by_uid[source_uid], PullConverter):
+        for source_uid in self.source_uids:
+            if self.is_pull_source(source_uid):
                 self.update_source_static(source_uid)
 
     def update_sources_realtime(self):
-        for source_uid in self.park_api_sources.converter_by_uid.keys():
-            if isinstance(self.park_api_sources.converter_by_uid[source_uid], PullConverter):
+        for source_uid in self.source_uids:
+            if self.is_pull_source(source_uid):
                 self.update_source_realtime(source_uid)
 
     def update_source_static(self, source_uid: str):
+        with self.event_helper.suppress_model_events():
+            self._update_source_static(source_uid)
+
+        self.event_helper.record(
+            Event(type=EventType.SOURCE_STATIC_IMPORTED, source=EventSource.SERVICE, data={'source_uid': source_uid}),
+        )
+
+    def _update_source_static(self, source_uid: str):
         self.context_helper.set_telemetry_context(TelemetryContext.SOURCE, source_uid)
 
         source = self.get_upserted_source(source_uid)
-        converter = self.park_api_sources.converter_by_uid[source_uid]
+        converter = self.get_converter(source_uid)
 
         if isinstance(converter, ParkingSitePullConverter):
             try:
@@ -116,11 +195,12 @@ class GenericImportService(BaseService):
                     type=LogMessageType.STATIC_PARKING_SITE_HANDLING,
                 )
 
-            for static_parking_site_error in static_parking_site_errors:
-                logger.info(
-                    f'Failed to pull {source.uid} static parking site item: {static_parking_site_error}.',
-                    type=LogMessageType.STATIC_PARKING_SITE_HANDLING,
-                )
+            ImportErrorSummary.from_errors(static_parking_site_errors).log(
+                logger,
+                f'Failed to pull {source.uid} static parking site items',
+                type=LogMessageType.STATIC_PARKING_SITE_HANDLING,
+                level='info',
+            )
 
         if isinstance(converter, ParkingSpotPullConverter):
             try:
@@ -152,20 +232,29 @@ class GenericImportService(BaseService):
                     type=LogMessageType.STATIC_PARKING_SPOT_HANDLING,
                 )
 
-            for static_parking_spot_error in static_parking_spot_errors:
-                logger.info(
-                    f'Failed to pull {source.uid} static parking spot item: {static_parking_spot_error}',
-                    type=LogMessageType.STATIC_PARKING_SPOT_HANDLING,
-                )
+            ImportErrorSummary.from_errors(static_parking_spot_errors).log(
+                logger,
+                f'Failed to pull {source.uid} static parking spot items',
+                type=LogMessageType.STATIC_PARKING_SPOT_HANDLING,
+                level='info',
+            )
 
         source.static_status = SourceStatus.ACTIVE
         self.source_repository.save_source(source)
 
     def update_source_realtime(self, source_uid: str):
+        with self.event_helper.suppress_model_events():
+            self._update_source_realtime(source_uid)
+
+        self.event_helper.record(
+            Event(type=EventType.SOURCE_REALTIME_IMPORTED, source=EventSource.SERVICE, data={'source_uid': source_uid}),
+        )
+
+    def _update_source_realtime(self, source_uid: str):
         self.context_helper.set_telemetry_context(TelemetryContext.SOURCE, source_uid)
 
         source = self.source_repository.fetch_source_by_uid(source_uid)
-        converter = self.park_api_sources.converter_by_uid[source_uid]
+        converter = self.get_converter(source_uid)
 
         # We can't do realtime updates when static data is not active
         if source.static_status != SourceStatus.ACTIVE:
@@ -206,11 +295,12 @@ class GenericImportService(BaseService):
                     type=LogMessageType.REALTIME_PARKING_SITE_HANDLING,
                 )
 
-            for realtime_parking_site_error in realtime_parking_site_errors:
-                logger.info(
-                    f'Failed to pull {source.uid} realtime parking site item: {realtime_parking_site_error}',
-                    type=LogMessageType.REALTIME_PARKING_SITE_HANDLING,
-                )
+            ImportErrorSummary.from_errors(realtime_parking_site_errors).log(
+                logger,
+                f'Failed to pull {source.uid} realtime parking site items',
+                type=LogMessageType.REALTIME_PARKING_SITE_HANDLING,
+                level='info',
+            )
 
         if isinstance(converter, ParkingSpotPullConverter):
             try:
@@ -243,18 +333,18 @@ class GenericImportService(BaseService):
                     type=LogMessageType.REALTIME_PARKING_SPOT_HANDLING,
                 )
 
-            for realtime_parking_spot_error in realtime_parking_spot_errors:
-                logger.info(
-                    f'Failed to pull {source.uid} realtime parking spot item: {realtime_parking_spot_error}',
-                    type=LogMessageType.REALTIME_PARKING_SPOT_HANDLING,
-                )
+            ImportErrorSummary.from_errors(realtime_parking_spot_errors).log(
+                logger,
+                f'Failed to pull {source.uid} realtime parking spot items',
+                type=LogMessageType.REALTIME_PARKING_SPOT_HANDLING,
+                level='info',
+            )
 
         source.realtime_status = SourceStatus.ACTIVE
         self.source_repository.save_source(source)
 
     def get_upserted_source(self, source_uid: str) -> Source:
-        if source_uid not in self.park_api_sources.converter_by_uid:
-            raise UnknownSourceException(message=f'Source {source_uid} is not supported.')
+        source_info = self.get_converter(source_uid).source_info
 
         try:
             source = self.source_repository.fetch_source_by_uid(source_uid)
@@ -262,7 +352,6 @@ class GenericImportService(BaseService):
             source = Source()
             source.uid = source_uid
 
-        source_info = self.park_api_sources.converter_by_uid[source_uid].source_info
         for key, value in source_info.to_dict().items():
             if key not in ['uid', 'has_realtime_data']:
                 setattr(source, key, value)
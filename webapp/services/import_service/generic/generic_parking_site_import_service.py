@@ -3,7 +3,6 @@ Copyright 2025 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
-import traceback
 from datetime import datetime, timezone
 
 import structlog
@@ -17,13 +16,21 @@ from parkapi_sources.models import (
 )
 
 from webapp.common.logging.models import LogMessageType
+from webapp.common.pubsub import LocalPubSub
 from webapp.models import ParkingSite, ParkingSiteHistory, Source
 from webapp.models.parking_site_group import ParkingSiteGroup
 from webapp.models.source import SourceStatus
 from webapp.repositories import ParkingSiteGroupRepository, ParkingSiteHistoryRepository, ParkingSiteRepository
 from webapp.repositories.exceptions import ObjectNotFoundException
+from webapp.services.matching_service import MatchingService
+from webapp.services.source_metrics_service import SourceMetricDeltas
+from webapp.shared.parking_site.parking_site_realtime_event import (
+    PARKING_SITE_REALTIME_CHANNEL,
+    ParkingSiteRealtimeEvent,
+)
 
 from .generic_base_import_service import GenericBaseImportService
+from .import_error_summary import ImportErrorSummary
 
 logger = structlog.get_logger(__name__)
 
@@ -42,6 +49,8 @@ class GenericParkingSiteImportService(GenericBaseImportService):
     parking_site_repository: ParkingSiteRepository
     parking_site_history_repository: ParkingSiteHistoryRepository
     parking_site_group_repository: ParkingSiteGroupRepository
+    pubsub: LocalPubSub
+    matching_service: MatchingService
 
     def __init__(
         self,
@@ -49,12 +58,16 @@ class GenericParkingSiteImportService(GenericBaseImportService):
         parking_site_repository: ParkingSiteRepository,
         parking_site_history_repository: ParkingSiteHistoryRepository,
         parking_site_group_repository: ParkingSiteGroupRepository,
+        pubsub: LocalPubSub,
+        matching_service: MatchingService,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
         self.parking_site_repository = parking_site_repository
         self.parking_site_history_repository = parking_site_history_repository
         self.parking_site_group_repository = parking_site_group_repository
+        self.pubsub = pubsub
+        self.matching_service = matching_service
 
     def handle_static_import_results(
         self,
@@ -63,23 +76,31 @@ class GenericParkingSiteImportService(GenericBaseImportService):
         static_parking_site_errors: list[ImportParkingSiteException],
     ):
         existing_parking_site_ids = self.parking_site_repository.fetch_parking_site_ids_by_source_id(source.id)
+        source_metric_deltas = self.source_metrics_service.get_source_metric_deltas(source)
+        unhandled_errors = ImportErrorSummary()
         for static_parking_site_input in static_parking_site_inputs:
             try:
                 self.save_static_or_combined_parking_site_input(
                     source,
                     static_parking_site_input,
                     existing_parking_site_ids,
+                    source_metric_deltas=source_metric_deltas,
                 )
             except Exception as e:
-                logger.warning(
-                    f'Unhandled exception at dataset {static_parking_site_input}: {e} {traceback.format_exc()}',
-                    type=LogMessageType.STATIC_PARKING_SITE_HANDLING,
-                )
+                unhandled_errors.add(e, sample=static_parking_site_input.uid, with_traceback=True)
+
+        unhandled_errors.log(
+            logger,
+            f'Unhandled exceptions at static parking sites of source {source.uid}',
+            type=LogMessageType.STATIC_PARKING_SITE_HANDLING,
+        )
 
         # Delete remaining existing parking sites because they are not in the new dataset
         for existing_parking_site_id in existing_parking_site_ids:
             existing_parking_site = self.parking_site_repository.fetch_parking_site_by_id(existing_parking_site_id)
+            realtime_data_updated_at = existing_parking_site.realtime_data_updated_at
             self.parking_site_repository.delete_parking_site(existing_parking_site)
+            source_metric_deltas.add_parking_site(realtime_data_updated_at, None, count_delta=-1)
 
         if len(static_parking_site_inputs):
             source.static_status = SourceStatus.ACTIVE
@@ -88,18 +109,47 @@ class GenericParkingSiteImportService(GenericBaseImportService):
 
         source.static_data_updated_at = datetime.now(tz=timezone.utc)
         source.static_parking_site_error_count = len(static_parking_site_errors)
+        self.source_metrics_service.apply_source_metric_deltas(source, source_metric_deltas, commit=False)
+
+        self.source_repository.save_source(source)
+
+        self._check_pending_duplicates(source)
+
+    def _check_pending_duplicates(self, source: Source):
+        """
+        Checks new and moved parking sites for duplicates. Failures are just logged, as the sites stay queued for the next
+        check, but the import must not fail.
+        """
+        try:
+            self.matching_service.check_pending_duplicates()
+        except Exception as e:
+            self.parking_site_repository.rollback_transaction()
+            logger.warning(
+                f'Failed to check pending duplicates after import of source {source.uid}: {e}',
+                type=LogMessageType.DUPLICATE_HANDLING,
+            )
 
     def save_static_or_combined_parking_site_input(
         self,
         source: Source,
         parking_site_input: StaticParkingSiteInput,
         existing_parking_site_ids: list[int],
+        source_metric_deltas: SourceMetricDeltas | None = None,
     ) -> ParkingSite:
+        """
+        Creates or updates a parking site. Metric changes are added to `source_metric_deltas`, or applied right away if
+        not set.
+        """
+        apply_source_metric_deltas = source_metric_deltas is None
+        if source_metric_deltas is None:
+            source_metric_deltas = self.source_metrics_service.get_source_metric_deltas(source)
+
         try:
             parking_site = self.parking_site_repository.fetch_parking_site_by_source_id_and_original_uid(
                 source_id=source.id,
                 original_uid=parking_site_input.uid,
             )
+            created = False
             # If the ParkingSite exists: remove it from existing parking site list
             if parking_site.id in existing_parking_site_ids:
                 existing_parking_site_ids.remove(parking_site.id)
@@ -107,6 +157,8 @@ class GenericParkingSiteImportService(GenericBaseImportService):
             parking_site = ParkingSite()
             parking_site.source_id = source.id
             parking_site.original_uid = parking_site_input.uid
+            created = True
+        previous_realtime_data_updated_at = parking_site.realtime_data_updated_at
 
         history_enabled: bool = self.config_helper.get('HISTORY_ENABLED', False)
         history_changed = False
@@ -159,10 +211,20 @@ class GenericParkingSiteImportService(GenericBaseImportService):
         else:
             parking_site.parking_site_group_id = None
 
+        # The commit expires the parking site, so the value is kept for the metrics
+        realtime_data_updated_at = parking_site.realtime_data_updated_at
         self.parking_site_repository.save_parking_site(parking_site)
+        source_metric_deltas.add_parking_site(
+            previous_realtime_data_updated_at,
+            realtime_data_updated_at,
+            count_delta=1 if created else 0,
+        )
         if history_enabled and history_changed:
             self._add_history(parking_site)
 
+        if apply_source_metric_deltas:
+            self.source_metrics_service.apply_source_metric_deltas(source, source_metric_deltas)
+
         return parking_site
 
     def handle_realtime_import_results(
@@ -174,9 +236,18 @@ class GenericParkingSiteImportService(GenericBaseImportService):
         if source.static_status != SourceStatus.ACTIVE:
             return
 
+        # Events are just built if anyone listens to the realtime streams
+        realtime_events: list[ParkingSiteRealtimeEvent] | None = [] if self._has_realtime_listeners(source) else None
+        source_metric_deltas = self.source_metrics_service.get_source_metric_deltas(source)
+        unhandled_errors = ImportErrorSummary()
         for realtime_parking_site_input in realtime_parking_site_inputs:
             try:
-                self._save_realtime_parking_site_input(source, realtime_parking_site_input)
+                self._save_realtime_parking_site_input(
+                    source,
+                    realtime_parking_site_input,
+                    realtime_events=realtime_events,
+                    source_metric_deltas=source_metric_deltas,
+                )
             except ObjectNotFoundException:
                 realtime_parking_site_errors.append(
                     ImportParkingSiteException(
@@ -186,19 +257,22 @@ class GenericParkingSiteImportService(GenericBaseImportService):
                     ),
                 )
             except Exception as e:
-                logger.warning(
-                    f'Unhandled exception at dataset {realtime_parking_site_input}: {e} {traceback.format_exc()}',
-                    type=LogMessageType.REALTIME_PARKING_SITE_HANDLING,
-                )
+                unhandled_errors.add(e, sample=realtime_parking_site_input.uid, with_traceback=True)
                 realtime_parking_site_errors.append(
                     ImportParkingSiteException(
-                        message=f'Unhandled exception at dataset {realtime_parking_site_input}: '
-                        f'{e} {traceback.format_exc()}',
+                        message=f'Unhandled exception at dataset {realtime_parking_site_input.uid}: {e}',
                         source_uid=source.uid,
+                        parking_site_uid=realtime_parking_site_input.uid,
                         data=realtime_parking_site_input.to_dict(),
                     ),
                 )
 
+        unhandled_errors.log(
+            logger,
+            f'Unhandled exceptions at realtime parking sites of source {source.uid}',
+            type=LogMessageType.REALTIME_PARKING_SITE_HANDLING,
+        )
+
         if len(realtime_parking_site_inputs):
             source.realtime_status = SourceStatus.ACTIVE
         elif len(realtime_parking_site_errors):
@@ -206,15 +280,55 @@ class GenericParkingSiteImportService(GenericBaseImportService):
 
         source.realtime_data_updated_at = datetime.now(tz=timezone.utc)
         source.realtime_parking_site_error_count = len(realtime_parking_site_errors)
+        self.source_metrics_service.apply_source_metric_deltas(source, source_metric_deltas, commit=False)
 
         self.source_repository.save_source(source)
 
-    def _save_realtime_parking_site_input(self, source: Source, realtime_parking_site_input: RealtimeParkingSiteInput):
+        if realtime_events:
+            self._publish_realtime_events(source, realtime_events)
+
+    def _has_realtime_listeners(self, source: Source) -> bool:
+        if not self.config_helper.get('REALTIME_STREAM_ENABLED', True):
+            return False
+
+        try:
+            return self.pubsub.has_subscribers(PARKING_SITE_REALTIME_CHANNEL)
+        except Exception as e:
+            logger.warning(
+                f'Failed to check realtime stream listeners for source {source.uid}: {e}',
+                type=LogMessageType.REALTIME_PARKING_SITE_HANDLING,
+            )
+            return False
+
+    def _publish_realtime_events(self, source: Source, realtime_events: list[ParkingSiteRealtimeEvent]):
+        """
+        Publishes the committed realtime data to the parking site realtime streams. Failures are just logged, as stream
+        clients can catch up via Last-Event-ID, but the import must not fail.
+        """
+        try:
+            self.pubsub.publish(
+                PARKING_SITE_REALTIME_CHANNEL,
+                {'source_id': source.id, 'events': [realtime_event.to_dict() for realtime_event in realtime_events]},
+            )
+        except Exception as e:
+            logger.warning(
+                f'Failed to publish realtime parking sites of source {source.uid}: {e}',
+                type=LogMessageType.REALTIME_PARKING_SITE_HANDLING,
+            )
+
+    def _save_realtime_parking_site_input(
+        self,
+        source: Source,
+        realtime_parking_site_input: RealtimeParkingSiteInput,
+        realtime_events: list[ParkingSiteRealtimeEvent] | None = None,
+        source_metric_deltas: SourceMetricDeltas | None = None,
+    ) -> ParkingSite:
         parking_site = self.parking_site_repository.fetch_parking_site_by_source_id_and_original_uid(
             source_id=source.id,
             original_uid=realtime_parking_site_input.uid,
             include_restrictions=True,
         )
+        previous_realtime_data_updated_at = parking_site.realtime_data_updated_at
 
         history_enabled: bool = self.config_helper.get('HISTORY_ENABLED', False)
         history_changed = False
@@ -285,10 +399,23 @@ class GenericParkingSiteImportService(GenericBaseImportService):
                 restriction.realtime_free_capacity,
             )
 
+        # The event is built before saving, as the commit expires the parking site and its restrictions
+        if (
+            realtime_events is not None
+            and parking_site.has_realtime_data
+            and parking_site.realtime_data_updated_at is not None
+        ):
+            realtime_events.append(ParkingSiteRealtimeEvent.from_parking_site(parking_site))
+
+        realtime_data_updated_at = parking_site.realtime_data_updated_at
         self.parking_site_repository.save_parking_site(parking_site)
+        if source_metric_deltas is not None:
+            source_metric_deltas.add_parking_site(previous_realtime_data_updated_at, realtime_data_updated_at)
         if history_enabled and history_changed:
             self._add_history(parking_site)
 
+        return parking_site
+
     def _add_history(self, parking_site: ParkingSite):
         parking_site_history = ParkingSiteHistory()
         parking_site_history.parking_site_id = parking_site.id
@@ -3,11 +3,9 @@ Copyright 2025 binary butterfly GmbH
 Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
 """
 
-import traceback
 from datetime import datetime, timezone
 
 import structlog
-from parkapi_sources import ParkAPISources
 from parkapi_sources.exceptions import ImportParkingSpotException
 from parkapi_sources.models import RealtimeParkingSpotInput, StaticParkingSpotInput
 
@@ -20,8 +18,10 @@ from webapp.repositories import (
     SourceRepository,
 )
 from webapp.repositories.exceptions import ObjectNotFoundException
+from webapp.services.source_metrics_service import SourceMetricDeltas
 
 from .generic_base_import_service import GenericBaseImportService
+from .import_error_summary import ImportErrorSummary
 
 logger = structlog.get_logger(__name__)
 
@@ -30,7 +30,6 @@ class GenericParkingSpotImportService(GenericBaseImportService):
     source_repository: SourceRepository
     parking_site_repository: ParkingSiteRepository
     parking_spot_repository: ParkingSpotRepository
-    park_api_sources: ParkAPISources
 
     def __init__(
         self,
@@ -50,23 +49,31 @@ class GenericParkingSpotImportService(GenericBaseImportService):
         static_parking_spot_errors: list[ImportParkingSpotException],
     ):
         existing_parking_spot_ids = self.parking_spot_repository.fetch_parking_spot_ids_by_source_id(source.id)
+        source_metric_deltas = self.source_metrics_service.get_source_metric_deltas(source)
+        unhandled_errors = ImportErrorSummary()
         for static_parking_spot_input in static_parking_spot_inputs:
             try:
                 self.save_static_or_combined_parking_spot_input(
                     source,
                     static_parking_spot_input,
                     existing_parking_spot_ids,
+                    source_metric_deltas=source_metric_deltas,
                 )
             except Exception as e:
-                logger.warning(
-                    f'Unhandled exception at dataset {static_parking_spot_input}: {e} {traceback.format_exc()}',
-                    type=LogMessageType.STATIC_PARKING_SPOT_HANDLING,
-                )
+                unhandled_errors.add(e, sample=static_parking_spot_input.uid, with_traceback=True)
+
+        unhandled_errors.log(
+            logger,
+            f'Unhandled exceptions at static parking spots of source {source.uid}',
+            type=LogMessageType.STATIC_PARKING_SPOT_HANDLING,
+        )
 
         # Delete remaining existing parking sites because they are not in the new dataset
         for existing_parking_spot_id in existing_parking_spot_ids:
             existing_parking_spot = self.parking_spot_repository.fetch_parking_spot_by_id(existing_parking_spot_id)
+            realtime_data_updated_at = existing_parking_spot.realtime_data_updated_at
             self.parking_spot_repository.delete_parking_spot(existing_parking_spot)
+            source_metric_deltas.add_parking_spot(realtime_data_updated_at, None, count_delta=-1)
 
         if len(static_parking_spot_inputs):
             source.static_status = SourceStatus.ACTIVE
@@ -75,6 +82,7 @@ class GenericParkingSpotImportService(GenericBaseImportService):
 
         source.static_data_updated_at = datetime.now(tz=timezone.utc)
         source.static_parking_spot_error_count = len(static_parking_spot_errors)
+        self.source_metrics_service.apply_source_metric_deltas(source, source_metric_deltas, commit=False)
 
         self.source_repository.save_source(source)
 
@@ -89,7 +97,16 @@ class GenericParkingSpotImportService(GenericBaseImportService):
         source: Source,
         parking_spot_input: StaticParkingSpotInput,
         existing_parking_spot_ids: list[int] | None = None,
+        source_metric_deltas: SourceMetricDeltas | None = None,
     ) -> tuple[ParkingSpot, bool]:
+        """
+        Creates or updates a parking spot. Metric changes are added to `source_metric_deltas`, or applied right away if
+        not set.
+        """
+        apply_source_metric_deltas = source_metric_deltas is None
+        if source_metric_deltas is None:
+            source_metric_deltas = self.source_metrics_service.get_source_metric_deltas(source)
+
         try:
             parking_spot = self.parking_spot_repository.fetch_parking_spot_by_source_id_and_original_uid(
                 source_id=source.id,
@@ -104,6 +121,7 @@ class GenericParkingSpotImportService(GenericBaseImportService):
             parking_spot.source_id = source.id
             parking_spot.original_uid = parking_spot_input.uid
             created = True
+        previous_realtime_data_updated_at = parking_spot.realtime_data_updated_at
 
         for key, value in parking_spot_input.to_dict().items():
             if key in [
@@ -132,7 +150,17 @@ class GenericParkingSpotImportService(GenericBaseImportService):
         else:
             parking_spot.parking_site_id = None
 
+        # The commit expires the parking spot, so the value is kept for the metrics
+        realtime_data_updated_at = parking_spot.realtime_data_updated_at
         self.parking_spot_repository.save_parking_spot(parking_spot)
+        source_metric_deltas.add_parking_spot(
+            previous_realtime_data_updated_at,
+            realtime_data_updated_at,
+            count_delta=1 if created else 0,
+        )
+
+        if apply_source_metric_deltas:
+            self.source_metrics_service.apply_source_metric_deltas(source, source_metric_deltas)
 
         return parking_spot, created
 
@@ -145,9 +173,15 @@ class GenericParkingSpotImportService(GenericBaseImportService):
         if source.static_status != SourceStatus.ACTIVE:
             return
 
+        source_metric_deltas = self.source_metrics_service.get_source_metric_deltas(source)
+        unhandled_errors = ImportErrorSummary()
         for realtime_parking_spot_input in realtime_parking_spot_inputs:
             try:
-                self.save_realtime_parking_spot_input(source, realtime_parking_spot_input)
+                self.save_realtime_parking_spot_input(
+                    source,
+                    realtime_parking_spot_input,
+                    source_metric_deltas=source_metric_deltas,
+                )
             except ObjectNotFoundException:
                 realtime_parking_spot_errors.append(
                     ImportParkingSpotException(
@@ -157,19 +191,22 @@ class GenericParkingSpotImportService(GenericBaseImportService):
                     ),
                 )
             except Exception as e:
-                logger.warning(
-                    f'Unhandled exception at dataset {realtime_parking_spot_input}: {e} {traceback.format_exc()}',
-                    type=LogMessageType.REALTIME_PARKING_SPOT_HANDLING,
-                )
+                unhandled_errors.add(e, sample=realtime_parking_spot_input.uid, with_traceback=True)
                 realtime_parking_spot_errors.append(
                     ImportParkingSpotException(
-                        message=f'Unhandled exception at dataset {realtime_parking_spot_input}: '
-                        f'{e} {traceback.format_exc()}',
+                        message=f'Unhandled exception at dataset {realtime_parking_spot_input.uid}: {e}',
                         source_uid=source.uid,
+                        parking_spot_uid=realtime_parking_spot_input.uid,
                         data=realtime_parking_spot_input.to_dict(),
                     ),
                 )
 
+        unhandled_errors.log(
+            logger,
+            f'Unhandled exceptions at realtime parking spots of source {source.uid}',
+            type=LogMessageType.REALTIME_PARKING_SPOT_HANDLING,
+        )
+
         if len(realtime_parking_spot_inputs):
             source.realtime_status = SourceStatus.ACTIVE
         elif len(realtime_parking_spot_errors):
@@ -177,6 +214,7 @@ class GenericParkingSpotImportService(GenericBaseImportService):
 
         source.realtime_data_updated_at = datetime.now(tz=timezone.utc)
         source.realtime_parking_spot_error_count = len(realtime_parking_spot_errors)
+        self.source_metrics_service.apply_source_metric_deltas(source, source_metric_deltas, commit=False)
 
         self.source_repository.save_source(source)
 
@@ -186,15 +224,24 @@ class GenericParkingSpotImportService(GenericBaseImportService):
             type=LogMessageType.REALTIME_PARKING_SPOT_HANDLING,
         )
 
-    def save_realtime_parking_spot_input(self, source: Source, realtime_parking_spot_input: RealtimeParkingSpotInput):
+    def save_realtime_parking_spot_input(
+        self,
+        source: Source,
+        realtime_parking_spot_input: RealtimeParkingSpotInput,
+        source_metric_deltas: SourceMetricDeltas | None = None,
+    ):
         parking_spot = self.parking_spot_repository.fetch_parking_spot_by_source_id_and_original_uid(
             source_id=source.id,
             original_uid=realtime_parking_spot_input.uid,
         )
+        previous_realtime_data_updated_at = parking_spot.realtime_data_updated_at
 
         for key, value in realtime_parking_spot_input.to_dict().items():
             if key == 'uid':
                 continue
             setattr(parking_spot, key, value)
 
+        realtime_data_updated_at = parking_spot.realtime_data_updated_at
         self.parking_spot_repository.save_parking_spot(parking_spot)
+        if source_metric_deltas is not None:
+            source_metric_deltas.add_parking_spot(previous_realtime_data_updated_at, realtime_data_updated_at)
@@ -0,0 +1,148 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+import re
+import traceback
+from dataclasses import dataclass, field
+from threading import Lock
+from time import monotonic
+from typing import Any
+
+from parkapi_sources.exceptions import ImportException, ImportParkingSiteException, ImportParkingSpotException
+
+from webapp.common.logging.models import LogMessageType
+
+# Tracebacks with the same exception class and frames are logged at most once per interval and process
+TRACEBACK_RATE_LIMIT_SECONDS = 3600
+
+MESSAGE_TEMPLATE_MAX_LENGTH = 200
+SAMPLE_MAX_LENGTH = 500
+
+MESSAGE_TEMPLATE_PATTERNS: list[tuple[re.Pattern, str]] = [
+    (re.compile(r"'[^']*'|\"[^\"]*\""), '<str>'),
+    (re.compile(r'\b(?=[0-9a-f-]*\d)[0-9a-f]+(?:-[0-9a-f]+){2,}\b', re.IGNORECASE), '<id>'),
+    (re.compile(r'\d+(?:\.\d+)?'), '<num>'),
+]
+
+
+def get_message_template(message: str) -> str:
+    """
+    Replaces quoted strings, ids and numbers, so messages which just differ by their values share a template.
+    """
+    template = message[: MESSAGE_TEMPLATE_MAX_LENGTH * 2]
+    for pattern, replacement in MESSAGE_TEMPLATE_PATTERNS:
+        template = pattern.sub(replacement, template)
+    return template[:MESSAGE_TEMPLATE_MAX_LENGTH]
+
+
+class TracebackRateLimiter:
+    interval: int
+    _logged_at: dict[tuple, float]
+    _lock: Lock
+
+    def __init__(self, interval: int):
+        self.interval = interval
+        self._logged_at = {}
+        self._lock = Lock()
+
+    def allow(self, exception: BaseException) -> bool:
+        # Builds the key from code locations only, which is way cheaper than formatting the traceback
+        key = (
+            exception.__class__.__name__,
+            tuple(
+                (frame.f_code.co_filename, line_number)
+                for frame, line_number in traceback.walk_tb(exception.__traceback__)
+            ),
+        )
+        now = monotonic()
+        with self._lock:
+            logged_at = self._logged_at.get(key)
+            if logged_at is not None and now - logged_at < self.interval:
+                return False
+            self._logged_at[key] = now
+            return True
+
+
+traceback_rate_limiter = TracebackRateLimiter(TRACEBACK_RATE_LIMIT_SECONDS)
+
+
+@dataclass
+class ImportErrorGroup:
+    error_class: str
+    message_template: str
+    count: int = 0
+    samples: list[str] = field(default_factory=list)
+    traceback: str | None = None
+    traceback_checked: bool = False
+
+
+class ImportErrorSummary:
+    """
+    Aggregates the errors of one import run by error class and message template, so a broken source produces one log
+    record per run instead of one per invalid dataset.
+    """
+
+    sample_count: int
+    error_groups: dict[tuple[str, str], ImportErrorGroup]
+
+    def __init__(self, *, sample_count: int = 3):
+        self.sample_count = sample_count
+        self.error_groups = {}
+
+    @property
+    def count(self) -> int:
+        return sum(error_group.count for error_group in self.error_groups.values())
+
+    def add(self, error: Exception, *, sample: str | None = None, with_traceback: bool = False) -> None:
+        if isinstance(error, ImportException):
+            message = error.message
+            if sample is None and isinstance(error, ImportParkingSiteException):
+                sample = error.parking_site_uid
+            elif sample is None and isinstance(error, ImportParkingSpotException):
+                sample = error.parking_spot_uid
+        else:
+            message = str(error)
+
+        error_class = error.__class__.__name__
+        message_template = get_message_template(message)
+        error_group = self.error_groups.get((error_class, message_template))
+        if error_group is None:
+            error_group = ImportErrorGroup(error_class=error_class, message_template=message_template)
+            self.error_groups[(error_class, message_template)] = error_group
+
+        error_group.count += 1
+        if len(error_group.samples) < self.sample_count:
+            error_group.samples.append((message if sample is None else f'{sample}: {message}')[:SAMPLE_MAX_LENGTH])
+
+        # Just the first traceback of a group is of interest, and only if it wasn't logged recently
+        if with_traceback and not error_group.traceback_checked:
+            error_group.traceback_checked = True
+            if traceback_rate_limiter.allow(error):
+                error_group.traceback = ''.join(traceback.format_exception(error))
+
+    @classmethod
+    def from_errors(cls, errors: list[Exception]) -> 'ImportErrorSummary':
+        import_error_summary = cls()
+        for error in errors:
+            import_error_summary.add(error)
+        return import_error_summary
+
+    def log(self, logger: Any, message: str, *, type: LogMessageType, level: str = 'warning') -> None:
+        if not self.error_groups:
+            return
+
+        lines = [f'{message}: {self.count} errors in {len(self.error_groups)} groups.']
+        for error_group in sorted(self.error_groups.values(), key=lambda item: item.count, reverse=True):
+            lines.append(f'{error_group.count}x {error_group.error_class}: {error_group.message_template}')
+            lines += [f'  sample: {sample}' for sample in error_group.samples]
+            if error_group.traceback is not None:
+                lines.append(error_group.traceback)
+
+        getattr(logger, level)(
+            '\n'.join(lines),
+            type=type,
+            error_count=self.count,
+            error_group_count=len(self.error_groups),
+        )
@@ -0,0 +1,109 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+import math
+from collections import defaultdict
+from itertools import product
+from typing import Iterable, Iterator
+
+# WGS84 ellipsoid
+WGS84_SEMI_MAJOR_AXIS = 6378137.0
+WGS84_ECCENTRICITY_SQUARED = 6.69437999014e-3
+
+_NEIGHBOUR_OFFSETS = list(product((-1, 0, 1), repeat=3))
+
+
+class LocationGrid:
+    """
+    Grid of cubic cells with an edge length of `cell_size` meters over earth-centered cartesian coordinates. The straight
+    line between two points is never longer than the geodesic between them, so all pairs within `cell_size` meters
+    geodesic distance are in the same or in neighbouring cells. This works anywhere on earth, without any projection.
+    """
+
+    cell_size: float
+    _points: list[tuple[int, float, float, float]]
+    _cells: defaultdict[tuple[int, int, int], list[int]]
+    _positions_by_index: dict[int, int]
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self._points = []
+        self._cells = defaultdict(list)
+        self._positions_by_index = {}
+
+    def add(self, index: int, lon: float, lat: float) -> None:
+        if math.isnan(lon) or math.isnan(lat):
+            return
+
+        x, y, z = self.to_cartesian(lon, lat)
+        cell_key = (math.floor(x / self.cell_size), math.floor(y / self.cell_size), math.floor(z / self.cell_size))
+        self._cells[cell_key].append(len(self._points))
+        self._positions_by_index[index] = len(self._points)
+        self._points.append((index, x, y, z))
+
+    def iter_candidate_pairs(self, indexes: Iterable[int] | None = None) -> Iterator[tuple[int, int]]:
+        """
+        Yields all pairs of indexes whose straight line distance is at most `cell_size`, each pair just once and with the
+        smaller index first. This is a superset of all pairs within `cell_size` geodesic distance. If `indexes` is set,
+        just pairs with at least one of these points are yielded.
+        """
+        if indexes is not None:
+            yield from self._iter_candidate_pairs_of(set(indexes))
+            return
+
+        max_distance_squared = self.cell_size * self.cell_size
+        for cell_key, point_positions in self._cells.items():
+            for offset in _NEIGHBOUR_OFFSETS:
+                neighbour_key = (cell_key[0] + offset[0], cell_key[1] + offset[1], cell_key[2] + offset[2])
+                # Each pair of cells is visited from the smaller key, and each pair within a cell just once
+                if neighbour_key < cell_key or neighbour_key not in self._cells:
+                    continue
+                same_cell = neighbour_key == cell_key
+                neighbour_point_positions = self._cells[neighbour_key]
+
+                for position_index, point_position in enumerate(point_positions):
+                    index_1, x_1, y_1, z_1 = self._points[point_position]
+                    other_positions = point_positions[position_index + 1 :] if same_cell else neighbour_point_positions
+                    for other_position in other_positions:
+                        index_2, x_2, y_2, z_2 = self._points[other_position]
+                        if (x_1 - x_2) ** 2 + (y_1 - y_2) ** 2 + (z_1 - z_2) ** 2 > max_distance_squared:
+                            continue
+                        yield (index_1, index_2) if index_1 < index_2 else (index_2, index_1)
+
+    def _iter_candidate_pairs_of(self, indexes: set[int]) -> Iterator[tuple[int, int]]:
+        max_distance_squared = self.cell_size * self.cell_size
+        for index_1 in sorted(indexes):
+            if index_1 not in self._positions_by_index:
+                continue
+            _, x_1, y_1, z_1 = self._points[self._positions_by_index[index_1]]
+            cell_key = (
+                math.floor(x_1 / self.cell_size),
+                math.floor(y_1 / self.cell_size),
+                math.floor(z_1 / self.cell_size),
+            )
+
+            for offset in _NEIGHBOUR_OFFSETS:
+                neighbour_key = (cell_key[0] + offset[0], cell_key[1] + offset[1], cell_key[2] + offset[2])
+                for other_position in self._cells.get(neighbour_key, []):
+                    index_2, x_2, y_2, z_2 = self._points[other_position]
+                    # Pairs of two requested points are yielded from the smaller index
+                    if index_2 == index_1 or (index_2 in indexes and index_2 < index_1):
+                        continue
+                    if (x_1 - x_2) ** 2 + (y_1 - y_2) ** 2 + (z_1 - z_2) ** 2 > max_distance_squared:
+                        continue
+                    yield (index_1, index_2) if index_1 < index_2 else (index_2, index_1)
+
+    @staticmethod
+    def to_cartesian(lon: float, lat: float) -> tuple[float, float, float]:
+        lon_radians = math.radians(lon)
+        lat_radians = math.radians(lat)
+        sin_lat = math.sin(lat_radians)
+        prime_vertical_radius = WGS84_SEMI_MAJOR_AXIS / math.sqrt(1 - WGS84_ECCENTRICITY_SQUARED * sin_lat * sin_lat)
+
+        return (
+            prime_vertical_radius * math.cos(lat_radians) * math.cos(lon_radians),
+            prime_vertical_radius * math.cos(lat_radians) * math.sin(lon_radians),
+            prime_vertical_radius * (1 - WGS84_ECCENTRICITY_SQUARED) * sin_lat,
+        )
@@ -6,21 +6,29 @@ Use of this source code is governed by an MIT-style license that can be found in
 import math
 from dataclasses import asdict, dataclass
 from decimal import Decimal
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import structlog
 from parkapi_sources.models.enums import ParkAndRideType, ParkingSiteType
-from pyproj import Geod
 
 from webapp.common.logging.models import LogMessageType
-from webapp.models import ParkingSite
-from webapp.repositories import ParkingSiteRepository
+from webapp.models import ParkingSite, PendingDuplicate
+from webapp.repositories import ParkingSiteRepository, PendingDuplicateRepository
 from webapp.repositories.parking_site_repository import ParkingSiteLocation
+from webapp.repositories.spatial_repository_mixin import get_radius_envelope
 from webapp.services.base_service import BaseService
+from webapp.services.matching_service.location_grid import LocationGrid
 from webapp.shared.parking_site.parking_site_search_query import ParkingSiteBaseSearchInput
 
+if TYPE_CHECKING:
+    from pyproj import Geod
+
 logger = structlog.get_logger(__name__)
 
+# Distances on the WGS84 ellipsoid are up to 0.6 % shorter than on the sphere of get_radius_envelope(), so match
+# envelopes are widened to contain all parking sites within the match radius.
+MATCH_ENVELOPE_MARGIN = 1.01
+
 
 @dataclass
 class DuplicatedParkingSite:
@@ -49,11 +57,28 @@ class DuplicatedParkingSite:
 
 class MatchingService(BaseService):
     parking_site_repository: ParkingSiteRepository
-    geo_distance_service = Geod(ellps='WGS84')
+    pending_duplicate_repository: PendingDuplicateRepository
+    _geo_distance_service: Optional['Geod'] = None
 
-    def __init__(self, *args, parking_site_repository: ParkingSiteRepository, **kwargs):
+    def __init__(
+        self,
+        *args,
+        parking_site_repository: ParkingSiteRepository,
+        pending_duplicate_repository: PendingDuplicateRepository,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         self.parking_site_repository = parking_site_repository
+        self.pending_duplicate_repository = pending_duplicate_repository
+
+    @property
+    def geo_distance_service(self) -> 'Geod':
+        # pyproj is imported on first use, as web processes mostly never match
+        if self._geo_distance_service is None:
+            from pyproj import Geod
+
+            self._geo_distance_service = Geod(ellps='WGS84')
+        return self._geo_distance_service
 
     def generate_duplicates(
         self,
@@ -61,7 +86,6 @@ class MatchingService(BaseService):
         match_radius: int | None = None,
         source_ids: list[int] | None = None,
     ) -> list[DuplicatedParkingSite]:
-        matches: list[tuple[ParkingSiteLocation, ParkingSiteLocation, float]] = []
         if match_radius is None:
             match_radius: int = self.config_helper.get('MATCH_RADIUS', 100)
 
@@ -69,39 +93,13 @@ class MatchingService(BaseService):
 
         parking_site_locations = self.parking_site_repository.fetch_parking_site_locations()
 
-        for i in range(len(parking_site_locations)):
-            for j in range(i + 1, len(parking_site_locations)):
-                # If source_ids is set, we just want matches for these, so we continue for any other source id
-                if (
-                    source_ids is not None
-                    and parking_site_locations[i].source_id not in source_ids
-                    and parking_site_locations[j].source_id not in source_ids
-                ):
-                    continue
-
-                # If both datasets are from the same source: ignore possible match
-                if parking_site_locations[i].source_id == parking_site_locations[j].source_id:
-                    continue
-
-                # Duplicates should have same purpose
-                if parking_site_locations[i].purpose != parking_site_locations[j].purpose:
-                    continue
-
-                # If the combination in this order is in existing matches: ignore that match
-                if (parking_site_locations[i].id, parking_site_locations[j].id) in existing_matches:
-                    continue
-
-                # Don't add combinations which are already stored in DB
-                if (parking_site_locations[j].id, parking_site_locations[i].id) in existing_matches_in_db:
-                    continue
-                if (parking_site_locations[i].id, parking_site_locations[j].id) in existing_matches_in_db:
-                    continue
-
-                # If distance is over match radius: ignore possible match
-                distance = self.distance(parking_site_locations[i], parking_site_locations[j])
-                if math.isnan(distance) or distance > match_radius:
-                    continue
-                matches.append((parking_site_locations[i], parking_site_locations[j], distance))
+        matches = self.find_matches(
+            parking_site_locations,
+            existing_matches=existing_matches,
+            existing_matches_in_db=existing_matches_in_db,
+            match_radius=match_radius,
+            source_ids=source_ids,
+        )
 
         duplicates: list[DuplicatedParkingSite] = []
         parking_site_ids: list[int] = [match[0].id for match in matches] + [match[1].id for match in matches]
@@ -149,31 +147,279 @@ class MatchingService(BaseService):
             )
         return duplicates
 
-    def apply_duplicates(self, keep: list[list[int]], ignore: list[list[int]]):
-        for keep_parking_site_id, keep_duplicate_parking_site_id in keep:
-            keep_parking_site = self.parking_site_repository.fetch_parking_site_by_id(keep_parking_site_id)
-            keep_parking_site.duplicate_of_parking_site_id = None
-            self.parking_site_repository.save_parking_site(keep_parking_site)
+    def find_matches(
+        self,
+        parking_site_locations: list[ParkingSiteLocation],
+        *,
+        existing_matches: list[tuple[int, int]],
+        existing_matches_in_db: list[tuple[int, int]],
+        match_radius: int,
+        source_ids: list[int] | None = None,
+        parking_site_ids: set[int] | None = None,
+    ) -> list[tuple[ParkingSiteLocation, ParkingSiteLocation, float]]:
+        """
+        Returns all pairs of parking sites within `match_radius` meters, ordered like the parking site locations. Just
+        candidates from neighbouring grid cells are checked, and their distances are calculated in one batch. If
+        `parking_site_ids` is set, just pairs with at least one of these parking sites are returned.
+        """
+        source_id_set = set(source_ids) if source_ids is not None else None
+        existing_match_set = set(existing_matches)
+        existing_match_in_db_set = set(existing_matches_in_db)
 
-        for ignore_parking_site_id, ignore_duplicate_parking_site_id in ignore:
-            ignore_parking_site = self.parking_site_repository.fetch_parking_site_by_id(ignore_parking_site_id)
-            duplicate_parking_site = self.parking_site_repository.fetch_parking_site_by_id(
-                ignore_duplicate_parking_site_id
+        # Coordinates are passed in the same order as at distance(), so the results are identical
+        location_grid = LocationGrid(cell_size=max(match_radius, 1))
+        for index, parking_site_location in enumerate(parking_site_locations):
+            location_grid.add(index, float(parking_site_location.lat), float(parking_site_location.lon))
+
+        indexes: list[int] | None = None
+        if parking_site_ids is not None:
+            indexes = [
+                index
+                for index, parking_site_location in enumerate(parking_site_locations)
+                if parking_site_location.id in parking_site_ids
+            ]
+
+        candidate_pairs: list[tuple[int, int]] = []
+        for i, j in location_grid.iter_candidate_pairs(indexes):
+            location_1 = parking_site_locations[i]
+            location_2 = parking_site_locations[j]
+
+            # If source_ids is set, we just want matches for these, so we continue for any other source id
+            if (
+                source_id_set is not None
+                and location_1.source_id not in source_id_set
+                and location_2.source_id not in source_id_set
+            ):
+                continue
+
+            # If both datasets are from the same source: ignore possible match
+            if location_1.source_id == location_2.source_id:
+                continue
+
+            # Duplicates should have same purpose
+            if location_1.purpose != location_2.purpose:
+                continue
+
+            # If the combination in this order is in existing matches: ignore that match
+            if (location_1.id, location_2.id) in existing_match_set:
+                continue
+
+            # Don't add combinations which are already stored in DB
+            if (location_2.id, location_1.id) in existing_match_in_db_set:
+                continue
+            if (location_1.id, location_2.id) in existing_match_in_db_set:
+                continue
+
+            candidate_pairs.append((i, j))
+
+        if not candidate_pairs:
+            return []
+
+        candidate_pairs.sort()
+        _, _, distances = self.geo_distance_service.inv(
+            [float(parking_site_locations[i].lat) for i, _ in candidate_pairs],
+            [float(parking_site_locations[i].lon) for i, _ in candidate_pairs],
+            [float(parking_site_locations[j].lat) for _, j in candidate_pairs],
+            [float(parking_site_locations[j].lon) for _, j in candidate_pairs],
+        )
+
+        matches: list[tuple[ParkingSiteLocation, ParkingSiteLocation, float]] = []
+        for (i, j), distance in zip(candidate_pairs, distances):
+            # If distance is over match radius: ignore possible match
+            if math.isnan(distance) or distance > match_radius:
+                continue
+            matches.append((parking_site_locations[i], parking_site_locations[j], distance))
+
+        return matches
+
+    def check_pending_duplicates(self) -> None:
+        """
+        Searches duplicates for all new and moved parking sites queued since the last check.
+        """
+        pending_duplicate_checks = self.pending_duplicate_repository.fetch_pending_duplicate_checks()
+        if not pending_duplicate_checks:
+            return
+
+        self.update_pending_duplicates({parking_site_id for _, parking_site_id in pending_duplicate_checks})
+
+        self.pending_duplicate_repository.delete_pending_duplicate_checks(up_to_id=pending_duplicate_checks[-1][0])
+        self.pending_duplicate_repository.commit_transaction()
+
+    def update_pending_duplicates(self, parking_site_ids: set[int] | None = None) -> None:
+        """
+        Replaces the pending duplicates of the given parking sites, or of all parking sites if not set, by their current
+        matches. Dismissed pending duplicates stay dismissed as long as they match. Given parking sites are just matched
+        against parking sites within MATCH_RADIUS, so the effort depends on the number of given parking sites and not
+        on the size of the dataset.
+        """
+        match_radius: int = self.config_helper.get('MATCH_RADIUS', 100)
+        if parking_site_ids is None:
+            parking_site_locations = self.parking_site_repository.fetch_parking_site_locations()
+            parking_site_ids = {parking_site_location.id for parking_site_location in parking_site_locations}
+            existing_matches_in_db = self.parking_site_repository.fetch_parking_sites_duplicates()
+        else:
+            parking_site_locations = self._fetch_parking_site_locations_within_match_radius(
+                sorted(parking_site_ids),
+                match_radius,
+            )
+            existing_matches_in_db = self.parking_site_repository.fetch_parking_sites_duplicates(
+                parking_site_ids=sorted(parking_site_ids),
             )
-            ignore_parking_site.duplicate_of_parking_site_id = duplicate_parking_site.id
-            self.parking_site_repository.save_parking_site(ignore_parking_site)
 
-    def reset_matching(self, search_query: ParkingSiteBaseSearchInput):
-        search_query.is_duplicate = True
-        parking_sites = self.parking_site_repository.fetch_parking_sites(search_query=search_query)
-        for parking_site in parking_sites:
-            parking_site.duplicate_of_parking_site_id = None
-            self.parking_site_repository.save_parking_site(parking_site, commit=False)
+        matches = self.find_matches(
+            parking_site_locations,
+            existing_matches=[],
+            existing_matches_in_db=existing_matches_in_db,
+            match_radius=match_radius,
+            parking_site_ids=parking_site_ids,
+        )
+        distances_by_pair: dict[tuple[int, int], float] = {
+            (min(location_1.id, location_2.id), max(location_1.id, location_2.id)): distance
+            for location_1, location_2, distance in matches
+        }
+
+        for pending_duplicate in self.pending_duplicate_repository.fetch_pending_duplicates_by_parking_site_ids(
+            sorted(parking_site_ids),
+        ):
+            pair = (pending_duplicate.parking_site_id, pending_duplicate.duplicate_parking_site_id)
+            if pair not in distances_by_pair:
+                self.pending_duplicate_repository.delete_pending_duplicate(pending_duplicate, commit=False)
+                continue
+            pending_duplicate.distance = distances_by_pair.pop(pair)
+            self.pending_duplicate_repository.save_pending_duplicate(pending_duplicate, commit=False)
+
+        for (parking_site_id, duplicate_parking_site_id), distance in distances_by_pair.items():
+            pending_duplicate = PendingDuplicate()
+            pending_duplicate.parking_site_id = parking_site_id
+            pending_duplicate.duplicate_parking_site_id = duplicate_parking_site_id
+            pending_duplicate.distance = distance
+            self.pending_duplicate_repository.save_pending_duplicate(pending_duplicate, commit=False)
+
+        self.pending_duplicate_repository.commit_transaction()
+
+        logger.info(
+            f'Checked {len(parking_site_ids)} parking sites for duplicates, found {len(matches)} pending duplicates',
+            type=LogMessageType.DUPLICATE_HANDLING,
+        )
+
+    def _fetch_parking_site_locations_within_match_radius(
+        self,
+        parking_site_ids: list[int],
+        match_radius: int,
+    ) -> list[ParkingSiteLocation]:
+        """
+        Returns the locations of the given parking sites and of all parking sites which might be within `match_radius`
+        meters of them, ordered by id. The exact distance is checked by find_matches().
+        """
+        parking_site_locations = self.parking_site_repository.fetch_parking_site_locations_by_ids(parking_site_ids)
+
+        match_envelopes = [
+            self.get_match_envelope(parking_site_location, match_radius)
+            for parking_site_location in parking_site_locations
+        ]
+        # Envelopes crossing a pole or the antimeridian can't be expressed, so all parking sites are candidates
+        if None in match_envelopes:
+            return self.parking_site_repository.fetch_parking_site_locations()
+
+        locations_by_id: dict[int, ParkingSiteLocation] = {
+            parking_site_location.id: parking_site_location
+            for parking_site_location in self.parking_site_repository.fetch_parking_site_locations_within_envelopes(
+                match_envelopes,
+            )
+        }
+        for parking_site_location in parking_site_locations:
+            locations_by_id[parking_site_location.id] = parking_site_location
+
+        return sorted(locations_by_id.values(), key=lambda parking_site_location: parking_site_location.id)
+
+    @staticmethod
+    def get_match_envelope(
+        location: ParkingSiteLocation,
+        match_radius: int,
+    ) -> tuple[float, float, float, float] | None:
+        """
+        Returns the envelope (lon_min, lat_min, lon_max, lat_max) containing all parking sites which find_matches() and
+        distance() consider to be within `match_radius` meters. Both pass lat as longitude and lon as latitude to
+        Geod.inv(), so the envelope is calculated with swapped axes as well and swapped back afterwards.
+        """
+        match_envelope = get_radius_envelope(
+            float(location.lon),
+            float(location.lat),
+            match_radius * MATCH_ENVELOPE_MARGIN,
+        )
+        if match_envelope is None:
+            return None
+
+        lat_min, lon_min, lat_max, lon_max = match_envelope
+        return lon_min, lat_min, lon_max, lat_max
+
+    def get_pending_duplicates(self) -> list[DuplicatedParkingSite]:
+        pending_duplicates = self.pending_duplicate_repository.fetch_pending_duplicates()
+
+        parking_site_ids: set[int] = set()
+        for pending_duplicate in pending_duplicates:
+            parking_site_ids.add(pending_duplicate.parking_site_id)
+            parking_site_ids.add(pending_duplicate.duplicate_parking_site_id)
+        parking_sites = self.parking_site_repository.fetch_parking_site_by_ids(list(parking_site_ids))
+        parking_sites_by_id: dict[int, ParkingSite] = {parking_site.id: parking_site for parking_site in parking_sites}
+
+        duplicates: list[DuplicatedParkingSite] = []
+        for pending_duplicate in pending_duplicates:
+            duplicates.append(
+                self.parking_site_to_duplicate(
+                    parking_sites_by_id[pending_duplicate.parking_site_id],
+                    pending_duplicate.duplicate_parking_site_id,
+                    pending_duplicate.distance,
+                ),
+            )
+            duplicates.append(
+                self.parking_site_to_duplicate(
+                    parking_sites_by_id[pending_duplicate.duplicate_parking_site_id],
+                    pending_duplicate.parking_site_id,
+                    pending_duplicate.distance,
+                ),
+            )
+        return duplicates
+
+    def apply_duplicates(self, keep: list[list[int]], ignore: list[list[int]]):
+        # Ignore decisions are applied after keep decisions, so they win for parking sites listed in both
+        duplicate_of_parking_site_ids: dict[int, Optional[int]] = {
+            keep_parking_site_id: None for keep_parking_site_id, _ in keep
+        }
+        for ignore_parking_site_id, ignore_duplicate_parking_site_id in ignore:
+            duplicate_of_parking_site_ids[ignore_parking_site_id] = ignore_duplicate_parking_site_id
+
+        # Validates all ids up front, so nothing is written if any of them does not exist
+        current_duplicate_of_parking_site_ids = self.parking_site_repository.fetch_duplicate_of_parking_site_ids(
+            list({*duplicate_of_parking_site_ids, *(item[1] for item in ignore)}),
+        )
+
+        self.parking_site_repository.update_duplicate_of_parking_site_ids(
+            {
+                parking_site_id: duplicate_of_parking_site_id
+                for parking_site_id, duplicate_of_parking_site_id in duplicate_of_parking_site_ids.items()
+                if current_duplicate_of_parking_site_ids[parking_site_id] != duplicate_of_parking_site_id
+            },
+            commit=False,
+        )
+
+        # Both decisions resolve the pending duplicate
+        self.pending_duplicate_repository.dismiss_pending_duplicates(
+            [(item[0], item[1]) for item in keep + ignore],
+            commit=False,
+        )
 
         self.parking_site_repository.commit_transaction()
 
+    def reset_matching(self, search_query: ParkingSiteBaseSearchInput):
+        search_query.is_duplicate = True
+        parking_site_ids = self.parking_site_repository.fetch_parking_site_ids(search_query=search_query)
+        self.parking_site_repository.update_duplicate_of_parking_site_ids(
+            {parking_site_id: None for parking_site_id in parking_site_ids},
+        )
+
         logger.info(
-            f'Reset {len(parking_sites)} duplicates',
+            f'Reset {len(parking_site_ids)} duplicates',
             type=LogMessageType.DUPLICATE_HANDLING,
         )
 
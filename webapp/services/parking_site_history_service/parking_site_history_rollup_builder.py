@@ -0,0 +1,166 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Optional
+
+from webapp.models import ParkingSiteHistoryResolution
+from webapp.models.parking_site import OpeningStatus
+
+
+@dataclass
+class ParkingSiteHistoryState:
+    """
+    Values of a parking site, which are valid until the next history entry.
+    """
+
+    realtime_opening_status: Optional[OpeningStatus] = None
+    realtime_free_capacity: Optional[int] = None
+
+
+@dataclass
+class ParkingSiteHistoryChange:
+    parking_site_id: int
+    created_at: datetime
+    state: ParkingSiteHistoryState
+
+
+@dataclass
+class HourRollupAccumulator:
+    change_count: int = 0
+    opening_status_seconds: float = 0
+    open_seconds: float = 0
+    realtime_free_capacity_seconds: float = 0
+    realtime_free_capacity_integral: float = 0
+    realtime_free_capacity_min: Optional[int] = None
+    realtime_free_capacity_max: Optional[int] = None
+
+    def add(self, state: ParkingSiteHistoryState, seconds: float):
+        # Values which were replaced at the same instant were never valid
+        if seconds <= 0:
+            return
+
+        if state.realtime_opening_status is not None:
+            self.opening_status_seconds += seconds
+            if state.realtime_opening_status == OpeningStatus.OPEN:
+                self.open_seconds += seconds
+
+        if state.realtime_free_capacity is not None:
+            self.realtime_free_capacity_seconds += seconds
+            self.realtime_free_capacity_integral += state.realtime_free_capacity * seconds
+            if (
+                self.realtime_free_capacity_min is None
+                or state.realtime_free_capacity < self.realtime_free_capacity_min
+            ):
+                self.realtime_free_capacity_min = state.realtime_free_capacity
+            if (
+                self.realtime_free_capacity_max is None
+                or state.realtime_free_capacity > self.realtime_free_capacity_max
+            ):
+                self.realtime_free_capacity_max = state.realtime_free_capacity
+
+    def is_empty(self) -> bool:
+        return self.change_count == 0 and self.opening_status_seconds == 0 and self.realtime_free_capacity_seconds == 0
+
+    def to_dict(self, parking_site_id: int, period_start: datetime, last_state: ParkingSiteHistoryState) -> dict:
+        return {
+            'parking_site_id': parking_site_id,
+            'resolution': ParkingSiteHistoryResolution.HOUR,
+            'period_start': period_start,
+            'change_count': self.change_count,
+            'opening_status_seconds': round(self.opening_status_seconds),
+            'open_seconds': round(self.open_seconds),
+            'realtime_free_capacity_seconds': round(self.realtime_free_capacity_seconds),
+            'realtime_free_capacity_integral': (
+                round(self.realtime_free_capacity_integral) if self.realtime_free_capacity_seconds else None
+            ),
+            'realtime_free_capacity_min': self.realtime_free_capacity_min,
+            'realtime_free_capacity_max': self.realtime_free_capacity_max,
+            'realtime_opening_status_last': last_state.realtime_opening_status,
+            'realtime_free_capacity_last': last_state.realtime_free_capacity,
+        }
+
+
+def build_hour_rollups(
+    parking_site_id: int,
+    state: ParkingSiteHistoryState,
+    changes: Iterable[ParkingSiteHistoryChange],
+    start: datetime,
+    end: datetime,
+) -> list[dict]:
+    """
+    Builds the hourly rollups of one parking site in [start, end), which has to be at full hours. `state` holds the
+    values valid at `start`, and `changes` are the history entries of the parking site in [start, end) ordered by
+    created_at. Each value is weighted by the seconds until the next change, so hours without changes get a rollup of
+    the carried over values. Hours without any known value and without changes are skipped.
+    """
+    rollups: list[dict] = []
+    change_iterator = iter(changes)
+    next_change = next(change_iterator, None)
+
+    hour_start = start
+    while hour_start < end:
+        hour_end = hour_start + timedelta(hours=1)
+        accumulator = HourRollupAccumulator()
+        valid_since = hour_start
+
+        while next_change is not None and next_change.created_at < hour_end:
+            accumulator.add(state, (next_change.created_at - valid_since).total_seconds())
+            accumulator.change_count += 1
+            state = next_change.state
+            valid_since = next_change.created_at
+            next_change = next(change_iterator, None)
+
+        accumulator.add(state, (hour_end - valid_since).total_seconds())
+        if not accumulator.is_empty():
+            rollups.append(accumulator.to_dict(parking_site_id, hour_start, state))
+
+        hour_start = hour_end
+
+    return rollups
+
+
+def iter_hour_rollups(
+    states: dict[int, ParkingSiteHistoryState],
+    changes: Iterable[ParkingSiteHistoryChange],
+    start: datetime,
+    end: datetime,
+) -> Iterator[dict]:
+    """
+    Builds the hourly rollups of all parking sites in [start, end). `states` holds the values valid at `start` by parking
+    site id, and `changes` are all history entries in [start, end) ordered by parking site id and created_at, so just
+    the changes of one parking site are kept in memory at once.
+    """
+    # States of parking sites with changes are removed, so the remaining ones just carry over their values
+    states = dict(states)
+    parking_site_id: Optional[int] = None
+    parking_site_changes: list[ParkingSiteHistoryChange] = []
+
+    for change in changes:
+        if change.parking_site_id != parking_site_id:
+            if parking_site_id is not None:
+                yield from build_hour_rollups(
+                    parking_site_id,
+                    states.pop(parking_site_id, ParkingSiteHistoryState()),
+                    parking_site_changes,
+                    start,
+                    end,
+                )
+            parking_site_id = change.parking_site_id
+            parking_site_changes = []
+        parking_site_changes.append(change)
+
+    if parking_site_id is not None:
+        yield from build_hour_rollups(
+            parking_site_id,
+            states.pop(parking_site_id, ParkingSiteHistoryState()),
+            parking_site_changes,
+            start,
+            end,
+        )
+
+    for parking_site_id, state in sorted(states.items()):
+        yield from build_hour_rollups(parking_site_id, state, [], start, end)
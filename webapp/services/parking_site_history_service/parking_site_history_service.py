@@ -0,0 +1,218 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import structlog
+
+from webapp.models import ParkingSiteHistoryResolution
+from webapp.repositories import ParkingSiteHistoryRepository, ParkingSiteHistoryRollupRepository
+from webapp.services.base_service import BaseService
+from webapp.services.parking_site_history_service.parking_site_history_rollup_builder import (
+    ParkingSiteHistoryChange,
+    ParkingSiteHistoryState,
+    iter_hour_rollups,
+)
+
+logger = structlog.get_logger(__name__)
+
+HISTORY_DELETE_BATCH_SIZE = 10000
+
+# History is rolled up in steps of this duration, each in its own transaction
+HISTORY_ROLLUP_STEP = timedelta(days=1)
+
+
+def get_month_start(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month_start: datetime, months: int) -> datetime:
+    month_index = month_start.year * 12 + month_start.month - 1 + months
+    return month_start.replace(year=month_index // 12, month=month_index % 12 + 1)
+
+
+def get_hour_start(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def get_day_start(value: datetime) -> datetime:
+    return get_hour_start(value).replace(hour=0)
+
+
+def get_partition_name(month_start: datetime) -> str:
+    return f'parking_site_history_y{month_start.year:04d}m{month_start.month:02d}'
+
+
+class ParkingSiteHistoryService(BaseService):
+    parking_site_history_repository: ParkingSiteHistoryRepository
+    parking_site_history_rollup_repository: ParkingSiteHistoryRollupRepository
+
+    def __init__(
+        self,
+        *args,
+        parking_site_history_repository: ParkingSiteHistoryRepository,
+        parking_site_history_rollup_repository: ParkingSiteHistoryRollupRepository,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.parking_site_history_repository = parking_site_history_repository
+        self.parking_site_history_rollup_repository = parking_site_history_rollup_repository
+
+    def rollup_history(self):
+        """
+        Rolls up history of all complete hours after the last hourly rollup, so every run just reads new history entries.
+        Hours are complete HISTORY_ROLLUP_DELAY_SECONDS after they ended, which covers entries committed late. History
+        entries are just written on changes, so the values valid at the end of the last hourly rollup are carried over
+        into the next hours. Daily rollups are rebuilt from the hourly rollups of the affected days, so the current day
+        is rolled up as far as its hours are.
+        """
+        rollup_until = get_hour_start(
+            datetime.now(tz=timezone.utc)
+            - timedelta(seconds=self.config_helper.get('HISTORY_ROLLUP_DELAY_SECONDS', 300)),
+        )
+        last_period_start = self.parking_site_history_rollup_repository.fetch_last_period_start(
+            ParkingSiteHistoryResolution.HOUR,
+        )
+        start = None if last_period_start is None else last_period_start + timedelta(hours=1)
+
+        hour_rollup_count = 0
+        day_rollup_count = 0
+        while start is None or start < rollup_until:
+            states = {} if start is None else self._fetch_carried_over_states(start)
+            if not states:
+                # Nothing to carry over, so periods without any history are skipped, e.g. at the first run
+                first_created_at = self.parking_site_history_repository.fetch_first_created_at(since=start)
+                if first_created_at is None or first_created_at >= rollup_until:
+                    break
+                start = get_hour_start(first_created_at)
+
+            end = min(start + HISTORY_ROLLUP_STEP, rollup_until)
+
+            hour_rollup_count += self._rollup_hours(start, end, states)
+            day_rollup_count += self.parking_site_history_rollup_repository.rollup_days(
+                get_day_start(start),
+                get_day_start(end - timedelta(hours=1)) + timedelta(days=1),
+            )
+            self.parking_site_history_rollup_repository.commit_transaction()
+
+            start = end
+
+        if hour_rollup_count:
+            logger.info(
+                f'Rolled up parking site history until {rollup_until.isoformat()}: {hour_rollup_count} hourly and '
+                f'{day_rollup_count} daily rollups.',
+            )
+
+    def _fetch_carried_over_states(self, start: datetime) -> dict[int, ParkingSiteHistoryState]:
+        return {
+            row.parking_site_id: ParkingSiteHistoryState(
+                realtime_opening_status=row.realtime_opening_status_last,
+                realtime_free_capacity=row.realtime_free_capacity_last,
+            )
+            for row in self.parking_site_history_rollup_repository.fetch_hour_rollup_last_values(
+                start - timedelta(hours=1),
+            )
+            if row.realtime_opening_status_last is not None or row.realtime_free_capacity_last is not None
+        }
+
+    def _rollup_hours(self, start: datetime, end: datetime, states: dict[int, ParkingSiteHistoryState]) -> int:
+        self.parking_site_history_rollup_repository.delete_rollups(ParkingSiteHistoryResolution.HOUR, start, end)
+
+        changes = (
+            ParkingSiteHistoryChange(
+                parking_site_id=row.parking_site_id,
+                created_at=row.created_at,
+                state=ParkingSiteHistoryState(
+                    realtime_opening_status=row.realtime_opening_status,
+                    realtime_free_capacity=row.realtime_free_capacity,
+                ),
+            )
+            for row in self.parking_site_history_repository.iter_parking_site_history_changes(start, end)
+        )
+
+        return self.parking_site_history_rollup_repository.insert_rollups(
+            iter_hour_rollups(states, changes, start, end),
+        )
+
+    def maintain_history(self):
+        """
+        At partitioned tables, monthly partitions are created HISTORY_PARTITIONS_AHEAD months in advance and expired
+        partitions are dropped as a whole. Unpartitioned tables (MySQL, or PostgreSQL databases created from the models)
+        are cleaned up by deleting expired entries in batches.
+        """
+        retention_days: int | None = self.config_helper.get('HISTORY_RETENTION_DAYS')
+        created_before = (
+            None if retention_days is None else datetime.now(tz=timezone.utc) - timedelta(days=retention_days)
+        )
+
+        if self.parking_site_history_repository.is_partitioned():
+            self._create_partitions()
+            if created_before is not None:
+                self._drop_expired_partitions(created_before)
+        elif created_before is not None:
+            self._delete_expired_history(created_before)
+
+    def _create_partitions(self):
+        partition_upper_bounds = self.parking_site_history_repository.fetch_partition_upper_bounds()
+        current_month_start = get_month_start(datetime.now(tz=timezone.utc))
+        last_month_start = add_months(current_month_start, self.config_helper.get('HISTORY_PARTITIONS_AHEAD', 3))
+
+        # Partitions are contiguous, so new ones start where the existing ones end
+        upper_bounds = [upper_bound for upper_bound in partition_upper_bounds.values() if upper_bound is not None]
+        month_start = current_month_start if not upper_bounds else get_month_start(max(upper_bounds))
+
+        created_partition_names: list[str] = []
+        while month_start <= last_month_start:
+            partition_name = get_partition_name(month_start)
+            if partition_name not in partition_upper_bounds:
+                moved_count = self.parking_site_history_repository.create_partition(
+                    partition_name,
+                    month_start,
+                    add_months(month_start, 1),
+                )
+                created_partition_names.append(partition_name)
+                if moved_count:
+                    logger.warning(
+                        f'Parking site history partition {partition_name} was created too late, moved {moved_count} '
+                        f'entries from the default partition. Check the history maintenance task.',
+                    )
+            month_start = add_months(month_start, 1)
+
+        self.parking_site_history_repository.commit_transaction()
+
+        if created_partition_names:
+            logger.info(f'Created parking site history partitions {", ".join(created_partition_names)}.')
+
+    def _drop_expired_partitions(self, created_before: datetime):
+        partition_upper_bounds = self.parking_site_history_repository.fetch_partition_upper_bounds()
+
+        dropped_partition_names: list[str] = []
+        for partition_name, upper_bound in sorted(partition_upper_bounds.items()):
+            # Just partitions which exclusively contain expired entries are dropped
+            if upper_bound is None or upper_bound > created_before:
+                continue
+            self.parking_site_history_repository.drop_partition(partition_name)
+            self.parking_site_history_repository.commit_transaction()
+            dropped_partition_names.append(partition_name)
+
+        if dropped_partition_names:
+            logger.info(
+                f'Dropped parking site history partitions {", ".join(dropped_partition_names)} before '
+                f'{created_before.isoformat()}.',
+            )
+
+    def _delete_expired_history(self, created_before: datetime):
+        deleted_count = 0
+        while True:
+            batch_deleted_count = self.parking_site_history_repository.delete_parking_site_history_before(
+                created_before,
+                limit=HISTORY_DELETE_BATCH_SIZE,
+            )
+            self.parking_site_history_repository.commit_transaction()
+            deleted_count += batch_deleted_count
+            if batch_deleted_count < HISTORY_DELETE_BATCH_SIZE:
+                break
+
+        logger.info(f'Deleted {deleted_count} parking site history entries before {created_before.isoformat()}.')
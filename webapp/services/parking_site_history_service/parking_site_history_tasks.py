@@ -0,0 +1,19 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from webapp.dependencies import dependencies
+from webapp.extensions import celery
+
+
+@celery.task()
+def maintain_parking_site_history_task():
+    parking_site_history_service = dependencies.get_parking_site_history_service()
+    parking_site_history_service.maintain_history()
+
+
+@celery.task()
+def rollup_parking_site_history_task():
+    parking_site_history_service = dependencies.get_parking_site_history_service()
+    parking_site_history_service.rollup_history()
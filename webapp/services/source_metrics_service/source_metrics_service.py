@@ -0,0 +1,227 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+
+import structlog
+
+from webapp.models import Source
+from webapp.repositories import ParkingSiteRepository, ParkingSpotRepository, SourceRepository
+from webapp.services.base_service import BaseService
+
+logger = structlog.get_logger(__name__)
+
+SOURCE_METRIC_FIELDS = [
+    'parking_site_count',
+    'parking_spot_count',
+    'realtime_outdated_parking_site_count',
+    'realtime_outdated_parking_spot_count',
+]
+
+
+@dataclass
+class SourceMetricDeltas:
+    """
+    Changes of the metrics of a source, collected during an import and applied at once. Entries count as realtime
+    outdated relative to realtime_outdated_counted_before of the source, like the stored counts.
+    """
+
+    realtime_outdated_counted_before: datetime | None
+    parking_site_count: int = 0
+    parking_spot_count: int = 0
+    realtime_outdated_parking_site_count: int = 0
+    realtime_outdated_parking_spot_count: int = 0
+
+    def is_realtime_outdated(self, realtime_data_updated_at: datetime | None) -> bool:
+        return (
+            self.realtime_outdated_counted_before is not None
+            and realtime_data_updated_at is not None
+            and realtime_data_updated_at < self.realtime_outdated_counted_before
+        )
+
+    def add_parking_site(
+        self,
+        previous_realtime_data_updated_at: datetime | None,
+        realtime_data_updated_at: datetime | None,
+        *,
+        count_delta: int = 0,
+    ) -> None:
+        self.parking_site_count += count_delta
+        self.realtime_outdated_parking_site_count += self.is_realtime_outdated(
+            realtime_data_updated_at,
+        ) - self.is_realtime_outdated(previous_realtime_data_updated_at)
+
+    def add_parking_spot(
+        self,
+        previous_realtime_data_updated_at: datetime | None,
+        realtime_data_updated_at: datetime | None,
+        *,
+        count_delta: int = 0,
+    ) -> None:
+        self.parking_spot_count += count_delta
+        self.realtime_outdated_parking_spot_count += self.is_realtime_outdated(
+            realtime_data_updated_at,
+        ) - self.is_realtime_outdated(previous_realtime_data_updated_at)
+
+    def to_dict(self) -> dict[str, int]:
+        return {key: value for key, value in asdict(self).items() if key in SOURCE_METRIC_FIELDS}
+
+
+class SourceMetricsService(BaseService):
+    """
+    Maintains the parking site / spot counts and realtime outdated counts at the sources, so metric scrapes just have to
+    read the source table. Imports apply the changes of their entries as deltas. Entries getting outdated by time passing
+    are added periodically, just reading entries which got outdated since the last run. Changes outside of imports,
+    like deletions via admin API, are corrected by a daily repair, which recounts everything.
+    """
+
+    source_repository: SourceRepository
+    parking_site_repository: ParkingSiteRepository
+    parking_spot_repository: ParkingSpotRepository
+
+    def __init__(
+        self,
+        *args,
+        source_repository: SourceRepository,
+        parking_site_repository: ParkingSiteRepository,
+        parking_spot_repository: ParkingSpotRepository,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.source_repository = source_repository
+        self.parking_site_repository = parking_site_repository
+        self.parking_spot_repository = parking_spot_repository
+
+    @staticmethod
+    def get_source_metric_deltas(source: Source) -> SourceMetricDeltas:
+        return SourceMetricDeltas(realtime_outdated_counted_before=source.realtime_outdated_counted_before)
+
+    def apply_source_metric_deltas(self, source: Source, deltas: SourceMetricDeltas, *, commit: bool = True) -> None:
+        """
+        Applies the deltas of an import. Sources which were not counted yet, like new sources, are counted once instead.
+        """
+        if source.realtime_outdated_counted_before is None:
+            self.update_source_metrics(source)
+            self.source_repository.save_source(source, commit=commit)
+            return
+
+        self.source_repository.add_source_metric_deltas(source.id, deltas.to_dict(), commit=commit)
+
+    def update_source_metrics(self, source: Source) -> None:
+        """
+        Counts all metrics of a single source. The source is not saved, this is up to the caller.
+        """
+        realtime_outdated_before = self._get_realtime_outdated_before()
+
+        source.parking_site_count = self.parking_site_repository.count_by_source(source_id=source.id).get(source.id, 0)
+        source.parking_spot_count = self.parking_spot_repository.count_by_source(source_id=source.id).get(source.id, 0)
+        source.realtime_outdated_parking_site_count = (
+            self.parking_site_repository.fetch_realtime_outdated_parking_site_count_by_source(
+                realtime_outdated_before,
+                source_id=source.id,
+            ).get(source.id, 0)
+        )
+        source.realtime_outdated_parking_spot_count = (
+            self.parking_spot_repository.fetch_realtime_outdated_parking_spot_count_by_source(
+                realtime_outdated_before,
+                source_id=source.id,
+            ).get(source.id, 0)
+        )
+        source.realtime_outdated_counted_before = realtime_outdated_before
+
+    def update_realtime_outdated_metrics(self) -> None:
+        """
+        Adds entries which got realtime outdated since the last run to the realtime outdated counts. Just sources with
+        such entries are written.
+        """
+        realtime_outdated_before = self._get_realtime_outdated_before()
+        sources = [
+            source
+            for source in self.source_repository.fetch_sources()
+            if source.realtime_outdated_counted_before is not None
+            and source.realtime_outdated_counted_before < realtime_outdated_before
+        ]
+        if not sources:
+            return
+
+        since = min(source.realtime_outdated_counted_before for source in sources)
+        parking_site_counts_by_source = (
+            self.parking_site_repository.fetch_newly_realtime_outdated_parking_site_count_by_source(
+                realtime_outdated_before,
+                since=since,
+            )
+        )
+        parking_spot_counts_by_source = (
+            self.parking_spot_repository.fetch_newly_realtime_outdated_parking_spot_count_by_source(
+                realtime_outdated_before,
+                since=since,
+            )
+        )
+
+        for source in sources:
+            deltas = {
+                'realtime_outdated_parking_site_count': parking_site_counts_by_source.get(source.id, 0),
+                'realtime_outdated_parking_spot_count': parking_spot_counts_by_source.get(source.id, 0),
+            }
+            # Without newly outdated entries, the counts are the same for the new timestamp
+            if not any(deltas.values()):
+                continue
+            self.source_repository.add_source_metric_deltas(
+                source.id,
+                deltas,
+                realtime_outdated_counted_before=realtime_outdated_before,
+                commit=False,
+            )
+
+        self.source_repository.commit_transaction()
+
+    def repair_source_metrics(self) -> None:
+        """
+        Recounts the metrics of all sources, and just writes sources whose metrics drifted. Realtime outdated counts are
+        recounted as of realtime_outdated_counted_before of each source, so counts which are correct are kept as they are.
+        """
+        realtime_outdated_before = self._get_realtime_outdated_before()
+
+        metrics_by_field: dict[str, dict[int, int]] = {
+            'parking_site_count': self.parking_site_repository.count_by_source(),
+            'parking_spot_count': self.parking_spot_repository.count_by_source(),
+            'realtime_outdated_parking_site_count': (
+                self.parking_site_repository.fetch_counted_realtime_outdated_parking_site_count_by_source(
+                    realtime_outdated_before,
+                )
+            ),
+            'realtime_outdated_parking_spot_count': (
+                self.parking_spot_repository.fetch_counted_realtime_outdated_parking_spot_count_by_source(
+                    realtime_outdated_before,
+                )
+            ),
+        }
+
+        repaired_source_uids: list[str] = []
+        for source in self.source_repository.fetch_sources():
+            changed = source.realtime_outdated_counted_before is None
+            for field in SOURCE_METRIC_FIELDS:
+                value = metrics_by_field[field].get(source.id, 0)
+                if getattr(source, field) != value:
+                    setattr(source, field, value)
+                    changed = True
+            if not changed:
+                continue
+
+            if source.realtime_outdated_counted_before is None:
+                source.realtime_outdated_counted_before = realtime_outdated_before
+            self.source_repository.save_source(source, commit=False)
+            repaired_source_uids.append(source.uid)
+
+        self.source_repository.commit_transaction()
+
+        if repaired_source_uids:
+            logger.info(f'Repaired metrics of sources {", ".join(repaired_source_uids)}.')
+
+    def _get_realtime_outdated_before(self) -> datetime:
+        return datetime.now(tz=timezone.utc) - timedelta(
+            minutes=self.config_helper.get('REALTIME_OUTDATED_AFTER_MINUTES'),
+        )
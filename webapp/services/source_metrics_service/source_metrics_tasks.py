@@ -0,0 +1,19 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from webapp.dependencies import dependencies
+from webapp.extensions import celery
+
+
+@celery.task()
+def update_realtime_outdated_metrics_task():
+    source_metrics_service = dependencies.get_source_metrics_service()
+    source_metrics_service.update_realtime_outdated_metrics()
+
+
+@celery.task()
+def repair_source_metrics_task():
+    source_metrics_service = dependencies.get_source_metrics_service()
+    source_metrics_service.repair_source_metrics()
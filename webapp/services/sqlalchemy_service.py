@@ -19,6 +19,9 @@ class SqlalchemyService(BaseService):
     """
 
     def handle_model_changes(self, changes: List[Tuple[Any, str]]):
+        # Bulk imports record a summary event instead, so there is no need to look at every changed object
+        if self.event_helper.model_events_suppressed:
+            return
         for obj, action in changes:
             for event in obj.get_events(ModelEventAction(action)):
                 self.event_helper.record(event)
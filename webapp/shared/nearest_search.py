@@ -0,0 +1,42 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from urllib.parse import urlencode
+
+from validataclass.exceptions import ValidationError
+from validataclass_search_queries.search_queries import BaseSearchQuery
+
+
+def validate_nearest_search(search_query: BaseSearchQuery) -> None:
+    if getattr(search_query, 'lat') is None or getattr(search_query, 'lon') is None:
+        raise ValidationError(reason='nearest requires lat and lon')
+    if (getattr(search_query, 'nearest_after_distance') is None) != (getattr(search_query, 'nearest_after_id') is None):
+        raise ValidationError(reason='nearest_after_distance and nearest_after_id have both to be set if one is set')
+
+
+def nearest_api_response(
+    items: list[dict],
+    search_query: BaseSearchQuery,
+    *,
+    request_path: str,
+    original_params: dict,
+) -> dict:
+    """
+    Builds the response of a nearest search. Items have to contain `id` and `distance`, and have to be ordered by
+    `distance` and `id`. If the page is full, `next_path` points to the next page, continuing after the last item.
+    """
+    response: dict = {'items': items}
+
+    if len(items) < getattr(search_query, 'nearest'):
+        return response
+
+    next_params = {
+        **original_params,
+        'nearest_after_distance': items[-1]['distance'],
+        'nearest_after_id': items[-1]['id'],
+    }
+    response['next_path'] = f'{request_path}?{urlencode(next_params)}'
+
+    return response
@@ -8,6 +8,7 @@ from validataclass_search_queries.pagination import PaginatedResult
 from webapp.models import ParkingSite
 from webapp.public_rest_api.base_handler import PublicApiBaseHandler
 from webapp.repositories import ParkingSiteRepository
+from webapp.repositories.parking_site_repository import ParkingSiteRow
 from webapp.shared.parking_site.parking_site_search_query import ParkingSiteSearchInput
 
 
@@ -27,6 +28,18 @@ class GenericParkingSiteHandler(PublicApiBaseHandler):
             include_parking_site_group=True,
         )
 
+    def get_parking_site_row_list(self, search_query: ParkingSiteSearchInput) -> PaginatedResult[ParkingSiteRow]:
+        return self.parking_site_repository.fetch_parking_site_rows(search_query=search_query)
+
+    def get_nearest_parking_site_list(self, search_query: ParkingSiteSearchInput) -> list[tuple[ParkingSite, float]]:
+        return self.parking_site_repository.fetch_nearest_parking_sites(
+            search_query=search_query,
+            include_restrictions=True,
+            include_external_identifiers=True,
+            include_tags=True,
+            include_parking_site_group=True,
+        )
+
     def get_parking_site_item(self, parking_site_id: int) -> ParkingSite:
         return self.parking_site_repository.fetch_parking_site_by_id(
             parking_site_id,
@@ -0,0 +1,86 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+import json
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+from validataclass.exceptions import ValidationError
+
+from webapp.common.json import DefaultJSONEncoder
+from webapp.common.validation import DateTimeToUtcValidator
+from webapp.models import ParkingSite
+from webapp.repositories.parking_site_repository import ParkingSiteRealtime
+
+PARKING_SITE_REALTIME_CHANNEL = 'parking_site_realtime'
+
+
+@dataclass
+class ParkingSiteRealtimeEvent:
+    """
+    Realtime change of a single parking site as it is published after realtime imports. `data` is the already
+    serialized ParkingSiteRealtime, so it can be sent to any number of clients without serializing it again. The other
+    fields are used for filtering.
+    """
+
+    event_id: str
+    parking_site_id: int
+    source_id: int
+    lat: float
+    lon: float
+    data: str
+
+    @classmethod
+    def from_parking_site(cls, parking_site: ParkingSite) -> 'ParkingSiteRealtimeEvent':
+        return cls.from_parking_site_realtime(
+            ParkingSiteRealtime.from_parking_site(parking_site),
+            source_id=parking_site.source_id,
+            lat=float(parking_site.lat),
+            lon=float(parking_site.lon),
+        )
+
+    @classmethod
+    def from_parking_site_realtime(
+        cls,
+        parking_site_realtime: ParkingSiteRealtime,
+        *,
+        source_id: int,
+        lat: float,
+        lon: float,
+    ) -> 'ParkingSiteRealtimeEvent':
+        return cls(
+            event_id=get_parking_site_realtime_event_id(
+                parking_site_realtime.realtime_data_updated_at,
+                parking_site_realtime.id,
+            ),
+            parking_site_id=parking_site_realtime.id,
+            source_id=source_id,
+            lat=lat,
+            lon=lon,
+            data=json.dumps(parking_site_realtime.to_dict(), cls=DefaultJSONEncoder),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ParkingSiteRealtimeEvent':
+        return cls(**data)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def get_parking_site_realtime_event_id(realtime_data_updated_at: datetime, parking_site_id: int) -> str:
+    """
+    Event ids are realtime delta cursors (see RealtimeDeltaInput): the timestamp with microseconds and the parking site
+    id, so a stream can be resumed from the database.
+    """
+    return f'{realtime_data_updated_at.strftime("%Y-%m-%dT%H:%M:%S.%fZ")}/{parking_site_id}'
+
+
+def parse_parking_site_realtime_event_id(event_id: str) -> tuple[datetime, int]:
+    since_str, _, since_id_str = event_id.partition('/')
+    if not since_id_str.isdigit():
+        raise ValidationError(reason=f'Invalid event id {event_id}.')
+
+    return DateTimeToUtcValidator(discard_milliseconds=False).validate(since_str), int(since_id_str)
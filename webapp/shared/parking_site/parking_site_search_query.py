@@ -30,8 +30,10 @@ from validataclass_search_queries.pagination import CursorPaginationMixin, Pagin
 from validataclass_search_queries.search_queries import BaseSearchQuery, search_query_dataclass
 from validataclass_search_queries.validators import MultiSelectIntegerValidator, MultiSelectValidator
 
+from webapp.common.pagination import CountModeMixin
 from webapp.common.validation import DateTimeToUtcValidator
 from webapp.common.validation.list_validators import CommaSeparatedListValidator
+from webapp.shared.nearest_search import validate_nearest_search
 
 
 @search_query_dataclass
@@ -47,7 +49,7 @@ class ParkingSiteBaseSearchInput(BaseSearchQuery):
 
 
 @search_query_dataclass
-class ParkingSiteSearchInput(ParkingSiteBaseSearchInput, CursorPaginationMixin):
+class ParkingSiteSearchInput(ParkingSiteBaseSearchInput, CountModeMixin, CursorPaginationMixin):
     not_source_ids: list[int] | None = SearchParamCustom(), MultiSelectIntegerValidator(min_value=1)
     source_uids: list[str] | None = SearchParamMultiSelect(), MultiSelectValidator(StringValidator(min_length=1))
     name: str | None = SearchParamContains(), StringValidator()
@@ -70,6 +72,7 @@ class ParkingSiteSearchInput(ParkingSiteBaseSearchInput, CursorPaginationMixin):
     lon_min: Optional[Decimal] = SearchParamCustom(), NumericValidator()
     lon_max: Optional[Decimal] = SearchParamCustom(), NumericValidator()
     official_region_code: str | None = SearchParamEquals(), StringValidator(min_length=1, max_length=36)
+    has_free_capacity: bool | None = SearchParamCustom(), BooleanValidator(allow_strings=True)
 
 
 @search_query_dataclass
@@ -82,8 +85,16 @@ class ParkingSiteGeoSearchInput(ParkingSiteSearchInput):
     location: Optional[list[Decimal]] = SearchParamCustom(), CommaSeparatedListValidator(NumericValidator())
     radius: Optional[Decimal] = SearchParamCustom(), NumericValidator()
 
+    # Nearest search: returns the given number of parking sites ordered by distance to lat / lon, paginated by the
+    # distance and id of the last item
+    nearest: int | None = SearchParamCustom(), IntegerValidator(min_value=1, max_value=1000, allow_strings=True)
+    nearest_after_distance: Decimal | None = SearchParamCustom(), NumericValidator(min_value=0)
+    nearest_after_id: int | None = SearchParamCustom(), IntegerValidator(min_value=0, allow_strings=True)
+
     def __post_init__(self):
-        if (self.lat is not None or self.lon is not None or self.radius is not None or self.location) and not (
+        if self.nearest is not None:
+            validate_nearest_search(self)
+        elif (self.lat is not None or self.lon is not None or self.radius is not None or self.location) and not (
             ((self.lat and self.lon) or self.location) and self.radius
         ):
             raise ValidationError(reason='lat, lon and radius have all to be set if one is set')
@@ -0,0 +1,175 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+import csv
+from datetime import datetime
+from enum import Enum
+from importlib.util import find_spec
+from io import StringIO
+from typing import Any, Iterable, Iterator
+
+from sqlalchemy import BigInteger, Integer
+from sqlalchemy_utc import UtcDateTime
+
+from webapp.models import ParkingSiteHistory
+
+# Rows per CSV chunk or columnar record batch
+EXPORT_BATCH_SIZE = 10000
+
+PARKING_SITE_HISTORY_EXPORT_FIELDS: list[str] = list(ParkingSiteHistory.__table__.c.keys())
+# Deprecated capacity fields are mostly empty, so they are just exported on request
+PARKING_SITE_HISTORY_EXPORT_DEFAULT_FIELDS: list[str] = [
+    'id',
+    'parking_site_id',
+    'created_at',
+    'static_data_updated_at',
+    'realtime_data_updated_at',
+    'realtime_opening_status',
+    'capacity',
+    'realtime_capacity',
+    'realtime_free_capacity',
+]
+
+
+class ParkingSiteHistoryExportFormat(Enum):
+    CSV = 'csv'
+    ARROW = 'arrow'
+    PARQUET = 'parquet'
+
+    @property
+    def mimetype(self) -> str:
+        return {
+            ParkingSiteHistoryExportFormat.CSV: 'text/csv',
+            ParkingSiteHistoryExportFormat.ARROW: 'application/vnd.apache.arrow.stream',
+            ParkingSiteHistoryExportFormat.PARQUET: 'application/vnd.apache.parquet',
+        }[self]
+
+    @property
+    def is_available(self) -> bool:
+        # Columnar formats need the optional pyarrow package
+        return self == ParkingSiteHistoryExportFormat.CSV or find_spec('pyarrow') is not None
+
+
+def iter_parking_site_history_export(
+    rows: Iterable[Any],
+    fields: list[str],
+    export_format: ParkingSiteHistoryExportFormat,
+) -> Iterator[bytes]:
+    """
+    Serializes rows with the given fields in chunks, so exports of any size are streamed with bounded memory.
+    """
+    if export_format == ParkingSiteHistoryExportFormat.CSV:
+        return _iter_csv_export(rows, fields)
+
+    return _iter_columnar_export(rows, fields, export_format)
+
+
+def _iter_csv_export(rows: Iterable[Any], fields: list[str]) -> Iterator[bytes]:
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+
+    for index, row in enumerate(rows, start=1):
+        writer.writerow([_get_csv_value(value) for value in row])
+        if index % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue().encode()
+
+
+def _get_csv_value(value: Any) -> Any:
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+class _ChunkSink:
+    """
+    Write-only file object which collects written bytes until they are taken, so pyarrow writers can be streamed.
+    """
+
+    closed: bool = False
+    _chunks: list[bytes]
+    _position: int = 0
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _iter_columnar_export(
+    rows: Iterable[Any],
+    fields: list[str],
+    export_format: ParkingSiteHistoryExportFormat,
+) -> Iterator[bytes]:
+    import pyarrow
+    import pyarrow.ipc
+
+    columns = ParkingSiteHistory.__table__.c
+    schema = pyarrow.schema([(field, _get_arrow_type(pyarrow, columns[field].type)) for field in fields])
+
+    sink = _ChunkSink()
+    output_stream = pyarrow.PythonFile(sink, mode='w')
+    if export_format == ParkingSiteHistoryExportFormat.PARQUET:
+        import pyarrow.parquet
+
+        writer = pyarrow.parquet.ParquetWriter(output_stream, schema)
+    else:
+        writer = pyarrow.ipc.new_stream(output_stream, schema)
+
+    batch: list[list[Any]] = []
+    for row in rows:
+        batch.append([value.value if isinstance(value, Enum) else value for value in row])
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            writer.write_batch(_get_record_batch(pyarrow, schema, batch))
+            batch = []
+            yield sink.take()
+
+    if batch:
+        writer.write_batch(_get_record_batch(pyarrow, schema, batch))
+    writer.close()
+
+    yield sink.take()
+
+
+def _get_arrow_type(pyarrow: Any, column_type: Any) -> Any:
+    if isinstance(column_type, UtcDateTime):
+        return pyarrow.timestamp('us', tz='UTC')
+    if isinstance(column_type, BigInteger):
+        return pyarrow.int64()
+    if isinstance(column_type, Integer):
+        return pyarrow.int32()
+    return pyarrow.string()
+
+
+def _get_record_batch(pyarrow: Any, schema: Any, batch: list[list[Any]]) -> Any:
+    return pyarrow.record_batch(
+        [pyarrow.array([row[index] for row in batch], type=field.type) for index, field in enumerate(schema)],
+        schema=schema,
+    )
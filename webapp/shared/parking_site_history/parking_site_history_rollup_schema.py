@@ -0,0 +1,53 @@
+"""
+Copyright 2026 binary butterfly GmbH
+Use of this source code is governed by an MIT-style license that can be found in the LICENSE.txt.
+"""
+
+from flask_openapi.decorator import Schema
+from flask_openapi.schema import DateTimeField, EnumField, IntegerField, JsonSchema, NumericField
+
+from webapp.models.parking_site_history_rollup import ParkingSiteHistoryResolution
+
+parking_site_history_rollup_schema = JsonSchema(
+    title='ParkingSiteHistoryRollup',
+    properties={
+        'parking_site_id': IntegerField(minimum=1),
+        'resolution': EnumField(enum=ParkingSiteHistoryResolution),
+        'period_start': DateTimeField(description='Start of the UTC hour or day.'),
+        'change_count': IntegerField(
+            minimum=0,
+            description='Number of history entries, so changes, in this period. Periods without changes carry over the '
+            'values of the last change.',
+        ),
+        'realtime_free_capacity_min': IntegerField(minimum=0, nullable=True),
+        'realtime_free_capacity_max': IntegerField(minimum=0, nullable=True),
+        'realtime_free_capacity_avg': NumericField(
+            minimum=0,
+            nullable=True,
+            description='Average free capacity, weighted by the time each value was valid.',
+        ),
+        'open_share': NumericField(
+            minimum=0,
+            maximum=1,
+            nullable=True,
+            description='Share of time with opening status OPEN, of the time with any opening status.',
+        ),
+    },
+)
+
+parking_site_history_rollup_example = {
+    'parking_site_id': 1,
+    'resolution': 'hour',
+    'period_start': '2026-10-19T08:00:00Z',
+    'change_count': 12,
+    'realtime_free_capacity_min': 18,
+    'realtime_free_capacity_max': 42,
+    'realtime_free_capacity_avg': 27.5,
+    'open_share': 1.0,
+}
+
+parking_site_history_rollup_component = Schema(
+    'ParkingSiteHistoryRollup',
+    schema=parking_site_history_rollup_schema,
+    example=parking_site_history_rollup_example,
+)